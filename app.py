@@ -7,8 +7,8 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 # ✅ Import local components
 from components.landing_page import show_landing
-from utils.setup_admin import setup_admin_account
-from utils.auto_cancel import cancel_expired_requests
+from utils.maintenance import start_background_scheduler
+from utils.outbox import start_background_worker
 from auth.auth_handler import login, logout
 from auth.profile import change_password, profile_form
 from components.sidebar import sidebar
@@ -16,6 +16,7 @@ from components.mentorchat_widget import mentorchat_widget
 from roles import admin, mentor, mentee
 from utils.footer import app_footer
 from components import SendBroadcast
+from supabase_utils import tracing
 
 # ✅ Import matching utils
 from utils.matching import UserProfile, recommend_mentors
@@ -23,6 +24,9 @@ from utils.matching import UserProfile, recommend_mentors
 # ✅ Set app configuration
 st.set_page_config(page_title="MentorLink", layout="wide")
 
+# ✅ Group this rerun's Supabase calls into one trace span (admin 🐞 Trace tab)
+tracing.begin_rerun(st.session_state.get("role") or "guest")
+
 # ✅ Custom header
 st.markdown("""
     <style>
@@ -81,8 +85,26 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # ✅ Setup and initialize
-setup_admin_account()
-cancel_expired_requests()
+# Admin bootstrap and request sweeps run in the maintenance scheduler, not on
+# every rerun. With a separate `python -m utils.maintenance run` process, set
+# MAINTENANCE_IN_APP=0; otherwise one in-process scheduler per server starts
+# here (leader lock keeps replicas from duplicating work).
+@st.cache_resource
+def maintenance_scheduler():
+    return start_background_scheduler()
+
+if os.getenv("MAINTENANCE_IN_APP", "1").lower() not in ("0", "false", "no"):
+    maintenance_scheduler()
+
+# Booking calendar events and emails are outbox jobs (utils/outbox.py). One
+# worker thread per server drains them (leases keep replicas from running a
+# job twice); set OUTBOX_IN_APP=0 when `python -m utils.outbox work` runs separately.
+@st.cache_resource
+def outbox_worker():
+    return start_background_worker()
+
+if os.getenv("OUTBOX_IN_APP", "1").lower() not in ("0", "false", "no"):
+    outbox_worker()
 sidebar()
 mentorchat_widget()
 
@@ -2,6 +2,7 @@ import streamlit as st
 import bcrypt
 import time
 from database import supabase
+from supabase_utils import tracing
 from datetime import datetime
 import pytz
 
@@ -15,6 +16,7 @@ def login():
     password = st.text_input("Password", type="password", placeholder="Enter your password")
 
     if st.button("Login"):
+        tracing.action("login")
         if not email or not password:
             st.warning("Please enter both email and password.")
             return
@@ -2,6 +2,7 @@ import streamlit as st
 import time
 import bcrypt
 from database import supabase
+from utils.mentor_index import refresh_mentor
 
 def profile_form():
     st.title("🧑‍💼 Complete Your Profile")
@@ -30,6 +31,7 @@ def profile_form():
             }).execute()
 
         supabase.table("users").update({"profile_completed": True}).eq("userid", userid).execute()
+        refresh_mentor(userid)
         st.session_state.user["profile_completed"] = True
         st.session_state.pop("force_profile_update", None)
         
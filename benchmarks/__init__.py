@@ -0,0 +1,2 @@
+# Benchmarks and local stand-ins. Run from the repo root, e.g.:
+#   python -m benchmarks.bench_matching
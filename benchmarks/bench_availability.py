@@ -0,0 +1,131 @@
+# benchmarks/bench_availability.py
+"""
+Availability index vs. the linear scans it replaces, for one mentor.
+
+    python -m benchmarks.bench_availability [--slots 10000] [--queries 2000] [--candidates 1000]
+
+Legacy paths: the `any(...)` overlap scan with pd.to_datetime (mentor_calendar)
+and with datetime.fromisoformat (roles/mentor.py), and the free-slot filter
+over every slot (Browse Mentors). Results are checked for equality.
+"""
+
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytz
+
+from utils.availability import AvailabilityIndex
+
+WAT = pytz.timezone("Africa/Lagos")
+
+
+def make_slots(rng, n, base):
+    """n slots of 30-90 minutes spread over ~n/4 days; a few overlap, some back to back"""
+    slots, t = [], base
+    for i in range(n):
+        t += timedelta(minutes=rng.choice([0, 30, 60, 120, 360]))
+        start = t
+        end = start + timedelta(minutes=rng.choice([30, 60, 90]))
+        if rng.random() > 0.05:  # 5% overlap the next slot
+            t = end
+        slots.append({"availabilityid": f"a{i}", "start": start.isoformat(), "end": end.isoformat()})
+    return slots
+
+
+def legacy_overlap_pandas(slots, start, end):
+    return any(not (end <= pd.to_datetime(s["start"]) or start >= pd.to_datetime(s["end"])) for s in slots)
+
+
+def legacy_overlap_iso(slots, start, end):
+    return any(not (end <= datetime.fromisoformat(s["start"]) or start >= datetime.fromisoformat(s["end"])) for s in slots)
+
+
+def legacy_free_slots(slots, used_ids, after, days):
+    limit = after + timedelta(days=days)
+    free = []
+    for s in slots:
+        start = datetime.fromisoformat(s["start"])
+        if s["availabilityid"] not in used_ids and after < start < limit:
+            free.append(s["availabilityid"])
+    return free
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--slots", type=int, default=10_000)
+    parser.add_argument("--queries", type=int, default=2_000)
+    parser.add_argument("--pandas-queries", type=int, default=3, help="the pd.to_datetime scan takes seconds per query")
+    parser.add_argument("--candidates", type=int, default=1_000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    base = WAT.localize(datetime(2030, 1, 1, 8))
+    slots = make_slots(rng, args.slots, base)
+    used_ids = {s["availabilityid"] for s in rng.sample(slots, len(slots) // 3)}
+    span = datetime.fromisoformat(slots[-1]["end"]) - base
+
+    index, build_ms = timed(AvailabilityIndex, slots, used_ids)
+
+    queries = []
+    for _ in range(args.queries):
+        start = base + timedelta(minutes=rng.randrange(int(span.total_seconds() // 60)))
+        queries.append((start, start + timedelta(minutes=rng.choice([15, 30, 60]))))
+
+    legacy, legacy_ms = timed(lambda: [legacy_overlap_iso(slots, s, e) for s, e in queries])
+    fast, fast_ms = timed(lambda: [index.overlaps(s, e) for s, e in queries])
+    pandas_q = queries[:args.pandas_queries]
+    legacy_pd, pandas_ms = timed(lambda: [legacy_overlap_pandas(slots, s, e) for s, e in pandas_q])
+    overlap_ok = legacy == fast and legacy_pd == fast[:len(pandas_q)]
+
+    windows = [(base + timedelta(days=rng.randrange(max(span.days, 1))), 7) for _ in range(200)]
+    legacy_free, legacy_free_ms = timed(lambda: [legacy_free_slots(slots, used_ids, a, d) for a, d in windows])
+    fast_free, fast_free_ms = timed(lambda: [[r["availabilityid"] for _, _, r in index.free_slots(a, d)] for a, d in windows])
+
+    # The legacy scan keeps table order; the index returns start order
+    free_ok = [sorted(a) for a in legacy_free] == [sorted(b) for b in fast_free]
+
+    # Bulk insertion of candidate slots (e.g. a weekly pattern) vs. check-then-append one at a time
+    candidates = []
+    for i in range(args.candidates):
+        start = base + timedelta(minutes=30 * rng.randrange(int(span.total_seconds() // 1800)))
+        candidates.append({"availabilityid": f"c{i}", "start": start.isoformat(),
+                           "end": (start + timedelta(minutes=30)).isoformat()})
+
+    def legacy_bulk():
+        existing = list(slots)
+        accepted = []
+        for c in sorted(candidates, key=lambda c: (c["start"], c["end"])):
+            s, e = datetime.fromisoformat(c["start"]), datetime.fromisoformat(c["end"])
+            if not legacy_overlap_iso(existing, s, e):
+                existing.append(c)
+                accepted.append(c["availabilityid"])
+        return accepted
+
+    legacy_acc, legacy_bulk_ms = timed(legacy_bulk)
+    (accepted, rejected), bulk_ms = timed(index.bulk_add, candidates)
+    bulk_ok = sorted(legacy_acc) == sorted(r["availabilityid"] for r in accepted)
+
+    print(f"{args.slots:,} slots for one mentor ({len(index.merged()):,} merged blocks)")
+    print(f"  index build                 {build_ms:9.1f} ms")
+    print(f"  overlap check, legacy iso   {legacy_ms / len(queries) * 1000:9.1f} µs/query")
+    print(f"  overlap check, legacy pd    {pandas_ms / len(pandas_q) * 1000:9.1f} µs/query")
+    print(f"  overlap check, index        {fast_ms / len(queries) * 1000:9.1f} µs/query")
+    print(f"  free slots next 7 days      {legacy_free_ms / len(windows):9.2f} ms legacy  "
+          f"{fast_free_ms / len(windows):7.3f} ms index")
+    print(f"  bulk add {args.candidates} candidates     {legacy_bulk_ms:9.1f} ms legacy  {bulk_ms:7.1f} ms index  "
+          f"({len(accepted)} accepted)")
+    print(f"  results match: overlap {overlap_ok}  free slots {free_ok}  bulk {bulk_ok}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+# benchmarks/bench_calendar.py
+"""
+Google Calendar client against a local fake of the API.
+
+    python -m benchmarks.bench_calendar [--events 200] [--rtt-ms 40]
+
+FakeCalendarServer emulates the OAuth token endpoint, events.insert /
+events.get and the multipart batch endpoint, adding --rtt-ms to every HTTP
+request. Compares:
+
+  per-call   what get_calendar_service() used to do for every booking:
+             load the service-account credentials, build() the service,
+             fetch a token, insert
+  cached     one CalendarClient: token fetched once, keep-alive connection
+  batched    CalendarClient.insert_events: 50 inserts per HTTP request
+
+and checks that every event is created exactly once, that re-running a
+batch with the same event ids creates nothing new (409s resolve to the
+existing events), and that an expired token is refreshed once.
+"""
+
+import argparse
+import email.parser
+import json
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from google.oauth2 import service_account
+from googleapiclient.discovery import build
+
+from utils.google_calendar import SCOPES, CalendarClient, event_body
+from utils.outbox import event_id_for
+
+CALENDAR_ID = "bench@example.com"
+BATCH_WORKERS = 16
+
+
+class FakeCalendarServer:
+    """In-memory events store behind the Calendar v3 REST and batch endpoints"""
+
+    def __init__(self, rtt: float = 0.0, conference_delay: float = 0.0, pending_every: int = 0):
+        self.rtt = rtt
+        self.conference_delay = conference_delay  # Meet creation time on inserts with conferenceDataVersion=1
+        self.pending_every = pending_every  # every Nth conference is still "pending" until fetched again
+        self.events = {}
+        self.counts = {"token": 0, "insert": 0, "get": 0, "patch": 0, "conference": 0, "batch": 0, "http": 0,
+                       "unauthorized": 0}
+        self.lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}/"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.httpd.shutdown()
+
+    def count(self, key):
+        with self.lock:
+            self.counts[key] += 1
+
+    # One API call: (status, json body)
+    def call(self, method, path, headers, body):
+        if path == "/token":
+            self.count("token")
+            return 200, {"access_token": f"token-{uuid.uuid4().hex}", "expires_in": 3600, "token_type": "Bearer"}
+        if not (headers.get("Authorization") or headers.get("authorization") or "").startswith("Bearer token-"):
+            self.count("unauthorized")
+            return 401, {"error": {"code": 401, "message": "Login required"}}
+        prefix = f"/calendar/v3/calendars/{CALENDAR_ID.replace('@', '%40')}/events"
+        path, _, query = path.partition("?")
+        if method == "POST" and path == prefix:
+            self.count("insert")
+            event = json.loads(body or b"{}")
+            conference = "conferenceDataVersion=1" in query and "createRequest" in event.get("conferenceData", {})
+            if conference:
+                time.sleep(self.conference_delay)
+            with self.lock:
+                event_id = event.get("id") or uuid.uuid4().hex
+                if event_id in self.events:
+                    return 409, {"error": {"code": 409, "message": "The requested identifier already exists."}}
+                event.update(id=event_id, htmlLink=f"https://calendar.google.com/event?eid={event_id}", status="confirmed")
+                if conference:
+                    self.counts["conference"] += 1
+                    link = f"https://meet.google.com/{event_id[:3]}-{event_id[3:7]}-{event_id[7:10]}"
+                    if self.pending_every and self.counts["conference"] % self.pending_every == 0:
+                        event["_pending_link"] = link
+                        event["conferenceData"]["createRequest"]["status"] = {"statusCode": "pending"}
+                    else:
+                        event["hangoutLink"] = link
+                        event["conferenceData"]["createRequest"]["status"] = {"statusCode": "success"}
+                self.events[event_id] = event
+            return 200, {k: v for k, v in event.items() if k != "_pending_link"}
+        if method in ("GET", "PATCH") and path.startswith(prefix + "/"):
+            self.count(method.lower())
+            with self.lock:
+                event = self.events.get(path[len(prefix) + 1:])
+                if event is None:
+                    return 404, {"error": {"code": 404, "message": "Not Found"}}
+                if "_pending_link" in event:
+                    event["hangoutLink"] = event.pop("_pending_link")
+                    event["conferenceData"]["createRequest"]["status"] = {"statusCode": "success"}
+                if method == "PATCH":
+                    event.update(json.loads(body or b"{}"))
+                return 200, dict(event)
+        return 404, {"error": {"code": 404, "message": f"No route for {method} {path}"}}
+
+    def batch(self, content_type, body):
+        self.count("batch")
+        message = email.parser.BytesParser().parsebytes(
+            f"Content-Type: {content_type}\r\n\r\n".encode() + body)
+        boundary = f"batch_{uuid.uuid4().hex}"
+        # Google works on the parts of a batch concurrently
+        with ThreadPoolExecutor(max_workers=BATCH_WORKERS) as pool:
+            parts = list(pool.map(lambda part: self._batch_part(part, boundary), message.get_payload()))
+        return f"multipart/mixed; boundary={boundary}", ("".join(parts) + f"--{boundary}--\r\n").encode()
+
+    def _batch_part(self, part, boundary):
+        request = part.get_payload(decode=False)
+        head, _, inner_body = request.partition("\r\n\r\n") if "\r\n\r\n" in request else request.partition("\n\n")
+        request_line, *header_lines = head.splitlines()
+        method, path, _ = request_line.split(" ", 2)
+        headers = dict(line.split(": ", 1) for line in header_lines if ": " in line)
+        status, payload = self.call(method, path, headers, inner_body.encode())
+        content_id = part["Content-ID"].strip("<>")
+        return (
+            f"--{boundary}\r\nContent-Type: application/http\r\nContent-ID: <response-{content_id}>\r\n\r\n"
+            f"HTTP/1.1 {status} {'OK' if status == 200 else 'Error'}\r\nContent-Type: application/json; charset=UTF-8\r\n\r\n"
+            f"{json.dumps(payload)}\r\n"
+        )
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, like Google's frontends
+
+            def _respond(self, status, content_type, data):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _handle(self, method):
+                server.count("http")
+                time.sleep(server.rtt)
+                body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                if self.path.startswith("/batch/calendar/v3"):
+                    self._respond(200, *server.batch(self.headers["Content-Type"], body))
+                else:
+                    status, payload = server.call(method, self.path, self.headers, body)
+                    self._respond(status, "application/json", json.dumps(payload).encode())
+
+            def do_POST(self):
+                self._handle("POST")
+
+            def do_GET(self):
+                self._handle("GET")
+
+            def do_PATCH(self):
+                self._handle("PATCH")
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+def service_account_info(token_uri):
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    pem = key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8,
+                            serialization.NoEncryption()).decode()
+    return {
+        "type": "service_account", "project_id": "bench", "private_key_id": "bench-key",
+        "private_key": pem, "client_email": "bench@bench.iam.gserviceaccount.com", "client_id": "1",
+        "token_uri": token_uri,
+    }
+
+
+def make_bodies(n, tag):
+    start = datetime(2030, 1, 6, 9, tzinfo=timezone.utc)
+    return [event_body(start + timedelta(hours=i), start + timedelta(hours=i, minutes=45), f"Session {i}",
+                       ["mentor@example.com", "mentee@example.com"], event_id_for(f"{tag}:{i}"))
+            for i in range(n)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=200)
+    parser.add_argument("--rtt-ms", type=float, default=40.0, help="simulated latency per HTTP request")
+    args = parser.parse_args()
+
+    server = FakeCalendarServer(args.rtt_ms / 1000)
+    info = service_account_info(f"{server.url}token")
+    endpoint = {"api_endpoint": f"{server.url}calendar/v3/"}
+    n = args.events
+    rows = []
+
+    def measure(name, fn, bodies):
+        before = dict(server.counts)
+        started = time.perf_counter()
+        fn(bodies)
+        elapsed = time.perf_counter() - started
+        delta = {k: server.counts[k] - before[k] for k in server.counts}
+        rows.append((name, elapsed, delta))
+
+    # Legacy: credentials + build() + token fetch for every single event
+    def per_call(bodies):
+        for body in bodies:
+            credentials = service_account.Credentials.from_service_account_info(info, scopes=SCOPES)
+            service = build("calendar", "v3", credentials=credentials, client_options=endpoint)
+            service.events().insert(calendarId=CALENDAR_ID, body=body).execute()
+
+    client = CalendarClient(service_account.Credentials.from_service_account_info(info, scopes=SCOPES),
+                            root_url=server.url, calendar_id=CALENDAR_ID)
+
+    def cached(bodies):
+        for body in bodies:
+            client.insert_event(body)
+
+    batch_results = []
+
+    def batched(bodies):
+        batch_results.extend(client.insert_events(bodies))
+
+    measure("per-call", per_call, make_bodies(n, "legacy"))
+    measure("cached", cached, make_bodies(n, "cached"))
+    measure("batched", batched, make_bodies(n, "batched"))
+
+    print(f"{n} events, {args.rtt_ms:.0f} ms per HTTP round trip")
+    for name, elapsed, delta in rows:
+        print(f"  {name:9s} {elapsed * 1000:8.0f} ms  {elapsed / n * 1000:7.1f} ms/event  "
+              f"http {delta['http']:4d}  token {delta['token']:3d}  inserts {delta['insert']}")
+
+    checks = {}
+    checks["all created once"] = len(server.events) == 3 * n and all(e is not None and err is None for e, err in batch_results)
+
+    # Same ids again: every insert is a 409 that resolves to the existing event via a batched get
+    before = dict(server.counts)
+    again = client.insert_events(make_bodies(n, "batched"))
+    checks["idempotent re-run"] = (
+        len(server.events) == 3 * n
+        and all(e is not None and e["id"] == event_id_for(f"batched:{i}") for i, (e, _) in enumerate(again))
+        and server.counts["get"] - before["get"] == n
+    )
+
+    # Expired token: refreshed once, then reused
+    client.credentials.expiry = datetime.utcnow() - timedelta(seconds=1)
+    before = server.counts["token"]
+    client.insert_events(make_bodies(5, "refresh"))
+    client.insert_event(make_bodies(1, "refresh-single")[0])
+    checks["token refresh"] = server.counts["token"] - before == 1 and server.counts["unauthorized"] == 0
+
+    # Threads share the client (own connections, shared token)
+    before = server.counts["token"]
+    threads = [threading.Thread(target=lambda k=k: [client.insert_event(b) for b in make_bodies(10, f"thread-{k}")])
+               for k in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    checks["threads share token"] = server.counts["token"] == before and len(server.events) == 3 * n + 6 + 80
+
+    server.close()
+    print("  " + "  ".join(f"{k}: {v}" for k, v in checks.items()))
+    print("✅ all checks passed" if all(checks.values()) else "❌ some checks failed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+# benchmarks/bench_chat_history.py
+"""
+MentorChat widget cost on every rerun, with long chat sessions.
+
+    python -m benchmarks.bench_chat_history [--turns 100 1000 5000] [--reruns 5]
+
+Runs the widget in Streamlit's AppTest with a history of --turns exchanges
+already in session state, and times a plain rerun (what any unrelated click
+on the dashboard costs while the chat is open):
+
+  legacy   the old widget: every exchange kept, two st.markdown per exchange
+  bounded  components.mentorchat_widget: ring buffer, latest page rendered
+           as one markdown block
+
+Also checks ChatHistory's spill log: evicted turns land on disk in order,
+"load older" pages back through them, and a new session sees the log.
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from streamlit.testing.v1 import AppTest
+
+from utils.chat_history import CHAT_HISTORY_CAP, CHAT_PAGE_SIZE, ChatHistory
+
+LEGACY_WIDGET = '''
+import streamlit as st
+
+def mentorchat_widget():
+    if not st.session_state.get("show_mentor_chat", False):
+        return
+    st.markdown("### 🤖 MentorChat", help="Ask any question about using MentorLink")
+    with st.expander("💬 Chat with MentorChat", expanded=True):
+        if "chat_history" not in st.session_state:
+            st.session_state.chat_history = []
+        for entry in st.session_state.chat_history:
+            if entry["sender"] == "user":
+                st.markdown(f"🧑‍💻 **You:** {entry['message']}")
+            else:
+                st.markdown(f"🤖 **MentorChat:** {entry['message']}")
+        st.text_input("Type a message", key="mentor_input")
+
+mentorchat_widget()
+'''
+
+BOUNDED_WIDGET = '''
+from components.mentorchat_widget import mentorchat_widget
+mentorchat_widget()
+'''
+
+ANSWER = ("🎯 As a Mentee, you can:\n- Complete your profile with name, skills, and goals\n"
+          "- Browse available mentors by expertise or availability\n- Send mentorship requests")
+
+
+def time_reruns(script, state, reruns):
+    at = AppTest.from_string(script, default_timeout=120)
+    for key, value in state.items():
+        at.session_state[key] = value
+    at.run()
+    times = []
+    for _ in range(reruns):
+        started = time.perf_counter()
+        at.run()
+        times.append((time.perf_counter() - started) * 1000)
+    return at, statistics.median(times)
+
+
+def check_spill(workdir):
+    path = os.path.join(workdir, "user-1.jsonl")
+    history = ChatHistory(cap=50, log_path=path)
+    sent = [(f"question {i}", f"answer {i}") for i in range(1000)]
+    for q, a in sent:
+        history.append(q, a)
+    in_order = [(q, a) for _, q, a in history.window(1000)] == sent
+    bounded = len(history.turns) == 50 and len(history) == 1000
+    page = [(q, a) for _, q, a in history.window(120)] == sent[-120:]
+
+    reopened = ChatHistory(cap=50, log_path=path)  # next session: buffer empty, log has the spilled turns
+    persisted = len(reopened) == 950 and [(q, a) for _, q, a in reopened.window(300)] == sent[650:950]
+    size = os.path.getsize(path)
+    print(f"spill: 1000 turns, cap 50 -> {history.spilled} on disk ({size / history.spilled:.0f} B/turn); "
+          f"order {in_order}, bounded {bounded}, paging {page}, next session {persisted}")
+    return in_order and bounded and page and persisted
+
+
+def check_paging():
+    history = ChatHistory()
+    for i in range(3 * CHAT_PAGE_SIZE):
+        history.append(f"question {i}", ANSWER)
+    at = AppTest.from_string(BOUNDED_WIDGET, default_timeout=60)
+    at.session_state["show_mentor_chat"] = True
+    at.session_state["mentorchat_history"] = history
+    at.session_state["mentorchat_history_user"] = None
+    at.run()
+    first = "question 0\n" in at.markdown[-1].value
+    at.button(key="mentor_input_older").click().run()
+    at.button(key="mentor_input_older").click().run()
+    text = at.markdown[-1].value
+    at.run()
+    exhausted = not any(b.key == "mentor_input_older" for b in at.button)
+    print(f"paging: oldest turn hidden at first {not first}, shown after 2x 'load older' {'question 0' in text}, "
+          f"button gone once everything is shown {exhausted}")
+    return not first and "question 0\n" in text and exhausted
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--reruns", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"rerun with the chat open (median of {args.reruns}); buffer cap {CHAT_HISTORY_CAP}, page {CHAT_PAGE_SIZE}")
+    for n in args.turns:
+        legacy_state = {"show_mentor_chat": True, "chat_history": [
+            entry for i in range(n) for entry in ({"sender": "user", "message": f"question {i}"},
+                                                  {"sender": "bot", "message": ANSWER})]}
+        at, legacy_ms = time_reruns(LEGACY_WIDGET, legacy_state, args.reruns)
+        legacy_elements = len(at.markdown)
+
+        history = ChatHistory()
+        for i in range(n):
+            history.append(f"question {i}", ANSWER)
+        bounded_state = {"show_mentor_chat": True, "mentorchat_history": history, "mentorchat_history_user": None}
+        at, bounded_ms = time_reruns(BOUNDED_WIDGET, bounded_state, args.reruns)
+        print(f"  {n:>5} turns: legacy {legacy_ms:8.1f} ms ({legacy_elements} elements, {2 * n} entries kept)   "
+              f"bounded {bounded_ms:6.1f} ms ({len(at.markdown)} elements, {len(history.turns)} turns kept)")
+
+    with tempfile.TemporaryDirectory() as workdir:
+        ok = check_spill(workdir)
+    ok &= check_paging()
+    print("✅ all checks passed" if ok else "❌ some checks failed")
+
+
+if __name__ == "__main__":
+    main()
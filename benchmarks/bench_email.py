@@ -0,0 +1,112 @@
+# benchmarks/bench_email.py
+"""
+Email throughput against a local SMTP stand-in (aiosmtpd, no TLS/login):
+one connection per message (the old send_email) vs. the pooled dispatcher.
+
+    pip install aiosmtpd
+    python -m benchmarks.bench_email [--messages 500] [--workers 4] [--fail-rate 0.05]
+
+--fail-rate makes the server answer a share of messages with a 451 so the
+dispatcher's retry/backoff path is exercised too.
+"""
+
+import argparse
+import asyncio
+import random
+import smtplib
+import socket
+import time
+
+from emailer import EmailDispatcher, SMTPConnectionPool, build_message
+
+try:
+    from aiosmtpd.controller import Controller
+except ImportError:
+    Controller = None
+
+
+class CountingHandler:
+    def __init__(self, fail_rate=0.0, delay=0.0, seed=7):
+        self.fail_rate = fail_rate
+        self.delay = delay
+        self.rng = random.Random(seed)
+        self.received = 0
+
+    async def handle_DATA(self, server, session, envelope):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.rng.random() < self.fail_rate:
+            return "451 Temporary failure, try again"
+        self.received += 1
+        return "250 OK"
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def send_per_connection(host, port, messages):
+    """The old behaviour: connect, send, quit for every message"""
+    for to_email, subject, body in messages:
+        server = smtplib.SMTP(host, port, timeout=30)
+        try:
+            server.send_message(build_message(to_email, subject, body, from_email="bench@mentorlink.local"))
+        except smtplib.SMTPResponseException:
+            pass
+        finally:
+            server.quit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    parser.add_argument("--delay", type=float, default=0.0, help="server-side seconds per DATA")
+    args = parser.parse_args()
+
+    if Controller is None:
+        print("aiosmtpd is not installed: pip install aiosmtpd")
+        return
+
+    messages = [(f"user{i}@example.com", f"Session reminder #{i}", "See you soon!") for i in range(args.messages)]
+
+    handler = CountingHandler(delay=args.delay)
+    host, port = "127.0.0.1", free_port()
+    controller = Controller(handler, hostname=host, port=port)
+    controller.start()
+    try:
+        start = time.perf_counter()
+        send_per_connection(host, port, messages)
+        single_s = time.perf_counter() - start
+        single_received = handler.received
+
+        handler.received = 0
+        handler.fail_rate = args.fail_rate
+        pool = SMTPConnectionPool(host, port, username="", use_tls=False, size=args.workers)
+        dispatcher = EmailDispatcher(pool=pool, workers=args.workers, backoff=0.05)
+        start = time.perf_counter()
+        job_ids = dispatcher.submit_batch(messages)
+        submit_ms = (time.perf_counter() - start) * 1000
+        dispatcher.flush(timeout=120)
+        pooled_s = time.perf_counter() - start
+        pool.close()
+    finally:
+        controller.stop()
+
+    states = {}
+    for job_id in job_ids:
+        state = dispatcher.status(job_id)["state"]
+        states[state] = states.get(state, 0) + 1
+
+    print(f"{args.messages} messages, {args.workers} workers, fail rate {args.fail_rate:.0%}")
+    print(f"  per-message connection  {args.messages / single_s:8.0f} msg/s  ({single_received} delivered)")
+    print(f"  pooled dispatcher       {args.messages / pooled_s:8.0f} msg/s  ({handler.received} delivered)")
+    print(f"  batch submit returned in {submit_ms:.1f} ms")
+    print(f"  statuses: {states}  stats: {dispatcher.stats()}")
+
+
+if __name__ == "__main__":
+    main()
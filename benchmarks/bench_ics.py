@@ -0,0 +1,261 @@
+# benchmarks/bench_ics.py
+"""
+ICS import/export checks and timings on generated multi-thousand-event files.
+
+    python -m benchmarks.bench_ics [--events 5000] [--sessions 3000]
+
+Import: a fixture .ics mixing UTC, TZID and floating times, DURATION,
+folded multibyte lines, VALARMs, all-day, cancelled, past and duplicate
+events is stream-parsed and imported into an in-memory table; counts must
+match what the generator wrote, and the write must be a single insert.
+
+Export: a feed of --sessions sessions is parsed back and compared, then
+served over HTTP to show conditional GETs (If-None-Match /
+If-Modified-Since) answered with 304 until a session changes.
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+import tracemalloc
+import urllib.error
+import urllib.request
+from datetime import datetime, timedelta, timezone
+
+import pytz
+
+from utils import ics
+
+WAT = pytz.timezone("Africa/Lagos")
+NY = pytz.timezone("America/New_York")
+
+
+class _Result:
+    def __init__(self, data):
+        self.data = data
+
+
+class _Query:
+    def __init__(self, client, table):
+        self.client, self.table, self.filters, self.op = client, table, [], "select"
+
+    def select(self, *_):
+        return self
+
+    def eq(self, column, value):
+        self.filters.append((column, value))
+        return self
+
+    def insert(self, rows):
+        self.op, self.rows = "insert", rows if isinstance(rows, list) else [rows]
+        return self
+
+    def in_(self, column, values):
+        self.filters.append((column, set(values)))
+        return self
+
+    def execute(self):
+        store = self.client.tables.setdefault(self.table, [])
+        if self.op == "insert":
+            self.client.inserts.append((self.table, len(self.rows)))
+            store.extend(self.rows)
+            return _Result(self.rows)
+        match = lambda r: all(r.get(c) in v if isinstance(v, set) else r.get(c) == v for c, v in self.filters)
+        return _Result([r for r in store if match(r)])
+
+
+class MemoryClient:
+    """Just enough of the supabase client for import_availability"""
+
+    def __init__(self):
+        self.tables, self.inserts = {}, []
+
+    def table(self, name):
+        return _Query(self, name)
+
+
+def write_fixture(path, n, now):
+    """Write n events; return the counts import_availability should report"""
+    expected = {"accepted": 0, "rejected": 0, "all_day": 0, "cancelled": 0, "past_or_far": 0}
+    existing = []
+    slot = now.astimezone(WAT).replace(minute=0, second=0, microsecond=0) + timedelta(days=1)
+    previous = None
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write("BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//bench//EN\r\n")
+        for i in range(n):
+            lines = ["BEGIN:VEVENT", f"UID:event-{i}@bench"]
+            kind = i % 20
+            if kind == 0:
+                lines.append(f"DTSTART;VALUE=DATE:{(slot + timedelta(days=i % 30)).strftime('%Y%m%d')}")
+                expected["all_day"] += 1
+            elif kind == 1:
+                lines += [f"DTSTART:{ics._utc_stamp(slot)}", "DURATION:PT1H", "STATUS:CANCELLED"]
+                expected["cancelled"] += 1
+            elif kind == 2:
+                past = now - timedelta(days=30 + i)
+                lines += [f"DTSTART:{ics._utc_stamp(past)}", f"DTEND:{ics._utc_stamp(past + timedelta(hours=1))}"]
+                expected["past_or_far"] += 1
+            elif kind == 3 and previous:
+                # Same time as the previous event: rejected as an overlap
+                lines += [f"DTSTART:{ics._utc_stamp(previous)}", "DURATION:PT30M"]
+                expected["rejected"] += 1
+            else:
+                slot += timedelta(hours=2)
+                if kind % 3 == 0:
+                    local = slot.astimezone(NY).replace(tzinfo=None)
+                    lines.append(f"DTSTART;TZID=America/New_York:{local.strftime('%Y%m%dT%H%M%S')}")
+                elif kind % 3 == 1:
+                    lines.append(f"DTSTART:{slot.astimezone(WAT).strftime('%Y%m%dT%H%M%S')}")  # floating = WAT
+                else:
+                    lines.append(f"DTSTART:{ics._utc_stamp(slot)}")
+                lines.append("DURATION:PT1H" if i % 2 else f"DTEND:{ics._utc_stamp(slot + timedelta(hours=1))}")
+                if kind == 19:
+                    # Pre-existing slot in the table that this event overlaps
+                    existing.append({"availabilityid": f"x{i}", "mentorid": "mentor-1",
+                                     "start": (slot + timedelta(minutes=15)).isoformat(),
+                                     "end": (slot + timedelta(minutes=45)).isoformat()})
+                    expected["rejected"] += 1
+                else:
+                    expected["accepted"] += 1
+                previous = slot
+            lines.append(f"SUMMARY:Office hours ✨ {'with a long, folded description; ' * 3}#{i}")
+            lines += ["BEGIN:VALARM", "TRIGGER:-PT15M", "ACTION:DISPLAY", "END:VALARM", "END:VEVENT"]
+            f.write("".join(ics.fold_line(line) + "\r\n" for line in lines))
+        f.write("END:VCALENDAR\r\n")
+    return expected, existing
+
+
+def check_import(args):
+    now = datetime.now(timezone.utc)
+    workdir = tempfile.mkdtemp(prefix="bench_ics_")
+    path = os.path.join(workdir, "fixture.ics")
+    expected, existing = write_fixture(path, args.events, now)
+    size_mb = os.path.getsize(path) / 1e6
+
+    client = MemoryClient()
+    client.tables["availability"] = list(existing)
+    client.tables["session"], client.tables["availability_rule"] = [], []
+
+    started = time.perf_counter()
+    with open(path, "rb") as f:
+        result = ics.import_availability("mentor-1", f, client=client, after=now)
+    elapsed = time.perf_counter() - started
+
+    # Parser memory stays flat however big the file is (measured separately: tracing is slow)
+    tracemalloc.start()
+    with open(path, "rb") as f:
+        for _ in ics.iter_events(f):
+            pass
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    got = {"accepted": result["accepted"], "rejected": result["rejected"], **result["skipped"]}
+    ok = all(got.get(k) == v for k, v in expected.items()) and got["invalid"] == 0
+    inserts = [n for table, n in client.inserts if table == "availability"]
+    print(f"import: {args.events:,} events, {size_mb:.1f} MB in {elapsed * 1000:.0f} ms "
+          f"({args.events / elapsed:,.0f} events/s), parser peak {peak / 1e3:.0f} kB traced")
+    print(f"  accepted {got['accepted']}  rejected {got['rejected']}  all-day {got['all_day']}  "
+          f"cancelled {got['cancelled']}  past {got['past_or_far']}  invalid {got['invalid']}")
+    print(f"  counts match: {ok}  inserts: {len(inserts)} ({inserts[0] if inserts else 0} rows)")
+
+    # Importing the same file again adds nothing
+    with open(path, "rb") as f:
+        again = ics.import_availability("mentor-1", f, client=client, after=now)
+    print(f"  re-import accepted: {again['accepted']}")
+    return ok and len(inserts) == 1 and again["accepted"] == 0
+
+
+def make_sessions(n, base):
+    sessions = []
+    for i in range(n):
+        start = base + timedelta(hours=3 * i)
+        if i % 2:
+            sessions.append({"sessionid": i, "date": start.astimezone(WAT).replace(tzinfo=None).isoformat(),
+                             "end_time": None, "status": "Scheduled", "meet_link": f"https://meet.google.com/{i}",
+                             "availability": None})
+        else:
+            sessions.append({"sessionid": i, "date": None, "end_time": None, "status": "Scheduled", "meet_link": None,
+                             "availability": {"start": start.isoformat(), "end": (start + timedelta(minutes=45)).isoformat()}})
+    return sessions
+
+
+def check_feed(args):
+    base = datetime(2030, 1, 1, 9, tzinfo=timezone.utc)
+    sessions = make_sessions(args.sessions, base)
+
+    started = time.perf_counter()
+    body = ics.render_feed(sessions)
+    render_ms = (time.perf_counter() - started) * 1000
+    parsed = list(ics.iter_events(body.splitlines(keepends=True)))
+    round_trip = len(parsed) == len(sessions) and all(
+        e["start"] == ics._session_times(s)[0] and e["end"] == ics._session_times(s)[1]
+        for e, s in zip(parsed, sessions)
+    )
+    longest = max(len(line.encode()) for line in body.split("\r\n"))
+    print(f"feed: {args.sessions:,} sessions rendered in {render_ms:.0f} ms, {len(body) / 1e3:.0f} kB, "
+          f"round trip {round_trip}, longest line {longest} octets")
+
+    ics.FEED_SECRET = "bench-secret"
+    loads = {"n": 0}
+
+    def load_sessions(user_id):
+        loads["n"] += 1
+        return sessions
+
+    server = ics.serve(0, load_sessions)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/feed/{ics.feed_token('user-1')}.ics"
+
+    def get(headers=None):
+        request = urllib.request.Request(url, headers=headers or {})
+        started = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request) as response:
+                data = response.read()
+                return response.status, response.headers, len(data), (time.perf_counter() - started) * 1000
+        except urllib.error.HTTPError as e:
+            return e.code, e.headers, 0, (time.perf_counter() - started) * 1000
+
+    status, headers, size, full_ms = get()
+    etag, last_modified = headers["ETag"], headers["Last-Modified"]
+    results = [status == 200]
+    polls = []
+    for _ in range(args.polls):
+        status, _, size_304, ms = get({"If-None-Match": etag})
+        results.append(status == 304 and size_304 == 0)
+        polls.append(ms)
+    status, _, _, _ = get({"If-Modified-Since": last_modified})
+    results.append(status == 304)
+
+    sessions[0] = {**sessions[0], "status": "Cancelled"}
+    status, headers, _, _ = get({"If-None-Match": etag})
+    results.append(status == 200 and headers["ETag"] != etag)
+
+    bad = urllib.request.Request(url.replace("user-1.", "user-2."))
+    try:
+        urllib.request.urlopen(bad)
+        results.append(False)
+    except urllib.error.HTTPError as e:
+        results.append(e.code == 404)
+    server.shutdown()
+
+    print(f"  GET 200: {size / 1e3:.0f} kB in {full_ms:.1f} ms   conditional GET 304: 0 B in "
+          f"{sum(polls) / len(polls):.1f} ms avg over {len(polls)} polls")
+    print(f"  conditional GETs, change detection, bad token: {all(results)}")
+    return round_trip and all(results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=5000)
+    parser.add_argument("--sessions", type=int, default=3000)
+    parser.add_argument("--polls", type=int, default=50)
+    args = parser.parse_args()
+    ok = check_import(args) & check_feed(args)
+    print("✅ all checks passed" if ok else "❌ some checks failed")
+
+
+if __name__ == "__main__":
+    main()
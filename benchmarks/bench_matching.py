@@ -0,0 +1,73 @@
+# benchmarks/bench_matching.py
+"""
+Vectorized MentorMatcher vs the pure-Python recommend_mentors loop.
+
+    python -m benchmarks.bench_matching [--sizes 1000 10000 100000] [--queries 20]
+"""
+
+import argparse
+import random
+import time
+
+from utils.matching import UserProfile, recommend_mentors_linear
+from utils.match_engine import MentorMatcher
+
+SKILLS = [
+    "Python", "Data Science", "UI/UX", "Prototyping", "Design Systems", "Marketing",
+    "Branding", "Excel", "SQL", "Machine Learning", "Product Management", "Cloud",
+    "DevOps", "Communication", "Leadership", "Web Dev", "Cybersecurity", "Power BI",
+]
+WORDS = (
+    "senior engineer designer analyst mentor years experience building products data "
+    "systems teams users growth research testing strategy career learning startup "
+    "scale design code review interview leadership storytelling africa community"
+).split()
+
+
+def make_profile(rng, user_id, role):
+    # Zipf-like skew so a few skills dominate, as in real cohorts
+    skills = list({rng.choices(SKILLS, weights=[1 / (i + 1) for i in range(len(SKILLS))])[0]
+                   for _ in range(rng.randint(1, 5))})
+    bio = " ".join(rng.choices(WORDS, k=rng.randint(8, 25)))
+    goals = " ".join(rng.choices(WORDS, k=rng.randint(5, 12)))
+    return UserProfile(user_id=user_id, role=role, bio=bio, skills=skills, goals=goals)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--top-n", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    mentees = [make_profile(rng, f"e{i}", "mentee") for i in range(args.queries)]
+
+    print(f"{'mentors':>8} {'python ms/q':>12} {'build ms':>10} {'vector ms/q':>12} {'speedup':>8}  identical")
+    for size in args.sizes:
+        mentors = [make_profile(rng, f"m{i}", "mentor") for i in range(size)]
+
+        start = time.perf_counter()
+        expected = [recommend_mentors_linear(m, mentors, args.top_n) for m in mentees]
+        python_ms = (time.perf_counter() - start) * 1000 / len(mentees)
+
+        start = time.perf_counter()
+        matcher = MentorMatcher(mentors)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        actual = [matcher.recommend(m, args.top_n) for m in mentees]
+        vector_ms = (time.perf_counter() - start) * 1000 / len(mentees)
+
+        identical = all(
+            [(r["mentorId"], r["score"], sorted(r["sharedSkills"])) for r in a]
+            == [(r["mentorId"], r["score"], sorted(r["sharedSkills"])) for r in e]
+            for a, e in zip(actual, expected)
+        )
+        print(f"{size:>8} {python_ms:>12.2f} {build_ms:>10.1f} {vector_ms:>12.2f} "
+              f"{python_ms / max(vector_ms, 1e-9):>7.1f}x  {identical}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+# benchmarks/bench_meet_pool.py
+"""
+Meet link pool end to end against the local fake Calendar API.
+
+    python -m benchmarks.bench_meet_pool [--bookings 50] [--per-day 20] [--conference-ms 800] [--rtt-ms 40]
+
+  legacy   utils.google_meet.create_meet_link inside the booking: every
+           booking waits for Google to create the conference
+  pooled   MeetProvisioner fills the pool (sized from --per-day bookings a
+           day over the last two weeks), then a burst of --bookings claims
+           links in the session insert, as the trigger in sql/meet_pool.sql
+           does; the outbox worker then patches the events and sends emails
+
+Bookings beyond the pool depth fall back to a calendar_event job. Checks
+that every session ends up with a Meet link, that each pooled event was
+moved to its session's time with the attendees invited, and that every
+participant gets exactly one email.
+"""
+
+import argparse
+import itertools
+import statistics
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from google.oauth2 import service_account
+
+from benchmarks.bench_calendar import CALENDAR_ID, FakeCalendarServer, service_account_info
+from benchmarks.bench_outbox import MemoryOutboxStore
+from utils.google_calendar import SCOPES, CalendarClient
+from utils.google_meet import create_meet_link, meet_event_body
+from utils.meet_pool import MeetPoolStore, MeetProvisioner
+import utils.outbox as outbox
+from utils.outbox import OutboxWorker, make_handlers
+
+
+class MemoryMeetPool(MeetPoolStore):
+    """In-process stand-in for the meet_pool table and its claim trigger"""
+
+    def __init__(self, history=()):
+        super().__init__(client=object())
+        self.rows = []
+        self.misses = list(history)  # earlier bookings, for the forecast
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def unclaimed(self):
+        with self._lock:
+            return [dict(r) for r in self.rows if r["sessionid"] is None]
+
+    def add(self, entries):
+        with self._lock:
+            self.rows += [{"poolid": next(self._ids), "sessionid": None, "claimed_at": None, **e} for e in entries]
+
+    def set_meet_link(self, poolid, meet_link, calendar_link=None):
+        with self._lock:
+            next(r for r in self.rows if r["poolid"] == poolid).update(meet_link=meet_link, calendar_link=calendar_link)
+
+    def remove(self, poolids):
+        with self._lock:
+            self.rows = [r for r in self.rows if r["poolid"] not in poolids]
+
+    def booking_times(self, since):
+        with self._lock:
+            times = [r["claimed_at"] for r in self.rows if r["claimed_at"]] + self.misses
+        return [t for t in times if t >= since]
+
+    def claim(self, sessionid):
+        """The trigger's UPDATE ... FOR UPDATE SKIP LOCKED: oldest ready entry, or None"""
+        with self._lock:
+            row = next((r for r in self.rows if r["sessionid"] is None and r["meet_link"]), None)
+            if row is None:
+                self.misses.append(datetime.now(timezone.utc))
+                return None
+            row.update(sessionid=sessionid, claimed_at=datetime.now(timezone.utc))
+            return dict(row)
+
+
+def book(pool, outbox_store, sessionid, start, end, emails, db_rtt):
+    """One session insert: claim a pooled link, or queue the event like book_session does"""
+    time.sleep(db_rtt)
+    entry = pool.claim(sessionid)
+    with outbox_store._lock:
+        outbox_store.sessions[sessionid] = {"start": start, "meet_link": entry and entry["meet_link"]}
+    if entry:
+        outbox_store.enqueue("meet_patch", {
+            "sessionid": sessionid, "event_id": entry["event_id"], "meet_link": entry["meet_link"],
+            "start": start.isoformat(), "end": end.isoformat(), "emails": emails,
+        }, f"session:{sessionid}:meet")
+    else:
+        outbox_store.enqueue("calendar_event", {
+            "sessionid": sessionid, "start": start.isoformat(), "end": end.isoformat(),
+            "summary": "Mentorship Session", "emails": emails,
+        }, f"session:{sessionid}:calendar")
+    return entry
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bookings", type=int, default=50)
+    parser.add_argument("--per-day", type=int, default=20, help="bookings a day in the synthetic history")
+    parser.add_argument("--legacy-bookings", type=int, default=8)
+    parser.add_argument("--conference-ms", type=float, default=800.0, help="time Google takes to create a Meet")
+    parser.add_argument("--rtt-ms", type=float, default=40.0, help="latency per Calendar HTTP request")
+    parser.add_argument("--db-ms", type=float, default=5.0, help="latency of the session insert")
+    args = parser.parse_args()
+
+    server = FakeCalendarServer(args.rtt_ms / 1000, conference_delay=args.conference_ms / 1000, pending_every=10)
+    calendar = CalendarClient(service_account.Credentials.from_service_account_info(
+        service_account_info(f"{server.url}token"), scopes=SCOPES), root_url=server.url, calendar_id=CALENDAR_ID)
+    now = datetime.now(timezone.utc)
+    base = (now + timedelta(days=3)).replace(minute=0, second=0, microsecond=0)
+
+    # Legacy: the booking waits for the Meet
+    legacy = []
+    for i in range(args.legacy_bookings):
+        started = time.perf_counter()
+        link = create_meet_link("Mentorship Session", None, base + timedelta(hours=i),
+                                base + timedelta(hours=i, minutes=45), [f"mentee{i}@example.com"], client=calendar)
+        legacy.append((time.perf_counter() - started) * 1000)
+        assert link, "legacy booking got no Meet link"
+
+    # History: --per-day bookings a day, all within the next few hours of the day
+    history = [now - timedelta(days=d) + timedelta(minutes=300 * k / args.per_day)
+               for d in range(1, 15) for k in range(args.per_day)]
+    pool = MemoryMeetPool(history)
+    provisioner = MeetProvisioner(pool, calendar)
+
+    started = time.perf_counter()
+    first = provisioner.top_up(now)
+    provision_ms = (time.perf_counter() - started) * 1000
+    second = provisioner.top_up(now)
+    depth_before = pool.metrics(now)
+
+    # Burst of bookings: each is one insert that claims a pooled link
+    outbox_store = MemoryOutboxStore()
+    latencies, claimed = [], []
+    lock = threading.Lock()
+
+    def one(i):
+        start = base + timedelta(days=1, hours=i)
+        emails = [f"mentor{i % 7}@example.com", f"mentee{i}@example.com"]
+        t = time.perf_counter()
+        entry = book(pool, outbox_store, i + 1, start, start + timedelta(minutes=45), emails, args.db_ms / 1000)
+        with lock:
+            latencies.append((time.perf_counter() - t) * 1000)
+            claimed.append(entry is not None)
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        list(executor.map(one, range(args.bookings)))
+
+    sent = []
+
+    def create_event(start, end, summary, event_id):
+        body = meet_event_body(summary, start, end)
+        body["id"] = event_id
+        return calendar.insert_event(body, conferenceDataVersion=1)
+
+    worker = OutboxWorker(store=outbox_store, concurrency=8, handlers=make_handlers(
+        create_event=create_event, patch_event=calendar.patch_event,
+        send=lambda to, subject, body: sent.append((to, body))))
+    outbox.BACKOFF_SECONDS = 0.05  # pending conferences retry quickly for the benchmark
+    started = time.perf_counter()
+    while worker.drain() or outbox_store.counts().get("PENDING"):
+        time.sleep(0.05)
+    worker.stop()
+    drain_ms = (time.perf_counter() - started) * 1000
+
+    pooled = sum(claimed)
+    print(f"legacy  create_meet_link per booking: p50 {statistics.median(legacy):.0f} ms  "
+          f"p95 {percentile(legacy, 0.95):.0f} ms  ({args.legacy_bookings} bookings)")
+    print(f"pool    top-up: target {first['target']}, created {first['created']} in {provision_ms:.0f} ms "
+          f"({first['created'] - first['available']} pending), next run resolved {second['resolved']}; "
+          f"ready {depth_before['available']}")
+    print(f"pooled  booking: p50 {statistics.median(latencies):.1f} ms  p95 {percentile(latencies, 0.95):.1f} ms  "
+          f"({args.bookings} bookings, {pooled} pooled, {args.bookings - pooled} fell back)")
+    print(f"outbox  drained in {drain_ms:.0f} ms: {server.counts['patch']} patches, "
+          f"{server.counts['conference']} conferences created, {len(sent)} emails")
+    print(f"metrics after: {pool.metrics(now + timedelta(seconds=1))}")
+
+    patched = True
+    for sessionid, session in outbox_store.sessions.items():
+        row = next((r for r in pool.rows if r["sessionid"] == sessionid), None)
+        if row is None:
+            continue
+        event = server.events[row["event_id"]]
+        patched &= (event["hangoutLink"] == session["meet_link"]
+                    and datetime.fromisoformat(event["start"]["dateTime"]) == session["start"]
+                    and len(event.get("attendees", [])) == 2 and event["transparency"] == "opaque")
+    expected = Counter(e for i in range(args.bookings) for e in (f"mentor{i % 7}@example.com", f"mentee{i}@example.com"))
+    checks = {
+        "pool sized to forecast": first["target"] == min(50, 2 * args.per_day) and depth_before["available"] == first["target"],
+        "pooled up to depth": pooled == min(args.bookings, depth_before["available"]),
+        "every session has a link": all(s["meet_link"] for s in outbox_store.sessions.values()),
+        "pooled events patched": patched,
+        "one email each": Counter(to for to, _ in sent) == expected,
+        "outbox settled": outbox_store.counts() == {"DONE": len(outbox_store.jobs)},
+    }
+    server.close()
+    print("  " + "  ".join(f"{k}: {v}" for k, v in checks.items()))
+    print("✅ all checks passed" if all(checks.values()) else "❌ some checks failed")
+
+
+if __name__ == "__main__":
+    main()
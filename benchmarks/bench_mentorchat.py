@@ -0,0 +1,119 @@
+# benchmarks/bench_mentorchat.py
+"""
+MentorChat throughput and answer parity with the old if/elif chain.
+
+    python -m benchmarks.bench_mentorchat [--messages 100000] [--distinct 1000]
+
+Parity: every trigger phrase, alone and inside a sentence, for every role,
+must get exactly the answer the old chain gave (benchmarks/mentorchat_legacy.py);
+so must every generated message the old chain had an answer for. Messages
+it didn't understand may now get an FAQ answer instead of the suggestions.
+
+Throughput: --messages drawn from --distinct generated messages (chat
+traffic repeats itself), for the old chain, the compiled matcher with the
+cache cleared, and with the cache warm.
+"""
+
+import argparse
+import random
+import time
+
+from benchmarks.mentorchat_legacy import legacy_mentorchat
+from utils import mentorchat as chat
+
+ROLES = ("Mentee", "Mentor", "Admin", "Guest")
+TEMPLATES = ("{}", "  {}  ", "{}!", "Can you {} me please", "I want to {} today", "{}?".upper())
+FILLER = ("please", "quick question", "where", "what", "is", "my", "the", "next", "week", "mentor", "session",
+          "calendar", "link", "time", "zone", "email", "account", "delete", "rate", "slot", "free", "lagos",
+          "python", "data", "science", "weather", "today", "tomorrow", "pizza", "mentorlink", "announcements")
+FREE_FORM = (
+    "what time zone are sessions in", "where is my meet link", "add sessions to google calendar",
+    "import my outlook calendar", "weekly recurring slot", "didn't get a confirmation email",
+    "rate my mentor", "delete my account", "forgot password", "what is mentorlink", "how long is a session",
+    "why no free slots", "become a mentor", "where are announcements", "pending accepted rejected meaning",
+)
+
+
+def trigger_messages():
+    return [template.format(keyword) for intent in chat.INTENTS for keyword in intent.keywords
+            for template in TEMPLATES]
+
+
+def generated_messages(n, seed=11):
+    rng = random.Random(seed)
+    keywords = [k for intent in chat.INTENTS for k in intent.keywords]
+    messages = []
+    for _ in range(n):
+        words = rng.sample(FILLER, rng.randint(2, 7))
+        kind = rng.random()
+        if kind < 0.5:
+            words.insert(rng.randrange(len(words) + 1), rng.choice(keywords))
+        elif kind < 0.7:
+            words = [rng.choice(FREE_FORM)]
+        messages.append(" ".join(words))
+    return messages
+
+
+def rate(fn, messages, roles):
+    started = time.perf_counter()
+    for message, role in zip(messages, roles):
+        fn(message, role)
+    return len(messages) / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=100000)
+    parser.add_argument("--distinct", type=int, default=1000)
+    args = parser.parse_args()
+
+    # Parity on the trigger phrases
+    triggers = trigger_messages()
+    mismatches = [(m, r) for m in triggers for r in ROLES if chat.mentorchat(m, r) != legacy_mentorchat(m, r)]
+    print(f"trigger phrases: {len(triggers)} messages x {len(ROLES)} roles, mismatches {len(mismatches)}")
+    for m, r in mismatches[:5]:
+        print(f"  {r}: {m!r}")
+
+    # Parity on generated traffic, and what the FAQ picks up
+    distinct = generated_messages(args.distinct)
+    answered = changed = faq = 0
+    faq_answers = {entry["answer"] for entry in chat.FAQ}
+    for message in distinct:
+        for role in ROLES:
+            old, new = legacy_mentorchat(message, role), chat.mentorchat(message, role)
+            if old != chat.FALLBACK:
+                answered += 1
+                changed += old != new
+            elif new in faq_answers:
+                faq += 1
+    total = len(distinct) * len(ROLES)
+    print(f"generated: {total} messages, old chain answered {answered} (changed now: {changed}); "
+          f"of the {total - answered} it didn't understand, the FAQ answers {faq}")
+
+    rng = random.Random(5)
+    messages = [rng.choice(distinct) for _ in range(args.messages)]
+    roles = [rng.choice(ROLES) for _ in range(args.messages)]
+
+    legacy_rate = rate(legacy_mentorchat, messages, roles)
+
+    def cold(message, role):
+        return chat._answer.__wrapped__(chat.normalize(message), role)
+
+    cold_rate = rate(cold, messages, roles)
+    chat._answer.cache_clear()
+    warm_rate = rate(chat.mentorchat, messages, roles)
+    info = chat._answer.cache_info()
+
+    matcher_only = rate(lambda m, r: chat.MATCHER.match(chat.normalize(m)), messages, roles)
+    print(f"throughput over {args.messages} messages ({args.distinct} distinct):")
+    print(f"  old if/elif chain          {legacy_rate:>10,.0f} msg/s")
+    print(f"  compiled matcher only      {matcher_only:>10,.0f} msg/s")
+    print(f"  matcher + FAQ, no cache    {cold_rate:>10,.0f} msg/s")
+    print(f"  mentorchat() with cache    {warm_rate:>10,.0f} msg/s  (hit rate {info.hits / (info.hits + info.misses):.0%})")
+
+    ok = not mismatches and changed == 0
+    print("✅ all checks passed" if ok else "❌ some checks failed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+# benchmarks/bench_outbox.py
+"""
+Booking outbox end to end with local stand-ins: an in-memory outbox with the
+same semantics as sql/outbox.sql, a fake calendar with latency and injected
+failures, and a local aiosmtpd server for the emails.
+
+    pip install aiosmtpd
+    python -m benchmarks.bench_outbox [--bookings 200] [--concurrency 8] [--calendar-ms 150] [--fail-rate 0.1]
+
+Checks that every booking ends with exactly one calendar event and one email
+per participant, even when calendar calls fail and are retried.
+"""
+
+import argparse
+import itertools
+import random
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import utils.outbox as outbox
+from benchmarks.bench_email import Controller, CountingHandler, free_port
+from emailer import SMTPConnectionPool, build_message
+from utils.outbox import OutboxStore, OutboxWorker, make_handlers
+
+
+class MemoryOutboxStore(OutboxStore):
+    """In-process stand-in for the outbox table, book_session and claim_outbox_jobs"""
+
+    def __init__(self):
+        super().__init__(client=object())
+        self.jobs = {}
+        self.keys = {}
+        self.sessions = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def book_session(self, mentor_id, mentee_id, start, end, summary="Mentorship Session"):
+        with self._lock:
+            if any(s["mentorid"] == mentor_id and start <= s["start"] <= end for s in self.sessions.values()):
+                return None
+            sessionid = next(self._ids)
+            self.sessions[sessionid] = {"mentorid": mentor_id, "menteeid": mentee_id, "start": start, "meet_link": None}
+        self.enqueue("calendar_event", {
+            "sessionid": sessionid, "start": start.isoformat(), "end": end.isoformat(), "summary": summary,
+            "emails": [f"{mentor_id}@example.com", f"{mentee_id}@example.com"],
+        }, f"session:{sessionid}:calendar")
+        return sessionid
+
+    def set_meet_link(self, sessionid, meet_link):
+        with self._lock:
+            self.sessions[sessionid]["meet_link"] = meet_link
+
+    def enqueue(self, kind, payload, key):
+        with self._lock:
+            if key in self.keys:
+                return
+            jobid = next(self._ids)
+            self.keys[key] = jobid
+            self.jobs[jobid] = {"jobid": jobid, "kind": kind, "payload": payload, "idempotency_key": key,
+                                "status": "PENDING", "attempts": 0, "run_after": 0.0, "locked_by": None,
+                                "locked_until": 0.0, "last_error": None}
+
+    def claim(self, worker, limit=20, lease=60):
+        now = time.monotonic()
+        with self._lock:
+            ready = [j for j in self.jobs.values() if j["run_after"] <= now and (
+                j["status"] == "PENDING" or (j["status"] == "RUNNING" and j["locked_until"] < now))]
+            claimed = []
+            for job in sorted(ready, key=lambda j: (j["run_after"], j["jobid"]))[:limit]:
+                job.update(status="RUNNING", attempts=job["attempts"] + 1, locked_by=worker, locked_until=now + lease)
+                claimed.append(dict(job))
+            return claimed
+
+    def _finish(self, job, fields):
+        with self._lock:
+            current = self.jobs[job["jobid"]]
+            if current["locked_by"] == job["locked_by"]:
+                if "run_after" in fields:
+                    fields = {**fields, "run_after": time.monotonic() + outbox.BACKOFF_SECONDS}
+                current.update(fields, locked_until=0.0)
+
+    def counts(self):
+        counts = {}
+        for job in self.jobs.values():
+            counts[job["status"]] = counts.get(job["status"], 0) + 1
+        return counts
+
+
+class FakeCalendar:
+    """Calendar stand-in honouring client-supplied event ids like Google does (409 on reuse)"""
+
+    def __init__(self, latency=0.15, fail_rate=0.0, seed=7):
+        self.latency = latency
+        self.fail_rate = fail_rate
+        self.rng = random.Random(seed)
+        self.events = {}
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def create_event(self, start, end, summary, event_id):
+        time.sleep(self.latency)
+        with self._lock:
+            self.calls += 1
+            if self.rng.random() < self.fail_rate:
+                raise ConnectionError("calendar unavailable")
+            event = self.events.setdefault(event_id, {
+                "id": event_id,
+                "htmlLink": f"https://calendar.local/event?eid={event_id}",
+                "hangoutLink": f"https://meet.local/{event_id[:10]}",
+            })
+            return event
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bookings", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--calendar-ms", type=float, default=150)
+    parser.add_argument("--fail-rate", type=float, default=0.1)
+    args = parser.parse_args()
+
+    if Controller is None:
+        print("aiosmtpd is not installed: pip install aiosmtpd")
+        return
+
+    outbox.BACKOFF_SECONDS = 0.05  # retry quickly for the benchmark
+    store = MemoryOutboxStore()
+    calendar = FakeCalendar(latency=args.calendar_ms / 1000, fail_rate=args.fail_rate)
+
+    smtp = CountingHandler()
+    host, port = "127.0.0.1", free_port()
+    controller = Controller(smtp, hostname=host, port=port)
+    controller.start()
+    pool = SMTPConnectionPool(host, port, username="", use_tls=False, size=args.concurrency)
+
+    def send(to_email, subject, body):
+        pool.send(build_message(to_email, subject, body, from_email="bench@mentorlink.local"))
+
+    worker = OutboxWorker(store, make_handlers(calendar.create_event, send), concurrency=args.concurrency)
+    try:
+        base = datetime(2030, 1, 1, 9, tzinfo=timezone.utc)
+        start = time.perf_counter()
+        for i in range(args.bookings):
+            slot = base + timedelta(hours=i)
+            store.book_session(f"mentor{i % 20}", f"mentee{i}", slot, slot + timedelta(minutes=30))
+        book_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        while any(j["status"] in ("PENDING", "RUNNING") for j in store.jobs.values()):
+            if not worker.run_once():
+                time.sleep(0.01)
+        drain_s = time.perf_counter() - start
+    finally:
+        worker.stop()
+        pool.close()
+        controller.stop()
+
+    serial_s = args.bookings * (args.calendar_ms / 1000)
+    linked = sum(1 for s in store.sessions.values() if s["meet_link"])
+    print(f"{args.bookings} bookings, concurrency {args.concurrency}, calendar {args.calendar_ms:.0f} ms, "
+          f"fail rate {args.fail_rate:.0%}")
+    print(f"  booking (UI path)    {book_ms / args.bookings:8.3f} ms per booking")
+    print(f"  outbox drain         {drain_s:8.2f} s   ({len(store.jobs) / drain_s:.0f} jobs/s)")
+    print(f"  serial calendar alone would take {serial_s:.1f} s")
+    print(f"  jobs: {store.counts()}  worker: {worker.counts}")
+    print(f"  calendar calls {calendar.calls}, events {len(calendar.events)}, sessions linked {linked}")
+    print(f"  emails delivered {smtp.received} / {2 * args.bookings}")
+    ok = len(calendar.events) == args.bookings and smtp.received == 2 * args.bookings and linked == args.bookings
+    print(f"  exactly-once effects: {ok}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+# benchmarks/bench_pages.py
+"""
+Wall time and backend round trips per dashboard page, against the in-memory
+client (supabase_utils/memory_client.py) at seeded data sizes.
+
+    python -m benchmarks.bench_pages [--users 100 1000 5000] [--rtt-ms 0] [--only mentor] 2>/dev/null
+
+(stderr only carries AppTest's bare-mode and deprecation warnings.)
+
+Each view (a role page with one tab selected, plus the Inbox section of the
+mentor and mentee dashboards and the mentor calendar) runs in Streamlit's
+AppTest as the user who would see it: the most requested mentor, the mentee
+with the most requests, or the admin.
+
+  cold   first render with every cache empty (query cache, st.cache_data,
+         mentor index snapshot)
+  warm   the next rerun of the same view
+
+--rtt-ms adds that much latency to every round trip, to see what the query
+count costs over a real network. Errors the page showed (st.error /
+st.exception) are counted per view; a clean run shows none.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime
+
+os.environ.setdefault("MENTOR_INDEX_PATH", os.path.join(tempfile.mkdtemp(prefix="bench_pages_"), "mentor_index.pkl"))
+os.environ.setdefault("SUPABASE_TRACE_FILE", "")  # no trace file unless asked for
+
+import streamlit as st  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+from database import supabase  # noqa: E402
+from benchmarks.cohort import ADMIN_EMAIL, MemorySink, write_cohort  # noqa: E402
+from supabase_utils.memory_client import MemoryClient  # noqa: E402
+from utils import mentor_index  # noqa: E402
+
+# (page, view, script, session state for the view)
+VIEWS = [
+    ("admin", "👥 Users", "admin", {"admin_tabs": "👥 Users"}),
+    ("admin", "📩 Requests", "admin", {"admin_tabs": "📩 Requests"}),
+    ("admin", "🔁 Matches", "admin", {"admin_tabs": "🔁 Matches"}),
+    ("admin", "🗓️ Sessions", "admin", {"admin_tabs": "🗓️ Sessions"}),
+    ("admin", "📢 Broadcast", "admin", {"admin_tabs": "📢 Broadcast"}),
+    ("admin", "📊 Analytics", "admin", {"admin_tabs": "📊 Analytics"}),
+    ("admin", "🐞 Trace", "admin", {"admin_tabs": "🐞 Trace"}),
+    ("mentor", "🏠 Dashboard", "mentor", {"mentor_tabs": "🏠 Dashboard"}),
+    ("mentor", "🏠 Dashboard › 📥 Inbox", "mentor", {"mentor_tabs": "🏠 Dashboard", "mentor_sub_tab": "📥 Inbox"}),
+    ("mentor", "📌 Availability", "mentor", {"mentor_tabs": "📌 Availability"}),
+    ("mentor", "📥 Requests", "mentor", {"mentor_tabs": "📥 Requests"}),
+    ("mentor", "📅 Sessions", "mentor", {"mentor_tabs": "📅 Sessions"}),
+    ("mentee", "🏠 Dashboard", "mentee", {"mentee_tabs": "🏠 Dashboard"}),
+    ("mentee", "🏠 Dashboard › 📥 Inbox", "mentee", {"mentee_tabs": "🏠 Dashboard", "mentee_sub_tab": "📥 Inbox"}),
+    ("mentee", "🧑‍🏫 Browse Mentors", "mentee", {"mentee_tabs": "🧑‍🏫 Browse Mentors"}),
+    ("mentee", "📄 My Requests", "mentee", {"mentee_tabs": "📄 My Requests"}),
+    ("mentee", "📆 My Sessions", "mentee", {"mentee_tabs": "📆 My Sessions"}),
+    ("mentee", "✅ Session Feedback", "mentee", {"mentee_tabs": "✅ Session Feedback"}),
+    ("calendar", "🗓️ Mentor Calendar", "calendar", {}),
+]
+
+SCRIPTS = {
+    "admin": "from roles import admin\nadmin.show()\n",
+    "mentor": "from roles import mentor\nmentor.show()\n",
+    "mentee": "from roles import mentee\nmentee.show()\n",
+    "calendar": "import mentor_calendar\nmentor_calendar.show_calendar()\n",
+}
+
+
+def seed(client: MemoryClient, n_users: int, seed: int = 7, now: datetime = None):
+    """
+    n_users mentors and mentees (1 in 5 a mentor) from benchmarks.cohort: a
+    year of slots, requests, sessions and messages, about one session per
+    user. Returns the admin, the most requested mentor and the mentee with the
+    most requests, to log in as.
+    """
+    n_mentors = max(1, n_users // 5)
+    write_cohort(MemorySink(client), mentors=n_mentors, mentees=max(1, n_users - n_mentors), years=1.0,
+                 sessions=n_users, seed=seed, now=now)
+    users = {u["userid"]: u for u in client.rows("users")}
+    admin = next(u for u in users.values() if u["email"] == ADMIN_EMAIL)
+    requests = client.rows("mentorshiprequest")
+    mentor = Counter(r["mentorid"] for r in requests).most_common(1)[0][0]
+    mentee = Counter(r["menteeid"] for r in requests).most_common(1)[0][0]
+    return admin, users[mentor], users[mentee]
+
+
+def reset_app_caches():
+    supabase.cache.clear()
+    st.cache_data.clear()
+    mentor_index._index = None
+    if os.path.exists(mentor_index.SNAPSHOT_PATH):
+        os.remove(mentor_index.SNAPSHOT_PATH)
+
+
+def login_state(user: dict) -> dict:
+    return {"user": user, "user_id": user["userid"], "role": user["role"], "user_role": user["role"].upper(),
+            "authenticated": True, "logged_in": True}
+
+
+def run_view(client: MemoryClient, script: str, state: dict):
+    """(cold ms, cold calls, warm ms, warm calls, errors) for one view"""
+    reset_app_caches()
+    at = AppTest.from_string(script, default_timeout=600)
+    for key, value in state.items():
+        at.session_state[key] = value
+
+    client.reset_calls()
+    started = time.perf_counter()
+    at.run()
+    cold_ms = (time.perf_counter() - started) * 1000
+    cold = client.reset_calls()
+
+    started = time.perf_counter()
+    at.run()
+    warm_ms = (time.perf_counter() - started) * 1000
+    warm = client.reset_calls()
+    errors = [e.value for e in at.error] + [str(e.value) for e in at.exception]
+    return cold_ms, cold, warm_ms, warm, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--rtt-ms", type=float, default=0.0)
+    parser.add_argument("--only", choices=sorted(SCRIPTS), help="only this page")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    client = MemoryClient(latency=args.rtt_ms / 1000)
+    supabase.use_client(client)
+    all_errors = []
+
+    for n_users in args.users:
+        client.tables.clear()
+        started = time.perf_counter()
+        admin, mentor, mentee = seed(client, n_users, args.seed)
+        sizes = ", ".join(f"{t} {len(rows)}" for t, rows in client.tables.items())
+        print(f"\n{n_users} users ({sizes}; seeded in {time.perf_counter() - started:.1f}s, rtt {args.rtt_ms:g} ms)")
+        print(f"  {'view':<36} {'cold ms':>9} {'queries':>8} {'rows':>7} {'warm ms':>9} {'queries':>8} {'errors':>6}")
+
+        users = {"admin": admin, "mentor": mentor, "mentee": mentee, "calendar": mentor}
+        for page, view, script, state in VIEWS:
+            if args.only and page != args.only:
+                continue
+            cold_ms, cold, warm_ms, warm, errors = run_view(
+                client, SCRIPTS[script], {**login_state(users[page]), **state})
+            rows = sum(c["rows"] for c in cold)
+            print(f"  {page + ' ' + view:<36} {cold_ms:9.0f} {len(cold):8} {rows:7} {warm_ms:9.0f} {len(warm):8} "
+                  f"{len(errors):6}")
+            all_errors += [f"{n_users} users, {page} {view}: {e}" for e in errors]
+
+    for error in all_errors[:10]:
+        print(f"  ⚠️ {error[:200]}")
+    print("✅ every view rendered without errors" if not all_errors else f"❌ {len(all_errors)} page errors")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+# benchmarks/bench_recurrence.py
+"""
+Browse-window cost: recurring rules expanded lazily vs. one availability row
+per weekly occurrence.
+
+    python -m benchmarks.bench_recurrence [--mentors 200] [--years 3] [--window-days 28]
+
+Every mentor is free on a few weekdays (some biweekly, with skipped dates)
+for --years of history and one more year ahead. "rows" materializes each
+occurrence the way mentors used to add them and finds the free slots in the
+browse window through AvailabilityIndex; "rules" expands only the window.
+Both must return the same slots.
+"""
+
+import argparse
+import random
+import time
+from datetime import date, datetime, time as dtime, timedelta
+
+import pytz
+
+from utils.availability import AvailabilityIndex
+from utils.recurrence import expand_rules, rule_occurrences
+
+WAT = pytz.timezone("Africa/Lagos")
+
+
+def make_rules(rng, mentors, first_day):
+    rules = []
+    for m in range(mentors):
+        for r in range(rng.randint(1, 3)):
+            hour = rng.randint(8, 18)
+            dtstart = first_day + timedelta(days=rng.randrange(30))
+            rules.append({
+                "ruleid": len(rules) + 1,
+                "mentorid": f"mentor-{m}",
+                "byday": sorted(rng.sample(range(7), rng.randint(1, 3))),
+                "every_weeks": rng.choice([1, 1, 2]),
+                "start_time": dtime(hour, 0).isoformat(),
+                "end_time": dtime(hour + 1, 0).isoformat(),
+                "tz": "Africa/Lagos",
+                "dtstart": dtstart.isoformat(),
+                "until": None,
+                "exdates": [(dtstart + timedelta(days=rng.randrange(1000))).isoformat() for _ in range(5)],
+            })
+    return rules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mentors", type=int, default=200)
+    parser.add_argument("--years", type=int, default=3, help="years of history before today")
+    parser.add_argument("--window-days", type=int, default=28)
+    parser.add_argument("--seed", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    now = WAT.localize(datetime(2030, 3, 4, 12))
+    rules = make_rules(rng, args.mentors, now.date() - timedelta(days=365 * args.years))
+    horizon = now + timedelta(days=365)
+    window_end = now + timedelta(days=args.window_days)
+
+    # Legacy: one row per occurrence, history plus a year ahead
+    started = time.perf_counter()
+    rows_by_mentor = {}
+    for rule in rules:
+        for start, end in rule_occurrences(rule, WAT.localize(datetime(1970, 1, 1)), horizon):
+            rows_by_mentor.setdefault(rule["mentorid"], []).append({
+                "availabilityid": f"{rule['ruleid']}-{start.date()}",
+                "start": start.isoformat(), "end": end.isoformat(),
+            })
+    materialize_s = time.perf_counter() - started
+    total_rows = sum(len(r) for r in rows_by_mentor.values())
+
+    rules_by_mentor = {}
+    for rule in rules:
+        rules_by_mentor.setdefault(rule["mentorid"], []).append(rule)
+
+    started = time.perf_counter()
+    legacy = {}
+    for mentor, rows in rows_by_mentor.items():
+        free = AvailabilityIndex(rows).free_slots(after=now, days=args.window_days)
+        legacy[mentor] = [s.isoformat() for s, _, _ in free]
+    legacy_ms = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    lazy = {}
+    for mentor, mentor_rules in rules_by_mentor.items():
+        slots = expand_rules(mentor_rules, now, window_end)
+        lazy[mentor] = [s["start"] for s in slots if s["start"] > now.isoformat()]
+    lazy_ms = (time.perf_counter() - started) * 1000
+
+    same = all(sorted(legacy.get(m, [])) == sorted(lazy.get(m, [])) for m in rules_by_mentor)
+    print(f"{args.mentors} mentors, {len(rules)} rules, {total_rows:,} materialized rows "
+          f"({materialize_s:.1f}s to build), {args.window_days}-day browse window")
+    print(f"  rows  (index over every row)  {legacy_ms:8.1f} ms   {total_rows:,} rows read")
+    print(f"  rules (expand window only)    {lazy_ms:8.1f} ms   {len(rules)} rules read")
+    print(f"  same slots: {same}")
+
+
+if __name__ == "__main__":
+    main()
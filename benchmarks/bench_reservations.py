@@ -0,0 +1,214 @@
+# benchmarks/bench_reservations.py
+"""
+Concurrency stress test for slot booking against a local SQLite stand-in.
+
+    python -m benchmarks.bench_reservations [--bookers 400] [--mentors 5] [--slots 60] [--rtt-ms 2]
+
+Hundreds of threads book at once, most of them wanting each mentor's first
+few slots (a cohort-launch spike). Two implementations:
+
+  legacy    check `session` for the slot, insert the session, delete the slot
+            (the old mentee_requests.py flow, 3 round trips, no constraint)
+  reserve   utils.reservations.book_slot over a store that mirrors
+            sql/reservations.sql: one compare-and-set per attempt, losers
+            move on to the next free slot
+
+Each statement sleeps --rtt-ms to stand in for the network round trip.
+Reports bookings/second and double bookings (slots with more than one session).
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from utils.reservations import book_slot
+
+SCHEMA = """
+create table availability (
+  availabilityid integer primary key,
+  mentorid       text not null,
+  start          text not null,
+  "end"          text not null,
+  reserved_by    text,
+  reserved_at    text
+);
+create index availability_free_by_mentor on availability (mentorid, start) where reserved_by is null;
+create table session (
+  sessionid           integer primary key,
+  mentorid            text,
+  menteeid            text,
+  mentorshiprequestid text,
+  availabilityid      integer,
+  date                text,
+  end_time            text,
+  status              text
+);
+"""
+
+
+def connect(path):
+    conn = sqlite3.connect(path, timeout=60, isolation_level=None, check_same_thread=False)
+    conn.execute("pragma journal_mode=wal")
+    conn.execute("pragma synchronous=normal")
+    return conn
+
+
+def setup_db(path, mentors, slots, unique_index):
+    conn = connect(path)
+    conn.executescript(SCHEMA)
+    if unique_index:
+        conn.execute("create unique index session_availabilityid_unique on session (availabilityid)")
+    base = datetime(2030, 1, 6, 9, tzinfo=timezone.utc)
+    rows = []
+    for m in range(mentors):
+        for i in range(slots):
+            start = base + timedelta(hours=i)
+            rows.append((f"mentor-{m}", start.isoformat(), (start + timedelta(minutes=45)).isoformat()))
+    conn.executemany('insert into availability (mentorid, start, "end") values (?, ?, ?)', rows)
+    conn.close()
+
+
+class SqliteReservationStore:
+    """ReservationStore's interface on SQLite; each call is one round trip"""
+
+    def __init__(self, path, rtt):
+        self.conn = connect(path)
+        self.rtt = rtt
+
+    def _insert_session(self, slot, mentee_id, request_id):
+        cur = self.conn.execute(
+            "insert into session (mentorid, menteeid, mentorshiprequestid, availabilityid, date, end_time, status) "
+            "values (?, ?, ?, ?, ?, ?, 'Scheduled')",
+            (slot[1], mentee_id, request_id, slot[0], slot[2], slot[3]))
+        return {"sessionid": cur.lastrowid, "availabilityid": slot[0], "menteeid": mentee_id, "date": slot[2]}
+
+    def _claim(self, where, params, mentee_id, request_id):
+        time.sleep(self.rtt)
+        self.conn.execute("begin immediate")
+        try:
+            slot = self.conn.execute(
+                "update availability set reserved_by = ?, reserved_at = ? "
+                f"where reserved_by is null and {where} "
+                'returning availabilityid, mentorid, start, "end"',
+                (mentee_id, datetime.now(timezone.utc).isoformat(), *params)).fetchone()
+            session = self._insert_session(slot, mentee_id, request_id) if slot else None
+            self.conn.execute("commit")
+            return session
+        except Exception:
+            self.conn.execute("rollback")
+            raise
+
+    def reserve(self, availability_id, mentee_id, request_id=None):
+        return self._claim("availabilityid = ?", (availability_id,), mentee_id, request_id)
+
+    def reserve_next(self, mentor_id, mentee_id, after=None, request_id=None):
+        after = (after or datetime(1970, 1, 1, tzinfo=timezone.utc)).isoformat()
+        return self._claim(
+            "availabilityid = (select availabilityid from availability "
+            "where mentorid = ? and reserved_by is null and start > ? order by start limit 1)",
+            (mentor_id, after), mentee_id, request_id)
+
+    def close(self):
+        self.conn.close()
+
+
+def legacy_book(conn, rtt, slot, mentee_id):
+    """check-then-insert-then-delete, each statement its own round trip"""
+    time.sleep(rtt)
+    exists = conn.execute("select sessionid from session where mentorid = ? and date = ?",
+                          (slot[1], slot[2])).fetchone()
+    if exists:
+        return None
+    time.sleep(rtt)
+    conn.execute("insert into session (mentorid, menteeid, availabilityid, date, end_time, status) "
+                 "values (?, ?, ?, ?, ?, 'Scheduled')", (slot[1], mentee_id, slot[0], slot[2], slot[3]))
+    time.sleep(rtt)
+    conn.execute("delete from availability where availabilityid = ?", (slot[0],))
+    return True
+
+
+def run(mode, args):
+    workdir = tempfile.mkdtemp(prefix="bench_reservations_")
+    path = os.path.join(workdir, "bench.db")
+    setup_db(path, args.mentors, args.slots, unique_index=(mode == "reserve"))
+
+    conn = connect(path)
+    slots = conn.execute('select availabilityid, mentorid, start, "end" from availability order by start').fetchall()
+    conn.close()
+    by_mentor = {}
+    for slot in slots:
+        by_mentor.setdefault(slot[1], []).append(slot)
+
+    rng = random.Random(args.seed)
+    wants = []
+    for b in range(args.bookers):
+        mentor_slots = by_mentor[f"mentor-{rng.randrange(args.mentors)}"]
+        # Spike: most bookers want one of the first few slots
+        pick = min(int(rng.expovariate(1 / 3)), len(mentor_slots) - 1)
+        wants.append((f"mentee-{b}", mentor_slots[pick]))
+
+    rtt = args.rtt_ms / 1000
+    barrier = threading.Barrier(args.bookers)
+    local = threading.local()
+    results = {"booked": 0, "fell_back": 0, "lost": 0}
+    lock = threading.Lock()
+
+    def worker(want):
+        mentee_id, slot = want
+        if not hasattr(local, "store"):
+            local.store = SqliteReservationStore(path, rtt)
+        barrier.wait()
+        if mode == "legacy":
+            outcome = "booked" if legacy_book(local.store.conn, rtt, slot, mentee_id) else "lost"
+        else:
+            session, fell_back = book_slot(slot[1], mentee_id, slot[0], store=local.store)
+            outcome = "lost" if session is None else ("fell_back" if fell_back else "booked")
+        with lock:
+            results[outcome] += 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.bookers) as pool:
+        list(pool.map(worker, wants))
+    elapsed = time.perf_counter() - started
+
+    conn = connect(path)
+    sessions = conn.execute("select count(*) from session").fetchone()[0]
+    double = conn.execute(
+        "select count(*) from (select availabilityid from session group by availabilityid having count(*) > 1)"
+    ).fetchone()[0]
+    mentee_twice = conn.execute(
+        "select count(*) from (select menteeid from session group by menteeid having count(*) > 1)"
+    ).fetchone()[0]
+    conn.close()
+
+    print(f"{mode:8s} {sessions:5d} sessions in {elapsed:6.2f}s  {sessions / elapsed:8.1f} bookings/s  "
+          f"first choice {results['booked']:4d}  next slot {results['fell_back']:4d}  "
+          f"unbooked {results['lost']:4d}  double-booked slots {double}  "
+          f"mentees with 2 sessions {mentee_twice}")
+    return double
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bookers", type=int, default=400)
+    parser.add_argument("--mentors", type=int, default=5)
+    parser.add_argument("--slots", type=int, default=60, help="slots per mentor")
+    parser.add_argument("--rtt-ms", type=float, default=2.0, help="simulated round trip per statement")
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args()
+
+    print(f"{args.bookers} concurrent bookers, {args.mentors} mentors x {args.slots} slots, "
+          f"{args.rtt_ms} ms per round trip")
+    run("legacy", args)
+    double = run("reserve", args)
+    print("✅ zero double bookings" if double == 0 else f"❌ {double} double-booked slots")
+
+
+if __name__ == "__main__":
+    main()
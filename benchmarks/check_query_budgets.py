@@ -0,0 +1,151 @@
+# benchmarks/check_query_budgets.py
+"""
+Per-page query budgets: every role page and tab (the views in
+benchmarks/bench_pages.py) is rendered against the in-memory client at a
+fixed cohort size, and its backend round trips and rows transferred are
+checked against BUDGETS. Exits 1 when a view goes over, listing the call
+sites behind its queries, so an N+1 shows up as "41x select profile
+roles/mentor.py:251" rather than as a slow page months later.
+
+    python -m benchmarks.check_query_budgets [--verbose] [--suggest] 2>/dev/null
+
+tests/test_query_budgets.py runs the same check per view under pytest.
+
+  cold   first render with every cache empty: round trips and rows
+  warm   the rerun right after: round trips only (caches should absorb it)
+
+The views render as the admin, the mentor with the most pending requests
+(so per-request work is exercised) and the mentee with the most requests.
+After a deliberate change, --suggest prints a BUDGETS table for the new
+numbers (with some headroom) to paste in.
+"""
+
+import argparse
+import math
+import sys
+from collections import Counter
+
+from benchmarks.bench_pages import SCRIPTS, VIEWS, login_state, run_view
+from benchmarks.cohort import ADMIN_EMAIL, MemorySink, write_cohort
+from database import supabase
+from supabase_utils.memory_client import MemoryClient
+
+USERS = 1000
+SEED = 7
+ROW_HEADROOM = 1.25  # rows drift a little with the time of day the cohort is generated at
+
+# view -> (cold round trips, cold rows, warm round trips)
+BUDGETS = {
+    "admin 👥 Users": (1, 1260, 0),
+    "admin 📩 Requests": (1, 450, 0),
+    "admin 🔁 Matches": (1, 1260, 0),
+    "admin 🗓️ Sessions": (1, 1250, 0),
+    "admin 📢 Broadcast": (0, 0, 0),
+    "admin 📊 Analytics": (10, 280, 0),
+    "admin 🐞 Trace": (0, 0, 0),
+    "mentor 🏠 Dashboard": (3, 210, 0),
+    "mentor 🏠 Dashboard › 📥 Inbox": (5, 70, 3),
+    "mentor 📌 Availability": (3, 300, 1),
+    "mentor 📥 Requests": (5, 300, 1),
+    "mentor 📅 Sessions": (2, 300, 0),
+    "mentee 🏠 Dashboard": (2, 30, 0),
+    "mentee 🏠 Dashboard › 📥 Inbox": (4, 70, 2),
+    "mentee 🧑‍🏫 Browse Mentors": (3, 780, 1),
+    "mentee 📄 My Requests": (1, 10, 0),
+    "mentee 📆 My Sessions": (1, 20, 0),
+    "mentee ✅ Session Feedback": (1, 20, 0),
+    "calendar 🗓️ Mentor Calendar": (3, 300, 1),
+}
+
+
+def pick_users(client: MemoryClient):
+    """(admin, mentor with the most pending requests, mentee with the most requests)"""
+    users = {u["userid"]: u for u in client.rows("users")}
+    requests = client.rows("mentorshiprequest")
+    pending = Counter(r["mentorid"] for r in requests if r["status"] == "PENDING")
+    busiest = Counter(r["menteeid"] for r in requests)
+    admin = next(u for u in users.values() if u["email"] == ADMIN_EMAIL)
+    return admin, users[pending.most_common(1)[0][0]], users[busiest.most_common(1)[0][0]]
+
+
+def budget_cohort():
+    """The seeded in-memory cohort, swapped in for `supabase`, and the user each page renders as"""
+    client = MemoryClient(trace_sites=True)
+    supabase.use_client(client)
+    write_cohort(MemorySink(client), mentors=USERS // 5, mentees=USERS - USERS // 5, years=1.0, sessions=USERS,
+                 seed=SEED)
+    admin, mentor, mentee = pick_users(client)
+    return client, {"admin": admin, "mentor": mentor, "mentee": mentee, "calendar": mentor}
+
+
+def measure_view(client: MemoryClient, users, page: str, script: str, state: dict):
+    """(cold calls, warm calls, page errors) for one view"""
+    _, cold, _, warm, errors = run_view(client, SCRIPTS[script], {**login_state(users[page]), **state})
+    return cold, warm, errors
+
+
+def over_budget(name: str, cold, warm, errors):
+    """Why the view fails its budget; empty when it passes"""
+    trips, rows = len(cold), sum(c["rows"] for c in cold)
+    max_trips, max_rows, max_warm = BUDGETS.get(name, (0, 0, 0))
+    over = [f"{what} {actual} > {budget}" for what, actual, budget in (
+        ("round trips", trips, max_trips), ("rows", rows, max_rows), ("warm round trips", len(warm), max_warm),
+    ) if actual > budget]
+    if name not in BUDGETS:
+        over.append("no budget")
+    return over + [f"page error: {str(e)[:120]}" for e in errors]
+
+
+def call_sites(calls):
+    """Lines of "<n>x <op> <table>  <site>", most repeated first"""
+    counts = Counter((c["op"], c["table"], c.get("site", "?")) for c in calls)
+    return [f"{n:>4}x {op} {table:<20} {site}" for (op, table, site), n in counts.most_common()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--verbose", action="store_true", help="list call sites for every view, not just failures")
+    parser.add_argument("--suggest", action="store_true", help="print a BUDGETS table for the measured numbers")
+    args = parser.parse_args()
+
+    client, users = budget_cohort()
+
+    print(f"{USERS} users, seed {SEED}")
+    print(f"  {'view':<36} {'round trips':>12} {'rows':>12} {'warm':>6}")
+    failed, measured = [], {}
+    for page, view, script, state in VIEWS:
+        name = f"{page} {view}"
+        cold, warm, errors = measure_view(client, users, page, script, state)
+        trips, rows = len(cold), sum(c["rows"] for c in cold)
+        measured[name] = (trips, rows, len(warm))
+        max_trips, max_rows, max_warm = BUDGETS.get(name, (0, 0, 0))
+        over = over_budget(name, cold, warm, errors)
+        print(f"  {'❌' if over else '✅'} {name:<34} {trips:>4} / {max_trips:<5} {rows:>5} / {max_rows:<5} "
+              f"{len(warm):>2} / {max_warm}")
+        if over or args.verbose:
+            for line in over:
+                print(f"       ⚠️ {line}")
+            for line in call_sites(cold):
+                print(f"      {line}")
+            if warm:
+                print("      warm:")
+                for line in call_sites(warm):
+                    print(f"      {line}")
+        if over:
+            failed.append(name)
+
+    if args.suggest:
+        print("\nBUDGETS = {")
+        for name, (trips, rows, warm) in measured.items():
+            max_rows = max(10, int(math.ceil(rows * ROW_HEADROOM / 10) * 10)) if trips else 0
+            print(f'    "{name}": ({trips}, {max_rows}, {warm}),')
+        print("}")
+
+    if failed:
+        print(f"❌ {len(failed)} views over budget: {', '.join(failed)}")
+        sys.exit(1)
+    print("✅ every view within budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,448 @@
+# benchmarks/cohort.py
+"""
+Deterministic synthetic cohort for scale testing: users, profile,
+availability, mentorshiprequest, session, messages, broadcast_read_state
+(and optionally legacy message_reads), generated week by week and streamed
+to a sink, so a million sessions never sit in memory at once.
+
+    python -m benchmarks.cohort --mentors 2000 --mentees 20000 --years 3 --sessions 1000000 --out /tmp/cohort
+    python -m benchmarks.cohort ... --format jsonl --out /tmp/cohort
+    python -m benchmarks.cohort ... --sqlite /tmp/cohort.db
+
+What it models:
+  - skills: a few tracks (data, web, cloud, ...) with Zipf-skewed popularity,
+    and Zipf-skewed skills inside each track; bios and goals are written from
+    the track's vocabulary, so utils.matching finds real overlaps
+  - mentors join early, mentees join in quarterly cohorts and stay active for
+    about six months; mentor popularity is Zipf-skewed too, so a few mentors
+    carry many sessions
+  - each mentor-week publishes slots in working hours (WAT); some get booked
+    (an ACCEPTED request a few days earlier plus the session, rated once past),
+    others stay free; extra requests are REJECTED, or PENDING near the end;
+    --ahead-weeks of free slots are already published past "now"
+  - broadcasts every week plus direct messages; at the end each user is
+    engaged (read up to the last few broadcasts), lapsed (stopped reading
+    when they went quiet) or never read
+
+CSV files use Postgres' CSV conventions (empty = NULL, arrays as {1,2}) and
+load with `\\copy <table> (<header>) from '<table>.csv' csv header`. Every
+user's password is DEFAULT_PASSWORD (hashed once, at bcrypt cost 4).
+Same --seed and --now, same rows.
+"""
+
+import argparse
+import csv
+import json
+import math
+import os
+import random
+import sqlite3
+import time
+import uuid
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import bcrypt
+
+DEFAULT_PASSWORD = "mentorlink-demo"
+ADMIN_EMAIL = "admin@theincubatorhub.com"
+BATCH_ROWS = 5000
+COHORT_EVERY_WEEKS = 13  # a new mentee cohort every quarter...
+COHORT_ACTIVE_WEEKS = 26  # ...active for about six months
+
+TABLE_COLUMNS = {
+    "users": ("userid", "email", "password", "role", "status", "must_change_password", "profile_completed",
+              "created_at"),
+    "profile": ("userid", "name", "bio", "skills", "goals", "profile_image_url"),
+    "availability": ("availabilityid", "mentorid", "start", "end", "date", "ruleid", "reserved_by", "reserved_at"),
+    "mentorshiprequest": ("mentorshiprequestid", "mentorid", "menteeid", "status", "createdat"),
+    "session": ("sessionid", "mentorid", "menteeid", "availabilityid", "mentorshiprequestid", "date", "end_time",
+                "status", "meet_link", "rating", "feedback"),
+    "messages": ("id", "seq", "sender_id", "receiver_id", "role", "title", "body", "created_at", "is_read"),
+    "broadcast_read_state": ("user_id", "read_through", "read_extra"),
+    "message_reads": ("message_id", "user_id"),
+}
+
+# track -> (skills, most popular first; words for bios and goals)
+TRACKS = {
+    "data": (["Python", "SQL", "Data Science", "Machine Learning", "Power BI", "Excel", "Statistics"],
+             "analytics dashboards pipelines models experiments insights forecasting datasets"),
+    "web": (["JavaScript", "React", "Web Dev", "Node.js", "TypeScript", "HTML/CSS"],
+            "frontend apps components accessibility performance browsers apis"),
+    "cloud": (["Cloud", "DevOps", "AWS", "Kubernetes", "Linux", "Terraform"],
+              "infrastructure deployments reliability automation containers monitoring"),
+    "product": (["Product Management", "Communication", "Leadership", "Marketing"],
+                "roadmaps users discovery prioritisation stakeholders launches strategy"),
+    "design": (["UI/UX", "Prototyping", "Design Systems", "Branding", "Figma"],
+               "interfaces research usability prototypes visual identity"),
+    "security": (["Cybersecurity", "Networking", "Linux", "Cloud"],
+                 "threats audits incident response compliance encryption"),
+    "mobile": (["Android", "Kotlin", "Flutter", "Java"],
+               "mobile apps offline sync releases devices"),
+}
+FIRST_NAMES = ("Ada Tunde Chioma Emeka Zainab Kwame Amina Femi Ngozi Ibrahim Folake Musa Yetunde Kofi Halima "
+               "Chinedu Aisha Segun Bisi Obinna Fatima Dayo Nneka Sani Efua").split()
+LAST_NAMES = ("Okafor Adeyemi Balogun Mensah Abubakar Eze Okonkwo Bello Owusu Nwosu Adebayo Danjuma Afolabi "
+              "Boateng Ogunleye Yusuf Chukwu Lawal").split()
+FEEDBACK = ("Very helpful session", "Clear next steps", "Great career advice", "Good code review",
+            "Helped me prepare for interviews", "Practical and patient")
+
+
+def zipf_weights(n: int, s: float = 1.0) -> List[float]:
+    return [1 / (rank + 1) ** s for rank in range(n)]
+
+
+def poisson(rng: random.Random, lam: float) -> int:
+    if lam <= 0:
+        return 0
+    if lam > 30:
+        return max(0, round(rng.gauss(lam, math.sqrt(lam))))
+    limit, k, p = math.exp(-lam), 0, rng.random()
+    while p > limit:
+        k += 1
+        p *= rng.random()
+    return k
+
+
+def _uuid(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def _stamp(dt: datetime) -> str:
+    return dt.strftime("%Y-%m-%dT%H:%M:%S")
+
+
+def make_profile(rng: random.Random, userid: str, role: str, track: str) -> Dict:
+    skills, words = TRACKS[track]
+    words = words.split()
+    picked = list(dict.fromkeys(rng.choices(skills, zipf_weights(len(skills)), k=rng.randint(1, 4))))
+    if rng.random() < 0.25:  # a skill from another track
+        other = rng.choice(list(TRACKS))
+        picked.append(rng.choice(TRACKS[other][0]))
+    picked = list(dict.fromkeys(picked))
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    focus = " ".join(rng.sample(words, min(3, len(words))))
+    if role == "Mentor":
+        bio = (f"{rng.choice(['Senior', 'Lead', 'Staff', 'Principal'])} {track} practitioner with "
+               f"{rng.randint(4, 20)} years building {focus} using {', '.join(picked)}.")
+        goals = f"Help mentees grow in {track} and {rng.choice(words)}"
+    else:
+        bio = f"{rng.choice(['Student', 'Career switcher', 'Junior developer', 'Graduate'])} learning {track}: {focus}."
+        goals = f"Learn {', '.join(rng.sample(skills, min(2, len(skills))))} and get better at {rng.choice(words)}"
+    return {"userid": userid, "name": name, "bio": bio, "skills": ", ".join(picked), "goals": goals,
+            "profile_image_url": None}
+
+
+def generate(mentors: int = 200, mentees: int = 2000, years: float = 2.0, sessions: int = 10000, seed: int = 7,
+             now: Optional[datetime] = None, ahead_weeks: int = 2, broadcasts_per_week: float = 2.0,
+             direct_per_user_year: float = 6.0, legacy_reads: bool = False,
+             batch_rows: int = BATCH_ROWS) -> Iterator[Tuple[str, List[Dict]]]:
+    """Yield (table, rows) batches; parent rows are always yielded before the rows that reference them"""
+    rng = random.Random(seed)
+    now = (now or datetime.now()).replace(minute=0, second=0, microsecond=0)
+    weeks = max(1, int(years * 52))
+    origin = (now - timedelta(weeks=weeks)).replace(hour=0)
+    salt = "$2b$04$" + "".join(rng.choices("./ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789", k=21)) + "."
+    password = bcrypt.hashpw(DEFAULT_PASSWORD.encode(), salt.encode()).decode()
+    track_names = list(TRACKS)
+    track_weights = zipf_weights(len(track_names), 0.8)
+
+    buffers: Dict[str, List[Dict]] = defaultdict(list)
+
+    def emit(table, row):
+        buffers[table].append(row)
+
+    def flush(force=False):
+        for table in list(buffers):
+            if buffers[table] and (force or len(buffers[table]) >= batch_rows):
+                yield table, buffers.pop(table)
+
+    # ---- people ----
+    admin_id = _uuid(rng)
+    emit("users", {"userid": admin_id, "email": ADMIN_EMAIL, "password": password, "role": "Admin",
+                   "status": "Active", "must_change_password": False, "profile_completed": True,
+                   "created_at": _stamp(origin)})
+    people = []  # (userid, role, track, join week, active until week)
+    for i in range(mentors + mentees):
+        role = "Mentor" if i < mentors else "Mentee"
+        track = rng.choices(track_names, track_weights)[0]
+        if role == "Mentor":
+            join = 0 if rng.random() < 0.4 else rng.randrange(weeks)
+            until = weeks
+        else:
+            join = min(weeks - 1, rng.randrange(0, weeks, COHORT_EVERY_WEEKS) + rng.randint(0, 1))
+            until = join + COHORT_ACTIVE_WEEKS + (rng.randint(0, 52) if rng.random() < 0.2 else 0)
+        userid = _uuid(rng)
+        people.append((userid, role, track, join, until))
+        joined = origin + timedelta(weeks=join, days=rng.random() * 6)
+        emit("users", {"userid": userid, "email": f"{role.lower()}{i}@example.com", "password": password,
+                       "role": role, "status": "Active" if rng.random() < 0.97 else "Inactive",
+                       "must_change_password": False, "profile_completed": True, "created_at": _stamp(joined)})
+        emit("profile", make_profile(rng, userid, role, track))
+        yield from flush()
+    yield from flush(force=True)  # users before anything that references them
+
+    mentor_people = [p for p in people if p[1] == "Mentor"]
+    popularity = zipf_weights(len(mentor_people), 0.8)
+    rng.shuffle(popularity)
+    mentor_weeks = sum(w * (weeks - p[3]) for w, p in zip(popularity, mentor_people))
+    rate = sessions / mentor_weeks if mentor_weeks else 0.0
+
+    cohorts = defaultdict(lambda: defaultdict(list))  # cohort start week -> track -> mentee ids
+    cohort_all = defaultdict(list)
+    for userid, role, track, join, until in people:
+        if role == "Mentee":
+            cohorts[join][track].append(userid)
+            cohort_all[join].append((userid, until))
+
+    # ---- week by week ----
+    seq = 0
+    broadcasts = []  # (seq, id, role, week)
+    all_users = [(p[0], p[1], p[3]) for p in people]
+    for week in range(weeks):
+        week_start = origin + timedelta(weeks=week)
+        active = [start for start in cohort_all if start <= week < start + COHORT_ACTIVE_WEEKS]
+
+        for (mentorid, _, track, join, _), weight in zip(mentor_people, popularity):
+            if week < join:
+                continue
+            lam = weight * rate
+            booked = poisson(rng, lam) if active else 0
+            slots = booked + poisson(rng, 1.0 + lam * 0.5)
+            for k in range(slots):
+                start = week_start + timedelta(days=rng.randrange(7), hours=rng.randint(9, 19))
+                slot_id = _uuid(rng)
+                slot = {"availabilityid": slot_id, "mentorid": mentorid, "start": _stamp(start),
+                        "end": _stamp(start + timedelta(hours=1)), "date": start.date().isoformat(), "ruleid": None,
+                        "reserved_by": None, "reserved_at": None}
+                if k < booked:
+                    cohort = cohorts[rng.choice(active)]
+                    pool = cohort.get(track) if rng.random() < 0.7 and cohort.get(track) else \
+                        [u for t in cohort.values() for u in t]
+                    menteeid = rng.choice(pool)
+                    requested = start - timedelta(days=rng.randint(1, 10), hours=rng.randint(0, 12))
+                    request_id = _uuid(rng)
+                    slot["reserved_by"], slot["reserved_at"] = menteeid, _stamp(requested + timedelta(hours=6))
+                    emit("mentorshiprequest", {"mentorshiprequestid": request_id, "mentorid": mentorid,
+                                               "menteeid": menteeid, "status": "ACCEPTED",
+                                               "createdat": _stamp(requested)})
+                    rated = start + timedelta(hours=1) < now and rng.random() < 0.75
+                    emit("availability", slot)
+                    emit("session", {"sessionid": _uuid(rng), "mentorid": mentorid, "menteeid": menteeid,
+                                     "availabilityid": slot_id, "mentorshiprequestid": request_id,
+                                     "date": _stamp(start), "end_time": _stamp(start + timedelta(hours=1)),
+                                     "status": "Scheduled",
+                                     "meet_link": f"https://meet.google.com/{slot_id[:3]}-{slot_id[4:8]}-{slot_id[9:12]}",
+                                     "rating": rng.choices([5, 4, 3, 2, 1], [45, 30, 15, 6, 4])[0] if rated else None,
+                                     "feedback": rng.choice(FEEDBACK) if rated else None})
+                else:
+                    emit("availability", slot)
+            for _ in range(poisson(rng, lam * 0.4) if active else 0):
+                cohort = cohorts[rng.choice(active)]
+                menteeid = rng.choice([u for t in cohort.values() for u in t])
+                created = week_start + timedelta(days=rng.random() * 7)
+                recent = now - created < timedelta(weeks=2)
+                emit("mentorshiprequest", {"mentorshiprequestid": _uuid(rng), "mentorid": mentorid,
+                                           "menteeid": menteeid,
+                                           "status": "PENDING" if recent else rng.choice(["REJECTED", "REJECTED",
+                                                                                          "CANCELLED"]),
+                                           "createdat": _stamp(created)})
+
+        # Messages in created_at order, numbered as they go
+        week_messages = []
+        for _ in range(poisson(rng, broadcasts_per_week)):
+            created = week_start + timedelta(days=rng.random() * 7)
+            week_messages.append((created, None, rng.choices([None, "MENTOR", "MENTEE"], [2, 1, 3])[0]))
+        joined = [u for u, _, join in all_users if join <= week]
+        for _ in range(poisson(rng, len(joined) * direct_per_user_year / 52)):
+            created = week_start + timedelta(days=rng.random() * 7)
+            week_messages.append((created, rng.choice(joined), None))
+        for created, receiver, role in sorted(week_messages, key=lambda m: m[0]):
+            seq += 1
+            message_id = _uuid(rng)
+            if receiver is None:
+                broadcasts.append((seq, message_id, role, week))
+            age = now - created
+            emit("messages", {"id": message_id, "seq": seq, "sender_id": admin_id, "receiver_id": receiver,
+                              "role": role,
+                              "title": f"Announcement #{seq}" if receiver is None else "A note from the admin team",
+                              "body": "Cohort update" if receiver is None else "Personal note",
+                              "created_at": _stamp(created),
+                              "is_read": receiver is not None and rng.random() < (0.9 if age > timedelta(weeks=2)
+                                                                                  else 0.3)})
+        yield from flush()
+
+    # ---- slots already published for the coming weeks, still free ----
+    for week in range(weeks, weeks + ahead_weeks):
+        week_start = origin + timedelta(weeks=week)
+        for (mentorid, _, _, _, _), weight in zip(mentor_people, popularity):
+            for _ in range(poisson(rng, 1.0 + weight * rate * 1.5)):
+                start = week_start + timedelta(days=rng.randrange(7), hours=rng.randint(9, 19))
+                emit("availability", {"availabilityid": _uuid(rng), "mentorid": mentorid, "start": _stamp(start),
+                                      "end": _stamp(start + timedelta(hours=1)), "date": start.date().isoformat(),
+                                      "ruleid": None, "reserved_by": None, "reserved_at": None})
+        yield from flush()
+
+    # ---- broadcast read patterns ----
+    for userid, role, _, join, until in people:
+        visible = [(s, mid, w) for s, mid, r, w in broadcasts if w >= join and (r is None or r == role.upper())]
+        kind = rng.random()
+        if not visible or kind < 0.1:  # never opened the inbox
+            continue
+        if kind < 0.4:  # lapsed: stopped reading when they went quiet
+            stop = min(until, weeks) if role == "Mentee" else rng.randint(join, weeks)
+            read = [v for v in visible if v[2] < stop]
+            through, extra = (read[-1][0] if read else 0), []
+        else:  # engaged: a few recent ones unread, a few read out of order
+            lag = min(len(visible), poisson(rng, 1.5))
+            read = visible[:len(visible) - lag]
+            through = read[-1][0] if read else 0
+            extra = sorted(rng.sample([v[0] for v in visible[len(read):]], min(lag, rng.randint(0, 2))))
+            read += [v for v in visible if v[0] in extra]
+        emit("broadcast_read_state", {"user_id": userid, "read_through": through, "read_extra": extra})
+        if legacy_reads:
+            for _, message_id, _ in read:
+                emit("message_reads", {"message_id": message_id, "user_id": userid})
+        yield from flush()
+    yield from flush(force=True)
+
+
+# ---- sinks ----
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, list):
+        return "{" + ",".join(str(v) for v in value) + "}"
+    return value
+
+
+class CsvSink:
+    """One <table>.csv per table, Postgres CSV conventions"""
+
+    def __init__(self, out_dir: str):
+        self.out_dir = out_dir
+        os.makedirs(out_dir, exist_ok=True)
+        self._files, self._writers = {}, {}
+
+    def write(self, table: str, rows: List[Dict]):
+        writer = self._writers.get(table)
+        if writer is None:
+            f = self._files[table] = open(os.path.join(self.out_dir, f"{table}.csv"), "w", newline="", encoding="utf-8")
+            writer = self._writers[table] = csv.writer(f)
+            writer.writerow(TABLE_COLUMNS[table])
+        columns = TABLE_COLUMNS[table]
+        writer.writerows([_csv_value(row.get(c)) for c in columns] for row in rows)
+
+    def close(self):
+        for f in self._files.values():
+            f.close()
+
+
+class JsonlSink:
+    """One <table>.jsonl per table"""
+
+    def __init__(self, out_dir: str):
+        self.out_dir = out_dir
+        os.makedirs(out_dir, exist_ok=True)
+        self._files = {}
+
+    def write(self, table: str, rows: List[Dict]):
+        f = self._files.get(table)
+        if f is None:
+            f = self._files[table] = open(os.path.join(self.out_dir, f"{table}.jsonl"), "w", encoding="utf-8")
+        f.writelines(json.dumps(row, separators=(",", ":")) + "\n" for row in rows)
+
+    def close(self):
+        for f in self._files.values():
+            f.close()
+
+
+class SqliteSink:
+    """A local SQLite file with one table per cohort table (arrays stored as JSON)"""
+
+    def __init__(self, path: str):
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("pragma journal_mode = off")
+        self.conn.execute("pragma synchronous = off")
+        for table, columns in TABLE_COLUMNS.items():
+            self.conn.execute(f'drop table if exists "{table}"')
+            self.conn.execute(f'create table "{table}" ({", ".join(f"{chr(34)}{c}{chr(34)}" for c in columns)})')
+
+    def write(self, table: str, rows: List[Dict]):
+        columns = TABLE_COLUMNS[table]
+        quoted = ", ".join(f'"{c}"' for c in columns)
+        self.conn.executemany(
+            f'insert into "{table}" ({quoted}) values ({", ".join("?" * len(columns))})',
+            ([json.dumps(v) if isinstance(v, list) else v for v in (row.get(c) for c in columns)] for row in rows),
+        )
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
+
+
+class MemorySink:
+    """Straight into a MemoryClient (supabase_utils/memory_client.py)"""
+
+    def __init__(self, client):
+        self.client = client
+
+    def write(self, table: str, rows: List[Dict]):
+        self.client.load(table, rows)
+
+    def close(self):
+        pass
+
+
+def write_cohort(sink, **params) -> Counter:
+    """Stream a generated cohort into `sink`; returns rows written per table"""
+    counts = Counter()
+    try:
+        for table, rows in generate(**params):
+            sink.write(table, rows)
+            counts[table] += len(rows)
+    finally:
+        sink.close()
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mentors", type=int, default=200)
+    parser.add_argument("--mentees", type=int, default=2000)
+    parser.add_argument("--years", type=float, default=2.0)
+    parser.add_argument("--sessions", type=int, default=10000, help="target number of sessions (approximate)")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--now", type=datetime.fromisoformat, help="end of the generated history (default: now)")
+    parser.add_argument("--ahead-weeks", type=int, default=2, help="weeks of free slots published after --now")
+    parser.add_argument("--broadcasts-per-week", type=float, default=2.0)
+    parser.add_argument("--direct-per-user-year", type=float, default=6.0)
+    parser.add_argument("--legacy-reads", action="store_true", help="also write one message_reads row per read broadcast")
+    parser.add_argument("--format", choices=["csv", "jsonl"], default="csv")
+    parser.add_argument("--out", default="cohort", help="output directory for --format")
+    parser.add_argument("--sqlite", help="write to this SQLite file instead")
+    args = parser.parse_args()
+
+    if args.sqlite:
+        sink = SqliteSink(args.sqlite)
+    else:
+        sink = CsvSink(args.out) if args.format == "csv" else JsonlSink(args.out)
+
+    started = time.perf_counter()
+    counts = write_cohort(sink, mentors=args.mentors, mentees=args.mentees, years=args.years,
+                          sessions=args.sessions, seed=args.seed, now=args.now, ahead_weeks=args.ahead_weeks,
+                          broadcasts_per_week=args.broadcasts_per_week,
+                          direct_per_user_year=args.direct_per_user_year, legacy_reads=args.legacy_reads)
+    elapsed = time.perf_counter() - started
+    for table, n in counts.items():
+        print(f"  {table:<22} {n:>10,}")
+    total = sum(counts.values())
+    print(f"✅ {total:,} rows in {elapsed:.1f}s ({total / elapsed:,.0f} rows/s) -> {args.sqlite or args.out}")
+
+
+if __name__ == "__main__":
+    main()
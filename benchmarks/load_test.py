@@ -0,0 +1,368 @@
+# benchmarks/load_test.py
+"""
+Concurrent logged-in users clicking through the real app.py, against the
+in-memory backend (supabase_utils/memory_client.py) seeded by
+benchmarks.cohort.
+
+    python -m benchmarks.load_test [--mentees 150] [--mentors 40] [--admins 10] [--duration 180] 2>/dev/null
+
+Every virtual user is its own Streamlit session (an AppTest of app.py) on
+its own thread, sharing one process, query cache and st.cache_data the way
+sessions share a server. That includes sharing one interpreter: CPU-bound
+reruns queue behind each other exactly as they do on a single Streamlit
+server, which is what a cohort launch (everyone logging in within --ramp
+seconds) runs into. Users log in through the login form, then loop over a
+click script with exponential think time between actions:
+
+  mentee  inbox, browse mentors, request mentorship, my requests, my sessions,
+          session feedback (submits one when a past session is unrated)
+  mentor  inbox, requests, accept and book, sessions, availability
+  admin   users, requests, sessions, analytics
+
+Reported:
+  - p50/p95/p99/max wall time per action (an action is one click or tab
+    switch, including any st.rerun it triggers), with error counts
+    (st.exception / st.error on the page, or AppTest timing out)
+  - reruns per second over the run, overall and per 5 s window, next to the
+    number of users logged in
+  - session state size per session (pickled) after the first and the last
+    action, and process RSS over time
+
+--rtt-ms adds that much latency to every backend round trip. Set
+SUPABASE_TRACE_FILE to keep the run's per-rerun call trace (see
+supabase_utils/tracing.py); it is off by default here.
+"""
+
+import argparse
+import os
+import pickle
+import random
+import statistics
+import tempfile
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import nullcontext
+from datetime import datetime
+from unittest.mock import MagicMock
+
+os.environ.setdefault("MENTOR_INDEX_PATH", os.path.join(tempfile.mkdtemp(prefix="load_test_"), "mentor_index.pkl"))
+os.environ["MAINTENANCE_IN_APP"] = "0"
+os.environ.setdefault("SUPABASE_TRACE_FILE", "")
+
+from streamlit import config  # noqa: E402
+from streamlit.components.v2.component_manager import BidiComponentManager  # noqa: E402
+from streamlit.runtime import Runtime  # noqa: E402
+from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager  # noqa: E402
+from streamlit.runtime.dataframe_source_manager import DataframeSourceManager  # noqa: E402
+from streamlit.runtime.media_file_manager import MediaFileManager  # noqa: E402
+from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+from streamlit.testing.v1 import app_test  # noqa: E402
+
+from benchmarks.cohort import ADMIN_EMAIL, DEFAULT_PASSWORD, MemorySink, write_cohort  # noqa: E402
+from database import supabase  # noqa: E402
+from supabase_utils.memory_client import MemoryClient  # noqa: E402
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+WINDOW_SECONDS = 5
+SCRIPTS = {
+    "Mentee": ["inbox", "browse", "request", "my_requests", "my_sessions", "feedback"],
+    "Mentor": ["inbox", "requests", "accept", "sessions", "availability"],
+    "Admin": ["users", "requests", "sessions", "analytics"],
+}
+TABS = {
+    ("Mentee", "dashboard"): ("mentee_tabs", "🏠 Dashboard"),
+    ("Mentee", "browse"): ("mentee_tabs", "🧑‍🏫 Browse Mentors"),
+    ("Mentee", "my_requests"): ("mentee_tabs", "📄 My Requests"),
+    ("Mentee", "my_sessions"): ("mentee_tabs", "📆 My Sessions"),
+    ("Mentee", "feedback"): ("mentee_tabs", "✅ Session Feedback"),
+    ("Mentor", "dashboard"): ("mentor_tabs", "🏠 Dashboard"),
+    ("Mentor", "availability"): ("mentor_tabs", "📌 Availability"),
+    ("Mentor", "requests"): ("mentor_tabs", "📥 Requests"),
+    ("Mentor", "sessions"): ("mentor_tabs", "📅 Sessions"),
+    ("Admin", "users"): ("admin_tabs", "👥 Users"),
+    ("Admin", "requests"): ("admin_tabs", "📩 Requests"),
+    ("Admin", "sessions"): ("admin_tabs", "🗓️ Sessions"),
+    ("Admin", "analytics"): ("admin_tabs", "📊 Analytics"),
+}
+
+
+def share_one_runtime():
+    """
+    AppTest sets up process-wide state for every run and tears it down after:
+    it points the global Runtime at a fresh mock (then None) and patches the
+    "global.appTest" config option. Torn down under sessions running at the
+    same time, their widgets lose state mid-run. Give every session one shared
+    runtime instead, the way a server has one, turn the option on for the whole
+    process, and let AppTest's per-run setup land on a subclass and a no-op.
+    """
+    runtime = MagicMock(spec=Runtime)
+    runtime.media_file_mgr = MediaFileManager(MemoryMediaFileStorage("/mock/media"))
+    runtime.dataframe_source_mgr = DataframeSourceManager()
+    runtime.cache_storage_manager = MemoryCacheStorageManager()
+    components = BidiComponentManager()
+    components.discover_and_register_components(start_file_watching=False)
+    runtime.bidi_component_registry = components
+    Runtime._instance = runtime
+    app_test.Runtime = type("AppTestRuntime", (Runtime,), {"_instance": None})
+    config.set_option("global.appTest", True)
+    app_test.patch_config_options = lambda overrides: nullcontext()
+
+
+def rss_bytes() -> int:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def session_bytes(at: AppTest) -> int:
+    """Pickled size of the session's state (values that don't pickle count as 0)"""
+    total = 0
+    for value in at.session_state._state.filtered_state.values():
+        try:
+            total += len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        except Exception:
+            pass
+    return total
+
+
+class Recorder:
+    """Thread-safe sink for action timings, reruns and memory samples"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started = time.perf_counter()
+        self.actions = defaultdict(list)  # (role, action) -> [ms]
+        self.errors = defaultdict(list)  # (role, action) -> [message]
+        self.reruns = []  # completion time of every rerun, seconds since start
+        self.logged_in = []  # seconds since start at each login
+        self.sessions = {}  # session -> [first state bytes, last state bytes, actions]
+        self.rss = []  # (seconds since start, bytes)
+        self.round_trips = 0
+        self.writes = Counter()  # "insert mentorshiprequest", "rpc reserve_slot", ... (everything but selects)
+
+    def now(self) -> float:
+        return time.perf_counter() - self.started
+
+    def action(self, role, name, ms, reruns, errors):
+        with self.lock:
+            self.actions[(role, name)].append(ms)
+            self.errors[(role, name)].extend(errors)
+            self.reruns.extend([self.now()] * reruns)
+
+    def backend(self, calls):
+        self.round_trips += len(calls)
+        self.writes.update(f"{c['op']} {c['table']}" for c in calls if c["op"] != "select")
+
+    def session(self, user, state_bytes):
+        with self.lock:
+            sample = self.sessions.setdefault(user, [state_bytes, state_bytes, 0])
+            sample[1], sample[2] = state_bytes, sample[2] + 1
+
+
+class VirtualUser(threading.Thread):
+    """One logged-in Streamlit session running its role's click script until the deadline"""
+
+    def __init__(self, user, recorder: Recorder, deadline: float, think: float, timeout: float, seed: int):
+        super().__init__(daemon=True)
+        self.user, self.role = user, user["role"]
+        self.recorder, self.deadline, self.think, self.timeout = recorder, deadline, think, timeout
+        self.rng = random.Random(seed)
+        self.at = None
+        self.tab = None  # (tabs key, label) the user is on
+        self.reruns = 0
+
+    # ---- driving AppTest ----
+    def rerun(self):
+        # AppTest sends the tabs widget's default on every run; a browser keeps the selected tab
+        if self.tab:
+            self.at.session_state[self.tab[0]] = self.tab[1]
+        self.at.run(timeout=self.timeout)
+        self.reruns += 1
+
+    def page_errors(self):
+        return [str(e.value)[:200] for e in list(self.at.exception) + list(self.at.error)]
+
+    def click(self, label=None, key_prefix=None) -> bool:
+        buttons = [b for b in self.at.button if (label is None or b.label == label)
+                   and (key_prefix is None or (b.key or "").startswith(key_prefix))]
+        if not buttons:
+            return False
+        self.rng.choice(buttons).click()
+        self.rerun()
+        return True
+
+    def open_tab(self, name):
+        tab = TABS[(self.role, name)]
+        if tab != self.tab:
+            self.tab = tab
+            self.rerun()
+
+    # ---- actions ----
+    def do_login(self):
+        self.rerun()
+        next(t for t in self.at.text_input if t.label == "Email").input(self.user["email"])
+        next(t for t in self.at.text_input if t.label == "Password").input(DEFAULT_PASSWORD)
+        self.click(label="Login")
+
+    def do_inbox(self):
+        self.open_tab("dashboard")
+        self.click(label="📥 Inbox")
+
+    def do_request(self):
+        self.open_tab("browse")
+        self.click(key_prefix="req_")
+
+    def do_accept(self):
+        self.open_tab("requests")
+        self.click(key_prefix="accept_")
+
+    def do_feedback(self):
+        self.open_tab("feedback")
+        pending = [b for b in self.at.button if (b.key or "").startswith("submit_feedback_")]
+        if pending:
+            sessionid = self.rng.choice(pending).key[len("submit_feedback_"):]
+            self.at.selectbox(key=f"rating_{sessionid}").set_value(self.rng.randint(3, 5))
+            self.at.text_area(key=f"feedback_{sessionid}").input("Helpful session")
+            self.at.button(key=f"submit_feedback_{sessionid}").click()
+            self.rerun()
+
+    def perform(self, name):
+        self.reruns = 0
+        started = time.perf_counter()
+        try:
+            action = getattr(self, f"do_{name}", None)
+            if action is not None:
+                action()
+            else:
+                self.open_tab(name)
+            errors = self.page_errors()
+        except Exception as e:  # AppTest timeouts and script crashes
+            errors = [f"{type(e).__name__}: {e}"[:200]]
+        ms = (time.perf_counter() - started) * 1000
+        if self.reruns or errors:  # nothing to click (no pending request, already on the tab) isn't timed
+            self.recorder.action(self.role, name, ms, self.reruns, errors)
+        self.recorder.session(self.name, session_bytes(self.at))
+
+    def run(self):
+        self.at = AppTest.from_file(APP_PATH, default_timeout=self.timeout)
+        self.perform("login")
+        with self.recorder.lock:
+            self.recorder.logged_in.append(self.recorder.now())
+        script = SCRIPTS[self.role]
+        step = 0
+        while time.perf_counter() < self.deadline:
+            time.sleep(self.rng.expovariate(1 / self.think) if self.think else 0)
+            if time.perf_counter() >= self.deadline:
+                break
+            self.perform(script[step % len(script)])
+            step += 1
+
+
+def percentile(values, p):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+
+def pick_users(client: MemoryClient, mentees: int, mentors: int, admins: int, rng: random.Random):
+    users = [u for u in client.rows("users") if u.get("status") == "Active"]
+    admin = next(u for u in users if u["email"] == ADMIN_EMAIL)
+    by_role = {role: [u for u in users if u["role"] == role] for role in ("Mentee", "Mentor")}
+    picked = rng.sample(by_role["Mentee"], min(mentees, len(by_role["Mentee"])))
+    picked += rng.sample(by_role["Mentor"], min(mentors, len(by_role["Mentor"])))
+    return picked + [admin] * admins  # admins share the one admin account, as they do in production
+
+
+def report(recorder: Recorder, duration: float):
+    print(f"\n  {'action':<26} {'n':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8} {'errors':>6}")
+    for (role, name), times in sorted(recorder.actions.items()):
+        print(f"  {role.lower() + ' ' + name:<26} {len(times):6} {percentile(times, 50):8.0f} "
+              f"{percentile(times, 95):8.0f} {percentile(times, 99):8.0f} {max(times):8.0f} "
+              f"{len(recorder.errors[(role, name)]):6}")
+
+    print(f"\n  reruns: {len(recorder.reruns)} in {duration:.0f}s = {len(recorder.reruns) / duration:.1f}/s; "
+          f"backend: {recorder.round_trips} round trips = {recorder.round_trips / duration:.0f}/s")
+    print(f"  writes and rpcs: {', '.join(f'{k} {n}' for k, n in recorder.writes.most_common()) or 'none'}")
+    logins = recorder.logged_in
+    rss = dict((int(t // WINDOW_SECONDS), b) for t, b in recorder.rss)
+    for window in range(int(duration // WINDOW_SECONDS) + 1):
+        lo, hi = window * WINDOW_SECONDS, (window + 1) * WINDOW_SECONDS
+        n = sum(lo <= t < hi for t in recorder.reruns)
+        online = sum(t < hi for t in logins)
+        mem = f"{rss[window] / 2 ** 20:7.0f} MB RSS" if window in rss else ""
+        print(f"    {lo:4d}-{hi:<4d}s  {n / WINDOW_SECONDS:6.1f} reruns/s  {online:4d} users logged in  {mem}")
+
+    if recorder.sessions:
+        first = [s[0] for s in recorder.sessions.values()]
+        last = [s[1] for s in recorder.sessions.values()]
+        growth = [(s[1] - s[0]) / max(1, s[2] - 1) for s in recorder.sessions.values()]
+        print(f"\n  session state: median {statistics.median(first) / 1024:.1f} KB after login -> "
+              f"{statistics.median(last) / 1024:.1f} KB at the end (median {statistics.median(growth):+.0f} B/action, "
+              f"largest session {max(last) / 1024:.1f} KB)")
+    if recorder.rss:
+        start, end = recorder.rss[0][1], recorder.rss[-1][1]
+        print(f"  process RSS: {start / 2 ** 20:.0f} MB -> {end / 2 ** 20:.0f} MB "
+              f"({(end - start) / max(1, len(recorder.sessions)) / 1024:.0f} KB per session)")
+
+    failures = [(key, e) for key, errors in recorder.errors.items() for e in errors]
+    for (role, name), error in failures[:10]:
+        print(f"  ⚠️ {role.lower()} {name}: {error}")
+    print("✅ no page errors" if not failures else f"❌ {len(failures)} page errors")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mentees", type=int, default=150, help="concurrent mentee sessions")
+    parser.add_argument("--mentors", type=int, default=40, help="concurrent mentor sessions")
+    parser.add_argument("--admins", type=int, default=10, help="concurrent admin sessions")
+    parser.add_argument("--duration", type=float, default=180, help="seconds of clicking after the ramp-up starts")
+    parser.add_argument("--ramp", type=float, default=60, help="seconds over which sessions log in")
+    parser.add_argument("--think", type=float, default=2.0, help="mean seconds between a user's actions")
+    parser.add_argument("--timeout", type=float, default=120, help="AppTest timeout per rerun")
+    parser.add_argument("--rtt-ms", type=float, default=0)
+    parser.add_argument("--cohort-mentors", type=int, default=200)
+    parser.add_argument("--cohort-mentees", type=int, default=2000)
+    parser.add_argument("--cohort-sessions", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    share_one_runtime()
+    client = MemoryClient(latency=args.rtt_ms / 1000)
+    supabase.use_client(client)
+    started = time.perf_counter()
+    write_cohort(MemorySink(client), mentors=args.cohort_mentors, mentees=args.cohort_mentees, years=1.0,
+                 sessions=args.cohort_sessions, seed=args.seed, now=datetime.now())
+    rng = random.Random(args.seed)
+    users = pick_users(client, args.mentees, args.mentors, args.admins, rng)
+    rng.shuffle(users)
+    print(f"cohort: {', '.join(f'{t} {len(r)}' for t, r in client.tables.items())} "
+          f"(seeded in {time.perf_counter() - started:.1f}s)")
+    print(f"{len(users)} sessions over {args.ramp:g}s, {args.duration:g}s, think {args.think:g}s, "
+          f"rtt {args.rtt_ms:g} ms")
+
+    recorder = Recorder()
+    deadline = time.perf_counter() + args.duration
+    sessions, timers = [], []
+    for i, user in enumerate(users):
+        session = VirtualUser(user, recorder, deadline, args.think, args.timeout, seed=args.seed * 100003 + i)
+        timer = threading.Timer(args.ramp * i / max(1, len(users)), session.start)
+        timer.daemon = True
+        timer.start()
+        sessions.append(session)
+        timers.append(timer)
+
+    # The client's call log is drained every second so it doesn't count as growth
+    while time.perf_counter() < deadline:
+        recorder.rss.append((recorder.now(), rss_bytes()))
+        recorder.backend(client.reset_calls())
+        time.sleep(1)
+    recorder.rss.append((recorder.now(), rss_bytes()))
+    for timer, session in zip(timers, sessions):
+        timer.join()
+        session.join(timeout=args.timeout)
+    recorder.backend(client.reset_calls())
+    report(recorder, recorder.now())
+
+
+if __name__ == "__main__":
+    main()
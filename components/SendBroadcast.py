@@ -1,14 +1,8 @@
 import streamlit as st
-from supabase import create_client
-from datetime import datetime
-import uuid
+from utils.broadcasts import send_message
+from database import supabase
 
 def show():
-    # Connect to Supabase
-    SUPABASE_URL = "your-supabase-url"
-    SUPABASE_KEY = "your-supabase-key"
-    supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
-    
     st.title("📢 Admin: Send Broadcast Message")
     
     if st.session_state.get("user_role") != "ADMIN":
@@ -40,15 +34,5 @@ def show():
         if not title or not body:
             st.warning("Please provide both title and body.")
         else:
-            message_data = {
-                "id": str(uuid.uuid4()),
-                "sender_id": st.session_state.get("user_id"),
-                "receiver_id": receiver_id,
-                "role": role,
-                "title": title,
-                "body": body,
-                "created_at": datetime.now().isoformat(),
-                "is_read": False
-            }
-            supabase.table("messages").insert(message_data).execute()
+            send_message(st.session_state.get("user_id"), title, body, receiver_id=receiver_id, role=role)
             st.success("Message sent successfully!")
@@ -0,0 +1,86 @@
+import streamlit as st
+from datetime import datetime, timedelta, time
+
+import pytz
+
+from utils.availability import load_availability_index
+from utils.recurrence import (
+    WEEKDAYS, add_rule, delete_rule, describe_rule, rule_occurrences, skip_date,
+)
+
+WAT = pytz.timezone("Africa/Lagos")
+CONFLICT_CHECK_WEEKS = 12
+
+
+def render_availability_rules(mentor_id, rules, key_prefix="rules"):
+    """Weekly / biweekly availability: add a rule, skip a date, or delete a rule"""
+    st.markdown("### 🔁 Recurring Availability")
+
+    with st.form(f"{key_prefix}_form_{mentor_id}", clear_on_submit=True):
+        weekdays = st.multiselect("Days", WEEKDAYS, default=[])
+        col1, col2 = st.columns(2)
+        start_time = col1.time_input("From", value=time(10, 0), key=f"{key_prefix}_start")
+        end_time = col2.time_input("To", value=time(11, 0), key=f"{key_prefix}_end")
+        every = st.radio("Repeat", ["Every week", "Every 2 weeks"], horizontal=True)
+        col3, col4 = st.columns(2)
+        starts_on = col3.date_input("Starting", value=datetime.now(WAT).date(), key=f"{key_prefix}_from")
+        until = col4.date_input("Until (optional)", value=None, key=f"{key_prefix}_until")
+        submitted = st.form_submit_button("➕ Add Recurring Slot")
+
+        if submitted:
+            candidate = {
+                "ruleid": None, "mentorid": mentor_id, "byday": [WEEKDAYS.index(d) for d in weekdays],
+                "every_weeks": 2 if every == "Every 2 weeks" else 1, "start_time": start_time,
+                "end_time": end_time, "dtstart": starts_on, "until": until,
+            }
+            try:
+                # Only the next few weeks are checked against one-off slots and other rules
+                window_start = WAT.localize(datetime.combine(starts_on, time.min))
+                window_end = window_start + timedelta(weeks=CONFLICT_CHECK_WEEKS)
+                conflict = None
+                if weekdays and end_time > start_time:
+                    index = load_availability_index(mentor_id)
+                    others = [occ for rule in rules for occ in rule_occurrences(rule, window_start, window_end)]
+                    for occ_start, occ_end in rule_occurrences(candidate, window_start, window_end):
+                        if index.overlaps(occ_start, occ_end) or any(
+                            s < occ_end and occ_start < e for s, e in others
+                        ):
+                            conflict = occ_start
+                            break
+
+                if conflict:
+                    st.warning(f"⛔ This pattern overlaps existing availability on "
+                               f"{conflict.strftime('%a %d %b %Y %I:%M %p')}.")
+                else:
+                    add_rule(mentor_id, candidate["byday"], start_time, end_time, candidate["every_weeks"],
+                             starts_on, until)
+                    st.success("✅ Recurring availability added.")
+                    st.rerun()
+            except ValueError as e:
+                st.warning(f"⚠️ {e}")
+            except Exception as e:
+                st.error(f"Failed to add recurring availability: {e}")
+
+    if not rules:
+        st.info("No recurring availability yet.")
+        return
+
+    for rule in rules:
+        ruleid = rule["ruleid"]
+        col1, col2, col3 = st.columns([6, 2, 1])
+        col1.markdown(f"- 🔁 {describe_rule(rule)}")
+        skip_day = col2.date_input("Skip date", value=None, key=f"{key_prefix}_skip_{ruleid}",
+                                   label_visibility="collapsed")
+        if skip_day and col2.button("Skip", key=f"{key_prefix}_skip_btn_{ruleid}"):
+            try:
+                skip_date(rule, skip_day)
+                st.rerun()
+            except Exception as e:
+                st.error(f"Failed to skip date: {e}")
+        if col3.button("❌", key=f"{key_prefix}_delete_{ruleid}"):
+            try:
+                delete_rule(ruleid)
+                st.success("Recurring availability removed.")
+                st.rerun()
+            except Exception as e:
+                st.error(f"Failed to remove rule: {e}")
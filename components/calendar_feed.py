@@ -0,0 +1,34 @@
+import streamlit as st
+
+from utils.ics import FEED_SECRET, feed_url, import_availability, load_feed_sessions, render_feed
+
+
+def render_calendar_feed(user_id):
+    """Subscribe link (served by `python -m utils.ics serve`) and a one-off .ics download"""
+    with st.expander("📅 Add sessions to your calendar"):
+        if FEED_SECRET:
+            st.markdown("Subscribe from Google Calendar or Outlook (**Add calendar → From URL**); "
+                        "new bookings show up on their own.")
+            st.code(feed_url(user_id), language=None)
+        st.download_button(
+            "⬇️ Download .ics",
+            data=lambda: render_feed(load_feed_sessions(user_id)),  # only built when clicked
+            file_name="mentorlink-sessions.ics",
+            mime="text/calendar",
+            key=f"ics_download_{user_id}",
+        )
+
+
+def render_ics_import(mentor_id):
+    """Upload an .ics export and add its events as availability in one batch"""
+    with st.expander("📥 Import availability from a calendar (.ics)"):
+        st.caption("Timed events in the next year become slots; overlaps with existing availability are skipped.")
+        uploaded = st.file_uploader("Calendar file", type=["ics"], key=f"ics_upload_{mentor_id}")
+        if uploaded and st.button("Import", key=f"ics_import_{mentor_id}"):
+            try:
+                result = import_availability(mentor_id, uploaded)
+                skipped = sum(result["skipped"].values())
+                st.success(f"✅ Added {result['accepted']} slots "
+                           f"({result['rejected']} overlapping, {skipped} past, all-day or cancelled).")
+            except Exception as e:
+                st.error(f"❌ Import failed: {e}")
@@ -0,0 +1,45 @@
+import streamlit as st
+from utils.broadcasts import (
+    INBOX_PAGE_SIZE, is_read, load_inbox, load_read_state, mark_all_read, mark_read, unread_count,
+)
+
+
+def render_inbox(user_id, user_role):
+    """Shared mentor/mentee inbox: a page of messages, unread count and batch mark-as-read"""
+    st.subheader("📥 Inbox")
+
+    if not user_id:
+        st.warning("⚠️ User ID not found in session. Please log in again.")
+        return
+
+    limit_key = f"inbox_limit_{user_id}"
+    limit = st.session_state.get(limit_key, INBOX_PAGE_SIZE)
+
+    try:
+        messages = load_inbox(user_id, user_role, limit)
+        state = load_read_state(user_id)
+        unread = unread_count(user_id, user_role)
+
+        col1, col2 = st.columns([3, 1])
+        col1.markdown(f"🔔 Unread Messages: **{unread}**")
+        if unread and col2.button("✅ Mark all as read", key=f"inbox_mark_all_{user_id}"):
+            mark_all_read(user_id, user_role)
+            st.rerun()
+
+        newly_read = []
+        for msg in messages:
+            read = is_read(msg, state)
+            with st.expander(f"{'📨' if not read else '📄'} {msg['title']} ({msg['created_at'][:16]})"):
+                st.write(msg["body"])
+            if not read:
+                newly_read.append(msg)
+
+        # Showing the inbox marks what was shown as read, in one batch
+        mark_read(user_id, user_role, newly_read)
+
+        if len(messages) >= limit and st.button("⬇️ Load older messages", key=f"inbox_more_{user_id}"):
+            st.session_state[limit_key] = limit + INBOX_PAGE_SIZE
+            st.rerun()
+
+    except Exception as e:
+        st.error(f"❌ Failed to load messages: {e}")
@@ -0,0 +1,20 @@
+import streamlit as st
+
+
+def lazy_tabs(labels, key):
+    """
+    Tabs whose bodies only run when selected: guard each one with
+    `if tab.open:`. Switching tabs reruns the script, so each interaction only
+    pays for the visible tab. Streamlit builds without lazy tabs fall back to
+    a session-state router (a horizontal radio) with the same `.open` contract.
+    """
+    try:
+        return st.tabs(labels, key=key, on_change="rerun")
+    except TypeError:
+        selected = st.radio("Section", labels, key=key, horizontal=True, label_visibility="collapsed")
+        tabs = []
+        for label in labels:
+            container = st.container()
+            container.open = label == selected
+            tabs.append(container)
+        return tabs
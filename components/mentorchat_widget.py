@@ -1,33 +1,58 @@
 import streamlit as st
+from supabase_utils import tracing
+from utils.chat_history import CHAT_PAGE_SIZE, ChatHistory, log_path_for
 from utils.mentorchat import mentorchat
 
+
+def chat_history() -> ChatHistory:
+    """This user's MentorChat history, kept in session state (a new one after logging in as someone else)"""
+    user_id = (st.session_state.get("user") or {}).get("userid")
+    history = st.session_state.get("mentorchat_history")
+    if history is None or st.session_state.get("mentorchat_history_user") != user_id:
+        history = ChatHistory(log_path=log_path_for(user_id))
+        st.session_state["mentorchat_history"] = history
+        st.session_state["mentorchat_history_user"] = user_id
+        st.session_state["mentorchat_window"] = CHAT_PAGE_SIZE
+    return history
+
+
+def handle_chat(input_key):
+    user_input = st.session_state.get(input_key, "").strip()
+    role = st.session_state.get("role", "Guest")
+
+    if user_input:
+        chat_history().append(user_input, mentorchat(user_input, user_role=role))
+        st.session_state[input_key] = ""
+
+
+def render_chat(input_key="mentor_input", label="Type a message"):
+    """The latest turns as one markdown block, with 'load older' paging, then the input box"""
+    history = chat_history()
+    shown = st.session_state.get("mentorchat_window", CHAT_PAGE_SIZE)
+
+    if len(history) > shown and st.button("⬆️ Load older messages", key=f"{input_key}_older"):
+        shown = st.session_state["mentorchat_window"] = shown + CHAT_PAGE_SIZE
+
+    turns = history.window(shown)
+    if turns:
+        st.markdown("\n\n".join(f"🧑‍💻 **You:** {question}\n\n🤖 **MentorChat:** {answer}"
+                                for _, question, answer in turns))
+
+    st.text_input(label, key=input_key, on_change=handle_chat, args=(input_key,))
+
+
+# Sending a message or paging only reruns the chat, not the page around it
+@st.fragment
+def _chat_panel():
+    tracing.begin_fragment("mentorchat")
+    st.markdown("### 🤖 MentorChat", help="Ask any question about using MentorLink")
+    with st.expander("💬 Chat with MentorChat", expanded=True):
+        render_chat()
+
+
 def mentorchat_widget():
     # Only show if toggle is ON
     if not st.session_state.get("show_mentor_chat", False):
         return
 
-    st.markdown("### 🤖 MentorChat", help="Ask any question about using MentorLink")
-    with st.expander("💬 Chat with MentorChat", expanded=True):
-        # Initialize chat history
-        if "chat_history" not in st.session_state:
-            st.session_state.chat_history = []
-
-        # Display chat history
-        for entry in st.session_state.chat_history:
-            if entry["sender"] == "user":
-                st.markdown(f"🧑‍💻 **You:** {entry['message']}")
-            else:
-                st.markdown(f"🤖 **MentorChat:** {entry['message']}")
-
-        # Chat input
-        def handle_chat():
-            user_input = st.session_state.get("mentor_input", "").strip()
-            role = st.session_state.get("role", "Guest")
-
-            if user_input:
-                st.session_state.chat_history.append({"sender": "user", "message": user_input})
-                response = mentorchat(user_input, user_role=role)
-                st.session_state.chat_history.append({"sender": "bot", "message": response})
-                st.session_state["mentor_input"] = ""
-
-        st.text_input("Type a message", key="mentor_input", on_change=handle_chat)
+    _chat_panel()
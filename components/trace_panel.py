@@ -0,0 +1,61 @@
+import os
+
+import pandas as pd
+import streamlit as st
+
+from supabase_utils.tracing import Tracer
+
+
+def render_trace_panel(tracer: Tracer):
+    """Slowest Supabase calls, where the time goes per call site, and recent reruns, for this server process"""
+    st.subheader("🐞 Supabase Trace")
+    st.caption("Every query and RPC made by this server process since it started (or since the last reset). "
+               "Cache hits are included but cost no round trip. Replicas each keep their own trace.")
+
+    tracer.flush()  # totals are kept by the tracer thread
+    sites = tracer.site_totals()
+    if not sites:
+        st.info("No Supabase calls traced yet.")
+        return
+
+    calls = sum(t["calls"] for t in sites)
+    cached = sum(t["cached"] for t in sites)
+    col1, col2, col3 = st.columns(3)
+    col1.metric("📞 Calls", calls)
+    col2.metric("⚡ Cache hits", f"{cached / calls * 100:.0f}%")
+    col3.metric("⏱️ Time in Supabase", f"{sum(t['ms'] for t in sites) / 1000:.1f}s")
+
+    st.markdown("### 🐢 Slowest calls")
+    slowest = pd.DataFrame(tracer.slowest(25))
+    slowest["filters"] = slowest["filters"].map(", ".join)
+    st.dataframe(slowest[["ms", "op", "table", "filters", "rows", "bytes_in", "site", "action", "rerun", "ts"]],
+                 use_container_width=True, hide_index=True)
+
+    st.markdown("### 📍 Where the time goes")
+    totals = pd.DataFrame(sites[:25])
+    totals["avg_ms"] = (totals["ms"] / totals["calls"]).round(2)
+    st.dataframe(totals[["ms", "calls", "cached", "avg_ms", "max_ms", "rows", "bytes", "op", "table", "site"]],
+                 use_container_width=True, hide_index=True)
+
+    st.markdown("### 🔁 Recent reruns")
+    spans = pd.DataFrame(tracer.recent_spans(50))
+    if not spans.empty:
+        st.dataframe(spans[["started", "name", "action", "calls", "cached", "ms", "rows", "bytes", "session"]],
+                     use_container_width=True, hide_index=True)
+
+    def read_trace_file():
+        with open(tracer.path, "rb") as f:
+            return f.read()
+
+    col1, col2 = st.columns(2)
+    if tracer.path and os.path.exists(tracer.path):
+        col1.download_button(
+            "⬇️ Download trace (.jsonl)",
+            data=read_trace_file,  # only read when clicked
+            file_name=os.path.basename(tracer.path),
+            mime="application/jsonl",
+            key="trace_download",
+        )
+    if col2.button("🧹 Reset trace", key="trace_reset"):
+        tracer.reset()
+        st.rerun()
@@ -2,13 +2,19 @@
 from supabase import create_client
 import os
 from dotenv import load_dotenv
+from supabase_utils.query_cache import CachedClient
+from supabase_utils.tracing import TracedClient
 
 load_dotenv()
 
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 
-supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+# Reads through `supabase.table(...)` are cached across reruns (per-table TTLs)
+# and invalidated by writes made through it; see supabase_utils/query_cache.py.
+# Every query and RPC (cache hits included) is traced per rerun for the admin
+# 🐞 Trace tab and a rotating JSONL file; see supabase_utils/tracing.py
+supabase = TracedClient(CachedClient(create_client(SUPABASE_URL, SUPABASE_KEY)))
 
 # Example: Get all mentors
 def get_mentors():
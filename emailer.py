@@ -1,30 +1,294 @@
 # Uses SMTP to send session reminders or confirmations
 import smtplib
+import socket
 import os
+import queue
+import threading
+import time
+import uuid
+import logging
+from collections import OrderedDict
 from email.message import EmailMessage
 from dotenv import load_dotenv
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 SMTP_SERVER = os.getenv("SMTP_SERVER")
 SMTP_PORT = int(os.getenv("SMTP_PORT", 587))
 SMTP_USERNAME = os.getenv("SMTP_USERNAME")
 SMTP_PASSWORD = os.getenv("SMTP_PASSWORD")
 FROM_EMAIL = os.getenv("FROM_EMAIL")
+SMTP_USE_TLS = os.getenv("SMTP_USE_TLS", "true").lower() not in ("0", "false", "no")
 
-def send_email(to_email, subject, body):
-    try:
-        msg = EmailMessage()
-        msg["Subject"] = subject
-        msg["From"] = FROM_EMAIL
-        msg["To"] = to_email
-        msg.set_content(body)
+EMAIL_WORKERS = int(os.getenv("EMAIL_WORKERS", 4))        # concurrent SMTP connections
+EMAIL_MAX_ATTEMPTS = int(os.getenv("EMAIL_MAX_ATTEMPTS", 4))
+EMAIL_BACKOFF_SECONDS = float(os.getenv("EMAIL_BACKOFF_SECONDS", 1.0))
+EMAIL_STATUS_HISTORY = 10_000                            # delivery statuses kept in memory
+
+# Errors worth retrying on a fresh connection, plus 4xx replies (see is_retryable);
+# anything else, e.g. refused recipients or 5xx rejections, fails the message.
+# Not OSError: every SMTPException is one, permanent failures included.
+RETRYABLE_ERRORS = (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError, ConnectionError, TimeoutError,
+                    socket.timeout)
+
+
+def build_message(to_email, subject, body, from_email=None):
+    msg = EmailMessage()
+    msg["Subject"] = subject
+    msg["From"] = from_email or FROM_EMAIL
+    msg["To"] = to_email
+    msg.set_content(body)
+    return msg
+
+
+def is_retryable(error):
+    if isinstance(error, RETRYABLE_ERRORS):
+        return True
+    if isinstance(error, smtplib.SMTPResponseException):
+        return 400 <= error.smtp_code < 500  # 4xx = transient
+    return False
+
+
+class SMTPConnectionPool:
+    """
+    Keeps up to `size` authenticated SMTP connections open and hands them out,
+    so STARTTLS + login happen once per connection instead of once per message.
+    At most `size` connections are out at once; further callers wait for one.
+    """
+
+    def __init__(self, host=None, port=None, username=None, password=None, use_tls=None, size=EMAIL_WORKERS, timeout=30):
+        self.host = host or SMTP_SERVER
+        self.port = port or SMTP_PORT
+        self.username = SMTP_USERNAME if username is None else username
+        self.password = SMTP_PASSWORD if password is None else password
+        self.use_tls = SMTP_USE_TLS if use_tls is None else use_tls
+        self.timeout = timeout
+        self._idle = queue.LifoQueue(maxsize=size)
+        self._slots = threading.BoundedSemaphore(size)  # one per connection handed out
+        self.connections_opened = 0
 
-        with smtplib.SMTP(SMTP_SERVER, SMTP_PORT) as server:
+    def _connect(self):
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        if self.use_tls:
             server.starttls()
-            server.login(SMTP_USERNAME, SMTP_PASSWORD)
+        if self.username:
+            server.login(self.username, self.password)
+        self.connections_opened += 1
+        return server
+
+    def acquire(self):
+        """An idle connection, or a new one; waits (up to `timeout`) while `size` are out"""
+        if not self._slots.acquire(timeout=self.timeout):
+            raise TimeoutError(f"No SMTP connection free after {self.timeout}s")
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            return self._connect()
+        except Exception:
+            self._slots.release()
+            raise
+
+    def release(self, server):
+        """Hand a healthy connection back"""
+        try:
+            self._idle.put_nowait(server)
+        except queue.Full:
+            self._close(server)
+        self._slots.release()
+
+    def discard(self, server):
+        """Close a connection that was handed out and free its slot"""
+        self._close(server)
+        self._slots.release()
+
+    def _close(self, server):
+        try:
+            server.quit()
+        except Exception:
+            try:
+                server.close()
+            except Exception:
+                pass
+
+    def send(self, msg):
+        """Send on a pooled connection; a stale connection is replaced once"""
+        server = self.acquire()
+        try:
             server.send_message(msg)
+        except smtplib.SMTPServerDisconnected:
+            self._close(server)  # reconnect in the same slot
+            try:
+                server = self._connect()
+            except Exception:
+                self._slots.release()
+                raise
+            try:
+                server.send_message(msg)
+            except (smtplib.SMTPResponseException, smtplib.SMTPRecipientsRefused):
+                self.release(server)
+                raise
+            except Exception:
+                self.discard(server)
+                raise
+        except (smtplib.SMTPResponseException, smtplib.SMTPRecipientsRefused):
+            self.release(server)  # the server rejected the message, the connection is fine
+            raise
+        except Exception:
+            self.discard(server)
+            raise
+        self.release(server)
+
+    def close(self):
+        while True:
+            try:
+                self._close(self._idle.get_nowait())
+            except queue.Empty:
+                return
+
+
+class EmailDispatcher:
+    """
+    Background email delivery: a bounded pool of worker threads drains a queue
+    over pooled SMTP connections, retrying transient failures with exponential
+    backoff. Callers get a job id back immediately and can poll `status()`.
+    """
+
+    def __init__(self, pool=None, workers=EMAIL_WORKERS, max_attempts=EMAIL_MAX_ATTEMPTS, backoff=EMAIL_BACKOFF_SECONDS):
+        self.pool = pool or SMTPConnectionPool(size=workers)
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self._queue = queue.Queue()
+        self._statuses = OrderedDict()
+        self._lock = threading.Lock()
+        self._threads = []
+        self._pending = 0  # queued or waiting to retry, not yet sent/failed
+        self.counts = {"queued": 0, "sent": 0, "failed": 0, "retried": 0}
+
+    def start(self):
+        with self._lock:
+            if self._threads:
+                return self
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._work, name=f"email-worker-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+        return self
+
+    def _set_status(self, job_id, **fields):
+        with self._lock:
+            status = self._statuses.setdefault(job_id, {})
+            status.update(fields)
+            self._statuses.move_to_end(job_id)
+            while len(self._statuses) > EMAIL_STATUS_HISTORY:
+                self._statuses.popitem(last=False)
 
+    def submit(self, to_email, subject, body):
+        """Queue one message; returns a job id for status()"""
+        job_id = str(uuid.uuid4())
+        self._set_status(job_id, state="queued", to=to_email, attempts=0, error=None)
+        with self._lock:
+            self.counts["queued"] += 1
+            self._pending += 1
+        self._queue.put((job_id, (to_email, subject, body), 1))
+        self.start()
+        return job_id
+
+    def submit_batch(self, messages):
+        """Queue many (to_email, subject, body) tuples; returns their job ids"""
+        return [self.submit(to_email, subject, body) for to_email, subject, body in messages]
+
+    def status(self, job_id):
+        with self._lock:
+            return dict(self._statuses.get(job_id, {"state": "unknown"}))
+
+    def stats(self):
+        with self._lock:
+            return {**self.counts, "pending": self._pending, "connections": self.pool.connections_opened}
+
+    def flush(self, timeout=None):
+        """Block until every queued message is sent or has failed (True) or timeout (False)"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._pending:
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def _retry_later(self, job_id, msg, attempt):
+        delay = self.backoff * (2 ** (attempt - 1))
+        timer = threading.Timer(delay, self._queue.put, args=((job_id, msg, attempt + 1),))
+        timer.daemon = True
+        timer.start()
+
+    def _finish(self, job_id, state, error=None):
+        self._set_status(job_id, state=state, error=error)
+        with self._lock:
+            self.counts[state] += 1
+            self._pending -= 1
+
+    def _work(self):
+        while True:
+            job_id, msg, attempt = self._queue.get()
+            to_email = msg[0] if isinstance(msg, tuple) else msg["To"]
+            self._set_status(job_id, state="sending", attempts=attempt)
+            if isinstance(msg, tuple):
+                try:
+                    msg = build_message(*msg)  # built off the caller's thread
+                except Exception as e:  # e.g. a newline in a header: retrying won't help
+                    logger.warning(f"Email to {to_email!r} could not be built: {e}")
+                    self._finish(job_id, "failed", str(e))
+                    continue
+            try:
+                self.pool.send(msg)
+                self._finish(job_id, "sent")
+            except Exception as e:
+                if attempt < self.max_attempts and is_retryable(e):
+                    self._set_status(job_id, state="retrying", error=str(e))
+                    with self._lock:
+                        self.counts["retried"] += 1
+                    self._retry_later(job_id, msg, attempt)
+                else:
+                    logger.warning(f"Email to {to_email} failed after {attempt} attempt(s): {e}")
+                    self._finish(job_id, "failed", str(e))
+
+
+_dispatcher = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_dispatcher():
+    """Process-wide dispatcher, started on first use"""
+    global _dispatcher
+    with _dispatcher_lock:
+        if _dispatcher is None:
+            _dispatcher = EmailDispatcher()
+        return _dispatcher
+
+
+def queue_email(to_email, subject, body):
+    """Non-blocking send; returns a job id (see get_dispatcher().status)"""
+    return get_dispatcher().submit(to_email, subject, body)
+
+
+def queue_emails(messages):
+    """Non-blocking batch send of (to_email, subject, body) tuples"""
+    return get_dispatcher().submit_batch(messages)
+
+
+def deliver_email(to_email, subject, body):
+    """Synchronous send over a pooled connection; raises on failure"""
+    get_dispatcher().pool.send(build_message(to_email, subject, body))
+
+
+def send_email(to_email, subject, body):
+    """Synchronous send over a pooled connection; returns True on success"""
+    try:
+        deliver_email(to_email, subject, body)
         return True
     except Exception as e:
         print("Email failed:", e)
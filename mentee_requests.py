@@ -1,7 +1,9 @@
 import streamlit as st
-from datetime import datetime
+from datetime import datetime, timedelta
 import pandas as pd
 from database import supabase
+from utils.reservations import book_available
+from utils.recurrence import WINDOW_DAYS, expand_rules, load_rules
 import pytz
 
 def show():
@@ -27,16 +29,27 @@ def show():
         return
 
     st.markdown("##### ✅ Accepted Requests (Book a Session)")
+    rules_by_mentor = load_rules([req["mentorid"] for req in accepted_requests])
     for req in accepted_requests:
         mentor_email = req["users"]["email"]
         st.markdown(f"#### Mentor: {mentor_email}")
 
-        # Step 2: Get mentor's available slots
-        slots = supabase.table("availability") \
+        # Step 2: Get mentor's upcoming slots (reserved ones hide their rule occurrence)
+        now_utc = datetime.now(pytz.utc)
+        upcoming = supabase.table("availability") \
             .select("*") \
             .eq("mentorid", req["mentorid"]) \
+            .gte("start", now_utc.isoformat()) \
             .order("start") \
-            .execute().data
+            .execute().data or []
+
+        # Plus the mentor's recurring slots, expanded for the next few weeks only
+        slots = sorted(
+            [s for s in upcoming if not s.get("reserved_by")]
+            + expand_rules(rules_by_mentor.get(req["mentorid"], []), now_utc,
+                           now_utc + timedelta(days=WINDOW_DAYS), upcoming),
+            key=lambda s: pd.to_datetime(s["start"], utc=True),
+        )
 
         if not slots:
             st.info("No available slots for this mentor yet.")
@@ -45,8 +58,8 @@ def show():
         # Format slot options nicely, converting UTC to Lagos time
         slot_options = {}
         for s in slots:
-            start_dt = pd.to_datetime(s["start"]).tz_localize("UTC").astimezone(lagos_tz)
-            end_dt = pd.to_datetime(s["end"]).tz_localize("UTC").astimezone(lagos_tz)
+            start_dt = pd.to_datetime(s["start"], utc=True).astimezone(lagos_tz)
+            end_dt = pd.to_datetime(s["end"], utc=True).astimezone(lagos_tz)
             label = f"{start_dt.strftime('%a, %d %b %Y %I:%M %p')} ➡ {end_dt.strftime('%I:%M %p')}"
             slot_options[label] = s
 
@@ -59,36 +72,22 @@ def show():
         if st.button("📌 Book This Slot", key=f"book_{req['mentorshiprequestid']}"):
             selected_slot = slot_options[selected_label]
             try:
-                # Prevent double booking: check if the slot is still available
-                exists = supabase.table("session") \
-                    .select("sessionid") \
-                    .eq("mentorid", req["mentorid"]) \
-                    .eq("date", selected_slot["start"]) \
-                    .execute().data
-
-                if exists:
-                    st.warning("⚠️ This slot has just been booked by someone else.")
+                # One conditional write claims the slot and creates the session;
+                # if it was just taken, the next free slot after it is booked instead
+                session, fell_back = book_available(
+                    {**selected_slot, "mentorid": req["mentorid"]}, menteeid,
+                    request_id=req["mentorshiprequestid"], after=selected_slot["start"],
+                )
+
+                if session is None:
+                    st.warning("⚠️ This slot has just been booked by someone else and no later slot is free.")
+                elif fell_back:
+                    booked_dt = pd.to_datetime(session["date"], utc=True).astimezone(lagos_tz)
+                    st.info(f"ℹ️ That slot was just taken, so you're booked for the next one: "
+                            f"{booked_dt.strftime('%a, %d %b %Y %I:%M %p')}.")
+                else:
+                    st.success(f"✅ Session booked successfully with {mentor_email}!")
                     st.rerun()
-                    return
-
-                # Step 3: Create the session record
-                supabase.table("session").insert({
-                    "mentorid": req["mentorid"],
-                    "menteeid": req["menteeid"],
-                    "date": selected_slot["start"],
-                    "end_time": selected_slot["end"],
-                    "mentorshiprequestid": req["mentorshiprequestid"],
-                    "feedback": "",
-                    "rating": None,
-                    "status": "Scheduled"
-                }).execute()
-
-                # Optionally remove the slot after booking
-                supabase.table("availability") \
-                    .delete().eq("availabilityid", selected_slot["availabilityid"]).execute()
-
-                st.success(f"✅ Session booked successfully with {mentor_email}!")
-                st.rerun()
 
             except Exception as e:
                 st.error("❌ Failed to book the session.")
@@ -2,6 +2,10 @@ import streamlit as st
 from datetime import datetime, timedelta
 import pandas as pd
 from database import supabase
+from utils.availability import load_availability_index
+from utils.recurrence import load_rules, overlapping_occurrence
+from components.availability_rules import render_availability_rules
+from components.calendar_feed import render_ics_import
 import pytz
 import plotly.express as px
 
@@ -109,21 +113,13 @@ def show_calendar():
                     st.error("❌ End time must be after start time.")
                 else:
                     try:
-                        # Check for overlapping slots
-                        existing_slots = supabase.table("availability") \
-                            .select("*") \
-                            .eq("mentorid", mentorid) \
-                            .execute().data or []
-
-                        has_overlap = any(
-                            not (
-                                end_datetime <= pd.to_datetime(slot["start"]) or
-                                start_datetime >= pd.to_datetime(slot["end"])
-                            )
-                            for slot in existing_slots
-                        )
-
-                        if has_overlap:
+                        # Check for overlapping slots (bisect over the mentor's sorted slots)
+                        existing_slots = load_availability_index(mentorid)
+                        rules = load_rules([mentorid]).get(mentorid, [])
+                        start_wat, end_wat = lagos_tz.localize(start_datetime), lagos_tz.localize(end_datetime)
+
+                        if existing_slots.overlaps(start_datetime, end_datetime) or \
+                                overlapping_occurrence(rules, start_wat, end_wat):
                             st.error("❌ This time slot overlaps with an existing one.")
                         else:
                             supabase.table("availability").insert({
@@ -138,6 +134,14 @@ def show_calendar():
                         st.error("❌ Failed to set availability.")
                         st.exception(e)
 
+        render_ics_import(mentorid)
+
+        try:
+            render_availability_rules(mentorid, load_rules([mentorid]).get(mentorid, []), key_prefix="calendar_rules")
+        except Exception as e:
+            st.error("🚫 Error fetching recurring availability.")
+            st.exception(e)
+
         # Show existing availability
         st.markdown("### 📋 Your Availability")
         try:
@@ -1,22 +1,34 @@
 import sys
 import os
 import time
+import logging
 from datetime import datetime, timedelta
 
 import streamlit as st
 import pandas as pd
 import pytz
 import plotly.express as px
-import uuid
+import calendar
 
 # Adjust path for imports
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 # Local imports
 from database import supabase
+from supabase_utils import tracing
 from auth.auth_handler import register_user
 from utils.session_creator import create_session_if_available
+from utils.reservations import ReservationStore
 from utils.helpers import format_datetime_safe  # Handles timezone-safe formatting
+from utils.mentor_index import refresh_mentor
+from utils.bulk_match import plan_bulk_matches, create_bulk_matches, schedule_kickoff_sessions
+from utils.meet_pool import MeetPoolStore, pool_missing
+from utils import analytics
+from utils.broadcasts import send_message
+from components.lazy_tabs import lazy_tabs
+from components.trace_panel import render_trace_panel
+
+logger = logging.getLogger(__name__)
 
 # Set West Africa Time
 WAT = pytz.timezone("Africa/Lagos")
@@ -52,309 +64,396 @@ def show():
     st.title("Admin Dashboard")
     st.info("Admin dashboard: manage users, mentorship matches, and sessions.")
 
-    tabs = st.tabs(["👥 Users", "📩 Requests", "🔁 Matches", "🗓️ Sessions", "📢 Broadcast", "📊 Analytics"])
+    tabs = lazy_tabs(["👥 Users", "📩 Requests", "🔁 Matches", "🗓️ Sessions", "📢 Broadcast", "📊 Analytics", "🐞 Trace"],
+                     key="admin_tabs")
 
     # --- USERS TAB--
-    with tabs[0]:
-        st.subheader("Register New User")
+    if tabs[0].open:
+        with tabs[0]:
+            st.subheader("Register New User")
     
-        with st.form("register_user", clear_on_submit=True):
-            user_email = st.text_input("User Email", placeholder="e.g. user@example.com")
-            role = st.selectbox("Assign Role", ["Select a role", "Mentor", "Mentee"])
-            submitted = st.form_submit_button("Create")
+            with st.form("register_user", clear_on_submit=True):
+                user_email = st.text_input("User Email", placeholder="e.g. user@example.com")
+                role = st.selectbox("Assign Role", ["Select a role", "Mentor", "Mentee"])
+                submitted = st.form_submit_button("Create")
     
-        if submitted:
-            if not user_email or role == "Select a role":
-                st.warning("⚠️ Please fill in both email and role.")
-            else:
-                register_user(user_email, role)
-                st.success(f"✅ User '{user_email}' registered as {role}.")
-                time.sleep(1)
-                st.rerun()
-    
-        st.subheader("All Users")
-        try:
-            users = supabase.table("users").select("""
+            if submitted:
+                if not user_email or role == "Select a role":
+                    st.warning("⚠️ Please fill in both email and role.")
+                else:
+                    register_user(user_email, role)
+                    st.success(f"✅ User '{user_email}' registered as {role}.")
+                    time.sleep(1)
+                    st.rerun()
+    
+            st.subheader("All Users")
+            try:
+                users = supabase.table("users").select("""
                 userid, email, role, must_change_password, profile_completed, created_at, status
             """).neq("status", "Delete").execute().data
-        except Exception as e:
-            st.error(f"❌ Failed to load users: {e}")
-            users = []
-    
-        if users:
-            df = pd.DataFrame(users)
-            df["created_at"] = df["created_at"].apply(format_datetime)
-            df = df.rename(columns={
-                "userid": "User ID",
-                "email": "Email",
-                "role": "Role",
-                "must_change_password": "Must Change Password",
-                "profile_completed": "Profile Completed",
-                "created_at": "Created At",
-                "status": "Status"
-            })
-    
-            email_search = st.text_input("🔍 Search by Email", placeholder="e.g. johndoe@example.com").lower()
-            status_filter = st.selectbox("📂 Filter by Status", ["All", "Active", "Inactive"])
-    
-            filtered_df = df.copy()
-            if email_search:
-                filtered_df = filtered_df[filtered_df["Email"].str.lower().str.contains(email_search)]
-            if status_filter != "All":
-                filtered_df = filtered_df[filtered_df["Status"] == status_filter]
-    
-            st.dataframe(filtered_df.reset_index(drop=True), use_container_width=True)
-    
-            st.subheader("Update User Status")
-    
-            # Initialize session state for form reset
-            if "reset_flags" not in st.session_state:
-                st.session_state.reset_flags = False
-            if st.session_state.reset_flags:
-                st.session_state["status_selector"] = "Select status..."
-                st.session_state["confirm_delete_1"] = False
-                st.session_state["confirm_delete_2"] = False
-                st.session_state.reset_flags = False
-    
-            selected_email = st.selectbox(
-                "✏️ Select User to Update",
-                ["Select an email..."] + df["Email"].tolist()
-            )
+            except Exception as e:
+                st.error(f"❌ Failed to load users: {e}")
+                users = []
+    
+            if users:
+                df = pd.DataFrame(users)
+                df["created_at"] = df["created_at"].apply(format_datetime)
+                df = df.rename(columns={
+                    "userid": "User ID",
+                    "email": "Email",
+                    "role": "Role",
+                    "must_change_password": "Must Change Password",
+                    "profile_completed": "Profile Completed",
+                    "created_at": "Created At",
+                    "status": "Status"
+                })
     
-            new_status = st.selectbox(
-                "🛠️ New Status",
-                ["Select status...", "Active", "Inactive", "Delete"],
-                key="status_selector"
-            )
+                email_search = st.text_input("🔍 Search by Email", placeholder="e.g. johndoe@example.com").lower()
+                status_filter = st.selectbox("📂 Filter by Status", ["All", "Active", "Inactive"])
     
-            with st.form("update_status_form", clear_on_submit=True):
-                if st.session_state.get("status_selector") == "Delete":
-                    st.warning("⚠️ Deleting a user is permanent. Please confirm below:")
-                    confirm_delete_1 = st.checkbox(
-                        "I understand that deleting this user is permanent and cannot be undone.",
-                        key="confirm_delete_1"
-                    )
-                    confirm_delete_2 = st.checkbox(
-                        "Yes, I really want to delete this user.",
-                        key="confirm_delete_2"
-                    )
-                else:
-                    confirm_delete_1 = confirm_delete_2 = False
+                filtered_df = df.copy()
+                if email_search:
+                    filtered_df = filtered_df[filtered_df["Email"].str.lower().str.contains(email_search)]
+                if status_filter != "All":
+                    filtered_df = filtered_df[filtered_df["Status"] == status_filter]
     
-                submitted = st.form_submit_button("✅ Update Status")
+                st.dataframe(filtered_df.reset_index(drop=True), use_container_width=True)
     
-            if submitted:
-                if selected_email == "Select an email..." or new_status == "Select status...":
-                    st.warning("⚠️ Please select both a valid user and a status.")
-                else:
-                    user_row = df[df["Email"] == selected_email].iloc[0]
-                    user_id = user_row["User ID"]
+                st.subheader("Update User Status")
     
-                    try:
-                        if new_status == "Delete":
-                            if st.session_state.get("confirm_delete_1") and st.session_state.get("confirm_delete_2"):
-                                # 🚨 CASCADE DELETE LOGIC 🚨
-                                supabase.table("session").delete().or_(
-                                    f"mentorid.eq.{user_id},menteeid.eq.{user_id}"
-                                ).execute()
-                                supabase.table("mentorshiprequest").delete().or_(
-                                    f"mentorid.eq.{user_id},menteeid.eq.{user_id}"
-                                ).execute()
-                                supabase.table("availability").delete().eq("mentorid", user_id).execute()
-                                supabase.table("users").delete().eq("userid", user_id).execute()
-    
-                                st.success(f"✅ Deleted user: {selected_email} and all related records")
+                # Initialize session state for form reset
+                if "reset_flags" not in st.session_state:
+                    st.session_state.reset_flags = False
+                if st.session_state.reset_flags:
+                    st.session_state["status_selector"] = "Select status..."
+                    st.session_state["confirm_delete_1"] = False
+                    st.session_state["confirm_delete_2"] = False
+                    st.session_state.reset_flags = False
+    
+                selected_email = st.selectbox(
+                    "✏️ Select User to Update",
+                    ["Select an email..."] + df["Email"].tolist()
+                )
+    
+                new_status = st.selectbox(
+                    "🛠️ New Status",
+                    ["Select status...", "Active", "Inactive", "Delete"],
+                    key="status_selector"
+                )
+    
+                with st.form("update_status_form", clear_on_submit=True):
+                    if st.session_state.get("status_selector") == "Delete":
+                        st.warning("⚠️ Deleting a user is permanent. Please confirm below:")
+                        confirm_delete_1 = st.checkbox(
+                            "I understand that deleting this user is permanent and cannot be undone.",
+                            key="confirm_delete_1"
+                        )
+                        confirm_delete_2 = st.checkbox(
+                            "Yes, I really want to delete this user.",
+                            key="confirm_delete_2"
+                        )
+                    else:
+                        confirm_delete_1 = confirm_delete_2 = False
+    
+                    submitted = st.form_submit_button("✅ Update Status")
+    
+                if submitted:
+                    if selected_email == "Select an email..." or new_status == "Select status...":
+                        st.warning("⚠️ Please select both a valid user and a status.")
+                    else:
+                        user_row = df[df["Email"] == selected_email].iloc[0]
+                        user_id = user_row["User ID"]
+    
+                        try:
+                            if new_status == "Delete":
+                                if st.session_state.get("confirm_delete_1") and st.session_state.get("confirm_delete_2"):
+                                    # 🚨 CASCADE DELETE LOGIC 🚨
+                                    # Free the slots the user holds with other mentors
+                                    supabase.table("availability").update(
+                                        {"reserved_by": None, "reserved_at": None}
+                                    ).eq("reserved_by", user_id).execute()
+                                    supabase.table("session").delete().or_(
+                                        f"mentorid.eq.{user_id},menteeid.eq.{user_id}"
+                                    ).execute()
+                                    supabase.table("mentorshiprequest").delete().or_(
+                                        f"mentorid.eq.{user_id},menteeid.eq.{user_id}"
+                                    ).execute()
+                                    supabase.table("availability").delete().eq("mentorid", user_id).execute()
+                                    supabase.table("users").delete().eq("userid", user_id).execute()
+                                    refresh_mentor(user_id)
+    
+                                    st.success(f"✅ Deleted user: {selected_email} and all related records")
+                                    st.session_state.reset_flags = True
+                                    time.sleep(1)
+                                    st.rerun()
+                                else:
+                                    st.warning("☑️ You must confirm both checkboxes to proceed with deletion.")
+                            else:
+                                supabase.table("users").update({"status": new_status}).eq("userid", user_id).execute()
+                                refresh_mentor(user_id)
+                                st.success(f"✅ Updated {selected_email} to {new_status}")
                                 st.session_state.reset_flags = True
-                                time.sleep(1)
                                 st.rerun()
-                            else:
-                                st.warning("☑️ You must confirm both checkboxes to proceed with deletion.")
-                        else:
-                            supabase.table("users").update({"status": new_status}).eq("userid", user_id).execute()
-                            st.success(f"✅ Updated {selected_email} to {new_status}")
-                            st.session_state.reset_flags = True
-                            st.rerun()
-                    except Exception as e:
-                        st.error(f"❌ Failed to update user: {e}")
+                        except Exception as e:
+                            st.error(f"❌ Failed to update user: {e}")
 
     
-            # ✅ Promotion logic (only for Active Mentees with completed profiles)
-            if selected_email != "Select an email...":
-                user_row = df[df["Email"] == selected_email].iloc[0]
-                current_role = user_row["Role"]
-                current_status = user_row["Status"]
-                profile_completed = user_row["Profile Completed"]
-    
-                if current_role == "Mentee":
-                    if current_status == "Active" and profile_completed:
-                        promote = st.checkbox("🚀 Promote this *Active Mentee* (Profile Completed) to Mentor")
-                        if promote and st.button("✅ Promote to Mentor"):
-                            try:
-                                supabase.table("users").update({"role": "Mentor"}).eq("userid", user_row["User ID"]).execute()
-                                st.success(f"✅ {selected_email} promoted to Mentor!")
-                                st.rerun()
-                            except Exception as e:
-                                st.error(f"❌ Failed to promote user: {e}")
-                    else:
-                        st.info("⚠️ Only *Active Mentees* with a **completed profile** can be promoted to Mentors.")
-        else:
-            st.info("No users found.")
+                # ✅ Promotion logic (only for Active Mentees with completed profiles)
+                if selected_email != "Select an email...":
+                    user_row = df[df["Email"] == selected_email].iloc[0]
+                    current_role = user_row["Role"]
+                    current_status = user_row["Status"]
+                    profile_completed = user_row["Profile Completed"]
+    
+                    if current_role == "Mentee":
+                        if current_status == "Active" and profile_completed:
+                            promote = st.checkbox("🚀 Promote this *Active Mentee* (Profile Completed) to Mentor")
+                            if promote and st.button("✅ Promote to Mentor"):
+                                try:
+                                    supabase.table("users").update({"role": "Mentor"}).eq("userid", user_row["User ID"]).execute()
+                                    refresh_mentor(user_row["User ID"])
+                                    st.success(f"✅ {selected_email} promoted to Mentor!")
+                                    st.rerun()
+                                except Exception as e:
+                                    st.error(f"❌ Failed to promote user: {e}")
+                        else:
+                            st.info("⚠️ Only *Active Mentees* with a **completed profile** can be promoted to Mentors.")
+            else:
+                st.info("No users found.")
   
     # Mentorship Requests
-    with tabs[1]:
-        st.subheader("Mentorship Requests")
-        try:
-            requests = supabase.table("mentorshiprequest").select("""
+    if tabs[1].open:
+        with tabs[1]:
+            st.subheader("Mentorship Requests")
+            try:
+                requests = supabase.table("mentorshiprequest").select("""
                 *, mentee:users!mentorshiprequest_menteeid_fkey(email),
                    mentor:users!mentorshiprequest_mentorid_fkey(email)
             """).neq("status", "ACCEPTED").execute().data
-        except Exception as e:
-            st.error(f"❌ Could not fetch mentorship requests: {e}")
-            requests = []
+            except Exception as e:
+                st.error(f"❌ Could not fetch mentorship requests: {e}")
+                requests = []
 
-        if requests:
-            for req in requests:
-                mentee_email = req['mentee']['email']
-                mentor_email = req['mentor']['email']
-                status = req.get("status", "Unknown")
-                st.markdown(f"""
+            if requests:
+                for req in requests:
+                    mentee_email = req['mentee']['email']
+                    mentor_email = req['mentor']['email']
+                    status = req.get("status", "Unknown")
+                    st.markdown(f"""
                 - 🧑 Mentee: **{mentee_email}**  
                 - 🧑‍🏫 Mentor: **{mentor_email}**  
                 - 📌 Status: **{status}**
                 """)
-        else:
-            st.info("No mentorship requests found.")
+            else:
+                st.info("No mentorship requests found.")
 
     # Match Mentees to Mentors
-    with tabs[2]:
-        st.subheader("Match Mentee to Mentor")
-    
-        try:
-            users = supabase.table("users").select("userid, email, role, status") \
-                .neq("status", "Delete").execute().data or []
-            mentees = [u for u in users if u["role"] == "Mentee"]
-            mentors = [u for u in users if u["role"] == "Mentor"]
-        except Exception as e:
-            st.error(f"❌ Failed to fetch users: {e}")
-            mentees, mentors = [], []
-    
-        if not mentees or not mentors:
-            st.warning("No available mentees or mentors.")
-        else:
-            mentee_options = ["-- Select Mentee --"] + [m["email"] for m in mentees]
-            mentor_options = ["-- Select Mentor --"] + [m["email"] for m in mentors]
-    
-            with st.form("match_form", clear_on_submit=True):
-                mentee_email = st.selectbox("Mentee Email", mentee_options, index=0, key="mentee_select_form")
-                mentor_email = st.selectbox("Mentor Email", mentor_options, index=0, key="mentor_select_form")
-                submit_match = st.form_submit_button("✅ Create Match")
-    
-            if submit_match:
-                if mentee_email == "-- Select Mentee --" or mentor_email == "-- Select Mentor --":
-                    st.warning("⚠️ Please select both a valid mentee and mentor.")
-                elif mentee_email == mentor_email:
-                    st.warning("Mentee and Mentor cannot be the same.")
-                else:
-                    mentee_id = next((m["userid"] for m in mentees if m["email"] == mentee_email), None)
-                    mentor_id = next((m["userid"] for m in mentors if m["email"] == mentor_email), None)
-    
-                    existing = supabase.table("mentorshiprequest") \
-                        .select("mentorshiprequestid") \
-                        .eq("menteeid", mentee_id).eq("mentorid", mentor_id) \
-                        .execute().data
-    
-                    if existing:
-                        st.warning("⚠️ This mentorship request already exists.")
+    if tabs[2].open:
+        with tabs[2]:
+            st.subheader("Match Mentee to Mentor")
+    
+            try:
+                users = supabase.table("users").select("userid, email, role, status") \
+                    .neq("status", "Delete").execute().data or []
+                mentees = [u for u in users if u["role"] == "Mentee"]
+                mentors = [u for u in users if u["role"] == "Mentor"]
+            except Exception as e:
+                st.error(f"❌ Failed to fetch users: {e}")
+                mentees, mentors = [], []
+    
+            if not mentees or not mentors:
+                st.warning("No available mentees or mentors.")
+            else:
+                mentee_options = ["-- Select Mentee --"] + [m["email"] for m in mentees]
+                mentor_options = ["-- Select Mentor --"] + [m["email"] for m in mentors]
+    
+                with st.form("match_form", clear_on_submit=True):
+                    mentee_email = st.selectbox("Mentee Email", mentee_options, index=0, key="mentee_select_form")
+                    mentor_email = st.selectbox("Mentor Email", mentor_options, index=0, key="mentor_select_form")
+                    submit_match = st.form_submit_button("✅ Create Match")
+    
+                if submit_match:
+                    if mentee_email == "-- Select Mentee --" or mentor_email == "-- Select Mentor --":
+                        st.warning("⚠️ Please select both a valid mentee and mentor.")
+                    elif mentee_email == mentor_email:
+                        st.warning("Mentee and Mentor cannot be the same.")
                     else:
-                        availability = supabase.table("availability") \
-                            .select("availabilityid") \
-                            .eq("mentorid", mentor_id).execute().data
+                        mentee_id = next((m["userid"] for m in mentees if m["email"] == mentee_email), None)
+                        mentor_id = next((m["userid"] for m in mentors if m["email"] == mentor_email), None)
     
-                        if not availability:
-                            st.warning("⚠️ This mentor has no availability slots set.")
+                        existing = supabase.table("mentorshiprequest") \
+                            .select("mentorshiprequestid") \
+                            .eq("menteeid", mentee_id).eq("mentorid", mentor_id) \
+                            .execute().data
+    
+                        if existing:
+                            st.warning("⚠️ This mentorship request already exists.")
                         else:
-                            supabase.table("mentorshiprequest").insert({
-                                "menteeid": mentee_id,
-                                "mentorid": mentor_id,
-                                "status": "ACCEPTED"
-                            }).execute()
-    
-                            now = datetime.now(tz=WAT)
-                            end = now + timedelta(minutes=30)
-                            success, msg = create_session_if_available(supabase, mentor_id, mentee_id, now, end)
-    
-                            if success:
-                                st.success("✅ Match created and session booked!")
+                            availability = supabase.table("availability") \
+                                .select("availabilityid") \
+                                .eq("mentorid", mentor_id).execute().data
+    
+                            if not availability:
+                                st.warning("⚠️ This mentor has no availability slots set.")
                             else:
-                                st.warning(msg)
+                                supabase.table("mentorshiprequest").insert({
+                                    "menteeid": mentee_id,
+                                    "mentorid": mentor_id,
+                                    "status": "ACCEPTED"
+                                }).execute()
     
-                    time.sleep(1)
-                    st.rerun()
+                                now = datetime.now(tz=WAT)
+                                end = now + timedelta(minutes=30)
+                                success, msg = create_session_if_available(supabase, mentor_id, mentee_id, now, end)
+    
+                                if success:
+                                    st.success("✅ Match created and session booked!")
+                                else:
+                                    st.warning(msg)
+    
+                        time.sleep(1)
+                        st.rerun()
+
+            # --- Bulk auto-match for cohort starts ---
+            st.markdown("### 🤖 Bulk Auto-Match")
+            st.caption("Scores every unmatched mentee against every active mentor and assigns them within mentor capacity.")
+
+            col1, col2 = st.columns(2)
+            max_per_mentor = col1.number_input("Max mentees per mentor", min_value=1, max_value=50, value=3, step=1)
+            min_score = col2.slider("Minimum match score", 0.0, 1.0, 0.0, 0.05)
+
+            if st.button("🧮 Compute Matches", key="bulk_match_compute"):
+                try:
+                    started = time.perf_counter()
+                    st.session_state["bulk_match_plan"] = plan_bulk_matches(int(max_per_mentor), min_score)
+                    st.session_state["bulk_match_seconds"] = time.perf_counter() - started
+                except Exception as e:
+                    st.error(f"❌ Failed to compute matches: {e}")
+
+            plan = st.session_state.get("bulk_match_plan")
+            if plan is not None:
+                if not plan:
+                    st.info("No matches possible: every mentee is matched or no mentor has free capacity.")
+                else:
+                    st.success(
+                        f"Proposed {len(plan)} matches in {st.session_state.get('bulk_match_seconds', 0):.2f}s."
+                    )
+                    df_plan = pd.DataFrame(plan)[["mentee_email", "mentor_email", "score"]].rename(columns={
+                        "mentee_email": "Mentee Email",
+                        "mentor_email": "Mentor Email",
+                        "score": "Score"
+                    })
+                    st.dataframe(df_plan, use_container_width=True)
+
+                    if st.button(f"✅ Create {len(plan)} Matches", key="bulk_match_create"):
+                        try:
+                            created = create_bulk_matches(plan, max_per_mentor=int(max_per_mentor))
+                            st.session_state.pop("bulk_match_plan", None)
+                            st.session_state["bulk_match_created"] = created
+                            st.success(f"✅ Created {len(created)} mentorship matches.")
+                            if len(created) < len(plan):
+                                st.warning(f"⚠️ {len(plan) - len(created)} pairs were skipped: the mentee was "
+                                           "matched or the mentor ran out of capacity since the plan was computed.")
+                            time.sleep(1)
+                            st.rerun()
+                        except Exception as e:
+                            st.error(f"❌ Failed to create matches: {e}")
+
+            # --- Kickoff sessions for the matches just created ---
+            created_plan = st.session_state.get("bulk_match_created")
+            if created_plan:
+                st.caption("Books each new pair's earliest free slot; calendar invites go out in batched requests.")
+                try:
+                    pool = MeetPoolStore().metrics()
+                    st.caption(f"🎥 Meet link pool: {pool['available']} ready (target {pool['target']}), "
+                               f"{pool['bookings_24h']} bookings in the last 24h.")
+                    if not pool["available"]:
+                        st.warning("⚠️ The Meet link pool is empty, so each session's calendar event is "
+                                   "created in the background. Check the meet_pool_top_up maintenance task.")
+                except Exception as e:
+                    if not pool_missing(e):  # a missing table just means the pool isn't migrated yet
+                        logger.warning(f"⚠️ Could not read Meet pool metrics: {e}")
+                if st.button(f"📅 Book {len(created_plan)} Kickoff Sessions", key="bulk_match_schedule"):
+                    try:
+                        with st.spinner("Booking sessions and creating calendar events..."):
+                            result = schedule_kickoff_sessions(created_plan)
+                        st.session_state.pop("bulk_match_created", None)
+                        st.success(f"✅ Booked {result['booked']} sessions; {result['events']} calendar events created.")
+                        if result["pooled"]:
+                            st.info(f"🎥 {result['pooled']} sessions got a ready Meet link; their invites are sent in the background.")
+                        if result["queued"]:
+                            st.info(f"ℹ️ {result['queued']} calendar events will be retried in the background.")
+                        if result["no_slot"]:
+                            st.warning(f"⚠️ {result['no_slot']} pairs had no free mentor slot.")
+                    except Exception as e:
+                        st.error(f"❌ Failed to book kickoff sessions: {e}")
 
     # Sessions
-    with tabs[3]:
-        st.subheader("🔍 Admin Session Management")
+    if tabs[3].open:
+        with tabs[3]:
+            st.subheader("🔍 Admin Session Management")
     
-        try:
-            sessions = supabase.table("session").select("""
-                sessionid, date, rating, feedback, meet_link,
+            try:
+                sessions = supabase.table("session").select("""
+                sessionid, date, rating, feedback, meet_link, availabilityid,
                 mentor:users!session_mentorid_fkey(email),
                 mentee:users!session_menteeid_fkey(email)
             """).execute().data or []
-        except Exception as e:
-            st.error(f"❌ Could not fetch sessions: {e}")
-            sessions = []
-    
-        if sessions:
-            now = datetime.now(WAT).replace(tzinfo=None)
-    
-            # --- Flatten session data ---
-            processed_sessions = []
-            for s in sessions:
-                session_time = pd.to_datetime(s.get("date"), errors="coerce")
-                if session_time < now:
-                    status = "🔴 Past"
-                elif session_time > now:
-                    status = "🟢 Upcoming"
-                else:
-                    status = "🟡 Ongoing"
-    
-                processed_sessions.append({
-                    "Session ID": s.get("sessionid"),
-                    "Mentor Email": s.get("mentor", {}).get("email", "N/A"),
-                    "Mentee Email": s.get("mentee", {}).get("email", "N/A"),
-                    "Date": session_time,
-                    "Rating": s.get("rating", "Not Rated"),
-                    "Feedback": s.get("feedback", "No Feedback"),
-                    "Meet Link": s.get("meet_link", "#"),
-                    "Status": status
-                })
-    
-            df_sessions = pd.DataFrame(processed_sessions)
-    
-            # --- Search by email ---
-            search_email = st.text_input("🔎 Search Mentor or Mentee Email").strip().lower()
-            if search_email:
-                df_sessions = df_sessions[
-                    df_sessions["Mentor Email"].str.lower().str.contains(search_email) |
-                    df_sessions["Mentee Email"].str.lower().str.contains(search_email)
-                ]
-    
-            # --- Filter by status ---
-            status_options = ["All", "Upcoming", "Ongoing", "Past"]
-            selected_status = st.selectbox("📂 Filter by Session Status", status_options)
-            if selected_status != "All":
-                df_sessions = df_sessions[df_sessions["Status"] == selected_status]
-    
-            # --- Display spreadsheet view ---
-            st.markdown("### 📊 Spreadsheet View")
-            st.dataframe(df_sessions.sort_values(by="Date", ascending=False), use_container_width=True)
+            except Exception as e:
+                st.error(f"❌ Could not fetch sessions: {e}")
+                sessions = []
+    
+            if sessions:
+                now = datetime.now(WAT).replace(tzinfo=None)
+                slot_of = {s["sessionid"]: s.get("availabilityid") for s in sessions}
+    
+                # --- Flatten session data ---
+                processed_sessions = []
+                for s in sessions:
+                    session_time = pd.to_datetime(s.get("date"), errors="coerce")
+                    if session_time < now:
+                        status = "🔴 Past"
+                    elif session_time > now:
+                        status = "🟢 Upcoming"
+                    else:
+                        status = "🟡 Ongoing"
+    
+                    processed_sessions.append({
+                        "Session ID": s.get("sessionid"),
+                        "Mentor Email": s.get("mentor", {}).get("email", "N/A"),
+                        "Mentee Email": s.get("mentee", {}).get("email", "N/A"),
+                        "Date": session_time,
+                        "Rating": s.get("rating", "Not Rated"),
+                        "Feedback": s.get("feedback", "No Feedback"),
+                        "Meet Link": s.get("meet_link", "#"),
+                        "Status": status
+                    })
+    
+                df_sessions = pd.DataFrame(processed_sessions)
+    
+                # --- Search by email ---
+                search_email = st.text_input("🔎 Search Mentor or Mentee Email").strip().lower()
+                if search_email:
+                    df_sessions = df_sessions[
+                        df_sessions["Mentor Email"].str.lower().str.contains(search_email) |
+                        df_sessions["Mentee Email"].str.lower().str.contains(search_email)
+                    ]
+    
+                # --- Filter by status ---
+                status_options = ["All", "Upcoming", "Ongoing", "Past"]
+                selected_status = st.selectbox("📂 Filter by Session Status", status_options)
+                if selected_status != "All":
+                    df_sessions = df_sessions[df_sessions["Status"] == selected_status]
+    
+                # --- Display spreadsheet view ---
+                st.markdown("### 📊 Spreadsheet View")
+                st.dataframe(df_sessions.sort_values(by="Date", ascending=False), use_container_width=True)
         
-            # --- Catalogue view with expanders ---
-            st.markdown("### 📦 Catalogue View")
-            for s in df_sessions.to_dict(orient="records"):
-                with st.expander(f"Session {s['Session ID']} - {s['Mentor Email']} ↔ {s['Mentee Email']}"):
-                    st.markdown(f"""
+                # --- Catalogue view with expanders ---
+                st.markdown("### 📦 Catalogue View")
+                for s in df_sessions.to_dict(orient="records"):
+                    with st.expander(f"Session {s['Session ID']} - {s['Mentor Email']} ↔ {s['Mentee Email']}"):
+                        st.markdown(f"""
                     - 🧑‍🏫 **Mentor:** {s['Mentor Email']}  
                     - 🧑 **Mentee:** {s['Mentee Email']}  
                     - 📅 **Start Time:** {format_datetime_safe(s['Date'])}  
@@ -364,382 +463,260 @@ def show():
                     - 🔗 **[Join Meet]({s['Meet Link']})**
                     """)
 
-                    if st.button(f"❌ Delete Session", key=f"show_delete_{s['Session ID']}"):
-                        st.session_state[f"show_confirm_{s['Session ID']}"] = True
+                        if st.button(f"❌ Delete Session", key=f"show_delete_{s['Session ID']}"):
+                            st.session_state[f"show_confirm_{s['Session ID']}"] = True
             
-                    if st.session_state.get(f"show_confirm_{s['Session ID']}", False):
-                        st.markdown("⚠️ This will permanently delete this session.")
+                        if st.session_state.get(f"show_confirm_{s['Session ID']}", False):
+                            st.markdown("⚠️ This will permanently delete this session.")
             
-                        confirm_delete_single = st.checkbox(
-                            f"☑️ Confirm delete of Session",
-                            key=f"confirm_delete_{s['Session ID']}"
-                        )
+                            confirm_delete_single = st.checkbox(
+                                f"☑️ Confirm delete of Session",
+                                key=f"confirm_delete_{s['Session ID']}"
+                            )
             
-                        if st.button(
-                            f"✅ Confirm Delete Session",
-                            key=f"delete_{s['Session ID']}",
-                            disabled=not confirm_delete_single
-                        ):
-                            try:
-                                mentorship_request_id = s.get("mentorshiprequestid")
+                            if st.button(
+                                f"✅ Confirm Delete Session",
+                                key=f"delete_{s['Session ID']}",
+                                disabled=not confirm_delete_single
+                            ):
+                                try:
+                                    mentorship_request_id = s.get("mentorshiprequestid")
             
-                                if mentorship_request_id:
-                                    supabase.table("mentorshiprequest").delete().eq("mentorshiprequestid", mentorship_request_id).execute()
+                                    if mentorship_request_id:
+                                        supabase.table("mentorshiprequest").delete().eq("mentorshiprequestid", mentorship_request_id).execute()
             
-                                supabase.table("session").delete().eq("sessionid", s['Session ID']).execute()
+                                    if slot_of.get(s['Session ID']):
+                                        # Deletes the session and frees its slot
+                                        ReservationStore().release(slot_of[s['Session ID']])
+                                    else:
+                                        supabase.table("session").delete().eq("sessionid", s['Session ID']).execute()
             
-                                st.success(f"✅ Session deleted successfully.")
-                                st.rerun()
+                                    st.success(f"✅ Session deleted successfully.")
+                                    st.rerun()
             
-                            except Exception as e:
-                                st.error(f"❌ Failed to delete session: {e}")
+                                except Exception as e:
+                                    st.error(f"❌ Failed to delete session: {e}")
 
     #---------Broadcast----------
-    with tabs[4]:
-        st.subheader("📢 Send Broadcast Message")
-    
-        if st.session_state.get("user_role") != "ADMIN":
-            st.error("Access Denied. Admins only.")
-            st.stop()
-    
-        title = st.text_input("Message Title")
-        body = st.text_area("Message Body")
-        target = st.selectbox("Send To", ["All Users", "Mentors", "Mentees", "Individual"])
-    
-        receiver_id = None
-        role = None
-    
-        if target == "Individual":
-            user_email = st.text_input("Enter User Email")
-            if user_email:
-                user = supabase.table("users").select("userid").eq("email", user_email).execute().data
-                if user:
-                    receiver_id = user[0]["userid"]
+    if tabs[4].open:
+        with tabs[4]:
+            st.subheader("📢 Send Broadcast Message")
+    
+            if st.session_state.get("user_role") != "ADMIN":
+                st.error("Access Denied. Admins only.")
+                st.stop()
+    
+            title = st.text_input("Message Title")
+            body = st.text_area("Message Body")
+            target = st.selectbox("Send To", ["All Users", "Mentors", "Mentees", "Individual"])
+    
+            receiver_id = None
+            role = None
+    
+            if target == "Individual":
+                user_email = st.text_input("Enter User Email")
+                if user_email:
+                    user = supabase.table("users").select("userid").eq("email", user_email).execute().data
+                    if user:
+                        receiver_id = user[0]["userid"]
+                    else:
+                        st.warning("User not found")
+            elif target == "Mentors":
+                role = "MENTOR"
+            elif target == "Mentees":
+                role = "MENTEE"
+    
+            if st.button("📤 Send Message"):
+                tracing.action("send broadcast")
+                if not title or not body:
+                    st.warning("Please provide both title and body.")
                 else:
-                    st.warning("User not found")
-        elif target == "Mentors":
-            role = "MENTOR"
-        elif target == "Mentees":
-            role = "MENTEE"
-    
-        if st.button("📤 Send Message"):
-            if not title or not body:
-                st.warning("Please provide both title and body.")
-            else:
-                sender_id = st.session_state.get("user_id")
+                    sender_id = st.session_state.get("user_id")
     
-                if not sender_id:
-                    st.error("Your session is missing a user_id.")
-                else:
-                    message_data = {
-                        "id": str(uuid.uuid4()),
-                        "sender_id": sender_id,
-                        "receiver_id": receiver_id,  # Can be None
-                        "role": role,  # Can be None
-                        "title": title,
-                        "body": body,
-                        "created_at": datetime.now().isoformat(),
-                        "is_read": False
-                    }
+                    if not sender_id:
+                        st.error("Your session is missing a user_id.")
+                    else:
+                        try:
+                            # One row per broadcast; read state is tracked per user (utils/broadcasts.py)
+                            send_message(sender_id, title, body, receiver_id=receiver_id, role=role)
+                            st.success("✅ Message sent successfully!")
+                        except Exception as e:
+                            st.error(f"❌ Failed to insert message: {e}")
+                            time.sleep(1)
+                            st.rerun()
     
-                    try:
-                        supabase.table("messages").insert(message_data).execute()
-                        st.success("✅ Message sent successfully!")
-                    except Exception as e:
-                        st.error(f"❌ Failed to insert message: {e}")
-                        time.sleep(1)
-                        st.rerun()
+            # --- Analytics Tab ---
+    if tabs[5].open:
+        with tabs[5]:
+            st.markdown(
+                "<h2 style='text-align: center;'>📊 Platform Insights</h2>",
+                unsafe_allow_html=True
+            )
     
-        # --- Analytics Tab ---
-    with tabs[5]:
-        st.markdown(
-            "<h2 style='text-align: center;'>📊 Platform Insights</h2>",
-            unsafe_allow_html=True
-        )
-    
-        try:
-            users = supabase.table("users").select("userid, email, created_at, role, status").execute().data or []
-            sessions = supabase.table("session").select("date, rating, mentorid, menteeid").execute().data or []
-            requests = supabase.table("mentorshiprequest").select("status, createdat, menteeid").execute().data or []
-        except Exception as e:
-            st.error(f"❌ Failed to load analytics data: {e}")
-            return
-    
-        df_users = pd.DataFrame(users)
-        df_sessions = pd.DataFrame(sessions)
-        df_requests = pd.DataFrame(requests)
-    
-        # --- Date Filters ---
-        st.markdown("### 🗂️ Filter by Month and Year")
-        date_pool = pd.concat([
-            pd.to_datetime(df_users.get("created_at"), errors="coerce"),
-            pd.to_datetime(df_sessions.get("date"), errors="coerce"),
-            pd.to_datetime(df_requests.get("createdat"), errors="coerce")
-        ]).dropna()
-    
-        filter_df = pd.DataFrame({"datetime": date_pool})
-        filter_df["datetime"] = pd.to_datetime(filter_df["datetime"], errors="coerce")
-        filter_df = filter_df.dropna(subset=["datetime"])
-        filter_df["Year"] = filter_df["datetime"].dt.year
-        filter_df["Month"] = filter_df["datetime"].dt.strftime("%B")
-    
-        years = sorted(filter_df["Year"].dropna().unique().tolist())
-        months = filter_df["Month"].dropna().unique().tolist()
-    
-        years_with_all = ["All"] + years
-        months_with_all = ["All"] + months
-    
-        selected_year = st.selectbox("📅 Select Year", years_with_all, index=len(years_with_all) - 1)
-        selected_month = st.selectbox("🗓️ Select Month", months_with_all)
-    
-        # --- Filter by Role (radio) ---
-        st.markdown("### 🧑‍💼 Filter Sessions By Role")
-        role_filter = st.radio("Filter By:", ["All", "Mentors", "Mentees"], horizontal=True)
-
-#        st.write("✅ df_sessions columns:", df_sessions.columns.tolist())
-        st.write("Session Columns:", df_sessions.columns.tolist())
-
+            # All figures below come from grouped SQL functions (sql/analytics.sql),
+            # so only small aggregated frames are transferred on each rerun.
+            try:
+                periods = analytics.load_periods()
+            except Exception as e:
+                st.error(f"❌ Failed to load analytics data: {e}")
+                return
+    
+            # --- Date Filters ---
+            st.markdown("### 🗂️ Filter by Month and Year")
+            years = sorted({year for year, _ in periods})
+            month_numbers = sorted({month for _, month in periods})
+            month_names = {calendar.month_name[m]: m for m in month_numbers}
+    
+            years_with_all = ["All"] + years
+            months_with_all = ["All"] + list(month_names)
+    
+            selected_year = st.selectbox("📅 Select Year", years_with_all, index=len(years_with_all) - 1)
+            selected_month_name = st.selectbox("🗓️ Select Month", months_with_all)
+            selected_month = month_names.get(selected_month_name, "All")
+    
+            # --- Filter by Role (radio) ---
+            st.markdown("### 🧑‍💼 Filter Users By Role")
+            role_filter = st.radio("Filter By:", ["All", "Mentors", "Mentees"], horizontal=True)
+            role = {"Mentors": "Mentor", "Mentees": "Mentee"}.get(role_filter)
+    
+            try:
+                summary = analytics.load_summary(selected_year, selected_month, role)
+                user_growth = analytics.load_monthly_registrations(selected_year, selected_month, role)
+                monthly_sessions = analytics.load_monthly_sessions(selected_year, selected_month)
+                ratings = analytics.load_rating_histogram(selected_year, selected_month)
+                request_counts = analytics.load_request_status(selected_year, selected_month)
+                request_trend = analytics.load_request_trend(selected_year, selected_month)
+                mentor_performance = analytics.load_mentor_performance(selected_year, selected_month)
+            except Exception as e:
+                st.error(f"❌ Failed to load analytics data: {e}")
+                return
+    
+            total_sessions = summary.get("total_sessions", 0)
+            total_requests = summary.get("total_requests", 0)
+    
+            # --- Metrics ---
+            st.markdown("### 📌 Key Metrics")
+            col1, col2, col3 = st.columns(3)
+            col1.metric("👥 Total Users", summary.get("total_users", 0))
+            col2.metric("🧑‍🏫 Mentors", summary.get("mentors", 0))
+            col3.metric("🧑 Mentees", summary.get("mentees", 0))
+    
+            col4, col5 = st.columns(2)
+            col4.metric("📅 Total Sessions", total_sessions)
+            col5.metric("📩 Total Requests", total_requests)
+    
+            # --- Users Over Time ---
+            st.markdown("### 📈 User Registrations Over Time")
+            user_growth = user_growth.rename(columns={"month": "Month", "count": "Count"})
+            fig = px.bar(user_growth, x="Month", y="Count", color="role", barmode="group", title="User Growth by Role")
+            st.plotly_chart(fig, use_container_width=True)
     
-        # Apply date filters
-        def apply_date_filter(df, date_col):
-            if date_col not in df.columns:
-                st.warning(f"⚠️ Column '{date_col}' not found in DataFrame. Available columns: {df.columns.tolist()}")
-                return df
-        
-            df[date_col] = pd.to_datetime(df[date_col], errors="coerce")
-            df = df.dropna(subset=[date_col])
-            df["Year"] = df[date_col].dt.year
-            df["Month"] = df[date_col].dt.strftime("%B")
-        
-            if selected_year != "All":
-                df = df[df["Year"] == selected_year]
-            if selected_month != "All":
-                df = df[df["Month"] == selected_month]
-            return df
-        
-        # Apply date filters safely
-        df_users = apply_date_filter(df_users, "created_at")
-        df_sessions = apply_date_filter(df_sessions, "date")
-        df_requests = apply_date_filter(df_requests, "createdat")
-        
-        # Backup originals
-        df_users_all = df_users.copy()
-        df_sessions_all = df_sessions.copy()
-        df_requests_all = df_requests.copy()
-        
-        # Confirm necessary columns exist before lookup
-        required_user_fields = {"userid", "email", "role"}
-        if not required_user_fields.issubset(df_users_all.columns):
-            st.error(f"Missing required fields in df_users. Found: {df_users_all.columns.tolist()}")
-            st.stop()
-        
-        # Prepare mentor and mentee lookups
-        mentor_lookup = df_users_all[df_users_all["role"] == "Mentor"][["userid", "email"]]
-        mentee_lookup = df_users_all[df_users_all["role"] == "Mentee"][["userid", "email"]]
-        
-        # Confirm merge keys exist in session data
-        if not {"mentorid", "menteeid"}.issubset(df_sessions_all.columns):
-            st.error("Missing 'mentorid' or 'menteeid' in session data.")
-            st.stop()
-        
-        # Merge mentor and mentee emails into session records
-        df_sessions_merged = df_sessions_all.copy()
-        
-        # Merge mentor email
-        if not mentor_lookup.empty:
-            df_sessions_merged = df_sessions_merged.merge(
-                mentor_lookup,
-                left_on="mentorid",
-                right_on="userid",
-                how="left",
-                suffixes=("", "_mentor")
-            )
-        
-        # Merge mentee email
-        if not mentee_lookup.empty:
-            df_sessions_merged = df_sessions_merged.merge(
-                mentee_lookup,
-                left_on="menteeid",
-                right_on="userid",
-                how="left",
-                suffixes=("", "_mentee")
-            )
-        
-        # Role-based filters
-        if role_filter == "Mentors":
-            df_users = df_users_all[df_users_all["role"] == "Mentor"]
-            df_sessions_merged = df_sessions_merged[df_sessions_merged["email"].notna()]
-            df_requests = df_requests_all[df_requests_all["menteeid"].isin(df_users_all["userid"])]
-        
-        elif role_filter == "Mentees":
-            df_users = df_users_all[df_users_all["role"] == "Mentee"]
-            df_sessions_merged = df_sessions_merged[df_sessions_merged["email_mentee"].notna()]
-            df_requests = df_requests_all[df_requests_all["menteeid"].isin(df_users["userid"])]
-        
-        else:
-            df_users = df_users_all
-            df_sessions_merged = df_sessions_merged
-            df_requests = df_requests_all
-
+            # --- Sessions Trend ---
+            st.markdown("### 📆 Sessions Trend")
+            monthly_sessions = monthly_sessions.rename(columns={"month": "Month", "sessions": "Sessions"})
+            fig2 = px.line(monthly_sessions, x="Month", y="Sessions", markers=True, title="Monthly Sessions")
+            st.plotly_chart(fig2, use_container_width=True)
+    
+            # --- Ratings Summary ---
+            st.markdown("### ⭐ Session Ratings Distribution")
+            fig3 = px.bar(ratings, x="rating", y="count", title="Ratings Given by Mentees")
+            st.plotly_chart(fig3, use_container_width=True)
+    
+            # --- Requests Status ---
+            st.markdown("### 📩 Request Status Breakdown")
+            request_counts = request_counts.rename(columns={"status": "Status", "count": "Count"})
+            fig4 = px.pie(request_counts, names="Status", values="Count", title="Request Status Distribution")
+            st.plotly_chart(fig4, use_container_width=True)
+    
+            # --- Top Requesting Mentees ---
+            st.markdown("### 📬 Top Requesting Mentees")
+            try:
+                top_mentees = analytics.load_top_requesting_mentees(5)
+                if not top_mentees.empty:
+                    top_mentees = top_mentees.rename(columns={"request_count": "RequestCount"})
+                    st.dataframe(top_mentees[["email", "RequestCount"]], use_container_width=True)
+                else:
+                    st.info("No mentorship requests found.")
+            except Exception as e:
+                st.error(f"Error loading mentorship request stats: {e}")
+    
+            # --- Mentee Engagement ---
+            st.markdown("### 🧑 Mentee Engagement")
+            rated_sessions = summary.get("rated_sessions", 0)
+            feedback_rate = (rated_sessions / total_sessions * 100) if total_sessions > 0 else 0
+            if summary.get("total_users") and total_requests and total_sessions:
+                mentee_count = summary.get("mentees", 0)
+                requesting_mentees = summary.get("requesting_mentees", 0)
+                avg_requests = total_requests / requesting_mentees if requesting_mentees else 0
+                col1, col2, col3 = st.columns(3)
+                col1.metric("📩 Avg. Requests per Mentee", f"{avg_requests:.2f}")
+                mentees_with_sessions = summary.get("mentees_with_sessions", 0)
+                session_percentage = (mentees_with_sessions / mentee_count * 100) if mentee_count > 0 else 0
+                col2.metric("📅 Mentees with Sessions", f"{session_percentage:.1f}%")
+                col3.metric("⭐ Feedback Submission Rate", f"{feedback_rate:.1f}%")
+    
+            # --- Mentor Performance ---
+            st.markdown("### 🧑‍🏫 Mentor Performance")
+            with_slots = mentor_performance[mentor_performance["slots"] > 0]
+            with_sessions = mentor_performance[mentor_performance["sessions"] > 0]
+            avg_slots = with_slots["slots"].mean() if not with_slots.empty else 0
+            avg_sessions = with_sessions["sessions"].mean() if not with_sessions.empty else 0
+            avg_rating = pd.to_numeric(mentor_performance["avg_rating"], errors="coerce").mean()
+            col1, col2, col3 = st.columns(3)
+            col1.metric("🕒 Avg. Availability Slots", f"{avg_slots:.2f}")
+            col2.metric("📅 Avg. Sessions per Mentor", f"{avg_sessions:.2f}")
+            col3.metric("⭐ Avg. Rating per Mentor", f"{0 if pd.isna(avg_rating) else avg_rating:.1f}")
     
-        # --- Metrics ---
-        st.markdown("### 📌 Key Metrics")
-        col1, col2, col3 = st.columns(3)
-        col1.metric("👥 Total Users", len(df_users))
-        col2.metric("🧑‍🏫 Mentors", len(df_users[df_users.role == "Mentor"]))
-        col3.metric("🧑 Mentees", len(df_users[df_users.role == "Mentee"]))
-    
-        col4, col5 = st.columns(2)
-        col4.metric("📅 Total Sessions", len(df_sessions_merged))
-        col5.metric("📩 Total Requests", len(df_requests))
-    
-        # --- Users Over Time ---
-        st.markdown("### 📈 User Registrations Over Time")
-        df_users["created_at"] = pd.to_datetime(df_users["created_at"], errors='coerce')
-        df_users = df_users.dropna(subset=["created_at"])
-        df_users["Month"] = df_users["created_at"].dt.to_period("M").astype(str)
-        user_growth = df_users.groupby(["Month", "role"]).size().reset_index(name="Count")
-        fig = px.bar(user_growth, x="Month", y="Count", color="role", barmode="group", title="User Growth by Role")
-        st.plotly_chart(fig, use_container_width=True)
-    
-        # --- Sessions Trend ---
-        st.markdown("### 📆 Sessions Trend")
-        df_sessions_merged["Month"] = df_sessions_merged["date"].dt.to_period("M").astype(str)
-        monthly_sessions = df_sessions_merged.groupby("Month").size().reset_index(name="Sessions")
-        fig2 = px.line(monthly_sessions, x="Month", y="Sessions", markers=True, title="Monthly Sessions")
-        st.plotly_chart(fig2, use_container_width=True)
-    
-        # --- Ratings Summary ---
-        st.markdown("### ⭐ Session Ratings Distribution")
-        df_ratings = df_sessions_merged.dropna(subset=["rating"])
-        fig3 = px.histogram(df_ratings, x="rating", nbins=5, title="Ratings Given by Mentees")
-        st.plotly_chart(fig3, use_container_width=True)
-    
-        # --- Requests Status ---
-        st.markdown("### 📩 Request Status Breakdown")
-        request_counts = df_requests["status"].value_counts().reset_index()
-        request_counts.columns = ["Status", "Count"]
-        fig4 = px.pie(request_counts, names="Status", values="Count", title="Request Status Distribution")
-        st.plotly_chart(fig4, use_container_width=True)
-    
-        # --- Top Requesting Mentees ---
-        st.markdown("### 📬 Top Requesting Mentees")
-        try:
-            raw_top_requests = supabase.table("mentorshiprequest") \
-                .select("menteeid, status, users:users!mentorshiprequest_menteeid_fkey(email)") \
-                .execute().data or []
-            df_requests_top = pd.DataFrame(raw_top_requests)
-        
-            if not df_requests_top.empty and "menteeid" in df_requests_top.columns:
-                df_requests_top["email"] = df_requests_top["users"].apply(
-                    lambda u: u.get("email", "Unknown") if isinstance(u, dict) else "Unknown"
-                )
-                requests_per_mentee = df_requests_top.groupby("menteeid").size().reset_index(name="RequestCount")
-                df_emails = df_requests_top[["menteeid", "email"]].drop_duplicates()
-                top_mentees = requests_per_mentee.merge(df_emails, on="menteeid", how="left") \
-                    .sort_values(by="RequestCount", ascending=False).head(5)
-                st.dataframe(top_mentees[["email", "RequestCount"]], use_container_width=True)
-            else:
-                st.info("No mentorship requests found or 'menteeid' is missing.")
-        except Exception as e:
-            st.error(f"Error loading mentorship request stats: {e}")
-    
-        # --- Mentee Engagement ---
-        st.markdown("### 🧑 Mentee Engagement")
-        rated_sessions = df_sessions_merged["rating"].notna().sum()
-        feedback_rate = (rated_sessions / len(df_sessions_merged) * 100) if len(df_sessions_merged) > 0 else 0
-        if not df_users.empty and not df_requests.empty and not df_sessions_merged.empty:
-            mentees = df_users[df_users["role"] == "Mentee"]
-            mentee_count = len(mentees)
-            requests_per_mentee = df_requests.groupby("menteeid").size().reset_index(name="RequestCount")
-            avg_requests = requests_per_mentee["RequestCount"].mean() if not requests_per_mentee.empty else 0
+            # --- Admin Actions ---
+            st.markdown("### 👑 Admin Actions")
             col1, col2, col3 = st.columns(3)
-            col1.metric("📩 Avg. Requests per Mentee", f"{avg_requests:.2f}")
-            mentees_with_sessions = df_sessions_merged["menteeid"].nunique()
-            session_percentage = (mentees_with_sessions / mentee_count * 100) if mentee_count > 0 else 0
-            col2.metric("📅 Mentees with Sessions", f"{session_percentage:.1f}%")
-            col3.metric("⭐ Feedback Submission Rate", f"{feedback_rate:.1f}%")
-    
-        # --- Mentor Performance ---
-        st.markdown("### 🧑‍🏫 Mentor Performance")
-        mentors = df_users[df_users["role"] == "Mentor"]
-        availability = supabase.table("availability").select("mentorid").execute().data or []
-        df_availability = pd.DataFrame(availability)
-        slots_per_mentor = df_availability.groupby("mentorid").size().reset_index(name="SlotCount")
-        avg_slots = slots_per_mentor["SlotCount"].mean() if not slots_per_mentor.empty else 0
-        sessions_per_mentor = df_sessions_merged.groupby("mentorid").size().reset_index(name="SessionCount")
-        avg_sessions = sessions_per_mentor["SessionCount"].mean() if not sessions_per_mentor.empty else 0
-        ratings_per_mentor = df_sessions_merged.groupby("mentorid")["rating"].mean().reset_index(name="AvgRating")
-        avg_rating = ratings_per_mentor["AvgRating"].mean() if not ratings_per_mentor.empty else 0
-        col1, col2, col3 = st.columns(3)
-        col1.metric("🕒 Avg. Availability Slots", f"{avg_slots:.2f}")
-        col2.metric("📅 Avg. Sessions per Mentor", f"{avg_sessions:.2f}")
-        col3.metric("⭐ Avg. Rating per Mentor", f"{avg_rating:.1f}")
-    
-        # --- Admin Actions ---
-        st.markdown("### 👑 Admin Actions")
-        admin_registrations = len(df_users)
-        promotions = supabase.table("users").select("userid").eq("role", "Mentor").execute().data or []
-        promotion_count = len(promotions)
-        admin_matches = df_requests[df_requests["status"] == "ACCEPTED"].shape[0]
-        col1, col2, col3 = st.columns(3)
-        col1.metric("👥 Admin-Registered Users", admin_registrations)
-        col2.metric("🚀 Mentees Promoted", promotion_count)
-        col3.metric("🔁 Admin-Created Matches", admin_matches)
-    
-        # --- Skill-Based Insights ---
-        st.markdown("### 🎯 Popular Skills")
-        try:
-            profiles = supabase.table("profile").select("skills, userid").execute().data or []
-            user_roles = supabase.table("users").select("userid, role").execute().data or []
-            df_profiles = pd.DataFrame(profiles).merge(pd.DataFrame(user_roles), on="userid")
-        except Exception as e:
-            st.error(f"❌ Failed to load profile data: {e}")
-            df_profiles = pd.DataFrame()
-        if not df_profiles.empty:
-            all_skills = []
-            for _, row in df_profiles.iterrows():
-                skills = row["skills"]
-                if skills:
-                    all_skills.extend([skill.strip().lower() for skill in skills.split(",")])
-            skill_counts = pd.Series(all_skills).value_counts().reset_index().head(5)
-            skill_counts.columns = ["Skill", "Count"]
+            col1.metric("👥 Admin-Registered Users", summary.get("total_users", 0))
+            col2.metric("🚀 Mentees Promoted", summary.get("all_mentors", 0))
+            col3.metric("🔁 Admin-Created Matches", summary.get("accepted_requests", 0))
+    
+            # --- Skill-Based Insights ---
+            st.markdown("### 🎯 Popular Skills")
+            try:
+                skill_counts = analytics.load_top_skills(5)
+            except Exception as e:
+                st.error(f"❌ Failed to load profile data: {e}")
+                skill_counts = pd.DataFrame()
+            if not skill_counts.empty:
+                skill_counts = skill_counts.rename(columns={"skill": "Skill", "count": "Count"})
+                col1, col2 = st.columns(2)
+                col1.metric("🎯 Unique Skills", int(skill_counts.iloc[0]["unique_skills"]))
+                col2.metric("📊 Top Skill", skill_counts.iloc[0]["Skill"])
+                fig_skills = px.bar(skill_counts, x="Skill", y="Count", title="Top 5 In-Demand Skills")
+                st.plotly_chart(fig_skills, use_container_width=True)
+    
+            # --- Session Completion and Feedback ---
+            st.markdown("### 📅 Session Completion and Feedback")
+            completed_sessions = summary.get("completed_sessions", 0)
             col1, col2 = st.columns(2)
-            col1.metric("🎯 Unique Skills", len(set(all_skills)))
-            col2.metric("📊 Top Skill", skill_counts.iloc[0]["Skill"] if not skill_counts.empty else "N/A")
-            fig_skills = px.bar(skill_counts, x="Skill", y="Count", title="Top 5 In-Demand Skills")
-            st.plotly_chart(fig_skills, use_container_width=True)
-    
-        # --- Session Completion and Feedback ---
-        st.markdown("### 📅 Session Completion and Feedback")
-        now = datetime.now(WAT).replace(tzinfo=None)
-        completed_sessions = df_sessions_merged[df_sessions_merged["date"] < now]
-        completion_rate = (len(completed_sessions) / len(df_sessions_merged) * 100) if len(df_sessions_merged) > 0 else 0
-        col1, col2 = st.columns(2)
-        col1.metric("📅 Completed Sessions", len(completed_sessions))
-        col2.metric("⭐ Feedback Rate", f"{feedback_rate:.1f}%")
-    
-        # --- Mentorship Success Rate ---
-        st.markdown("### 🔁 Mentorship Success Rate")
-        acceptance_rate = (df_requests["status"] == "ACCEPTED").mean() * 100
-        st.metric("✅ Acceptance Rate", f"{acceptance_rate:.1f}%")
-        
-        try:
-            df_requests_time = df_requests.copy()
-            df_requests_time["createdat"] = pd.to_datetime(df_requests_time["createdat"], errors="coerce")
-            df_requests_time = df_requests_time.dropna(subset=["createdat"])
-            df_requests_time["Month"] = df_requests_time["createdat"].dt.to_period("M").astype(str)
-        
-            request_trend = df_requests_time.groupby(["Month", "status"]).size().reset_index(name="Count")
-            fig = px.bar(
-                request_trend,
-                x="Month",
-                y="Count",
-                color="status",
-                barmode="group",
-                title="📈 Monthly Mentorship Request Status Trends"
-            )
-            st.plotly_chart(fig, use_container_width=True)
+            col1.metric("📅 Completed Sessions", completed_sessions)
+            col2.metric("⭐ Feedback Rate", f"{feedback_rate:.1f}%")
+    
+            # --- Mentorship Success Rate ---
+            st.markdown("### 🔁 Mentorship Success Rate")
+            acceptance_rate = (summary.get("accepted_requests", 0) / total_requests * 100) if total_requests else 0
+            st.metric("✅ Acceptance Rate", f"{acceptance_rate:.1f}%")
         
-        except Exception as e:
-            st.error(f"Error fetching mentorship request trends: {e}")
+            if not request_trend.empty:
+                request_trend = request_trend.rename(columns={"month": "Month", "count": "Count"})
+                fig = px.bar(
+                    request_trend,
+                    x="Month",
+                    y="Count",
+                    color="status",
+                    barmode="group",
+                    title="📈 Monthly Mentorship Request Status Trends"
+                )
+                st.plotly_chart(fig, use_container_width=True)
+
+    # --- Trace Tab ---
+    if tabs[6].open:
+        with tabs[6]:
+            if st.session_state.get("user_role") != "ADMIN":
+                st.error("Access Denied. Admins only.")
+                st.stop()
+            render_trace_panel(supabase.tracer)
@@ -1,7 +1,15 @@
 import streamlit as st
 from database import supabase
+from supabase_utils import tracing
 from utils.helpers import format_datetime_safe
 from utils.session_creator import create_session_if_available
+from utils.mentor_index import get_mentor_index, refresh_mentor
+from utils.data_loader import DataLoader
+from components.inbox import render_inbox
+from components.lazy_tabs import lazy_tabs
+from components.calendar_feed import render_calendar_feed
+from utils.availability import AvailabilityIndex
+from utils.recurrence import WINDOW_DAYS, expand_rules, load_rules
 from emailer import send_email
 from datetime import datetime, timedelta
 import pytz
@@ -69,323 +77,264 @@ def show():
     # 🌍 Get mentee's local timezone from browser
     mentee_timezone = streamlit_js_eval(js_expressions="Intl.DateTimeFormat().resolvedOptions().timeZone", key="tz") or "Africa/Lagos"
 
-    tabs = st.tabs([
+    tabs = lazy_tabs([
         "🏠 Dashboard",
         "🧑‍🏫 Browse Mentors",
         "📄 My Requests",
         "📆 My Sessions",
         "✅ Session Feedback"
-    ])
+    ], key="mentee_tabs")
     
     # --- Dashboard Tab ---
-    with tabs[0]:
-    
-        # Layout: 2 columns (left for buttons, right for content)
-        col1, col2 = st.columns([1, 3])
-    
-        with col1:
-            summary_btn = st.button("📊 Summary")
-            profile_btn = st.button("🙍‍♀️ Profile")
-            inbox_btn = st.button("📥 Inbox")
-    
-        # Use session state to track selected tab
-        if "mentee_sub_tab" not in st.session_state:
-            st.session_state.mentee_sub_tab = "📊 Summary"
-    
-        if summary_btn:
-            st.session_state.mentee_sub_tab = "📊 Summary"
-        elif profile_btn:
-            st.session_state.mentee_sub_tab = "🙍‍♀️ Profile"
-        elif inbox_btn:
-            st.session_state.mentee_sub_tab = "📥 Inbox"
+    if tabs[0].open:
+        with tabs[0]:
+    
+            # Layout: 2 columns (left for buttons, right for content)
+            col1, col2 = st.columns([1, 3])
+    
+            with col1:
+                summary_btn = st.button("📊 Summary")
+                profile_btn = st.button("🙍‍♀️ Profile")
+                inbox_btn = st.button("📥 Inbox")
+    
+            # Use session state to track selected tab
+            if "mentee_sub_tab" not in st.session_state:
+                st.session_state.mentee_sub_tab = "📊 Summary"
+    
+            if summary_btn:
+                st.session_state.mentee_sub_tab = "📊 Summary"
+            elif profile_btn:
+                st.session_state.mentee_sub_tab = "🙍‍♀️ Profile"
+            elif inbox_btn:
+                st.session_state.mentee_sub_tab = "📥 Inbox"
 
-        total_requests = supabase.table("mentorshiprequest").select("mentorshiprequestid").eq("menteeid", user_id).execute().data or []
-        total_sessions = supabase.table("session").select("sessionid").eq("menteeid", user_id).execute().data or []
-    
-        with col2:
-            sub_tab = st.session_state.mentee_sub_tab
+            with col2:
+                sub_tab = st.session_state.mentee_sub_tab
     
-            if sub_tab == "📊 Summary":
-                st.markdown("### 📊 Summary")
-                st.write(f"- 📥 Sent Requests: **{len(total_requests)}**")
-                st.write(f"- 📅 Sessions Booked: **{len(total_sessions)}**")
+                if sub_tab == "📊 Summary":
+                    total_requests = supabase.table("mentorshiprequest").select("mentorshiprequestid").eq("menteeid", user_id).execute().data or []
+                    total_sessions = supabase.table("session").select("sessionid").eq("menteeid", user_id).execute().data or []
+
+                    st.markdown("### 📊 Summary")
+                    st.write(f"- 📥 Sent Requests: **{len(total_requests)}**")
+                    st.write(f"- 📅 Sessions Booked: **{len(total_sessions)}**")
     
-            elif sub_tab == "🙍‍♀️ Profile":
-                st.markdown("### 🙍‍♀️ Profile")
+                elif sub_tab == "🙍‍♀️ Profile":
+                    st.markdown("### 🙍‍♀️ Profile")
+            
+                    # Fetch mentee profile
+                    profile_data = supabase.table("profile").select("*").eq("userid", user_id).execute().data
+                    profile = profile_data[0] if profile_data else {}
             
-                # Fetch mentee profile
-                profile_data = supabase.table("profile").select("*").eq("userid", user_id).execute().data
-                profile = profile_data[0] if profile_data else {}
+                    avatar_url = profile.get("profile_image_url") or f"https://ui-avatars.com/api/?name={profile.get('name', 'Mentee').replace(' ', '+')}&size=128"
+                    st.image(avatar_url, width=100, caption=profile.get("name", "Your Profile"))
             
-                avatar_url = profile.get("profile_image_url") or f"https://ui-avatars.com/api/?name={profile.get('name', 'Mentee').replace(' ', '+')}&size=128"
-                st.image(avatar_url, width=100, caption=profile.get("name", "Your Profile"))
+                    with st.form("mentee_profile_form"):
+                        name = st.text_input("Name", value=profile.get("name", ""))
+                        bio = st.text_area("Bio", value=profile.get("bio", ""))
+                        skills = st.text_area("Skills (comma-separated)", value=profile.get("skills", ""))
+                        goals = st.text_area("Goals", value=profile.get("goals", ""))
+                        profile_image = st.file_uploader("Upload Profile Picture", type=["jpg", "jpeg", "png"])
+                        submit_btn = st.form_submit_button("Update Profile")
             
-                with st.form("mentee_profile_form"):
-                    name = st.text_input("Name", value=profile.get("name", ""))
-                    bio = st.text_area("Bio", value=profile.get("bio", ""))
-                    skills = st.text_area("Skills (comma-separated)", value=profile.get("skills", ""))
-                    goals = st.text_area("Goals", value=profile.get("goals", ""))
-                    profile_image = st.file_uploader("Upload Profile Picture", type=["jpg", "jpeg", "png"])
-                    submit_btn = st.form_submit_button("Update Profile")
+                        if submit_btn:
+                            update_data = {
+                                "userid": user_id,
+                                "name": name,
+                                "bio": bio,
+                                "skills": skills,
+                                "goals": goals,
+                            }
             
-                    if submit_btn:
-                        update_data = {
-                            "userid": user_id,
-                            "name": name,
-                            "bio": bio,
-                            "skills": skills,
-                            "goals": goals,
-                        }
+                            if profile_image:
+                                try:
+                                    file_ext = profile_image.type.split("/")[-1]
+                                    file_name = f"{user_id}_{uuid.uuid4()}.{file_ext}"
+                                    file_bytes = profile_image.getvalue()
+                                    supabase.storage.from_("profilepics").upload(file_name, file_bytes)
+                                    public_url = supabase.storage.from_("profilepics").get_public_url(file_name)
+                                    update_data["profile_image_url"] = public_url
+                                except Exception as e:
+                                    st.error(f"Profile image upload failed: {e}")
             
-                        if profile_image:
                             try:
-                                file_ext = profile_image.type.split("/")[-1]
-                                file_name = f"{user_id}_{uuid.uuid4()}.{file_ext}"
-                                file_bytes = profile_image.getvalue()
-                                supabase.storage.from_("profilepics").upload(file_name, file_bytes)
-                                public_url = supabase.storage.from_("profilepics").get_public_url(file_name)
-                                update_data["profile_image_url"] = public_url
+                                supabase.table("profile").upsert(update_data, on_conflict=["userid"]).execute()
+                                refresh_mentor(user_id)
+                                st.success("✅ Profile updated successfully!")
+                                st.rerun()
                             except Exception as e:
-                                st.error(f"Profile image upload failed: {e}")
-            
-                        try:
-                            supabase.table("profile").upsert(update_data, on_conflict=["userid"]).execute()
-                            st.success("✅ Profile updated successfully!")
-                            st.rerun()
-                        except Exception as e:
-                            st.error(f"❌ Failed to update profile: {e}")
+                                st.error(f"❌ Failed to update profile: {e}")
     
-            elif sub_tab == "📥 Inbox":
-                st.subheader("📥 Inbox")
-                user_role = st.session_state.get("user_role")
-                
-                try:
-                    # Fetch direct and broadcast messages
-                    messages = supabase.table("messages") \
-                        .select("*") \
-                        .or_(f"receiver_id.eq.{user_id},and(receiver_id.is.null,role.is.null)") \
-                        .order("created_at", desc=True) \
-                        .execute().data
-                    # ... rest of your code to display messages
-            
-                    # Fetch IDs of broadcast messages already read by this user
-                    read_result = supabase.table("message_reads").select("message_id").eq("user_id", user_id).execute()
-                    read_broadcast_ids = {r["message_id"] for r in read_result.data}
-            
-                    # Count unread messages
-                    unread_count = 0
-                    for m in messages:
-                        if m["receiver_id"] == user_id and not m["is_read"]:
-                            unread_count += 1
-                        elif m["receiver_id"] is None and m["role"] is None and m["id"] not in read_broadcast_ids:
-                            unread_count += 1
-            
-                    st.markdown(f"🔔 Unread Messages: **{unread_count}**")
-            
-                    for msg in messages:
-                        is_personal = msg["receiver_id"] == user_id
-                        is_broadcast = msg["receiver_id"] is None and msg["role"] is None
-            
-                        is_read = False
-                        if is_personal:
-                            is_read = msg["is_read"]
-                        elif is_broadcast:
-                            is_read = msg["id"] in read_broadcast_ids
-            
-                        with st.expander(f"{'📨' if not is_read else '📄'} {msg['title']} ({msg['created_at'][:16]})"):
-                            st.write(msg["body"])
-            
-                            # ✅ Mark personal messages as read in place
-                            if is_personal and not is_read:
-                                supabase.table("messages").update({"is_read": True}).eq("id", msg["id"]).execute()
-            
-                            # ✅ Track broadcast read separately
-                            elif is_broadcast and not is_read:
-                                supabase.table("message_reads").insert({
-                                    "message_id": msg["id"],
-                                    "user_id": user_id
-                                }).execute()
-            
-                except Exception as e:
-                    st.error(f"❌ Failed to load messages: {e}")
+                elif sub_tab == "📥 Inbox":
+                    render_inbox(user_id, st.session_state.get("user_role"))
 
                     
     # --- Browse Mentors Tab ---
-    with tabs[1]:
-        st.subheader("Browse Available Mentors")
-    
-        # Load all mentors
-        try:
-            mentors = supabase.table("users") \
-                .select("*, profile(name, bio, skills, goals, profile_image_url)") \
-                .eq("role", "Mentor").eq("status", "Active").execute().data or []
-        except Exception as e:
-            st.error(f"Failed to load mentors: {e}")
-            mentors = []
-    
-        if not mentors:
-            st.info("No mentors available.")
-        else:
-            # Build skill filter safely
-            all_skills = []
-            for mentor in mentors:
-                profile = mentor.get("profile") or {}  # ✅ Avoid NoneType errors
-                skills = profile.get("skills", "")
-                if skills:
-                    all_skills.extend([skill.strip().lower() for skill in skills.split(",")])
-    
-            unique_skills = sorted(set(all_skills))
+    if tabs[1].open:
+        with tabs[1]:
+            st.subheader("Browse Available Mentors")
     
-            selected_skill = st.selectbox("🎯 Filter by Skill", ["All"] + unique_skills)
-    
-            if selected_skill != "All":
-                mentors = [
-                    m for m in mentors
-                    if selected_skill.lower() in ((m.get("profile") or {}).get("skills", "").lower())
-                ]
-        
-            # Fetch used availability slots from session table
+            # Load all mentors from the shared mentor index (snapshot-backed)
             try:
-                matched_sessions = supabase.table("session").select("availabilityid").execute().data or []
-                used_ids = {s.get("availabilityid") for s in matched_sessions if s.get("availabilityid")}
+                mentor_index = get_mentor_index()
+                mentors = mentor_index.mentors()
             except Exception as e:
-                used_ids = set()
-                st.error(f"Could not load matched sessions: {e}")
-    
-            now_utc = datetime.utcnow().replace(tzinfo=pytz.utc)
-    
-            # Display mentor cards
-            cols = st.columns(2)
-            for i, mentor in enumerate(mentors):
-                col = cols[i % 2]
-                with col:
-                    profile = mentor.get("profile") or {}
-                    name = profile.get("name", "Unnamed Mentor")
-                    avatar_url = profile.get("profile_image_url") or f"https://ui-avatars.com/api/?name={name.replace(' ', '+')}&size=128"
-                    bio = profile.get("bio", "No bio")
-                    skills = profile.get("skills", "Not listed")
-                    goals = profile.get("goals", "Not set")
+                st.error(f"Failed to load mentors: {e}")
+                mentor_index, mentors = None, []
     
-                    st.image(avatar_url, width=120, caption=name)
-                    st.markdown(f"**Bio:** {bio}  \n**Skills:** {skills}  \n**Goals:** {goals}")
-    
-                    # Load mentor's availability
-                    try:
-                        availability = supabase.table("availability") \
-                            .select("availabilityid, start, end").eq("mentorid", mentor["userid"]).execute().data or []
-                    except Exception as e:
-                        availability = []
-                        st.warning(f"Could not fetch availability for {name}: {e}")
-    
-                    # Filter upcoming, unmatched slots
-                    upcoming_free_slots = []
-                    for slot in availability:
-                        availability_id = slot.get("availabilityid")
-                        slot_start_str = slot.get("start")
-                        slot_end_str = slot.get("end")
-    
-                        if not availability_id or not slot_start_str or not slot_end_str:
-                            continue
+            if not mentors:
+                st.info("No mentors available.")
+            else:
+                # Skill filter comes straight from the inverted skill index
+                unique_skills = mentor_index.skills()
     
-                        try:
-                            slot_start = datetime.fromisoformat(slot_start_str.replace("Z", "+00:00"))
-                            slot_end = datetime.fromisoformat(slot_end_str.replace("Z", "+00:00"))
+                selected_skill = st.selectbox("🎯 Filter by Skill", ["All"] + unique_skills)
     
-                            # Ensure timezone-awareness
-                            if slot_start.tzinfo is None:
-                                slot_start = slot_start.replace(tzinfo=pytz.utc)
-                            if slot_end.tzinfo is None:
-                                slot_end = slot_end.replace(tzinfo=pytz.utc)
-                        except Exception as e:
-                            st.warning(f"⚠️ Invalid slot datetime: {e}")
-                            continue
+                if selected_skill != "All":
+                    mentors = mentor_index.mentors(selected_skill)
+        
+                now_utc = datetime.utcnow().replace(tzinfo=pytz.utc)
+                window_end = now_utc + timedelta(days=WINDOW_DAYS)
+                # Hour-aligned bounds keep the query (and its cache key) stable across reruns
+                since = now_utc.replace(minute=0, second=0, microsecond=0)
+
+                # Batch every mentor's availability in the browse window into one in_()
+                # query. Booked slots carry reserved_by (sql/reservations.sql), so the
+                # session table isn't consulted and the query doesn't grow with history.
+                loader = DataLoader()
+                try:
+                    availability_by_mentor = loader.load_many(
+                        "availability", "mentorid", [m["userid"] for m in mentors],
+                        "availabilityid, start, end, ruleid, reserved_by",
+                        filters=(("gte", "start", since.isoformat()),
+                                 ("lt", "start", (since + timedelta(days=WINDOW_DAYS, hours=1)).isoformat())),
+                    )
+                    rules_by_mentor = load_rules([m["userid"] for m in mentors])
+                except Exception as e:
+                    availability_by_mentor = {}
+                    rules_by_mentor = {}
+                    st.error(f"Could not load mentor availability: {e}")
+    
+                # Display mentor cards
+                cols = st.columns(2)
+                for i, mentor in enumerate(mentors):
+                    col = cols[i % 2]
+                    with col:
+                        profile = mentor.get("profile") or {}
+                        name = profile.get("name", "Unnamed Mentor")
+                        avatar_url = profile.get("profile_image_url") or f"https://ui-avatars.com/api/?name={name.replace(' ', '+')}&size=128"
+                        bio = profile.get("bio", "No bio")
+                        skills = profile.get("skills", "Not listed")
+                        goals = profile.get("goals", "Not set")
+    
+                        st.image(avatar_url, width=120, caption=name)
+                        st.markdown(f"**Bio:** {bio}  \n**Skills:** {skills}  \n**Goals:** {goals}")
+    
+                        # Mentor's availability (already batched above)
+                        availability = availability_by_mentor.get(mentor["userid"], [])
+                        # Recurring rules only expand over the browse window
+                        availability = availability + expand_rules(
+                            rules_by_mentor.get(mentor["userid"], []), now_utc, window_end, availability
+                        )
     
-                        if availability_id not in used_ids and slot_start > now_utc:
+                        # Upcoming, unmatched slots in start order (bisect past the current time)
+                        upcoming_free_slots = []
+                        free = AvailabilityIndex(availability, naive_tz=pytz.utc).free_slots(after=now_utc)
+                        for slot_start, slot_end, slot in free:
+                            if not (slot.get("availabilityid") or slot.get("ruleid")):
+                                continue
                             local_start = slot_start.astimezone()
                             local_end = slot_end.astimezone()
                             label = f"{local_start.strftime('%A %d %b %Y %I:%M %p')} ➡ {local_end.strftime('%I:%M %p')}"
-                            upcoming_free_slots.append((label, availability_id))
-    
-                    # Show slot selector and request button
-                    if upcoming_free_slots:
-                        slot_labels = [label for label, _ in upcoming_free_slots]
-                        slot_mapping = {label: aid for label, aid in upcoming_free_slots}
-    
-                        selected_slot = st.selectbox(
-                            "🕒 Choose a time slot",
-                            options=slot_labels,
-                            key=f"slot_select_{mentor['userid']}"
-                        )
-    
-                        if st.button("Request Mentorship", key=f"req_{mentor['userid']}"):
-                            try:
-                                # Check if existing request
-                                existing = supabase.table("mentorshiprequest") \
-                                    .select("mentorshiprequestid", "status") \
-                                    .eq("menteeid", user_id).eq("mentorid", mentor["userid"]) \
-                                    .in_("status", ["PENDING", "ACCEPTED"]).execute().data
-    
-                                if existing:
-                                    st.warning("❗ You already have a pending or accepted request with this mentor.")
-                                    time.sleep(1)
-                                    st.rerun()
-                                else:
-                                    supabase.table("mentorshiprequest").insert({
-                                        "mentorid": mentor["userid"],
-                                        "menteeid": user_id,
-                                        "status": "PENDING"
-                                    }).execute()
-                                    st.success(f"✅ Request sent to {mentor['email']}!")
-                                    st.rerun()
-                            except Exception as e:
-                                st.error(f"❌ Failed to request mentorship: {e}")
-                    else:
-                        st.warning("This mentor has no upcoming free slots.")
+                            upcoming_free_slots.append((label, slot.get("availabilityid")))
+    
+                        # Show slot selector and request button
+                        if upcoming_free_slots:
+                            slot_labels = [label for label, _ in upcoming_free_slots]
+                            slot_mapping = {label: aid for label, aid in upcoming_free_slots}
+    
+                            selected_slot = st.selectbox(
+                                "🕒 Choose a time slot",
+                                options=slot_labels,
+                                key=f"slot_select_{mentor['userid']}"
+                            )
+    
+                            if st.button("Request Mentorship", key=f"req_{mentor['userid']}"):
+                                tracing.action("request mentorship")
+                                try:
+                                    # Check if existing request
+                                    existing = supabase.table("mentorshiprequest") \
+                                        .select("mentorshiprequestid", "status") \
+                                        .eq("menteeid", user_id).eq("mentorid", mentor["userid"]) \
+                                        .in_("status", ["PENDING", "ACCEPTED"]).execute().data
+    
+                                    if existing:
+                                        st.warning("❗ You already have a pending or accepted request with this mentor.")
+                                        time.sleep(1)
+                                        st.rerun()
+                                    else:
+                                        supabase.table("mentorshiprequest").insert({
+                                            "mentorid": mentor["userid"],
+                                            "menteeid": user_id,
+                                            "status": "PENDING"
+                                        }).execute()
+                                        st.success(f"✅ Request sent to {mentor['email']}!")
+                                        st.rerun()
+                                except Exception as e:
+                                    st.error(f"❌ Failed to request mentorship: {e}")
+                        else:
+                            st.warning("This mentor has no upcoming free slots.")
+
+                st.session_state["browse_mentors_query_stats"] = loader.stats()
+                loader.log_stats("Browse Mentors")
 
     # --- My Requests Tab ---
-    with tabs[2]:
-        st.subheader("Your Mentorship Requests")
-        try:
-            requests = supabase.table("mentorshiprequest") \
-                .select("*, users!mentorshiprequest_mentorid_fkey(email)") \
-                .eq("menteeid", user_id).neq("status", "ACCEPTED").execute().data or []
-        except Exception as e:
-            st.error(f"Could not fetch requests: {e}")
-            requests = []
+    if tabs[2].open:
+        with tabs[2]:
+            st.subheader("Your Mentorship Requests")
+            try:
+                requests = supabase.table("mentorshiprequest") \
+                    .select("*, users!mentorshiprequest_mentorid_fkey(email)") \
+                    .eq("menteeid", user_id).neq("status", "ACCEPTED").execute().data or []
+            except Exception as e:
+                st.error(f"Could not fetch requests: {e}")
+                requests = []
 
-        if requests:
-            for req in requests:
-                mentor_email = req.get("users", {}).get("email", "Unknown")
-                status = req.get("status", "Unknown")
-                st.markdown(f"- 🧑 Mentor: **{mentor_email}**\n- 📌 Status: **{status}**")
-        else:
-            st.info("You have not made any mentorship requests yet.")
+            if requests:
+                for req in requests:
+                    mentor_email = req.get("users", {}).get("email", "Unknown")
+                    status = req.get("status", "Unknown")
+                    st.markdown(f"- 🧑 Mentor: **{mentor_email}**\n- 📌 Status: **{status}**")
+            else:
+                st.info("You have not made any mentorship requests yet.")
 
     # --- My Sessions Tab ---
-    with tabs[3]:
-        st.subheader("Your Mentorship Sessions")
-        try:
-            sessions = supabase.table("session") \
-                .select("sessionid, rating, feedback, meet_link, availability:availabilityid(start, end), users!session_menteeid_fkey(email)") \
-                .eq("menteeid", user_id).execute().data or []
-        except Exception as e:
-            st.error(f"Could not fetch sessions: {e}")
-            sessions = []
+    if tabs[3].open:
+        with tabs[3]:
+            st.subheader("Your Mentorship Sessions")
+            render_calendar_feed(user_id)
+            try:
+                sessions = supabase.table("session") \
+                    .select("sessionid, rating, feedback, meet_link, availability:availabilityid(start, end), users!session_menteeid_fkey(email)") \
+                    .eq("menteeid", user_id).execute().data or []
+            except Exception as e:
+                st.error(f"Could not fetch sessions: {e}")
+                sessions = []
 
-        if sessions:
-            for s in sessions:
-                mentor_email = s.get("users", {}).get("email", "Unknown")
-                availability = s.get("availability") or {}
-                start_str = availability.get("start")
-                end_str = availability.get("end")
-                rating = s.get("rating", "Pending")
-                feedback = s.get("feedback", "Not submitted")
-                meet_link = s.get("meet_link", "#")
-                status, emoji = classify_session(start_str, end_str)
-                start_fmt = format_datetime_safe(start_str, tz=WAT) if start_str else "N/A"
-                end_fmt = format_datetime_safe(end_str, tz=WAT) if end_str else "N/A"
+            if sessions:
+                for s in sessions:
+                    mentor_email = s.get("users", {}).get("email", "Unknown")
+                    availability = s.get("availability") or {}
+                    start_str = availability.get("start")
+                    end_str = availability.get("end")
+                    rating = s.get("rating", "Pending")
+                    feedback = s.get("feedback", "Not submitted")
+                    meet_link = s.get("meet_link", "#")
+                    status, emoji = classify_session(start_str, end_str)
+                    start_fmt = format_datetime_safe(start_str, tz=WAT) if start_str else "N/A"
+                    end_fmt = format_datetime_safe(end_str, tz=WAT) if end_str else "N/A"
 
-                st.markdown(f"""
+                    st.markdown(f"""
                     ### {emoji} {status} Session
                     - 👤 With: **{mentor_email}**
                     - 🕒 Start: {start_fmt}
@@ -395,81 +344,83 @@ def show():
                     - 🔗 [Join Meet]({meet_link})
                 """)
 
-                if st.button("📧 Send Reminder", key=f"reminder_{s['sessionid']}"):
-                    if send_email(
-                        to_email=mentor_email,
-                        subject="📅 Session Reminder",
-                        body=f"Reminder for your session on {start_fmt}. Join via Meet: {meet_link}"
-                    ):
-                        st.success("Reminder email sent!")
-                    else:
-                        st.error("Failed to send email.")
-        else:
-            st.info("You don’t have any sessions yet.")
+                    if st.button("📧 Send Reminder", key=f"reminder_{s['sessionid']}"):
+                        if send_email(
+                            to_email=mentor_email,
+                            subject="📅 Session Reminder",
+                            body=f"Reminder for your session on {start_fmt}. Join via Meet: {meet_link}"
+                        ):
+                            st.success("Reminder email sent!")
+                        else:
+                            st.error("Failed to send email.")
+            else:
+                st.info("You don’t have any sessions yet.")
 
     # --- Feedback Tab ---
-    with tabs[4]:
-        st.subheader("Rate Mentors & Provide Feedback")
-    
-        try:
-            sessions = supabase.table("session") \
-                .select("sessionid, rating, feedback, availability:availabilityid(start, end), users!session_mentorid_fkey(email)") \
-                .eq("menteeid", user_id).execute().data or []
-        except Exception as e:
-            st.error(f"Could not fetch sessions for feedback: {e}")
-            sessions = []
-    
-        now_wat = datetime.now(WAT)
-        pending_feedback_sessions = []
-    
-        if not sessions:
-            st.info("No sessions to give feedback for.")
-        else:
-            for session in sessions:
-                mentor_email = session.get("users", {}).get("email", "Unknown")
-                availability = session.get("availability", {})
-                start_str = availability.get("start")
-                end_str = availability.get("end")
-    
-                # Parse datetime and ensure timezone awareness
-                try:
-                    start_dt = datetime.fromisoformat(start_str.replace("Z", "+00:00")) if start_str else None
-                    if start_dt and start_dt.tzinfo is None:
-                        start_dt = start_dt.replace(tzinfo=WAT)
-    
-                    end_dt = datetime.fromisoformat(end_str.replace("Z", "+00:00")) if end_str else None
-                    if end_dt and end_dt.tzinfo is None:
-                        end_dt = end_dt.replace(tzinfo=WAT)
-                except Exception as e:
-                    start_dt, end_dt = None, None
-                    st.warning(f"⚠️ Failed to parse datetime for session: {e}")
+    if tabs[4].open:
+        with tabs[4]:
+            st.subheader("Rate Mentors & Provide Feedback")
     
-                has_feedback = session.get("rating") and session.get("feedback")
+            try:
+                sessions = supabase.table("session") \
+                    .select("sessionid, rating, feedback, availability:availabilityid(start, end), users!session_mentorid_fkey(email)") \
+                    .eq("menteeid", user_id).execute().data or []
+            except Exception as e:
+                st.error(f"Could not fetch sessions for feedback: {e}")
+                sessions = []
     
-                # Only include sessions that have ended and lack feedback
-                if end_dt is not None and now_wat > end_dt and not has_feedback:
-                    pending_feedback_sessions.append(session)
+            now_wat = datetime.now(WAT)
+            pending_feedback_sessions = []
     
-            if not pending_feedback_sessions:
-                st.success("✅ You have completed all required feedback.")
+            if not sessions:
+                st.info("No sessions to give feedback for.")
             else:
-                st.warning("⚠️ You must submit feedback for expired sessions to continue.")
-                for session in pending_feedback_sessions:
+                for session in sessions:
                     mentor_email = session.get("users", {}).get("email", "Unknown")
-                    start_str = session["availability"].get("start")
-                    date_str = format_datetime_safe(start_str, tz=WAT) if start_str else "Unavailable"
+                    availability = session.get("availability", {})
+                    start_str = availability.get("start")
+                    end_str = availability.get("end")
     
-                    with st.expander(f"Session with {mentor_email} on {date_str}"):
-                        rating = st.selectbox("Rating", [1, 2, 3, 4, 5], key=f"rating_{session['sessionid']}")
-                        feedback = st.text_area("Feedback", key=f"feedback_{session['sessionid']}")
+                    # Parse datetime and ensure timezone awareness
+                    try:
+                        start_dt = datetime.fromisoformat(start_str.replace("Z", "+00:00")) if start_str else None
+                        if start_dt and start_dt.tzinfo is None:
+                            start_dt = start_dt.replace(tzinfo=WAT)
     
-                        if st.button("Submit Feedback", key=f"submit_feedback_{session['sessionid']}"):
-                            try:
-                                supabase.table("session").update({
-                                    "rating": rating,
-                                    "feedback": feedback
-                                }).eq("sessionid", session["sessionid"]).execute()
-                                st.success("✅ Feedback submitted.")
-                                st.rerun()
-                            except Exception as e:
-                                st.error(f"❌ Error submitting feedback: {e}")
+                        end_dt = datetime.fromisoformat(end_str.replace("Z", "+00:00")) if end_str else None
+                        if end_dt and end_dt.tzinfo is None:
+                            end_dt = end_dt.replace(tzinfo=WAT)
+                    except Exception as e:
+                        start_dt, end_dt = None, None
+                        st.warning(f"⚠️ Failed to parse datetime for session: {e}")
+    
+                    has_feedback = session.get("rating") and session.get("feedback")
+    
+                    # Only include sessions that have ended and lack feedback
+                    if end_dt is not None and now_wat > end_dt and not has_feedback:
+                        pending_feedback_sessions.append(session)
+    
+                if not pending_feedback_sessions:
+                    st.success("✅ You have completed all required feedback.")
+                else:
+                    st.warning("⚠️ You must submit feedback for expired sessions to continue.")
+                    for session in pending_feedback_sessions:
+                        mentor_email = session.get("users", {}).get("email", "Unknown")
+                        start_str = session["availability"].get("start")
+                        date_str = format_datetime_safe(start_str, tz=WAT) if start_str else "Unavailable"
+    
+                        with st.expander(f"Session with {mentor_email} on {date_str}"):
+                            rating = st.selectbox("Rating", [1, 2, 3, 4, 5], key=f"rating_{session['sessionid']}")
+                            feedback = st.text_area("Feedback", key=f"feedback_{session['sessionid']}")
+    
+                            if st.button("Submit Feedback", key=f"submit_feedback_{session['sessionid']}"):
+                                tracing.action("submit feedback")
+                                try:
+                                    supabase.table("session").update({
+                                        "rating": rating,
+                                        "feedback": feedback
+                                    }).eq("sessionid", session["sessionid"]).execute()
+                                    st.success("✅ Feedback submitted.")
+                                    st.rerun()
+                                except Exception as e:
+                                    st.error(f"❌ Error submitting feedback: {e}")
@@ -0,0 +1,140 @@
+-- sql/analytics.sql
+-- Aggregates for the admin Analytics tab, called through supabase.rpc(...).
+-- Each function returns a handful of grouped rows, so the dashboard no longer
+-- downloads whole tables. Apply once in the Supabase SQL editor (or psql).
+--
+-- Filters: p_year / p_month (1-12) restrict rows by their own timestamp
+-- (users.created_at, session.date, mentorshiprequest.createdat); NULL = all.
+-- p_role ('Mentor' / 'Mentee' / NULL) restricts user-based metrics.
+--
+-- Period filters compare the raw columns against [analytics_period_start,
+-- analytics_period_end), so they are index range scans rather than a function
+-- call per row. Only a month without a year ("every March") has no single
+-- range and is matched per row.
+
+create index if not exists users_created_at on users (created_at);
+create index if not exists session_date on session (date);
+create index if not exists mentorshiprequest_createdat on mentorshiprequest (createdat);
+
+drop function if exists analytics_in_period(timestamp, int, int);
+
+create or replace function analytics_period_start(p_year int, p_month int)
+returns timestamp language sql immutable as $$
+  select case when p_year is null then '-infinity'::timestamp
+              else make_timestamp(p_year, coalesce(p_month, 1), 1, 0, 0, 0) end
+$$;
+
+create or replace function analytics_period_end(p_year int, p_month int)
+returns timestamp language sql immutable as $$
+  select case when p_year is null then 'infinity'::timestamp
+              when p_month is null then make_timestamp(p_year + 1, 1, 1, 0, 0, 0)
+              else make_timestamp(p_year, p_month, 1, 0, 0, 0) + interval '1 month' end
+$$;
+
+-- One row of headline counters
+create or replace function analytics_summary(p_year int default null, p_month int default null, p_role text default null)
+returns table (
+  total_users bigint, mentors bigint, mentees bigint,
+  total_sessions bigint, rated_sessions bigint, completed_sessions bigint, mentees_with_sessions bigint,
+  total_requests bigint, accepted_requests bigint, requesting_mentees bigint,
+  all_mentors bigint
+) language sql stable as $$
+  with u as (
+    select role from users
+    where created_at >= analytics_period_start(p_year, p_month)
+      and created_at < analytics_period_end(p_year, p_month)
+      and (p_year is not null or p_month is null or extract(month from created_at) = p_month)
+      and (p_role is null or role = p_role)
+  ), s as (
+    select menteeid, rating, date::timestamp as ts from session
+    where date >= analytics_period_start(p_year, p_month)
+      and date < analytics_period_end(p_year, p_month)
+      and (p_year is not null or p_month is null or extract(month from date) = p_month)
+  ), r as (
+    select menteeid, status from mentorshiprequest
+    where createdat >= analytics_period_start(p_year, p_month)
+      and createdat < analytics_period_end(p_year, p_month)
+      and (p_year is not null or p_month is null or extract(month from createdat) = p_month)
+  )
+  select
+    (select count(*) from u),
+    (select count(*) from u where role = 'Mentor'),
+    (select count(*) from u where role = 'Mentee'),
+    (select count(*) from s),
+    (select count(*) from s where rating is not null),
+    (select count(*) from s where ts < (now() at time zone 'Africa/Lagos')),
+    (select count(distinct menteeid) from s),
+    (select count(*) from r),
+    (select count(*) from r where status = 'ACCEPTED'),
+    (select count(distinct menteeid) from r),
+    (select count(*) from users where role = 'Mentor')
+$$;
+
+create or replace function analytics_rating_histogram(p_year int default null, p_month int default null)
+returns table (rating int, count bigint) language sql stable as $$
+  select rating::int, count(*)
+  from session
+  where rating is not null
+    and date >= analytics_period_start(p_year, p_month)
+    and date < analytics_period_end(p_year, p_month)
+    and (p_year is not null or p_month is null or extract(month from date) = p_month)
+  group by 1
+  order by 1
+$$;
+
+create or replace function analytics_request_status(p_year int default null, p_month int default null)
+returns table (status text, count bigint) language sql stable as $$
+  select status, count(*)
+  from mentorshiprequest
+  where createdat >= analytics_period_start(p_year, p_month)
+    and createdat < analytics_period_end(p_year, p_month)
+    and (p_year is not null or p_month is null or extract(month from createdat) = p_month)
+  group by 1
+  order by 2 desc
+$$;
+
+-- Per-mentor slots, sessions and average rating (one row per mentor with activity)
+create or replace function analytics_mentor_performance(p_year int default null, p_month int default null)
+returns table (mentorid text, email text, slots bigint, sessions bigint, avg_rating numeric)
+language sql stable as $$
+  with slots as (
+    select a.mentorid, count(*) as slots from availability a group by 1
+  ), sess as (
+    select s.mentorid, count(*) as sessions, avg(s.rating) as avg_rating
+    from session s
+    where s.date >= analytics_period_start(p_year, p_month)
+      and s.date < analytics_period_end(p_year, p_month)
+      and (p_year is not null or p_month is null or extract(month from s.date) = p_month)
+    group by 1
+  )
+  select coalesce(sl.mentorid, se.mentorid)::text, u.email,
+         coalesce(sl.slots, 0), coalesce(se.sessions, 0), se.avg_rating
+  from slots sl
+  full join sess se on se.mentorid = sl.mentorid
+  left join users u on u.userid = coalesce(sl.mentorid, se.mentorid)
+$$;
+
+-- Most common profile skills; unique_skills repeats the distinct-skill total on every row
+create or replace function analytics_top_skills(p_limit int default 5)
+returns table (skill text, count bigint, unique_skills bigint) language sql stable as $$
+  with s as (
+    select lower(trim(x)) as skill
+    from profile, unnest(string_to_array(skills, ',')) as x
+    where trim(x) <> ''
+  )
+  select skill, count(*), count(*) over ()
+  from s
+  group by skill
+  order by 2 desc, 1
+  limit p_limit
+$$;
+
+create or replace function analytics_top_requesting_mentees(p_limit int default 5)
+returns table (email text, request_count bigint) language sql stable as $$
+  select u.email, count(*)
+  from mentorshiprequest r
+  left join users u on u.userid = r.menteeid
+  group by r.menteeid, u.email
+  order by 2 desc
+  limit p_limit
+$$;
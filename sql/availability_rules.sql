@@ -0,0 +1,95 @@
+-- sql/availability_rules.sql
+-- Recurring availability. One row per rule ("every Tuesday 10:00-11:00,
+-- every 2 weeks, until June, except 14 May") instead of one availability row
+-- per week. utils/recurrence.py expands rules only for the window on screen;
+-- an occurrence becomes a real availability row when it is booked.
+
+create table if not exists availability_rule (
+  ruleid      bigserial   primary key,
+  mentorid    uuid        not null,
+  byday       smallint[]  not null,                  -- ISO weekday numbers minus one: 0 = Mon .. 6 = Sun
+  every_weeks smallint    not null default 1 check (every_weeks between 1 and 8),  -- 1 weekly, 2 biweekly
+  start_time  time        not null,
+  end_time    time        not null check (end_time > start_time),
+  tz          text        not null default 'Africa/Lagos',
+  dtstart     date        not null default current_date,
+  until       date,
+  exdates     date[]      not null default '{}',     -- skipped dates
+  created_at  timestamptz not null default now()
+);
+
+create index if not exists availability_rule_mentor on availability_rule (mentorid);
+
+-- Materialized occurrences point back at their rule; one row per occurrence
+alter table availability add column if not exists ruleid bigint references availability_rule (ruleid) on delete set null;
+create unique index if not exists availability_rule_occurrence on availability (ruleid, start) where ruleid is not null;
+
+-- Materialize one occurrence (idempotent): its availability row id, or null
+-- when p_start is not an occurrence of the rule. The occurrence is checked
+-- against the rule and the end time comes from the rule, not the caller.
+create or replace function materialize_rule_slot(
+  p_ruleid availability_rule.ruleid%type,
+  p_start timestamptz
+) returns availability.availabilityid%type language plpgsql as $$
+declare
+  v_rule availability_rule%rowtype;
+  v_local timestamp;
+  v_day date;
+  v_anchor date;
+  v_availabilityid availability.availabilityid%type;
+begin
+  select * into v_rule from availability_rule where ruleid = p_ruleid;
+  if not found then
+    return null;
+  end if;
+
+  v_local := p_start at time zone v_rule.tz;
+  v_day := v_local::date;
+  v_anchor := v_rule.dtstart - (extract(isodow from v_rule.dtstart)::int - 1);  -- Monday of the first week
+  if v_local::time <> v_rule.start_time
+     or v_day < v_rule.dtstart
+     or v_day > coalesce(v_rule.until, v_day)
+     or v_day = any (v_rule.exdates)
+     or not (extract(isodow from v_day)::smallint - 1 = any (v_rule.byday))
+     or ((v_day - v_anchor) / 7) % v_rule.every_weeks <> 0 then
+    return null;
+  end if;
+
+  -- A concurrent materializer of the same occurrence waits here, then gets the same row
+  insert into availability (mentorid, start, "end", date, ruleid)
+  values (v_rule.mentorid, p_start, p_start + (v_rule.end_time - v_rule.start_time), v_day, p_ruleid)
+  on conflict (ruleid, start) where ruleid is not null
+  do update set ruleid = excluded.ruleid
+  returning availabilityid into v_availabilityid;
+  return v_availabilityid;
+end;
+$$;
+
+-- Materialize a batch of occurrences ([{"ruleid": ..., "start": ...}, ...]),
+-- for code that counts or claims slots in SQL (bulk matching, reserve_next_slot).
+-- Returns how many of them are occurrences of their rule.
+create or replace function materialize_rule_slots(p_slots jsonb)
+returns int language sql as $$
+  select count(materialize_rule_slot((s->>'ruleid')::bigint, (s->>'start')::timestamptz))::int
+  from jsonb_array_elements(p_slots) s;
+$$;
+
+-- Materialize one occurrence and reserve it in one call. Returns the session,
+-- or no row when the occurrence is taken or not part of the rule.
+create or replace function reserve_rule_slot(
+  p_ruleid availability_rule.ruleid%type,
+  p_start timestamptz,
+  p_menteeid session.menteeid%type,
+  p_requestid session.mentorshiprequestid%type default null
+) returns setof session language plpgsql as $$
+declare
+  v_availabilityid availability.availabilityid%type;
+begin
+  v_availabilityid := materialize_rule_slot(p_ruleid, p_start);
+  if v_availabilityid is null then
+    return;
+  end if;
+
+  return query select * from reserve_slot(v_availabilityid, p_menteeid, p_requestid);
+end;
+$$;
@@ -0,0 +1,126 @@
+-- sql/broadcasts.sql
+-- Compact broadcast read state. Each message gets a monotonically increasing
+-- `seq`; each user keeps one row: a high-water mark (every broadcast they can
+-- see with seq <= read_through is read) plus the few seqs read out of order
+-- above it. This replaces one message_reads row per user per broadcast.
+--
+-- After applying, carry over existing reads once:
+--   python -m utils.broadcasts backfill
+
+-- ---- Message sequence (numbered in created_at order for existing rows) ----
+create sequence if not exists messages_seq_seq;
+alter table messages add column if not exists seq bigint;
+
+update messages m set seq = n.rn
+from (select id, row_number() over (order by created_at, id) as rn from messages) n
+where m.id = n.id and m.seq is null;
+
+select setval('messages_seq_seq', greatest((select max(seq) from messages), 1));
+alter table messages alter column seq set default nextval('messages_seq_seq');
+alter table messages alter column seq set not null;
+alter sequence messages_seq_seq owned by messages.seq;
+
+create index if not exists messages_broadcast_seq on messages (seq) where receiver_id is null;
+create index if not exists messages_receiver_unread on messages (receiver_id) where not is_read;
+
+-- ---- Per-user read state ----
+create table if not exists broadcast_read_state (
+  user_id      text     primary key,
+  read_through bigint   not null default 0,
+  read_extra   bigint[] not null default '{}'   -- read seqs above read_through
+);
+
+-- Broadcasts a user with `p_role` (MENTOR / MENTEE / ADMIN) can see
+create or replace function broadcast_visible(p_role text)
+returns setof messages language sql stable as $$
+  select * from messages
+  where receiver_id is null and (role is null or upper(role) = upper(p_role));
+$$;
+
+-- Unread personal messages plus unread visible broadcasts: two index range
+-- scans, independent of how much history the user has read.
+create or replace function inbox_unread_count(p_user_id messages.receiver_id%type, p_role text)
+returns bigint language sql stable as $$
+  select
+    (select count(*) from messages where receiver_id = p_user_id and not is_read)
+    + (select count(*)
+       from broadcast_visible(p_role) b
+       left join broadcast_read_state s on s.user_id = p_user_id::text
+       where b.seq > coalesce(s.read_through, 0)
+         and not (b.seq = any(coalesce(s.read_extra, '{}'))));
+$$;
+
+-- Advance the high-water mark over every contiguous read broadcast and keep
+-- only the out-of-order reads above it
+create or replace function compact_broadcast_reads(p_user_id text, p_role text)
+returns void language plpgsql as $$
+declare
+  v_through bigint;
+  v_extra bigint[];
+  v_first_unread bigint;
+begin
+  select read_through, read_extra into v_through, v_extra
+  from broadcast_read_state where user_id = p_user_id for update;
+  if not found then
+    return;
+  end if;
+
+  select min(seq) into v_first_unread from broadcast_visible(p_role)
+  where seq > v_through and not (seq = any(v_extra));
+
+  if v_first_unread is null then
+    v_through := greatest(v_through, coalesce((select max(seq) from broadcast_visible(p_role)), 0),
+                          coalesce((select max(x) from unnest(v_extra) x), 0));
+  else
+    v_through := greatest(v_through, v_first_unread - 1);
+  end if;
+
+  update broadcast_read_state
+  set read_through = v_through,
+      read_extra = coalesce((select array_agg(distinct x order by x) from unnest(v_extra) x where x > v_through), '{}')
+  where user_id = p_user_id;
+end;
+$$;
+
+-- Batch mark-as-read for broadcasts (by seq)
+create or replace function mark_broadcasts_read(p_user_id text, p_role text, p_seqs bigint[])
+returns void language plpgsql as $$
+begin
+  insert into broadcast_read_state (user_id, read_extra)
+  values (p_user_id, coalesce(p_seqs, '{}'))
+  on conflict (user_id) do update
+    set read_extra = broadcast_read_state.read_extra || excluded.read_extra;
+  perform compact_broadcast_reads(p_user_id, p_role);
+end;
+$$;
+
+-- Everything currently visible counts as read
+create or replace function mark_all_broadcasts_read(p_user_id text, p_role text)
+returns void language sql as $$
+  insert into broadcast_read_state (user_id, read_through)
+  values (p_user_id, coalesce((select max(seq) from broadcast_visible(p_role)), 0))
+  on conflict (user_id) do update
+    set read_through = greatest(broadcast_read_state.read_through, excluded.read_through),
+        read_extra = '{}';
+$$;
+
+-- One-off migration from message_reads (one row per user per broadcast)
+create or replace function broadcast_read_backfill()
+returns bigint language plpgsql as $$
+declare
+  r record;
+  n bigint := 0;
+begin
+  for r in
+    select mr.user_id::text as user_id, upper(coalesce(u.role, '')) as role, array_agg(m.seq) as seqs
+    from message_reads mr
+    join messages m on m.id = mr.message_id
+    left join users u on u.userid::text = mr.user_id::text
+    group by mr.user_id, u.role
+  loop
+    perform mark_broadcasts_read(r.user_id, r.role, r.seqs);
+    n := n + 1;
+  end loop;
+  return n;
+end;
+$$;
@@ -0,0 +1,55 @@
+-- sql/bulk_match.sql
+-- Write a bulk-match plan (utils/bulk_match.py) with its constraints checked
+-- again at write time. The plan is computed from a snapshot and can sit in the
+-- admin's session for a while. Pairs are skipped when, since then:
+--   - the mentee has got an open request, or
+--   - the mentor has reached p_max_per_mentor open requests, or
+--   - the mentor has run out of free upcoming slots.
+
+create or replace function create_bulk_matches(
+  p_pairs jsonb,                                  -- [{"menteeid": ..., "mentorid": ...}, ...]
+  p_status mentorshiprequest.status%type default 'ACCEPTED',
+  p_max_per_mentor int default 3
+) returns setof mentorshiprequest language plpgsql as $$
+declare
+  v_pair jsonb;
+  v_menteeid mentorshiprequest.menteeid%type;
+  v_mentorid mentorshiprequest.mentorid%type;
+  v_made mentorshiprequest.mentorid%type[] := '{}';  -- one entry per pair written, for slot accounting
+  v_users mentorshiprequest.menteeid%type[];
+begin
+  -- Lock every user in the plan up front, in userid order. Concurrent plans
+  -- (and anything else locking these users rows) queue here, so the checks
+  -- below and the inserts see the same state. Two plans take their shared
+  -- locks in the same order whatever their pair order, so they cannot
+  -- deadlock with each other.
+  select array_agg(distinct u) into v_users
+  from jsonb_array_elements(p_pairs) p, lateral (values (p->>'menteeid'), (p->>'mentorid')) as ids (u);
+  perform 1 from users where userid = any (v_users) order by userid for update;
+
+  for v_pair in select * from jsonb_array_elements(p_pairs) loop
+    v_menteeid := v_pair->>'menteeid';
+    v_mentorid := v_pair->>'mentorid';
+
+    continue when exists (
+      select 1 from mentorshiprequest
+      where menteeid = v_menteeid and status in ('PENDING', 'ACCEPTED')
+    );
+    -- Counts the pairs already written by this call as well
+    continue when (
+      select count(*) from mentorshiprequest
+      where mentorid = v_mentorid and status in ('PENDING', 'ACCEPTED')
+    ) >= p_max_per_mentor;
+    continue when (
+      select count(*) from availability
+      where mentorid = v_mentorid and reserved_by is null and start > now()
+    ) <= coalesce(cardinality(array_positions(v_made, v_mentorid)), 0);
+
+    v_made := v_made || v_mentorid;
+    return query
+    insert into mentorshiprequest (menteeid, mentorid, status)
+    values (v_menteeid, v_mentorid, p_status)
+    returning *;
+  end loop;
+end;
+$$;
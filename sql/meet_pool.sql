@@ -0,0 +1,77 @@
+-- sql/meet_pool.sql
+-- Pre-created Google Meet events. `python -m utils.meet_pool provision` keeps
+-- placeholder events with a Meet link in meet_pool; every new session claims
+-- one as part of its own insert (no extra round trip), and an outbox
+-- 'meet_patch' job later moves the event to the session's time and invites
+-- the attendees. When the pool is empty, bookings fall back to creating the
+-- event themselves (the 'calendar_event' job queued by book_session and
+-- reserve_slot).
+
+create table if not exists meet_pool (
+  poolid        bigserial   primary key,
+  event_id      text        not null unique,       -- placeholder event on the service calendar
+  meet_link     text,                              -- null while Google is still creating the conference
+  calendar_link text,
+  created_at    timestamptz not null default now(),
+  sessionid     text        unique,                -- the session that claimed it
+  claimed_at    timestamptz
+);
+
+create index if not exists meet_pool_free on meet_pool (poolid)
+  where sessionid is null and meet_link is not null;
+create index if not exists meet_pool_claimed_at on meet_pool (claimed_at) where claimed_at is not null;
+
+-- Give the new session a pooled Meet link and queue the event patch.
+-- SKIP LOCKED hands concurrent bookings different entries.
+create or replace function claim_pooled_meet() returns trigger language plpgsql as $$
+declare
+  v_entry meet_pool%rowtype;
+  v_start timestamptz;
+  v_end timestamptz;
+begin
+  update meet_pool
+  set sessionid = new.sessionid::text, claimed_at = now()
+  where poolid = (
+    select poolid from meet_pool
+    where sessionid is null and meet_link is not null
+    order by poolid
+    limit 1
+    for update skip locked
+  )
+  returning * into v_entry;
+
+  if not found then
+    return new;
+  end if;
+
+  -- Slot times when the session came from an availability row; otherwise
+  -- session.date is WAT wall-clock time (see book_session)
+  select a.start, a."end" into v_start, v_end
+  from availability a where a.availabilityid = new.availabilityid;
+  if v_start is null then
+    v_start := new.date at time zone 'Africa/Lagos';
+    v_end := coalesce(new.end_time at time zone 'Africa/Lagos', v_start + interval '1 hour');
+  end if;
+
+  new.meet_link := v_entry.meet_link;
+
+  insert into outbox (kind, idempotency_key, payload)
+  values ('meet_patch', 'session:' || new.sessionid || ':meet', jsonb_build_object(
+    'sessionid', new.sessionid,
+    'event_id', v_entry.event_id,
+    'meet_link', v_entry.meet_link,
+    'start', v_start,
+    'end', v_end,
+    'emails', (select coalesce(jsonb_agg(email), '[]') from users where userid in (new.mentorid, new.menteeid))
+  ))
+  on conflict (idempotency_key) do nothing;
+
+  return new;
+end;
+$$;
+
+drop trigger if exists session_claim_meet on session;
+create trigger session_claim_meet
+  before insert on session
+  for each row when (new.meet_link is null)
+  execute function claim_pooled_meet();
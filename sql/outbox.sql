@@ -0,0 +1,96 @@
+-- sql/outbox.sql
+-- Transactional outbox for booking side-effects. book_session() inserts the
+-- session and its follow-up jobs (calendar event, confirmation emails) in one
+-- transaction; `python -m utils.outbox work` drains the jobs in the background.
+
+create table if not exists outbox (
+  jobid           bigserial   primary key,
+  kind            text        not null,              -- 'calendar_event' | 'meet_patch' | 'email'
+  payload         jsonb       not null default '{}',
+  idempotency_key text        not null unique,       -- duplicate enqueues are ignored
+  status          text        not null default 'PENDING'
+                  check (status in ('PENDING', 'RUNNING', 'DONE', 'DEAD')),
+  attempts        int         not null default 0,
+  run_after       timestamptz not null default now(),
+  locked_until    timestamptz,
+  locked_by       text,
+  last_error      text,
+  created_at      timestamptz not null default now(),
+  done_at         timestamptz
+);
+
+create index if not exists outbox_ready on outbox (run_after) where status in ('PENDING', 'RUNNING');
+
+-- Book a session and queue its side-effects. Returns the new session id, or
+-- NULL when the mentor already has a session in [p_start, p_end].
+-- session.date keeps WAT wall-clock time, as the app has always stored it.
+create or replace function book_session(
+  p_mentorid session.mentorid%type,
+  p_menteeid session.menteeid%type,
+  p_start timestamptz,
+  p_end timestamptz,
+  p_summary text default 'Mentorship Session'
+) returns session.sessionid%type language plpgsql as $$
+declare
+  v_sessionid session.sessionid%type;
+  v_start timestamp := p_start at time zone 'Africa/Lagos';
+  v_end timestamp := p_end at time zone 'Africa/Lagos';
+  v_mentor_email text;
+  v_mentee_email text;
+  v_meet_link text;
+begin
+  -- Serialize bookings per mentor so two clicks can't both pass the conflict check
+  perform pg_advisory_xact_lock(hashtext('book_session:' || p_mentorid::text));
+
+  if exists (
+    select 1 from session
+    where mentorid = p_mentorid and date between v_start and v_end
+  ) then
+    return null;
+  end if;
+
+  insert into session (mentorid, menteeid, date, end_time)
+  values (p_mentorid, p_menteeid, v_start, v_end)
+  returning sessionid, meet_link into v_sessionid, v_meet_link;
+
+  -- A Meet link claimed from the pool (sql/meet_pool.sql) comes with its own
+  -- 'meet_patch' job; only create the event here when there was none
+  if v_meet_link is not null then
+    return v_sessionid;
+  end if;
+
+  select email into v_mentor_email from users where userid = p_mentorid;
+  select email into v_mentee_email from users where userid = p_menteeid;
+
+  insert into outbox (kind, idempotency_key, payload)
+  values ('calendar_event', 'session:' || v_sessionid || ':calendar', jsonb_build_object(
+    'sessionid', v_sessionid,
+    'start', p_start,
+    'end', p_end,
+    'summary', p_summary,
+    'emails', jsonb_build_array(v_mentor_email, v_mentee_email)
+  ));
+
+  return v_sessionid;
+end;
+$$;
+
+-- Lease up to p_limit ready jobs to one worker. Expired leases (crashed
+-- workers) become claimable again; SKIP LOCKED lets workers run side by side.
+create or replace function claim_outbox_jobs(p_worker text, p_limit int default 20, p_lease_seconds int default 60)
+returns setof outbox language sql as $$
+  update outbox o
+  set status = 'RUNNING',
+      attempts = o.attempts + 1,
+      locked_by = p_worker,
+      locked_until = now() + make_interval(secs => p_lease_seconds)
+  where o.jobid in (
+    select jobid from outbox
+    where run_after <= now()
+      and (status = 'PENDING' or (status = 'RUNNING' and locked_until < now()))
+    order by run_after, jobid
+    limit p_limit
+    for update skip locked
+  )
+  returning o.*;
+$$;
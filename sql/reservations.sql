@@ -0,0 +1,129 @@
+-- sql/reservations.sql
+-- Slot reservation with one conditional write. A slot is claimed by setting
+-- availability.reserved_by where it is still NULL; the session row is written
+-- in the same transaction, so a booking is a single round trip and two mentees
+-- can never both win the same slot.
+
+alter table availability add column if not exists reserved_by text;
+alter table availability add column if not exists reserved_at timestamptz;
+
+create index if not exists availability_free_by_mentor
+  on availability (mentorid, start) where reserved_by is null;
+
+-- Belt and braces: at most one session per slot. Older double bookings must
+-- be cleaned up first:
+--   select availabilityid, count(*) from session
+--   where availabilityid is not null group by 1 having count(*) > 1;
+create unique index if not exists session_availabilityid_unique
+  on session (availabilityid) where availabilityid is not null;
+
+-- Slots booked before this migration count as reserved
+update availability a
+set reserved_by = s.menteeid, reserved_at = coalesce(a.reserved_at, now())
+from session s
+where s.availabilityid = a.availabilityid and a.reserved_by is null;
+
+-- Claim one slot and create its session. Returns the session, or no row when
+-- the slot is already taken (or does not exist). With p_requestid the
+-- mentorship request is marked ACCEPTED in the same transaction. A session
+-- that got no pooled Meet link (sql/meet_pool.sql) queues its calendar event
+-- and emails as an outbox job, as book_session does.
+create or replace function reserve_slot(
+  p_availabilityid availability.availabilityid%type,
+  p_menteeid session.menteeid%type,
+  p_requestid session.mentorshiprequestid%type default null
+) returns setof session language plpgsql as $$
+declare
+  v_slot availability%rowtype;
+  v_session session%rowtype;
+begin
+  -- Compare-and-set: concurrent claimers queue on the row lock and re-check
+  -- reserved_by after the winner commits, so exactly one of them matches.
+  update availability
+  set reserved_by = p_menteeid, reserved_at = now()
+  where availabilityid = p_availabilityid and reserved_by is null
+  returning * into v_slot;
+
+  if not found then
+    return;
+  end if;
+
+  if p_requestid is not null then
+    update mentorshiprequest set status = 'ACCEPTED'
+    where mentorshiprequestid = p_requestid;
+  end if;
+
+  insert into session (mentorid, menteeid, mentorshiprequestid, availabilityid,
+                       date, end_time, feedback, rating, status)
+  values (v_slot.mentorid, p_menteeid, p_requestid, v_slot.availabilityid,
+          v_slot.start, v_slot."end", '', null, 'Scheduled')
+  returning * into v_session;
+
+  if v_session.meet_link is null then
+    insert into outbox (kind, idempotency_key, payload)
+    values ('calendar_event', 'session:' || v_session.sessionid || ':calendar', jsonb_build_object(
+      'sessionid', v_session.sessionid,
+      'start', v_slot.start,
+      'end', v_slot."end",
+      'summary', 'Mentorship Session',
+      'emails', (select coalesce(jsonb_agg(email), '[]') from users where userid in (v_slot.mentorid, p_menteeid))
+    ))
+    on conflict (idempotency_key) do nothing;
+  end if;
+
+  return next v_session;
+end;
+$$;
+
+-- Claim the mentor's earliest free slot starting after p_after. SKIP LOCKED
+-- hands concurrent callers different slots instead of making them wait on
+-- (and then lose) the same one.
+create or replace function reserve_next_slot(
+  p_mentorid availability.mentorid%type,
+  p_menteeid session.menteeid%type,
+  p_after timestamptz default now(),
+  p_requestid session.mentorshiprequestid%type default null
+) returns setof session language plpgsql as $$
+declare
+  v_availabilityid availability.availabilityid%type;
+begin
+  select availabilityid into v_availabilityid
+  from availability
+  where mentorid = p_mentorid and reserved_by is null and start > p_after
+  order by start
+  limit 1
+  for update skip locked;
+
+  if v_availabilityid is null then
+    return;
+  end if;
+
+  return query select * from reserve_slot(v_availabilityid, p_menteeid, p_requestid);
+end;
+$$;
+
+-- Deleting a session by any other route (admin screens, user deletes) must
+-- free its slot too, or the slot shows as open but can never be reserved.
+create or replace function release_slot_on_session_delete()
+returns trigger language plpgsql as $$
+begin
+  if old.availabilityid is not null then
+    update availability set reserved_by = null, reserved_at = null
+    where availabilityid = old.availabilityid;
+  end if;
+  return old;
+end;
+$$;
+
+drop trigger if exists session_release_slot on session;
+create trigger session_release_slot
+  after delete on session
+  for each row execute function release_slot_on_session_delete();
+
+-- Give a slot back (session cancelled by either side)
+create or replace function release_slot(p_availabilityid availability.availabilityid%type)
+returns void language sql as $$
+  delete from session where availabilityid = p_availabilityid;
+  update availability set reserved_by = null, reserved_at = null
+  where availabilityid = p_availabilityid;
+$$;
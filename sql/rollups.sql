@@ -0,0 +1,133 @@
+-- sql/rollups.sql
+-- Pre-aggregated daily and monthly counters for the admin dashboard, kept
+-- current by triggers on users, session and mentorshiprequest. The Year/Month
+-- selectors read these buckets instead of grouping raw rows.
+--
+-- After applying, run the backfill once for existing data:
+--   python -m utils.rollups backfill
+
+create table if not exists analytics_rollup (
+  grain     text   not null check (grain in ('day', 'month')),
+  bucket    date   not null,             -- first day of the day/month
+  metric    text   not null,             -- 'users' | 'sessions' | 'requests'
+  dimension text   not null default '',  -- users: role, requests: status, sessions: ''
+  mentorid  text   not null default '',  -- '' = all mentors
+  count     bigint not null default 0,
+  primary key (grain, bucket, metric, dimension, mentorid)
+);
+
+-- Month of year, for "every March" filters that span all years
+alter table analytics_rollup add column if not exists month smallint
+  generated always as (extract(month from bucket)::smallint) stored;
+
+create index if not exists analytics_rollup_lookup
+  on analytics_rollup (metric, grain, mentorid, bucket);
+
+-- Add `delta` to the day and month buckets of `ts`, overall and per mentor
+create or replace function rollup_bump(p_metric text, p_dimension text, p_mentorid text, ts timestamp, delta int)
+returns void language plpgsql as $$
+declare
+  g text;
+  m text;
+begin
+  if ts is null then
+    return;
+  end if;
+  foreach g in array array['day', 'month'] loop
+    foreach m in array array['', coalesce(p_mentorid, '')] loop
+      insert into analytics_rollup (grain, bucket, metric, dimension, mentorid, count)
+      values (g, date_trunc(g, ts)::date, p_metric, coalesce(p_dimension, ''), m, delta)
+      on conflict (grain, bucket, metric, dimension, mentorid)
+      do update set count = analytics_rollup.count + excluded.count;
+      exit when coalesce(p_mentorid, '') = '';  -- no separate per-mentor row
+    end loop;
+  end loop;
+end;
+$$;
+
+create or replace function rollup_users_trigger()
+returns trigger language plpgsql as $$
+begin
+  if tg_op in ('UPDATE', 'DELETE') then
+    perform rollup_bump('users', old.role, '', old.created_at::timestamp, -1);
+  end if;
+  if tg_op in ('INSERT', 'UPDATE') then
+    perform rollup_bump('users', new.role, '', new.created_at::timestamp, 1);
+  end if;
+  return null;
+end;
+$$;
+
+create or replace function rollup_session_trigger()
+returns trigger language plpgsql as $$
+begin
+  if tg_op in ('UPDATE', 'DELETE') then
+    perform rollup_bump('sessions', '', old.mentorid::text, old.date::timestamp, -1);
+  end if;
+  if tg_op in ('INSERT', 'UPDATE') then
+    perform rollup_bump('sessions', '', new.mentorid::text, new.date::timestamp, 1);
+  end if;
+  return null;
+end;
+$$;
+
+create or replace function rollup_request_trigger()
+returns trigger language plpgsql as $$
+begin
+  if tg_op in ('UPDATE', 'DELETE') then
+    perform rollup_bump('requests', old.status, old.mentorid::text, old.createdat::timestamp, -1);
+  end if;
+  if tg_op in ('INSERT', 'UPDATE') then
+    perform rollup_bump('requests', new.status, new.mentorid::text, new.createdat::timestamp, 1);
+  end if;
+  return null;
+end;
+$$;
+
+-- Only fire on updates that move a row between buckets
+drop trigger if exists rollup_users on users;
+create trigger rollup_users
+  after insert or delete or update of role, created_at on users
+  for each row execute function rollup_users_trigger();
+
+drop trigger if exists rollup_session on session;
+create trigger rollup_session
+  after insert or delete or update of date, mentorid on session
+  for each row execute function rollup_session_trigger();
+
+drop trigger if exists rollup_request on mentorshiprequest;
+create trigger rollup_request
+  after insert or delete or update of status, createdat, mentorid on mentorshiprequest
+  for each row execute function rollup_request_trigger();
+
+-- Rebuild every bucket from raw rows (set-based; safe to re-run)
+create or replace function analytics_rollup_backfill()
+returns bigint language plpgsql as $$
+declare
+  total bigint;
+begin
+  lock table analytics_rollup in exclusive mode;
+  delete from analytics_rollup;
+
+  with src as (
+    select 'users' as metric, role as dimension, '' as mentorid, created_at::timestamp as ts from users
+    union all
+    select 'sessions', '', mentorid::text, date::timestamp from session
+    union all
+    select 'requests', status, mentorid::text, createdat::timestamp from mentorshiprequest
+  ), expanded as (
+    select metric, coalesce(dimension, '') as dimension, '' as mentorid, ts from src
+    union all
+    select metric, coalesce(dimension, ''), mentorid, ts from src where coalesce(mentorid, '') <> ''
+  )
+  insert into analytics_rollup (grain, bucket, metric, dimension, mentorid, count)
+  select g.grain, date_trunc(g.grain, e.ts)::date, e.metric, e.dimension, e.mentorid, count(*)
+  from expanded e
+  cross join (values ('day'), ('month')) as g(grain)
+  where e.ts is not null
+  group by 1, 2, 3, 4, 5;
+
+  get diagnostics total = row_count;
+  return total;
+end;
+$$;
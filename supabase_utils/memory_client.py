@@ -0,0 +1,679 @@
+# supabase_utils/memory_client.py
+"""
+In-memory stand-in for the Supabase client: the part of the supabase-py
+query builder, storage and rpc API the app uses, over plain lists of dicts.
+Swap it in for every module at once with
+
+    from database import supabase
+    supabase.use_client(MemoryClient())
+
+Filters (eq/neq/gt/gte/lt/lte/like/ilike/is_/in_/contains/overlaps/not_/
+match/filter/or_ with nested and()/or()), order/limit/range, single,
+count="exact", embedded resources (`users!session_menteeid_fkey(email)`,
+`availability:availabilityid(start, end)`, `profile(...)`) and
+insert/update/upsert/delete follow PostgREST. Values are compared the way
+they arrive over JSON (timestamps as ISO strings). RPCs are Python ports
+registered by name (supabase_utils/memory_rpcs.py); triggers don't run.
+
+Every round trip is appended to `calls` (table, op, rows) so benchmarks can
+count queries, and `latency` adds a fixed delay per round trip. With
+`trace_sites=True` each call also records the app code that issued it
+("roles/mentor.py:251", or "utils/data_loader.py:60 < roles/mentee.py:212"
+when it went through a helper).
+"""
+
+import copy
+import json
+import re
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from postgrest.exceptions import APIError
+
+from supabase_utils.tracing import call_site
+
+# Primary key per table (generated on insert when missing) and bigserial columns
+PRIMARY_KEYS = {
+    "users": "userid",
+    "profile": "userid",
+    "availability": "availabilityid",
+    "availability_rule": "ruleid",
+    "session": "sessionid",
+    "mentorshiprequest": "mentorshiprequestid",
+    "messages": "id",
+    "broadcast_read_state": "user_id",
+    "meet_pool": "poolid",
+    "outbox": "jobid",
+}
+SERIAL_COLUMNS = {
+    "availability_rule": ("ruleid",),
+    "meet_pool": ("poolid",),
+    "outbox": ("jobid",),
+    "messages": ("seq",),
+}
+CREATED_AT_COLUMNS = {
+    "users": "created_at",
+    "mentorshiprequest": "createdat",
+    "messages": "created_at",
+    "meet_pool": "created_at",
+    "outbox": "created_at",
+}
+
+# (table, column) -> (referenced table, referenced column); FK names are `{table}_{column}_fkey`
+FOREIGN_KEYS = {
+    ("profile", "userid"): ("users", "userid"),
+    ("availability", "mentorid"): ("users", "userid"),
+    ("availability", "ruleid"): ("availability_rule", "ruleid"),
+    ("availability_rule", "mentorid"): ("users", "userid"),
+    ("session", "mentorid"): ("users", "userid"),
+    ("session", "menteeid"): ("users", "userid"),
+    ("session", "availabilityid"): ("availability", "availabilityid"),
+    ("session", "mentorshiprequestid"): ("mentorshiprequest", "mentorshiprequestid"),
+    ("mentorshiprequest", "mentorid"): ("users", "userid"),
+    ("mentorshiprequest", "menteeid"): ("users", "userid"),
+    ("messages", "receiver_id"): ("users", "userid"),
+}
+
+STORAGE_URL = "http://localhost:54321"
+
+
+def _error(message: str, code: str, details: Optional[str] = None) -> APIError:
+    return APIError({"message": message, "code": code, "hint": None, "details": details})
+
+
+def _key(value):
+    """How a value compares for equality once it has been through a PostgREST URL"""
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _ordered(row_value, value):
+    """Both sides as comparable values (numbers stay numbers, everything else compares as text)"""
+    if isinstance(row_value, (int, float)) and not isinstance(row_value, bool):
+        try:
+            return row_value, float(value)
+        except (TypeError, ValueError):
+            pass
+    return _key(row_value), _key(value)
+
+
+def _like(pattern: str, flags=0):
+    regex = "".join(".*" if c in "%*" else "." if c == "_" else re.escape(c) for c in pattern)
+    return re.compile(f"^{regex}$", flags | re.DOTALL)
+
+
+def _as_list(value) -> list:
+    if isinstance(value, str):
+        value = value.strip()
+        if value.startswith("{") and value.endswith("}"):
+            return [v.strip().strip('"') for v in value[1:-1].split(",") if v.strip()]
+        return json.loads(value)
+    return list(value or [])
+
+
+def _test(row_value, op: str, value) -> bool:
+    if op == "is":
+        target = {"null": None, "true": True, "false": False}.get(str(value).lower(), value) \
+            if isinstance(value, str) else value
+        return row_value is target if target is None or isinstance(target, bool) else _key(row_value) == _key(target)
+    if op == "eq":
+        return row_value is not None and _key(row_value) == _key(value)
+    if op == "neq":
+        return row_value is not None and _key(row_value) != _key(value)
+    if op == "in":
+        return row_value is not None and _key(row_value) in {_key(v) for v in value}
+    if op in ("gt", "gte", "lt", "lte"):
+        if row_value is None:
+            return False
+        a, b = _ordered(row_value, value)
+        try:
+            return {"gt": a > b, "gte": a >= b, "lt": a < b, "lte": a <= b}[op]
+        except TypeError:
+            return False
+    if op in ("like", "ilike"):
+        return row_value is not None and bool(
+            _like(str(value), re.IGNORECASE if op == "ilike" else 0).match(str(row_value)))
+    if op in ("cs", "cd", "ov"):
+        if row_value is None:
+            return False
+        have = {_key(v) for v in _as_list(row_value)}
+        want = {_key(v) for v in _as_list(value)}
+        return {"cs": want <= have, "cd": have <= want, "ov": bool(have & want)}[op]
+    raise _error(f"operator {op} is not supported by the in-memory client", "PGRST100")
+
+
+# ---- PostgREST string syntax: logic trees for or_/filter, select lists ----
+
+def _split_top(text: str, sep: str = ",") -> List[str]:
+    """Split on `sep` outside parentheses and double quotes"""
+    parts, depth, quoted, start = [], 0, False, 0
+    for i, c in enumerate(text):
+        if c == '"':
+            quoted = not quoted
+        elif quoted:
+            continue
+        elif c == "(":
+            depth += 1
+        elif c == ")":
+            depth -= 1
+        elif c == sep and depth == 0:
+            parts.append(text[start:i])
+            start = i + 1
+    parts.append(text[start:])
+    return [p.strip() for p in parts if p.strip()]
+
+
+def _parse_value(op: str, raw: str):
+    if op in ("in",):
+        return [v.strip().strip('"') for v in _split_top(raw.strip()[1:-1])]
+    return raw[1:-1] if len(raw) > 1 and raw[0] == raw[-1] == '"' else raw
+
+
+def _parse_condition(text: str):
+    """`col.op.value`, `col.not.op.value`, `and(...)`, `or(...)`, `not.and(...)` -> predicate tree"""
+    negate = False
+    if text.startswith("not.") and (text[4:].startswith("and(") or text[4:].startswith("or(")):
+        negate, text = True, text[4:]
+    for logic in ("and", "or"):
+        if text.startswith(logic + "(") and text.endswith(")"):
+            return (logic, negate, [_parse_condition(p) for p in _split_top(text[len(logic) + 1:-1])])
+    column, rest = text.split(".", 1)
+    if rest.startswith("not."):
+        negate, rest = True, rest[4:]
+    op, _, raw = rest.partition(".")
+    return ("cond", negate, (column, op, _parse_value(op, raw)))
+
+
+def _evaluate(node, row: Dict) -> bool:
+    kind, negate, body = node
+    if kind == "cond":
+        column, op, value = body
+        result = _test(row.get(column), op, value)
+    elif kind == "and":
+        result = all(_evaluate(child, row) for child in body)
+    else:
+        result = any(_evaluate(child, row) for child in body)
+    return not result if negate else result
+
+
+def _parse_select(columns: str) -> List[Tuple]:
+    """
+    A select list as ("*",) / ("col", alias, column) / ("embed", alias, name, hint, children)
+    """
+    fields = []
+    for item in _split_top(" ".join((columns or "*").split())):
+        alias, body = None, item
+        match = re.match(r"^(\w+)\s*:\s*(.+)$", item)
+        if match and not item.startswith("*"):
+            alias, body = match.groups()
+        embed = re.match(r"^(\w+)(?:!(\w+))?\s*\((.*)\)$", body, re.DOTALL)
+        if embed:
+            name, hint, inner = embed.groups()
+            fields.append(("embed", alias or name, name, hint, _parse_select(inner or "*")))
+        elif body == "*":
+            fields.append(("*",))
+        else:
+            column = body.split("::")[0].strip()
+            fields.append(("col", alias or column, column))
+    return fields
+
+
+class _RoundTrip:
+    """Holds the client lock for one request, logs it, then waits out the simulated latency"""
+
+    def __init__(self, client: "MemoryClient", entry: Dict):
+        self.client, self.entry = client, entry
+
+    def __enter__(self) -> Dict:
+        self.client._lock.acquire()
+        return self.entry
+
+    def __exit__(self, *exc):
+        self.client.calls.append(self.entry)
+        self.client._lock.release()
+        if self.client.latency:
+            time.sleep(self.client.latency)
+
+
+class MemoryResponse:
+    """What execute() returns: `.data` (rows, a row, or None) and `.count`"""
+
+    def __init__(self, data, count: Optional[int] = None):
+        self.data = data
+        self.count = count
+
+    def __repr__(self):
+        return f"MemoryResponse(data={self.data!r}, count={self.count!r})"
+
+
+class MemoryQuery:
+    """One supabase-py query chain against a MemoryClient table; nothing runs before execute()"""
+
+    def __init__(self, client: "MemoryClient", table: str):
+        self._client = client
+        self._table = table
+        self._op = "select"
+        self._columns = "*"
+        self._count = None
+        self._head = False
+        self._payload = None
+        self._on_conflict = None
+        self._ignore_duplicates = False
+        self._filters: List = []
+        self._negate_next = False
+        self._orders: List[Tuple[str, bool, Optional[bool]]] = []
+        self._limit = None
+        self._offset = 0
+        self._single = None  # "single" / "maybe"
+
+    # ---- operations ----
+    def select(self, *columns, count=None, head=False):
+        self._columns = ",".join(columns) if columns else "*"
+        self._count, self._head = count, head
+        return self
+
+    def insert(self, json, count=None, returning=None, upsert=False, default_to_null=True):
+        self._op, self._payload, self._count = ("upsert" if upsert else "insert"), json, count
+        return self
+
+    def upsert(self, json, count=None, returning=None, ignore_duplicates=False, on_conflict="",
+               default_to_null=True):
+        self._op, self._payload, self._count = "upsert", json, count
+        self._ignore_duplicates = ignore_duplicates
+        if isinstance(on_conflict, (list, tuple)):
+            on_conflict = ",".join(on_conflict)
+        self._on_conflict = [c.strip() for c in on_conflict.split(",") if c.strip()] or None
+        return self
+
+    def update(self, json, count=None, returning=None):
+        self._op, self._payload, self._count = "update", json, count
+        return self
+
+    def delete(self, count=None, returning=None):
+        self._op, self._count = "delete", count
+        return self
+
+    # ---- filters ----
+    def _add(self, node):
+        kind, negate, body = node
+        if self._negate_next:
+            node, self._negate_next = (kind, not negate, body), False
+        self._filters.append(node)
+        return self
+
+    def _cond(self, column, op, value):
+        return self._add(("cond", False, (column, op, value)))
+
+    def eq(self, column, value):
+        return self._cond(column, "eq", value)
+
+    def neq(self, column, value):
+        return self._cond(column, "neq", value)
+
+    def gt(self, column, value):
+        return self._cond(column, "gt", value)
+
+    def gte(self, column, value):
+        return self._cond(column, "gte", value)
+
+    def lt(self, column, value):
+        return self._cond(column, "lt", value)
+
+    def lte(self, column, value):
+        return self._cond(column, "lte", value)
+
+    def like(self, column, pattern):
+        return self._cond(column, "like", pattern)
+
+    def ilike(self, column, pattern):
+        return self._cond(column, "ilike", pattern)
+
+    def is_(self, column, value):
+        return self._cond(column, "is", "null" if value is None else value)
+
+    def in_(self, column, values):
+        return self._cond(column, "in", list(values))
+
+    def contains(self, column, value):
+        return self._cond(column, "cs", value)
+
+    def contained_by(self, column, value):
+        return self._cond(column, "cd", value)
+
+    def overlaps(self, column, value):
+        return self._cond(column, "ov", value)
+
+    def match(self, query: Dict):
+        for column, value in query.items():
+            self.eq(column, value)
+        return self
+
+    def filter(self, column, operator, criteria):
+        return self._add(_parse_condition(f"{column}.{operator}.{criteria}"))
+
+    def or_(self, filters: str, reference_table=None):
+        if reference_table:
+            raise _error("or_ on an embedded table is not supported by the in-memory client", "PGRST100")
+        return self._add(_parse_condition(f"or({filters})"))
+
+    @property
+    def not_(self):
+        self._negate_next = True
+        return self
+
+    # ---- modifiers ----
+    def order(self, column, desc=False, nullsfirst=None, foreign_table=None):
+        self._orders.append((column, desc, nullsfirst))
+        return self
+
+    def limit(self, size, foreign_table=None):
+        self._limit = size
+        return self
+
+    def range(self, start, end, foreign_table=None):
+        self._offset, self._limit = start, end - start + 1
+        return self
+
+    def single(self):
+        self._single = "single"
+        return self
+
+    def maybe_single(self):
+        self._single = "maybe"
+        return self
+
+    def execute(self):
+        return self._client._execute(self)
+
+
+class _Rpc:
+    def __init__(self, client: "MemoryClient", name: str, params: Dict):
+        self._client, self._name, self._params = client, name, params
+
+    def execute(self):
+        return self._client._call_rpc(self._name, self._params)
+
+
+class MemoryBucket:
+    def __init__(self, client: "MemoryClient", name: str):
+        self._client, self.name = client, name
+
+    def _files(self) -> Dict[str, bytes]:
+        return self._client.files.setdefault(self.name, {})
+
+    def upload(self, path: str, file, file_options=None):
+        data = file if isinstance(file, (bytes, bytearray)) else open(file, "rb").read()
+        upsert = str((file_options or {}).get("upsert", "false")).lower() == "true"
+        with self._client._round_trip("storage", self.name, "upload"):
+            if path in self._files() and not upsert:
+                raise _error("The resource already exists", "409")
+            self._files()[path] = bytes(data)
+            return {"Key": f"{self.name}/{path}"}
+
+    def download(self, path: str) -> bytes:
+        with self._client._round_trip("storage", self.name, "download"):
+            if path not in self._files():
+                raise _error("Object not found", "404")
+            return self._files()[path]
+
+    def remove(self, paths: List[str]):
+        with self._client._round_trip("storage", self.name, "remove"):
+            return [{"name": p} for p in paths if self._files().pop(p, None) is not None]
+
+    def list(self, path: Optional[str] = None, options=None):
+        with self._client._round_trip("storage", self.name, "list"):
+            prefix = f"{path.rstrip('/')}/" if path else ""
+            return [{"name": p[len(prefix):]} for p in sorted(self._files()) if p.startswith(prefix)]
+
+    def get_public_url(self, path: str, options=None) -> str:
+        return f"{STORAGE_URL}/storage/v1/object/public/{self.name}/{path}"
+
+
+class MemoryStorage:
+    def __init__(self, client: "MemoryClient"):
+        self._client = client
+
+    def from_(self, bucket: str) -> MemoryBucket:
+        return MemoryBucket(self._client, bucket)
+
+    get_bucket = from_
+
+
+class MemoryClient:
+    """
+    Tables are lists of row dicts in `tables`; `load()` bulk-appends trusted
+    rows (no JSON round trip, no defaults) for seeding. Safe to share across
+    threads: each execute() holds the client lock.
+    """
+
+    def __init__(self, tables: Optional[Dict[str, List[Dict]]] = None,
+                 rpcs: Optional[Dict[str, Callable]] = None, latency: float = 0.0, trace_sites: bool = False):
+        from supabase_utils.memory_rpcs import RPCS
+
+        self.tables: Dict[str, List[Dict]] = {name: list(rows) for name, rows in (tables or {}).items()}
+        self.rpcs: Dict[str, Callable] = dict(RPCS if rpcs is None else rpcs)
+        self.files: Dict[str, Dict[str, bytes]] = {}
+        self.latency = latency
+        self.trace_sites = trace_sites
+        self.calls: List[Dict] = []
+        self.storage = MemoryStorage(self)
+        self._lock = threading.RLock()
+        self._indexes: Dict[Tuple[str, str], Dict] = {}
+        self._serials: Dict[Tuple[str, str], int] = {}
+
+    # ---- client API ----
+    def table(self, name: str) -> MemoryQuery:
+        return MemoryQuery(self, name)
+
+    from_ = table
+
+    def rpc(self, fn: str, params: Optional[Dict] = None, count=None, head=False, get=False) -> _Rpc:
+        return _Rpc(self, fn, params or {})
+
+    # ---- seeding and bookkeeping ----
+    def load(self, table: str, rows: Iterable[Dict]):
+        """Append rows as-is (seed data); serial counters move past the loaded values"""
+        with self._lock:
+            store = self.tables.setdefault(table, [])
+            added = list(rows)
+            store.extend(added)
+            for column in SERIAL_COLUMNS.get(table, ()):
+                top = max((r[column] for r in added if isinstance(r.get(column), int)), default=0)
+                self._serials[(table, column)] = max(self._serials.get((table, column), 0), top)
+            self._drop_indexes(table)
+
+    def rows(self, table: str) -> List[Dict]:
+        return self.tables.setdefault(table, [])
+
+    def reset_calls(self) -> List[Dict]:
+        """Return the call log so far and start a new one"""
+        with self._lock:
+            calls, self.calls = self.calls, []
+            return calls
+
+    def register_rpc(self, name: str, fn: Callable):
+        """`fn(client, **params)` runs under the client lock and works on `client.rows(...)` directly"""
+        self.rpcs[name] = fn
+
+    def next_serial(self, table: str, column: str) -> int:
+        with self._lock:
+            value = self._serials.get((table, column), 0) + 1
+            self._serials[(table, column)] = value
+            return value
+
+    # ---- internals ----
+    def _round_trip(self, op: str, table: str, detail: str = "") -> "_RoundTrip":
+        entry = {"table": table, "op": op, "detail": detail, "rows": 0}
+        if self.trace_sites:
+            entry["site"] = call_site()
+        return _RoundTrip(self, entry)
+
+    def _drop_indexes(self, table: str):
+        for key in [k for k in self._indexes if k[0] == table]:
+            del self._indexes[key]
+
+    def _index(self, table: str, column: str) -> Dict:
+        index = self._indexes.get((table, column))
+        if index is None:
+            index = {}
+            for row in self.rows(table):
+                index.setdefault(_key(row.get(column)), []).append(row)
+            self._indexes[(table, column)] = index
+        return index
+
+    def _candidates(self, table: str, filters: List) -> List[Dict]:
+        """Rows matching every filter, using a hash index for the first plain eq/in"""
+        rows = None
+        rest = list(filters)
+        for node in filters:
+            kind, negate, body = node
+            if kind == "cond" and not negate and body[1] in ("eq", "in"):
+                index = self._index(table, body[0])
+                if body[1] == "eq":
+                    rows = list(index.get(_key(body[2]), ()))
+                else:  # grouped by key: like Postgres, no order without order()
+                    rows = [row for k in dict.fromkeys(_key(v) for v in body[2]) for row in index.get(k, ())]
+                rest.remove(node)
+                break
+        if rows is None:
+            rows = self.rows(table)
+        return [row for row in rows if all(_evaluate(node, row) for node in rest)]
+
+    def _relationship(self, table: str, name: str, hint: Optional[str]):
+        """(kind, child column, target table, target column) for an embed on `table`"""
+        forward = [(col, ref) for (t, col), ref in FOREIGN_KEYS.items() if t == table]
+        reverse = [(t, col, ref) for (t, col), ref in FOREIGN_KEYS.items() if ref[0] == table]
+        if hint:
+            for col, (ref_table, ref_col) in forward:
+                if ref_table == name and hint in (f"{table}_{col}_fkey", col):
+                    return "one", col, ref_table, ref_col
+            for child, col, (_, ref_col) in reverse:
+                if child == name and hint in (f"{child}_{col}_fkey", col):
+                    return self._reverse_kind(child, col), ref_col, child, col
+            raise _error(f"Could not find a relationship between '{table}' and '{name}'", "PGRST200", hint)
+        for col, (ref_table, ref_col) in forward:
+            if col == name:  # `availability:availabilityid(...)` embeds through the FK column
+                return "one", col, ref_table, ref_col
+        matches = [("one", col, ref_table, ref_col) for col, (ref_table, ref_col) in forward if ref_table == name]
+        matches += [(self._reverse_kind(child, col), ref_col, child, col)
+                    for child, col, (_, ref_col) in reverse if child == name]
+        if len(matches) != 1:
+            code = "PGRST201" if matches else "PGRST200"
+            raise _error(f"Could not embed '{name}' from '{table}' ({len(matches)} relationships)", code)
+        return matches[0]
+
+    @staticmethod
+    def _reverse_kind(child: str, column: str) -> str:
+        return "one" if PRIMARY_KEYS.get(child) == column else "many"
+
+    def _shape(self, table: str, row: Dict, fields: List[Tuple]) -> Dict:
+        out = {}
+        for field in fields:
+            if field[0] == "*":
+                out.update(row)
+            elif field[0] == "col":
+                out[field[1]] = row.get(field[2])
+            else:
+                _, alias, name, hint, children = field
+                kind, local, target, target_col = self._relationship(table, name, hint)
+                related = self._index(target, target_col).get(_key(row.get(local)), []) \
+                    if row.get(local) is not None else []
+                shaped = [self._shape(target, r, children) for r in related]
+                out[alias] = shaped if kind == "many" else (shaped[0] if shaped else None)
+        return copy.deepcopy(out)
+
+    def _sort(self, rows: List[Dict], orders) -> List[Dict]:
+        for column, desc, nullsfirst in reversed(orders):
+            nulls_first = desc if nullsfirst is None else nullsfirst
+            present = [r for r in rows if r.get(column) is not None]
+            missing = [r for r in rows if r.get(column) is None]
+            present.sort(key=lambda r: _ordered(r[column], r[column])[0], reverse=desc)
+            rows = missing + present if nulls_first else present + missing
+        return rows
+
+    def _with_defaults(self, table: str, row: Dict) -> Dict:
+        row = json.loads(json.dumps(row, default=str))
+        pk = PRIMARY_KEYS.get(table)
+        for column in SERIAL_COLUMNS.get(table, ()):
+            if row.get(column) is None:
+                row[column] = self.next_serial(table, column)
+        if pk and row.get(pk) is None:
+            row[pk] = str(uuid.uuid4())
+        created = CREATED_AT_COLUMNS.get(table)
+        if created and row.get(created) is None:
+            row[created] = datetime.now(timezone.utc).isoformat()
+        return row
+
+    def _execute(self, query: MemoryQuery):
+        with self._round_trip(query._op, query._table) as entry:
+            data, count = self._run(query)
+            entry["rows"] = len(data) if isinstance(data, list) else int(data is not None)
+            return MemoryResponse(data, count)
+
+    def _run(self, query: MemoryQuery):
+        table, store = query._table, self.rows(query._table)
+
+        if query._op == "select":
+            rows = self._sort(self._candidates(table, query._filters), query._orders)
+            count = len(rows) if query._count else None
+            rows = rows[query._offset:]
+            if query._limit is not None:
+                rows = rows[:query._limit]
+            fields = _parse_select(query._columns)
+            data = [] if query._head else [self._shape(table, r, fields) for r in rows]
+            if query._single:
+                if len(data) > 1 or (len(data) == 0 and query._single == "single"):
+                    raise _error("JSON object requested, multiple (or no) rows returned", "PGRST116",
+                                 f"The result contains {len(data)} rows")
+                return (data[0] if data else None), count
+            return data, count
+
+        if query._op in ("insert", "upsert"):
+            payload = query._payload if isinstance(query._payload, list) else [query._payload]
+            conflict = query._on_conflict or ([PRIMARY_KEYS[table]] if table in PRIMARY_KEYS else [])
+            written = []
+            for raw in payload:
+                existing = None
+                if conflict and all(raw.get(c) is not None for c in conflict):
+                    matches = self._candidates(table, [("cond", False, (c, "eq", raw[c])) for c in conflict])
+                    existing = matches[0] if matches else None
+                if existing is not None and query._op == "insert":
+                    raise _error(f'duplicate key value violates unique constraint "{table}_pkey"', "23505")
+                if existing is not None:
+                    if not query._ignore_duplicates:
+                        existing.update(json.loads(json.dumps(raw, default=str)))
+                        written.append(copy.deepcopy(existing))
+                    continue
+                row = self._with_defaults(table, raw)
+                store.append(row)
+                written.append(copy.deepcopy(row))
+            self._drop_indexes(table)
+            return written, (len(written) if query._count else None)
+
+        matched = self._candidates(table, query._filters)
+        if query._op == "update":
+            values = json.loads(json.dumps(query._payload, default=str))
+            for row in matched:
+                row.update(values)
+        else:
+            doomed = {id(r) for r in matched}
+            store[:] = [r for r in store if id(r) not in doomed]
+        self._drop_indexes(table)
+        return [copy.deepcopy(r) for r in matched], (len(matched) if query._count else None)
+
+    def _call_rpc(self, name: str, params: Dict):
+        with self._round_trip("rpc", name) as entry:
+            fn = self.rpcs.get(name)
+            if fn is None:
+                raise _error(f"Could not find the function public.{name} in the schema cache", "PGRST202")
+            data = fn(self, **params)
+            entry["rows"] = len(data) if isinstance(data, list) else int(data is not None)
+            return MemoryResponse(data)
@@ -0,0 +1,292 @@
+# supabase_utils/memory_rpcs.py
+"""
+Python ports of the SQL functions in sql/ for MemoryClient, registered by
+name in RPCS. Each takes the client plus the RPC's named parameters and
+works on `client.rows(...)` directly (it already holds the client lock),
+dropping the client's indexes for any table it writes.
+"""
+
+import copy
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+import pytz
+
+WAT = pytz.timezone("Africa/Lagos")
+
+
+def _ts(value) -> Optional[datetime]:
+    """A timestamp column as Postgres' ::timestamp would see it (naive)"""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00")).replace(tzinfo=None)
+    except ValueError:
+        return None
+
+
+def _utc(value) -> Optional[datetime]:
+    """A timestamptz column or parameter as an aware UTC datetime (naive values are UTC)"""
+    if not value:
+        return None
+    if not isinstance(value, datetime):
+        try:
+            value = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+def _in_period(value, p_year, p_month) -> bool:
+    ts = _ts(value)
+    return ts is not None and (p_year is None or ts.year == p_year) and (p_month is None or ts.month == p_month)
+
+
+# ---- sql/broadcasts.sql ----
+
+def _visible(client, p_role) -> List[Dict]:
+    return [m for m in client.rows("messages") if m.get("receiver_id") is None
+            and (m.get("role") is None or str(m["role"]).upper() == str(p_role or "").upper())]
+
+
+def _read_state(client, user_id) -> Optional[Dict]:
+    return next((s for s in client.rows("broadcast_read_state") if s["user_id"] == str(user_id)), None)
+
+
+def inbox_unread_count(client, p_user_id, p_role) -> int:
+    personal = sum(1 for m in client.rows("messages")
+                   if m.get("receiver_id") is not None and str(m["receiver_id"]) == str(p_user_id)
+                   and not m.get("is_read"))
+    state = _read_state(client, p_user_id) or {}
+    through, extra = state.get("read_through") or 0, set(state.get("read_extra") or [])
+    return personal + sum(1 for b in _visible(client, p_role) if b["seq"] > through and b["seq"] not in extra)
+
+
+def _compact(client, state: Dict, p_role):
+    visible = _visible(client, p_role)
+    extra = set(state["read_extra"])
+    unread = [b["seq"] for b in visible if b["seq"] > state["read_through"] and b["seq"] not in extra]
+    if unread:
+        through = max(state["read_through"], min(unread) - 1)
+    else:
+        through = max(state["read_through"], max((b["seq"] for b in visible), default=0), max(extra, default=0))
+    state["read_through"] = through
+    state["read_extra"] = sorted(x for x in extra if x > through)
+
+
+def mark_broadcasts_read(client, p_user_id, p_role, p_seqs):
+    state = _read_state(client, p_user_id)
+    if state is None:
+        state = {"user_id": str(p_user_id), "read_through": 0, "read_extra": []}
+        client.rows("broadcast_read_state").append(state)
+        client._drop_indexes("broadcast_read_state")
+    state["read_extra"] = list(state["read_extra"]) + list(p_seqs or [])
+    _compact(client, state, p_role)
+
+
+def mark_all_broadcasts_read(client, p_user_id, p_role):
+    top = max((b["seq"] for b in _visible(client, p_role)), default=0)
+    state = _read_state(client, p_user_id)
+    if state is None:
+        client.rows("broadcast_read_state").append({"user_id": str(p_user_id), "read_through": top, "read_extra": []})
+        client._drop_indexes("broadcast_read_state")
+    else:
+        state["read_through"], state["read_extra"] = max(state["read_through"], top), []
+
+
+# ---- sql/reservations.sql ----
+
+def reserve_slot(client, p_availabilityid, p_menteeid, p_requestid=None) -> List[Dict]:
+    slot = next((a for a in client.rows("availability")
+                 if a["availabilityid"] == p_availabilityid and a.get("reserved_by") is None), None)
+    if slot is None:
+        return []
+    slot["reserved_by"], slot["reserved_at"] = str(p_menteeid), datetime.now(timezone.utc).isoformat()
+    if p_requestid is not None:
+        for request in client.rows("mentorshiprequest"):
+            if request["mentorshiprequestid"] == p_requestid:
+                request["status"] = "ACCEPTED"
+    session = client._with_defaults("session", {
+        "mentorid": slot["mentorid"], "menteeid": p_menteeid, "mentorshiprequestid": p_requestid,
+        "availabilityid": slot["availabilityid"], "date": slot["start"], "end_time": slot["end"],
+        "feedback": "", "rating": None, "status": "Scheduled",
+    })
+    client.rows("session").append(session)
+    if not session.get("meet_link"):
+        key = f"session:{session['sessionid']}:calendar"
+        if not any(j.get("idempotency_key") == key for j in client.rows("outbox")):
+            client.rows("outbox").append(client._with_defaults("outbox", {
+                "kind": "calendar_event", "idempotency_key": key, "status": "PENDING", "attempts": 0,
+                "payload": {"sessionid": session["sessionid"], "start": slot["start"], "end": slot["end"],
+                            "summary": "Mentorship Session",
+                            "emails": [u["email"] for u in client.rows("users")
+                                       if u["userid"] in (slot["mentorid"], p_menteeid)]},
+            }))
+    for table in ("availability", "mentorshiprequest", "session", "outbox"):
+        client._drop_indexes(table)
+    return [copy.deepcopy(session)]
+
+
+def reserve_next_slot(client, p_mentorid, p_menteeid, p_after=None, p_requestid=None) -> List[Dict]:
+    after = _utc(p_after) or datetime.now(timezone.utc)
+    free = [a for a in client.rows("availability") if a.get("mentorid") == p_mentorid
+            and a.get("reserved_by") is None and (_utc(a.get("start")) or after) > after]
+    if not free:
+        return []
+    return reserve_slot(client, min(free, key=lambda a: _utc(a["start"]))["availabilityid"], p_menteeid, p_requestid)
+
+
+def release_slot(client, p_availabilityid):
+    client.tables["session"] = [s for s in client.rows("session") if s.get("availabilityid") != p_availabilityid]
+    for slot in client.rows("availability"):
+        if slot["availabilityid"] == p_availabilityid:
+            slot["reserved_by"], slot["reserved_at"] = None, None
+    client._drop_indexes("session")
+    client._drop_indexes("availability")
+
+
+# ---- sql/availability_rules.sql ----
+
+def materialize_rule_slot(client, p_ruleid, p_start):
+    from utils.recurrence import rule_occurrences
+
+    rule = next((r for r in client.rows("availability_rule") if str(r["ruleid"]) == str(p_ruleid)), None)
+    start = _utc(p_start)
+    if rule is None or start is None:
+        return None
+    occurrence = next((o for o in rule_occurrences(rule, start, start + timedelta(seconds=1)) if o[0] == start), None)
+    if occurrence is None:
+        return None
+    for row in client.rows("availability"):
+        if str(row.get("ruleid")) == str(rule["ruleid"]) and _utc(row.get("start")) == start:
+            return row["availabilityid"]
+    row = client._with_defaults("availability", {
+        "mentorid": rule["mentorid"], "start": start.isoformat(), "end": _utc(occurrence[1]).isoformat(),
+        "date": occurrence[0].date().isoformat(), "ruleid": rule["ruleid"], "reserved_by": None, "reserved_at": None,
+    })
+    client.rows("availability").append(row)
+    client._drop_indexes("availability")
+    return row["availabilityid"]
+
+
+def materialize_rule_slots(client, p_slots) -> int:
+    return sum(materialize_rule_slot(client, s["ruleid"], s["start"]) is not None for s in p_slots or [])
+
+
+def reserve_rule_slot(client, p_ruleid, p_start, p_menteeid, p_requestid=None) -> List[Dict]:
+    availabilityid = materialize_rule_slot(client, p_ruleid, p_start)
+    if availabilityid is None:
+        return []
+    return reserve_slot(client, availabilityid, p_menteeid, p_requestid)
+
+
+# ---- sql/bulk_match.sql ----
+
+def create_bulk_matches(client, p_pairs, p_status="ACCEPTED", p_max_per_mentor=3) -> List[Dict]:
+    requests = client.rows("mentorshiprequest")
+    now = datetime.now(timezone.utc)
+    made, written = Counter(), []
+    for pair in p_pairs or []:
+        menteeid, mentorid = pair["menteeid"], pair["mentorid"]
+        open_requests = [r for r in requests if r.get("status") in ("PENDING", "ACCEPTED")]
+        if any(r["menteeid"] == menteeid for r in open_requests):
+            continue
+        if sum(r["mentorid"] == mentorid for r in open_requests) >= p_max_per_mentor:
+            continue
+        free = sum(1 for a in client.rows("availability") if a.get("mentorid") == mentorid
+                   and a.get("reserved_by") is None and (_utc(a.get("start")) or now) > now)
+        if free <= made[mentorid]:
+            continue
+        made[mentorid] += 1
+        row = client._with_defaults("mentorshiprequest", {"menteeid": menteeid, "mentorid": mentorid,
+                                                          "status": p_status})
+        requests.append(row)
+        written.append(copy.deepcopy(row))
+    client._drop_indexes("mentorshiprequest")
+    return written
+
+
+# ---- sql/analytics.sql ----
+
+def analytics_summary(client, p_year=None, p_month=None, p_role=None) -> List[Dict]:
+    users = [u for u in client.rows("users") if _in_period(u.get("created_at"), p_year, p_month)
+             and (p_role is None or u.get("role") == p_role)]
+    sessions = [s for s in client.rows("session") if _in_period(s.get("date"), p_year, p_month)]
+    requests = [r for r in client.rows("mentorshiprequest") if _in_period(r.get("createdat"), p_year, p_month)]
+    now = datetime.now(WAT).replace(tzinfo=None)
+    return [{
+        "total_users": len(users),
+        "mentors": sum(u.get("role") == "Mentor" for u in users),
+        "mentees": sum(u.get("role") == "Mentee" for u in users),
+        "total_sessions": len(sessions),
+        "rated_sessions": sum(s.get("rating") is not None for s in sessions),
+        "completed_sessions": sum(_ts(s["date"]) < now for s in sessions),
+        "mentees_with_sessions": len({s.get("menteeid") for s in sessions}),
+        "total_requests": len(requests),
+        "accepted_requests": sum(r.get("status") == "ACCEPTED" for r in requests),
+        "requesting_mentees": len({r.get("menteeid") for r in requests}),
+        "all_mentors": sum(u.get("role") == "Mentor" for u in client.rows("users")),
+    }]
+
+
+def analytics_rating_histogram(client, p_year=None, p_month=None) -> List[Dict]:
+    counts = Counter(int(s["rating"]) for s in client.rows("session")
+                     if s.get("rating") is not None and _in_period(s.get("date"), p_year, p_month))
+    return [{"rating": rating, "count": n} for rating, n in sorted(counts.items())]
+
+
+def analytics_request_status(client, p_year=None, p_month=None) -> List[Dict]:
+    counts = Counter(r.get("status") for r in client.rows("mentorshiprequest")
+                     if _in_period(r.get("createdat"), p_year, p_month))
+    return [{"status": status, "count": n} for status, n in counts.most_common()]
+
+
+def analytics_mentor_performance(client, p_year=None, p_month=None) -> List[Dict]:
+    slots = Counter(a.get("mentorid") for a in client.rows("availability"))
+    ratings = defaultdict(list)
+    sessions = Counter()
+    for s in client.rows("session"):
+        if _in_period(s.get("date"), p_year, p_month):
+            sessions[s.get("mentorid")] += 1
+            if s.get("rating") is not None:
+                ratings[s.get("mentorid")].append(s["rating"])
+    emails = {u["userid"]: u.get("email") for u in client.rows("users")}
+    return [{
+        "mentorid": str(mentorid), "email": emails.get(mentorid),
+        "slots": slots.get(mentorid, 0), "sessions": sessions.get(mentorid, 0),
+        "avg_rating": sum(ratings[mentorid]) / len(ratings[mentorid]) if ratings.get(mentorid) else None,
+    } for mentorid in dict.fromkeys(list(slots) + list(sessions))]
+
+
+def analytics_top_skills(client, p_limit=5) -> List[Dict]:
+    counts = Counter(skill.strip().lower() for p in client.rows("profile")
+                     for skill in (p.get("skills") or "").split(",") if skill.strip())
+    ranked = sorted(counts.items(), key=lambda kv: (-kv[1], kv[0]))[:p_limit]
+    return [{"skill": skill, "count": n, "unique_skills": len(counts)} for skill, n in ranked]
+
+
+def analytics_top_requesting_mentees(client, p_limit=5) -> List[Dict]:
+    counts = Counter(r.get("menteeid") for r in client.rows("mentorshiprequest"))
+    emails = {u["userid"]: u.get("email") for u in client.rows("users")}
+    return [{"email": emails.get(menteeid), "request_count": n} for menteeid, n in counts.most_common(p_limit)]
+
+
+RPCS = {
+    "inbox_unread_count": inbox_unread_count,
+    "mark_broadcasts_read": mark_broadcasts_read,
+    "mark_all_broadcasts_read": mark_all_broadcasts_read,
+    "reserve_slot": reserve_slot,
+    "reserve_next_slot": reserve_next_slot,
+    "release_slot": release_slot,
+    "materialize_rule_slot": materialize_rule_slot,
+    "materialize_rule_slots": materialize_rule_slots,
+    "reserve_rule_slot": reserve_rule_slot,
+    "create_bulk_matches": create_bulk_matches,
+    "analytics_summary": analytics_summary,
+    "analytics_rating_histogram": analytics_rating_histogram,
+    "analytics_request_status": analytics_request_status,
+    "analytics_mentor_performance": analytics_mentor_performance,
+    "analytics_top_skills": analytics_top_skills,
+    "analytics_top_requesting_mentees": analytics_top_requesting_mentees,
+}
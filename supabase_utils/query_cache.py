@@ -0,0 +1,211 @@
+# supabase_utils/query_cache.py
+
+import copy
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Set
+
+# Seconds a read stays cached, per table. Tables not listed are never cached.
+TABLE_TTLS = {
+    "profile": 300,
+    "users": 60,
+    "availability": 30,
+    "session": 30,
+    "mentorshiprequest": 15,
+    "messages": 10,
+    "message_reads": 10,
+}
+MAX_ENTRIES = int(os.getenv("SUPABASE_CACHE_MAX_ENTRIES", 2048))
+CACHE_ENABLED = os.getenv("SUPABASE_CACHE_DISABLED", "").lower() not in ("1", "true", "yes")
+
+READ_OPS = {"select"}
+WRITE_OPS = {"insert", "update", "upsert", "delete"}
+ANY_TABLE = "*"
+
+# Embedded resources in a select string: `profile(...)`, `users!fk(...)`, `alias:users!fk(...)`
+EMBED_RE = re.compile(r"(\w+)(?:!\w+)?\s*\(")
+
+
+def embedded_tables(columns: str) -> Set[str]:
+    """Tables a select() depends on besides its own; unknown embeds depend on every table"""
+    tables = set()
+    for name in EMBED_RE.findall(columns or ""):
+        tables.add(name if name in TABLE_TTLS else ANY_TABLE)
+    return tables
+
+
+class QueryCache:
+    """Thread-safe LRU of query results with per-entry expiry and table dependencies."""
+
+    def __init__(self, max_entries: int = MAX_ENTRIES, ttls: Optional[Dict[str, int]] = None):
+        self.max_entries = max_entries
+        self.ttls = dict(TABLE_TTLS if ttls is None else ttls)
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()  # key -> (expires_at, deps, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.table_stats: Dict[str, Dict[str, int]] = {}
+
+    def ttl_for(self, deps: Iterable[str]) -> float:
+        ttls = [min(self.ttls.values(), default=0) if t == ANY_TABLE else self.ttls.get(t, 0) for t in deps]
+        return min(ttls, default=0)
+
+    def _count(self, table: str, field: str):
+        stats = self.table_stats.setdefault(table, {"hits": 0, "misses": 0, "invalidated": 0})
+        stats[field] += 1
+
+    def get(self, key: tuple):
+        table = key[0]
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                self._count(table, "hits")
+                return copy.deepcopy(entry[2])
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            self._count(table, "misses")
+            return None
+
+    def put(self, key: tuple, deps: Set[str], value, ttl: float):
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, deps, copy.deepcopy(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, *tables: str):
+        """Drop every cached read that touches any of `tables`"""
+        tables = set(tables)
+        with self._lock:
+            stale = [
+                key for key, (_, deps, _) in self._entries.items()
+                if ANY_TABLE in deps or ANY_TABLE in tables or deps & tables
+            ]
+            for key in stale:
+                del self._entries[key]
+                self._count(key[0], "invalidated")
+            self.invalidations += len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "tables": copy.deepcopy(self.table_stats),
+            }
+
+
+class CachedQuery:
+    """
+    Records a supabase-py query chain and replays it on execute(), serving
+    select() chains from the cache and invalidating it after writes.
+    """
+
+    def __init__(self, owner: "CachedClient", table: str):
+        self._owner = owner
+        self._table = table
+        self._ops = []
+        self.from_cache = False
+
+    @property
+    def not_(self):
+        self._ops.append(("not_", None, None))  # a property on the real builder
+        return self
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+
+        def record(*args, **kwargs):
+            self._ops.append((name, args, kwargs))
+            return self
+        return record
+
+    def _replay(self):
+        builder = self._owner.client.table(self._table)
+        for name, args, kwargs in self._ops:
+            builder = getattr(builder, name)
+            if args is not None:
+                builder = builder(*args, **kwargs)
+        return builder.execute()
+
+    def execute(self):
+        cache = self._owner.cache
+        first_op = self._ops[0][0] if self._ops else None
+
+        if first_op in WRITE_OPS:
+            try:
+                return self._replay()
+            finally:
+                cache.invalidate(self._table)
+
+        if first_op not in READ_OPS or not self._owner.enabled:
+            return self._replay()
+
+        columns = self._ops[0][1][0] if self._ops[0][1] else "*"
+        deps = {self._table} | embedded_tables(columns)
+        ttl = cache.ttl_for(deps)
+        if ttl <= 0:
+            return self._replay()
+
+        key = (self._table, repr(self._ops))
+        cached = cache.get(key)
+        if cached is not None:
+            self.from_cache = True
+            return cached
+        response = self._replay()
+        cache.put(key, deps, response, ttl)
+        return response
+
+
+class CachedClient:
+    """
+    Drop-in wrapper for the Supabase client: `table()` reads are cached per
+    table + filters with per-table TTLs, and writes made through it invalidate
+    the affected tables. Everything else (storage, rpc, auth) passes through.
+    """
+
+    def __init__(self, client, cache: Optional[QueryCache] = None, enabled: bool = CACHE_ENABLED):
+        self.client = client
+        self.cache = cache or QueryCache()
+        self.enabled = enabled
+
+    def table(self, name: str) -> CachedQuery:
+        return CachedQuery(self, name)
+
+    from_ = table
+
+    def use_client(self, client):
+        """Swap the underlying client (e.g. for a local stand-in) and start cold"""
+        self.client = client
+        self.cache.clear()
+
+    def invalidate(self, *tables: str):
+        """For writes made outside table() (RPCs, other processes)"""
+        self.cache.invalidate(*tables)
+
+    def cache_stats(self) -> Dict:
+        return self.cache.stats()
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
@@ -0,0 +1,417 @@
+# supabase_utils/tracing.py
+"""
+Instrumentation for `database.supabase`: TracedClient wraps the client and
+records every table() query and rpc() call (table, operation, filters, rows,
+payload bytes, latency, cache hit and the app code that issued it) in a
+process-wide Tracer.
+
+Calls are grouped into spans. app.py opens one per Streamlit rerun with
+begin_rerun(); an st.fragment that reruns on its own (without app.py) opens
+its own with begin_fragment(). `action("accept request")` in a button
+handler labels the calls made after it in that rerun. Calls made outside a
+rerun (maintenance scheduler, outbox and email workers) go to a
+"background" span.
+
+The tracer keeps the slowest calls, recent reruns and per call site totals
+in memory for the admin 🐞 Trace tab, and appends every call as a JSON line
+to SUPABASE_TRACE_FILE, rotated at SUPABASE_TRACE_MAX_BYTES (set it empty
+to turn the file off). Payload sizes, the totals and the file are all
+worked out on one tracer thread: the calling thread only timestamps the
+call and puts it on a queue, so the in-memory views lag the calls slightly
+(flush() waits for them). Filter values are left out of the records: they
+carry emails and ids.
+
+    python -m supabase_utils.tracing top [--path .cache/supabase_trace.jsonl] [--by site] [--limit 20]
+"""
+
+import argparse
+import atexit
+import contextvars
+import glob
+import heapq
+import itertools
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+import time
+import uuid
+from collections import deque
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+TRACE_FILE = os.getenv("SUPABASE_TRACE_FILE", os.path.join(".cache", "supabase_trace.jsonl"))
+TRACE_MAX_BYTES = int(os.getenv("SUPABASE_TRACE_MAX_BYTES", 10 * 1024 * 1024))
+TRACE_BACKUPS = int(os.getenv("SUPABASE_TRACE_BACKUPS", 5))  # rotated files kept next to the live one
+TRACING_ENABLED = os.getenv("SUPABASE_TRACE_DISABLED", "").lower() not in ("1", "true", "yes")
+SLOWEST_KEPT = 50
+RECENT_SPANS = 200
+
+WRITE_OPS = {"insert", "update", "upsert", "delete"}
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Frames that are plumbing, not the caller: the client layers and the benchmarks driving the app
+_PLUMBING = (os.path.join(REPO_ROOT, "supabase_utils") + os.sep, os.path.join(REPO_ROOT, "database.py"),
+             os.path.join(REPO_ROOT, "benchmarks") + os.sep)
+
+
+def call_site(depth: int = 2) -> str:
+    """The innermost app frames on the stack, innermost first (`utils/x.py:12 < roles/y.py:34`)"""
+    frames = []
+    frame = sys._getframe(1)
+    while frame is not None and len(frames) < depth:
+        path = frame.f_code.co_filename
+        if path.startswith(REPO_ROOT + os.sep) and not path.startswith(_PLUMBING):
+            frames.append(f"{os.path.relpath(path, REPO_ROOT)}:{frame.f_lineno}")
+        frame = frame.f_back
+    return " < ".join(frames) or "?"
+
+
+def describe(name: str, args: tuple, kwargs: dict) -> str:
+    """One filter or modifier without its values: `eq userid`, `in_ status[2]`, `order date desc`, `limit 20`"""
+    if name in ("limit", "range", "offset"):
+        return " ".join([name] + [str(a) for a in args])
+    column = args[0] if args and isinstance(args[0], str) else ""
+    if name == "order":
+        return f"order {column}{' desc' if kwargs.get('desc') else ''}"
+    if name in ("in_", "contains", "overlaps") and len(args) > 1 and isinstance(args[1], (list, tuple, set)):
+        return f"{name} {column}[{len(args[1])}]"
+    if name in ("or_", "match", "single", "maybe_single", "csv", "explain"):
+        return name
+    return f"{name} {column}".strip()
+
+
+def _size(value) -> int:
+    """Bytes of `value` as JSON on the wire (0 for nothing)"""
+    if value is None:
+        return 0
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    return len(json.dumps(value, default=str, separators=(",", ":")).encode("utf-8"))
+
+
+def _safe_size(value) -> int:
+    """_size on the tracer thread: the caller may be changing the rows meanwhile, so try twice"""
+    for _ in range(2):
+        try:
+            return _size(value)
+        except RuntimeError:  # dict/list changed size during serialization
+            continue
+    return 0
+
+
+class Span:
+    """The calls of one rerun (or of the background threads), with running totals"""
+
+    def __init__(self, kind: str, name: str = "", session: str = ""):
+        self.id = uuid.uuid4().hex[:12]
+        self.kind, self.name, self.session = kind, name, session
+        self.started = time.time()
+        self.action: Optional[str] = None
+        self.calls = self.cached = self.rows = self.bytes = 0
+        self.ms = 0.0
+
+    def as_dict(self) -> Dict:
+        return {
+            "span": self.id, "kind": self.kind, "name": self.name, "session": self.session,
+            "started": datetime.fromtimestamp(self.started, timezone.utc).isoformat(), "action": self.action,
+            "calls": self.calls, "cached": self.cached, "rows": self.rows, "bytes": self.bytes,
+            "ms": round(self.ms, 3),
+        }
+
+
+_current: "contextvars.ContextVar[Optional[Span]]" = contextvars.ContextVar("supabase_trace_span", default=None)
+
+
+class Tracer:
+    """Thread-safe sink for call records: slowest calls, recent spans, per call site totals and the JSONL export."""
+
+    def __init__(self, path: str = TRACE_FILE, max_bytes: int = TRACE_MAX_BYTES, backups: int = TRACE_BACKUPS,
+                 slowest: int = SLOWEST_KEPT, recent_spans: int = RECENT_SPANS):
+        self.path, self.max_bytes, self.backups = path, max_bytes, backups
+        self.background = Span("background", "background")
+        self._keep_slowest = slowest
+        self._slowest: List[tuple] = []  # min-heap of (ms, seq, record)
+        self._spans: deque = deque(maxlen=recent_spans)
+        self._sites: Dict[tuple, Dict] = {}  # (table, op, site) -> totals
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._pending: queue.Queue = queue.Queue()  # (span, entry, response data, request body)
+        self._worker: Optional[threading.Thread] = None
+        self._file: Optional[logging.Handler] = None
+
+    # ---- spans ----
+
+    def begin_rerun(self, name: str = "", session: str = "", kind: str = "rerun") -> Span:
+        span = Span(kind, name, session)
+        _current.set(span)
+        with self._lock:
+            self._spans.append(span)
+        return span
+
+    def action(self, name: str):
+        span = _current.get()
+        if span is not None:
+            span.action = name
+
+    # ---- records ----
+
+    def record(self, entry: Dict, data=None, body=None):
+        """
+        Queue one call. `data` (the response) and `body` (the request) are
+        sized on the tracer thread into bytes_in / bytes_out; entries that
+        already carry them are taken as they are.
+        """
+        span = _current.get() or self.background
+        entry.update(span=span.id, kind=span.kind, rerun=span.name, session=span.session, action=span.action)
+        if self._worker is None:
+            self._start_worker()
+        self._pending.put((span, entry, data, body))
+
+    def flush(self):
+        """Wait until every queued call is in the totals and the file"""
+        if self._worker is not None:
+            self._pending.join()
+
+    def _start_worker(self):
+        with self._lock:
+            if self._worker is not None:
+                return
+            self._worker = threading.Thread(target=self._drain, name="supabase-trace", daemon=True)
+            self._worker.start()
+            atexit.register(self._close)  # write what's queued on exit
+
+    def _drain(self):
+        while True:
+            span, entry, data, body = self._pending.get()
+            try:
+                entry.setdefault("bytes_out", _safe_size(body))
+                entry.setdefault("bytes_in", 0 if entry["cached"] else _safe_size(data))  # a cache hit never left the process
+                self._account(span, entry)
+                self._write(entry)
+            except Exception as e:
+                logging.getLogger(__name__).warning(f"⚠️ Trace record dropped: {e}")
+            finally:
+                self._pending.task_done()
+
+    def _account(self, span: Span, entry: Dict):
+        with self._lock:
+            span.calls += 1
+            span.cached += entry["cached"]
+            span.rows += entry["rows"]
+            span.bytes += entry["bytes_in"] + entry["bytes_out"]
+            span.ms += entry["ms"]
+            item = (entry["ms"], next(self._seq), entry)
+            if len(self._slowest) < self._keep_slowest:
+                heapq.heappush(self._slowest, item)
+            elif item[0] > self._slowest[0][0]:
+                heapq.heapreplace(self._slowest, item)
+            totals = self._sites.setdefault((entry["table"], entry["op"], entry["site"]), {
+                "table": entry["table"], "op": entry["op"], "site": entry["site"],
+                "calls": 0, "cached": 0, "errors": 0, "ms": 0.0, "max_ms": 0.0, "rows": 0, "bytes": 0,
+            })
+            totals["calls"] += 1
+            totals["cached"] += entry["cached"]
+            totals["errors"] += "error" in entry
+            totals["ms"] += entry["ms"]
+            totals["max_ms"] = max(totals["max_ms"], entry["ms"])
+            totals["rows"] += entry["rows"]
+            totals["bytes"] += entry["bytes_in"] + entry["bytes_out"]
+
+    def slowest(self, n: int = 20) -> List[Dict]:
+        with self._lock:
+            return [dict(e) for _, _, e in heapq.nlargest(n, self._slowest)]
+
+    def recent_spans(self, n: int = 50) -> List[Dict]:
+        """Newest first"""
+        with self._lock:
+            return [s.as_dict() for s in list(self._spans)[::-1][:n]]
+
+    def site_totals(self) -> List[Dict]:
+        """Per (table, op, call site), most total time first"""
+        with self._lock:
+            rows = [dict(t, ms=round(t["ms"], 3)) for t in self._sites.values()]
+        return sorted(rows, key=lambda t: -t["ms"])
+
+    def reset(self):
+        with self._lock:
+            self._slowest.clear()
+            self._spans.clear()
+            self._sites.clear()
+
+    # ---- JSONL export (tracer thread only) ----
+
+    def _write(self, entry: Dict):
+        if not self.path:
+            return
+        if self._file is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._file = logging.handlers.RotatingFileHandler(
+                self.path, maxBytes=self.max_bytes, backupCount=self.backups, encoding="utf-8")
+            self._file.setFormatter(logging.Formatter("%(message)s"))
+        self._file.handle(logging.makeLogRecord({"msg": json.dumps(entry, default=str)}))
+
+    def _close(self):
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+
+
+# The process-wide tracer: TracedClient records into it unless given another
+TRACER = Tracer()
+
+
+class TracedQuery:
+    """Passes a query chain through to the wrapped builder, noting its operation and filters for the record"""
+
+    def __init__(self, owner: "TracedClient", table: str, query, op: Optional[str] = None, body=None):
+        self._owner, self._table, self._query = owner, table, query
+        self._op, self._body = op, body
+        self._filters: List[str] = []
+
+    @property
+    def not_(self):
+        self._query = self._query.not_  # a property on the real builder
+        self._filters.append("not")
+        return self
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        method = getattr(self._query, name)
+
+        def record(*args, **kwargs):
+            if self._op is None:
+                self._op = name
+                self._body = args[0] if name in WRITE_OPS and args else None
+            else:
+                self._filters.append(describe(name, args, kwargs))
+            self._query = method(*args, **kwargs)
+            return self
+        return record
+
+    def execute(self):
+        return self._owner._execute(self._query, {
+            "table": self._table, "op": self._op or "?", "filters": self._filters,
+        }, self._body)
+
+
+class TracedClient:
+    """
+    Drop-in wrapper that records every table() query and rpc() call in
+    `tracer`; everything else (storage, auth, cache controls) passes through.
+    """
+
+    def __init__(self, client, tracer: Optional[Tracer] = None, enabled: bool = TRACING_ENABLED):
+        self.client = client
+        self.tracer = tracer or TRACER
+        self.enabled = enabled
+
+    def table(self, name: str):
+        if not self.enabled:
+            return self.client.table(name)
+        return TracedQuery(self, name, self.client.table(name))
+
+    from_ = table
+
+    def rpc(self, fn: str, params: Optional[Dict] = None, *args, **kwargs):
+        query = self.client.rpc(fn, {} if params is None else params, *args, **kwargs)
+        if not self.enabled:
+            return query
+        return TracedQuery(self, fn, query, op="rpc", body=params)
+
+    def _execute(self, query, entry: Dict, body=None):
+        entry["ts"] = datetime.now(timezone.utc).isoformat()
+        entry["site"] = call_site()
+        response = None
+        started = time.perf_counter()
+        try:
+            response = query.execute()
+            return response
+        except Exception as e:
+            entry["error"] = f"{type(e).__name__}: {str(e)[:200]}"
+            raise
+        finally:
+            entry["ms"] = round((time.perf_counter() - started) * 1000, 3)
+            entry["cached"] = getattr(query, "from_cache", False) is True
+            data = getattr(response, "data", None)
+            entry["rows"] = len(data) if isinstance(data, list) else int(data is not None)
+            self.tracer.record(entry, data, body)  # sized on the tracer thread
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
+
+
+def begin_rerun(name: str = "") -> Optional[Span]:
+    """Open the span for this Streamlit rerun (call once, at the top of the script)"""
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+    ctx = get_script_run_ctx(suppress_warning=True)
+    return TRACER.begin_rerun(name, ctx.session_id if ctx else "")
+
+
+def begin_fragment(name: str) -> Optional[Span]:
+    """
+    Open a span when an st.fragment reruns on its own (app.py's begin_rerun
+    doesn't run then, so its calls would land in the previous rerun's span).
+    Inside a full rerun it does nothing: the fragment's calls belong to the page.
+    """
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+    ctx = get_script_run_ctx(suppress_warning=True)
+    if ctx is None or not ctx.fragment_ids_this_run:
+        return None
+    return TRACER.begin_rerun(name, ctx.session_id, kind="fragment")
+
+
+def action(name: str):
+    """Label the calls made after this point in the current rerun as one user action"""
+    TRACER.action(name)
+
+
+# ---- offline analysis ----
+
+def read_trace(path: str = TRACE_FILE) -> List[Dict]:
+    """Every record in the trace file and its rotated backups, oldest first"""
+    rotated = [p for p in glob.glob(f"{glob.escape(path)}.*") if p.rsplit(".", 1)[1].isdigit()]
+    records = []
+    for name in sorted(rotated, key=lambda p: -int(p.rsplit(".", 1)[1])) + [path]:  # path.1 is the newest backup
+        if not os.path.exists(name):
+            continue
+        with open(name, encoding="utf-8") as f:
+            records += [json.loads(line) for line in f if line.strip()]
+    return records
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarise a Supabase trace file")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    top = sub.add_parser("top", help="where the time goes, most total time first")
+    top.add_argument("--path", default=TRACE_FILE)
+    top.add_argument("--by", choices=["site", "table", "action"], default="site")
+    top.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    records = read_trace(args.path)
+    if not records:
+        print(f"⚠️ No trace records in {args.path}")
+        return
+    keys = {
+        "site": lambda r: f"{r['op']} {r['table']}  {r['site']}",
+        "table": lambda r: f"{r['op']} {r['table']}",
+        "action": lambda r: r.get("action") or f"({r.get('kind')})",
+    }[args.by]
+    groups: Dict[str, List[float]] = {}
+    for r in records:
+        groups.setdefault(keys(r), []).append(r["ms"])
+    spans = {r["span"] for r in records}
+    print(f"{len(records)} calls in {len(spans)} spans, {sum(r['ms'] for r in records) / 1000:.1f}s total")
+    print(f"  {'total ms':>10} {'calls':>7} {'p50 ms':>8} {'max ms':>8}  {args.by}")
+    for key, ms in sorted(groups.items(), key=lambda kv: -sum(kv[1]))[:args.limit]:
+        ms.sort()
+        print(f"  {sum(ms):10.1f} {len(ms):7} {ms[len(ms) // 2]:8.1f} {ms[-1]:8.1f}  {key}")
+
+
+if __name__ == "__main__":
+    main()
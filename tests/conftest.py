@@ -0,0 +1,15 @@
+import os
+import sys
+import tempfile
+
+# Before any app module is imported: no trace file, and snapshots and locks
+# in a scratch directory instead of the working tree's .cache/
+_scratch = tempfile.mkdtemp(prefix="mentorlink_tests_")
+os.environ.setdefault("SUPABASE_TRACE_FILE", "")
+os.environ.setdefault("MENTOR_INDEX_PATH", os.path.join(_scratch, "mentor_index.pkl"))
+os.environ.setdefault("MAINTENANCE_LOCK_PATH", os.path.join(_scratch, "maintenance.lock"))
+os.environ.setdefault("MAINTENANCE_STATUS_PATH", os.path.join(_scratch, "maintenance_status.json"))
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_KEY", "test-key")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
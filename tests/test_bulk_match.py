@@ -0,0 +1,67 @@
+from datetime import datetime, timedelta, timezone
+
+from supabase_utils.memory_client import MemoryClient
+from utils.bulk_match import create_bulk_matches, load_bulk_match_inputs, plan_bulk_matches, schedule_kickoff_sessions
+from utils.match_engine import MentorMatcher
+from utils.matching import UserProfile
+
+
+class FakeCalendar:
+    def insert_events(self, bodies, **kwargs):
+        return [({"id": f"evt{i}", "hangoutLink": f"https://meet.google.com/evt{i}", "htmlLink": "#"}, None)
+                for i, _ in enumerate(bodies)]
+
+
+def cohort():
+    """Two mentors with the same skills: one with a single availability row, one with only a weekly rule"""
+    client = MemoryClient()
+    tomorrow = datetime.now(timezone.utc) + timedelta(days=1)
+    client.load("users", [
+        {"userid": "m-rows", "email": "rows@x.com", "role": "Mentor", "status": "Active"},
+        {"userid": "m-rule", "email": "rule@x.com", "role": "Mentor", "status": "Active"},
+    ] + [{"userid": f"e{i}", "email": f"e{i}@x.com", "role": "Mentee", "status": "Active"} for i in range(4)])
+    client.load("profile", [{"userid": f"e{i}", "bio": "", "skills": "python", "goals": "python"} for i in range(4)])
+    client.load("availability", [{
+        "availabilityid": 1, "mentorid": "m-rows", "start": tomorrow.isoformat(),
+        "end": (tomorrow + timedelta(hours=1)).isoformat(), "ruleid": None, "reserved_by": None, "reserved_at": None,
+    }])
+    client.load("availability_rule", [{
+        "ruleid": 1, "mentorid": "m-rule", "byday": list(range(7)), "every_weeks": 1,
+        "start_time": "10:00:00", "end_time": "11:00:00", "tz": "Africa/Lagos",
+        "dtstart": tomorrow.date().isoformat(), "until": None, "exdates": [],
+    }])
+    matcher = MentorMatcher([UserProfile(m, "mentor", "", ["python"], "python") for m in ("m-rows", "m-rule")])
+    rows = {u["userid"]: u for u in client.rows("users")}
+    return client, matcher, rows
+
+
+def test_rule_only_mentor_gets_capacity():
+    client, matcher, rows = cohort()
+
+    inputs = load_bulk_match_inputs(client)
+    plan = plan_bulk_matches(max_per_mentor=3, inputs=inputs, matcher=matcher, mentor_rows=rows)
+
+    assert inputs["free_slots"]["m-rows"] == 1
+    assert inputs["free_slots"]["m-rule"] >= 3
+    assert sorted(p["mentorid"] for p in plan) == ["m-rows", "m-rule", "m-rule", "m-rule"]
+
+
+def test_rule_only_mentor_is_matched_and_booked():
+    client, matcher, rows = cohort()
+    plan = plan_bulk_matches(max_per_mentor=3, inputs=load_bulk_match_inputs(client), matcher=matcher,
+                             mentor_rows=rows)
+
+    created = create_bulk_matches(plan, max_per_mentor=3, client=client)
+    result = schedule_kickoff_sessions(created, client=client, calendar=FakeCalendar())
+
+    assert len(created) == len(plan) == 4
+    assert result["booked"] == 4 and result["no_slot"] == 0
+    rule_sessions = [s for s in client.rows("session") if s["mentorid"] == "m-rule"]
+    assert len(rule_sessions) == 3
+    slots = {a["availabilityid"]: a for a in client.rows("availability")}
+    assert all(slots[s["availabilityid"]]["ruleid"] == 1 for s in rule_sessions)
+    # Materializing again (a second kickoff) reuses the rows
+    before = len(client.rows("availability"))
+    schedule_kickoff_sessions([], client=client)
+    create_bulk_matches(plan, client=client)
+    assert len(client.rows("availability")) == before
@@ -0,0 +1,50 @@
+import smtplib
+import socket
+
+import pytest
+
+from emailer import SMTPConnectionPool, build_message, is_retryable
+
+
+@pytest.mark.parametrize("error, retry", [
+    (smtplib.SMTPServerDisconnected(), True),
+    (smtplib.SMTPConnectError(421, b"busy"), True),
+    (ConnectionResetError(), True),
+    (socket.timeout(), True),
+    (smtplib.SMTPDataError(451, b"try later"), True),
+    (smtplib.SMTPDataError(554, b"rejected"), False),
+    (smtplib.SMTPSenderRefused(550, b"no", "a@x.com"), False),
+    (smtplib.SMTPRecipientsRefused({"b@x.com": (550, b"no such user")}), False),
+    (smtplib.SMTPNotSupportedError(), False),
+])
+def test_only_transient_errors_are_retried(error, retry):
+    assert is_retryable(error) is retry
+
+
+class FakeServer:
+    def __init__(self, error=None):
+        self.error = error
+        self.closed = False
+
+    def send_message(self, msg):
+        if self.error:
+            raise self.error
+
+    def quit(self):
+        self.closed = True
+
+
+@pytest.mark.parametrize("error", [
+    smtplib.SMTPRecipientsRefused({"b@x.com": (550, b"no such user")}),
+    smtplib.SMTPDataError(554, b"rejected"),
+])
+def test_a_rejected_message_keeps_the_connection(monkeypatch, error):
+    pool = SMTPConnectionPool(host="localhost", size=1, timeout=1)
+    server = FakeServer(error)
+    monkeypatch.setattr(pool, "_connect", lambda: server)
+
+    with pytest.raises(type(error)):
+        pool.send(build_message("b@x.com", "Hi", "Body", from_email="a@x.com"))
+
+    assert not server.closed
+    assert pool.acquire() is server  # back in the pool, and its slot is free
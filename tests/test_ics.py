@@ -0,0 +1,127 @@
+import threading
+import urllib.error
+import urllib.request
+from datetime import datetime, timezone
+
+import pytest
+
+from benchmarks.bench_ics import make_sessions, write_fixture
+from supabase_utils.memory_client import MemoryClient
+from utils import ics
+
+EVENTS = 5000
+SESSIONS = 3000
+NOW = datetime.now(timezone.utc)
+
+
+@pytest.fixture(scope="module")
+def fixture_ics(tmp_path_factory):
+    """A 5000-event file mixing UTC/TZID/floating times, DURATION, folded lines, VALARMs and rejects"""
+    path = tmp_path_factory.mktemp("ics") / "fixture.ics"
+    expected, existing = write_fixture(str(path), EVENTS, NOW)
+    return path, expected, existing
+
+
+def import_client(existing):
+    client = MemoryClient()
+    client.load("availability", [{**row, "ruleid": None, "reserved_by": None} for row in existing])
+    return client
+
+
+def test_import_counts_match_the_fixture(fixture_ics):
+    path, expected, existing = fixture_ics
+    client = import_client(existing)
+    client.reset_calls()
+
+    with open(path, "rb") as f:
+        result = ics.import_availability("mentor-1", f, client=client, after=NOW)
+
+    got = {"accepted": result["accepted"], "rejected": result["rejected"], **result["skipped"]}
+    assert got == {**expected, "invalid": 0}
+    assert [c for c in client.calls if c["op"] == "insert"] == [
+        {"table": "availability", "op": "insert", "detail": "", "rows": expected["accepted"]}
+    ]
+    assert len(client.rows("availability")) == len(existing) + expected["accepted"]
+
+
+def test_reimport_adds_nothing(fixture_ics):
+    path, expected, existing = fixture_ics
+    client = import_client(existing)
+    with open(path, "rb") as f:
+        ics.import_availability("mentor-1", f, client=client, after=NOW)
+
+    with open(path, "rb") as f:
+        again = ics.import_availability("mentor-1", f, client=client, after=NOW)
+
+    assert again["accepted"] == 0
+    assert again["rejected"] == expected["accepted"] + expected["rejected"]
+    assert len(client.rows("availability")) == len(existing) + expected["accepted"]
+
+
+def test_parser_streams(fixture_ics):
+    path, _, _ = fixture_ics
+    read = {"lines": 0}
+
+    def lines():
+        with open(path, "rb") as f:
+            for line in f:
+                read["lines"] += 1
+                yield line
+
+    events = ics.iter_events(lines())
+    first = next(events)
+    assert first["uid"] == "event-0@bench"
+    assert read["lines"] < 50  # the first event is out before the rest of the file is read
+    assert 1 + sum(1 for _ in events) == EVENTS
+
+
+def test_feed_round_trips():
+    sessions = make_sessions(SESSIONS, datetime(2030, 1, 1, 9, tzinfo=timezone.utc))
+
+    body = ics.render_feed(sessions)
+    parsed = list(ics.iter_events(body.splitlines(keepends=True)))
+
+    assert len(parsed) == SESSIONS
+    assert [(e["start"], e["end"]) for e in parsed] == [ics._session_times(s) for s in sessions]
+    assert max(len(line.encode()) for line in body.split("\r\n")) <= 75
+
+
+@pytest.fixture
+def feed_server(monkeypatch):
+    monkeypatch.setattr(ics, "FEED_SECRET", "test-secret")
+    sessions = make_sessions(SESSIONS, datetime(2030, 1, 1, 9, tzinfo=timezone.utc))
+    server = ics.serve(0, lambda user_id: sessions)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/feed/", sessions
+    server.shutdown()
+    server.server_close()
+
+
+def get(url, headers=None):
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, headers=headers or {})) as response:
+            return response.status, response.headers, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers, b""
+
+
+def test_feed_conditional_gets(feed_server):
+    base, sessions = feed_server
+    url = f"{base}{ics.feed_token('user-1')}.ics"
+
+    status, headers, body = get(url)
+    assert status == 200 and body.count(b"BEGIN:VEVENT") == SESSIONS
+    etag, last_modified = headers["ETag"], headers["Last-Modified"]
+
+    assert get(url, {"If-None-Match": etag})[::2] == (304, b"")
+    assert get(url, {"If-Modified-Since": last_modified})[0] == 304
+
+    sessions[0] = {**sessions[0], "status": "Cancelled"}
+    status, headers, _ = get(url, {"If-None-Match": etag})
+    assert status == 200 and headers["ETag"] != etag
+
+
+def test_feed_rejects_a_forged_token(feed_server):
+    base, _ = feed_server
+    token = ics.feed_token("user-1").replace("user-1.", "user-2.")
+    assert get(f"{base}{token}.ics")[0] == 404
@@ -0,0 +1,39 @@
+from utils import maintenance
+from utils.maintenance import MaintenanceScheduler, Task
+
+
+class HeldLock:
+    held = True
+
+    def acquire(self):
+        return True
+
+
+def test_failed_once_only_task_is_retried_after_a_backoff(tmp_path, monkeypatch):
+    clock = {"now": 1000.0}
+    monkeypatch.setattr(maintenance.time, "monotonic", lambda: clock["now"])
+    calls = []
+
+    def bootstrap():
+        calls.append(clock["now"])
+        if len(calls) < 3:
+            raise ConnectionError("supabase unreachable")
+        return "created"
+
+    task = Task("setup_admin_account", bootstrap)
+    scheduler = MaintenanceScheduler([task], lock=HeldLock(), status_path=str(tmp_path / "status.json"))
+
+    assert scheduler.run_pending() == 1 and not task.done
+    assert scheduler.run_pending() == 0  # backing off
+    clock["now"] += maintenance.RETRY_SECONDS
+    assert scheduler.run_pending() == 1 and not task.done
+    clock["now"] += maintenance.RETRY_SECONDS  # the second retry waits twice as long
+    assert scheduler.run_pending() == 0
+    clock["now"] += maintenance.RETRY_SECONDS
+    assert scheduler.run_pending() == 1 and task.done
+
+    clock["now"] += 10 * maintenance.RETRY_SECONDS
+    assert scheduler.run_pending() == 0  # done for this leadership
+    assert len(calls) == 3
+    assert scheduler.metrics["setup_admin_account"]["failures"] == 2
+    assert scheduler.metrics["setup_admin_account"]["last_result"] == "created"
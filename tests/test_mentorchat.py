@@ -0,0 +1,30 @@
+import pytest
+
+from benchmarks.bench_mentorchat import FREE_FORM, ROLES, generated_messages, trigger_messages
+from benchmarks.mentorchat_legacy import legacy_mentorchat
+from utils import mentorchat as chat
+
+
+@pytest.mark.parametrize("role", ROLES)
+def test_trigger_phrases_keep_the_canned_answers(role):
+    mismatches = [m for m in trigger_messages() if chat.mentorchat(m, role) != legacy_mentorchat(m, role)]
+    assert mismatches == []
+
+
+@pytest.mark.parametrize("role", ROLES)
+def test_generated_messages_keep_the_canned_answers(role):
+    messages = generated_messages(300)
+    answered = [m for m in messages if legacy_mentorchat(m, role) != chat.FALLBACK]
+    assert answered  # the generator still hits the old chain's keywords
+    assert [m for m in answered if chat.mentorchat(m, role) != legacy_mentorchat(m, role)] == []
+
+
+@pytest.mark.parametrize("message", FREE_FORM)
+def test_faq_answers_what_the_old_chain_did_not(message):
+    faq_answers = {entry["answer"] for entry in chat.FAQ}
+    assert chat.mentorchat(message, "Mentee") in faq_answers
+
+
+def test_spacing_and_case_do_not_change_the_answer():
+    for message in trigger_messages()[:50]:
+        assert chat.mentorchat(f"  {message.upper()}  ", "Mentor") == chat.mentorchat(message, "Mentor")
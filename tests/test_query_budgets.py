@@ -0,0 +1,26 @@
+import pytest
+
+from benchmarks.bench_pages import VIEWS
+from benchmarks.check_query_budgets import BUDGETS, budget_cohort, call_sites, measure_view, over_budget
+
+
+def view_id(page, view):
+    return "-".join([page] + [word for word in view.split() if word.isascii() and word.isalnum()])
+
+
+@pytest.fixture(scope="module")
+def cohort():
+    return budget_cohort()
+
+
+def test_every_view_has_a_budget():
+    assert sorted(f"{page} {view}" for page, view, _, _ in VIEWS) == sorted(BUDGETS)
+
+
+@pytest.mark.parametrize("page, view, script, state", VIEWS, ids=[view_id(p, v) for p, v, _, _ in VIEWS])
+def test_view_within_budget(cohort, page, view, script, state):
+    client, users = cohort
+    cold, warm, errors = measure_view(client, users, page, script, state)
+
+    over = over_budget(f"{page} {view}", cold, warm, errors)
+    assert not over, "\n".join(over + call_sites(cold) + (["warm:"] + call_sites(warm) if warm else []))
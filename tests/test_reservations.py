@@ -0,0 +1,128 @@
+import os
+import random
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from benchmarks.bench_reservations import SqliteReservationStore, connect, setup_db
+from supabase_utils.memory_client import MemoryClient
+from utils.reservations import ReservationStore, book_slot
+
+BOOKERS = 300
+MENTORS = 4
+SLOTS = 40
+
+
+def spike(by_mentor, seed=11):
+    """(mentee, mentor, wanted slot id) per booker; most want one of a mentor's first few slots"""
+    rng = random.Random(seed)
+    mentors = sorted(by_mentor)
+    wants = []
+    for b in range(BOOKERS):
+        mentor = mentors[rng.randrange(len(mentors))]
+        pick = min(int(rng.expovariate(1 / 3)), len(by_mentor[mentor]) - 1)
+        wants.append((f"mentee-{b}", mentor, by_mentor[mentor][pick]))
+    return wants
+
+
+def book_all(wants, store_for):
+    """Book every want from its own thread, all released at once; returns the sessions"""
+    barrier = threading.Barrier(len(wants))
+    local = threading.local()
+
+    def worker(want):
+        mentee_id, mentor_id, slot_id = want
+        if not hasattr(local, "store"):
+            local.store = store_for()
+        barrier.wait()
+        session, _ = book_slot(mentor_id, mentee_id, slot_id, store=local.store, retries=10)
+        return session
+
+    with ThreadPoolExecutor(max_workers=len(wants)) as pool:
+        return list(pool.map(worker, wants))
+
+
+def memory_client():
+    client = MemoryClient(latency=0.001)
+    base = datetime(2030, 1, 6, 9, tzinfo=timezone.utc)
+    client.load("availability", [
+        {"availabilityid": m * SLOTS + i + 1, "mentorid": f"mentor-{m}",
+         "start": (base + timedelta(hours=i)).isoformat(),
+         "end": (base + timedelta(hours=i, minutes=45)).isoformat(),
+         "reserved_by": None, "reserved_at": None}
+        for m in range(MENTORS) for i in range(SLOTS)
+    ])
+    return client
+
+
+def slots_by_mentor(rows):
+    by_mentor = {}
+    for row in sorted(rows, key=lambda r: r["start"]):
+        by_mentor.setdefault(row["mentorid"], []).append(row["availabilityid"])
+    return by_mentor
+
+
+def test_concurrent_bookings_never_share_a_slot():
+    client = memory_client()
+    wants = spike(slots_by_mentor(client.rows("availability")))
+
+    sessions = book_all(wants, lambda: ReservationStore(client))
+
+    booked = [s for s in sessions if s]
+    assert len(booked) == min(BOOKERS, MENTORS * SLOTS)
+    assert not [slot for slot, n in Counter(s["availabilityid"] for s in booked).items() if n > 1]
+    assert len(client.rows("session")) == len(booked)
+    reserved = {a["availabilityid"]: a["reserved_by"] for a in client.rows("availability") if a["reserved_by"]}
+    assert reserved == {s["availabilityid"]: s["menteeid"] for s in booked}
+
+
+def test_concurrent_bookings_on_sqlite(tmp_path):
+    # Real transactions and a unique index, as sql/reservations.sql has
+    path = os.path.join(tmp_path, "reservations.db")
+    setup_db(path, MENTORS, SLOTS, unique_index=True)
+    conn = connect(path)
+    rows = [dict(zip(("availabilityid", "mentorid", "start"), r))
+            for r in conn.execute("select availabilityid, mentorid, start from availability")]
+    conn.close()
+
+    stores = []
+
+    def store_for():
+        store = SqliteReservationStore(path, rtt=0.001)
+        stores.append(store)
+        return store
+
+    try:
+        sessions = book_all(spike(slots_by_mentor(rows)), store_for)
+    finally:
+        for store in stores:
+            store.close()
+
+    booked = [s for s in sessions if s]
+    conn = connect(path)
+    try:
+        assert conn.execute("select count(*) from session").fetchone()[0] == len(booked)
+        assert conn.execute(
+            "select count(*) from (select availabilityid from session group by 1 having count(*) > 1)"
+        ).fetchone()[0] == 0
+        assert conn.execute(
+            "select count(*) from availability a where reserved_by is not null and not exists "
+            "(select 1 from session s where s.availabilityid = a.availabilityid)"
+        ).fetchone()[0] == 0
+    finally:
+        conn.close()
+    assert len(booked) == min(BOOKERS, MENTORS * SLOTS)
+
+
+def test_released_slot_can_be_booked_again():
+    client = memory_client()
+    store = ReservationStore(client)
+    first = store.reserve(1, "mentee-first")
+    assert first and store.reserve(1, "mentee-second") is None
+
+    store.release(1)
+
+    again = store.reserve(1, "mentee-second")
+    assert again and again["menteeid"] == "mentee-second"
+    assert [s["menteeid"] for s in client.rows("session")] == ["mentee-second"]
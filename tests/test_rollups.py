@@ -0,0 +1,29 @@
+from supabase_utils.memory_client import MemoryClient
+from utils import rollups
+
+
+def rollup_client():
+    """Monthly session buckets for every month of 2024 and 2025, count = month number"""
+    client = MemoryClient()
+    client.load(rollups.ROLLUP_TABLE, [
+        # `month` is a generated column in sql/rollups.sql
+        {"grain": "month", "bucket": f"{year}-{month:02d}-01", "month": month, "metric": "sessions",
+         "dimension": "", "mentorid": "", "count": month}
+        for year in (2024, 2025) for month in range(1, 13)
+    ])
+    return client
+
+
+def test_year_and_month_select_one_bucket():
+    df = rollups.monthly_series("sessions", 2025, 3, client=rollup_client())
+    assert df[["month", "count"]].values.tolist() == [["2025-03", 3]]
+
+
+def test_all_years_with_a_month_keeps_that_month_of_every_year():
+    df = rollups.monthly_series("sessions", "All", 3, client=rollup_client())
+    assert df[["month", "count"]].values.tolist() == [["2024-03", 3], ["2025-03", 3]]
+
+
+def test_all_years_and_months_keeps_every_bucket():
+    df = rollups.monthly_series("sessions", "All", "All", client=rollup_client())
+    assert len(df) == 24
@@ -0,0 +1,83 @@
+# utils/analytics.py
+
+from typing import Dict, List, Optional, Tuple
+import pandas as pd
+import streamlit as st
+
+from database import supabase
+from utils import rollups
+
+# Aggregates change slowly; a short cache keeps filter changes instant
+ANALYTICS_TTL = 60
+
+
+def _rpc(name: str, params: Optional[Dict] = None) -> List[dict]:
+    return supabase.rpc(name, params or {}).execute().data or []
+
+
+def _period(year, month) -> Dict:
+    return {"p_year": None if year in (None, "All") else int(year),
+            "p_month": None if month in (None, "All") else int(month)}
+
+
+def _frame(rows: List[dict], columns: List[str]) -> pd.DataFrame:
+    return pd.DataFrame(rows, columns=columns)
+
+
+@st.cache_data(ttl=ANALYTICS_TTL, show_spinner=False)
+def load_periods() -> List[Tuple[int, int]]:
+    """(year, month) pairs with any registrations, sessions or requests"""
+    return rollups.active_months()
+
+
+@st.cache_data(ttl=ANALYTICS_TTL, show_spinner=False)
+def load_summary(year=None, month=None, role: Optional[str] = None) -> Dict:
+    rows = _rpc("analytics_summary", {**_period(year, month), "p_role": role})
+    return rows[0] if rows else {}
+
+
+# Time series below read the pre-aggregated analytics_rollup buckets
+# (sql/rollups.sql), so a filter change costs O(buckets), not O(rows).
+
+@st.cache_data(ttl=ANALYTICS_TTL, show_spinner=False)
+def load_monthly_registrations(year=None, month=None, role: Optional[str] = None) -> pd.DataFrame:
+    df = rollups.monthly_series("users", year, month, dimension=role)
+    return df.rename(columns={"dimension": "role"})[["month", "role", "count"]]
+
+
+@st.cache_data(ttl=ANALYTICS_TTL, show_spinner=False)
+def load_monthly_sessions(year=None, month=None) -> pd.DataFrame:
+    df = rollups.monthly_series("sessions", year, month)
+    return df.rename(columns={"count": "sessions"})[["month", "sessions"]]
+
+
+@st.cache_data(ttl=ANALYTICS_TTL, show_spinner=False)
+def load_rating_histogram(year=None, month=None) -> pd.DataFrame:
+    return _frame(_rpc("analytics_rating_histogram", _period(year, month)), ["rating", "count"])
+
+
+@st.cache_data(ttl=ANALYTICS_TTL, show_spinner=False)
+def load_request_status(year=None, month=None) -> pd.DataFrame:
+    return _frame(_rpc("analytics_request_status", _period(year, month)), ["status", "count"])
+
+
+@st.cache_data(ttl=ANALYTICS_TTL, show_spinner=False)
+def load_request_trend(year=None, month=None) -> pd.DataFrame:
+    df = rollups.monthly_series("requests", year, month)
+    return df.rename(columns={"dimension": "status"})[["month", "status", "count"]]
+
+
+@st.cache_data(ttl=ANALYTICS_TTL, show_spinner=False)
+def load_mentor_performance(year=None, month=None) -> pd.DataFrame:
+    rows = _rpc("analytics_mentor_performance", _period(year, month))
+    return _frame(rows, ["mentorid", "email", "slots", "sessions", "avg_rating"])
+
+
+@st.cache_data(ttl=ANALYTICS_TTL, show_spinner=False)
+def load_top_skills(limit: int = 5) -> pd.DataFrame:
+    return _frame(_rpc("analytics_top_skills", {"p_limit": limit}), ["skill", "count", "unique_skills"])
+
+
+@st.cache_data(ttl=ANALYTICS_TTL, show_spinner=False)
+def load_top_requesting_mentees(limit: int = 5) -> pd.DataFrame:
+    return _frame(_rpc("analytics_top_requesting_mentees", {"p_limit": limit}), ["email", "request_count"])
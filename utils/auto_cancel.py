@@ -1,7 +1,6 @@
 # utils/auto_cancel.py
 
 from datetime import datetime, timedelta
-from dateutil import parser
 from database import supabase
 import pytz
 import time
@@ -14,6 +13,8 @@ logger = logging.getLogger(__name__)
 # Define West Africa Time (WAT)
 WAT = pytz.timezone("Africa/Lagos")
 
+PENDING_TTL_HOURS = 48
+
 def retry_supabase_query(query_func, retries=3, delay=2):
     """Retries a Supabase query up to `retries` times with delay."""
     for attempt in range(retries):
@@ -25,45 +26,31 @@ def retry_supabase_query(query_func, retries=3, delay=2):
             else:
                 raise e
 
+def cancel_pending_requests(new_status, hours=PENDING_TTL_HOURS, now=None, client=None):
+    """
+    Set `new_status` on every PENDING request created more than `hours` ago,
+    in one set-based UPDATE. Returns the number of requests cancelled.
+    """
+    client = client or supabase
+    cutoff = (now or datetime.now(WAT)) - timedelta(hours=hours)
+    response = retry_supabase_query(lambda: client
+        .table("mentorshiprequest")
+        .update({"status": new_status})
+        .eq("status", "PENDING")
+        .lt("createdat", cutoff.isoformat())
+        .execute()
+    )
+    return len(response.data or [])
+
 def cancel_expired_requests():
     """
     Automatically cancel mentorship requests that have been pending for more than 48 hours.
-    Updates status to 'CANCELLED_AUTO'.
+    Updates status to 'CANCELLED_AUTO'. Returns the number cancelled.
     """
     try:
-        response = retry_supabase_query(lambda: supabase
-            .table("mentorshiprequest")
-            .select("mentorshiprequestid, createdat, status")
-            .eq("status", "PENDING")
-            .execute()
-        )
-
-        pending_requests = response.data or []
-        now_wat = datetime.now(WAT)
-
-        logger.info(f"Checking {len(pending_requests)} pending requests...")
-
-        for req in pending_requests:
-            try:
-                created_at = parser.isoparse(req["createdat"])
-
-                # Ensure datetime is timezone-aware in WAT
-                if created_at.tzinfo is None:
-                    created_at = WAT.localize(created_at)
-                else:
-                    created_at = created_at.astimezone(WAT)
-
-                # Cancel if older than 48 hours
-                if now_wat - created_at > timedelta(hours=48):
-                    supabase.table("mentorshiprequest") \
-                        .update({"status": "CANCELLED_AUTO"}) \
-                        .eq("mentorshiprequestid", req["mentorshiprequestid"]) \
-                        .execute()
-
-                    logger.info(f"✅ Auto-cancelled request: {req['mentorshiprequestid']}")
-
-            except Exception as inner_err:
-                logger.warning(f"⚠️ Skipped request {req.get('mentorshiprequestid')} due to: {inner_err}")
-
-    except Exception as outer_err:
-        logger.error(f"❌ Failed to process expired mentorship requests: {outer_err}")
+        cancelled = cancel_pending_requests("CANCELLED_AUTO")
+        logger.info(f"✅ Auto-cancelled {cancelled} expired requests")
+        return cancelled
+    except Exception as err:
+        logger.error(f"❌ Failed to process expired mentorship requests: {err}")
+        raise
@@ -0,0 +1,212 @@
+# utils/availability.py
+
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+import pytz
+
+from database import supabase
+from utils.recurrence import WINDOW_DAYS, expand_rules
+
+WAT = pytz.timezone("Africa/Lagos")
+
+
+def parse_slot_time(value, naive_tz=WAT) -> Optional[datetime]:
+    """Aware datetime from an availability start/end (ISO string or datetime); naive values are `naive_tz`"""
+    if not value:
+        return None
+    dt = value if isinstance(value, datetime) else datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    if dt.tzinfo is None:
+        dt = naive_tz.localize(dt)
+    return dt
+
+
+class AvailabilityIndex:
+    """
+    One mentor's availability slots kept sorted by start, plus the merged
+    coverage (union of all slots, adjacent slots joined) as disjoint sorted
+    intervals. Overlap checks and "free slots in a window" are bisects
+    instead of scans over every slot.
+    """
+
+    def __init__(self, rows: Iterable[dict] = (), used_ids: Iterable = (), naive_tz=WAT):
+        self.naive_tz = naive_tz
+        self.used_ids = set(used_ids)
+        self.invalid: List[dict] = []  # rows with missing/unparsable times
+        self._starts: List[float] = []
+        self._slots: List[Tuple[float, float, datetime, datetime, dict]] = []
+        self._cov_starts: List[float] = []
+        self._cov_ends: List[float] = []
+
+        for row in rows:
+            if row.get("reserved_by"):  # claimed via sql/reservations.sql
+                self.used_ids.add(row.get("availabilityid"))
+            slot = self._parse(row)
+            if slot is None:
+                self.invalid.append(row)
+            else:
+                self._slots.append(slot)
+        self._slots.sort(key=lambda s: (s[0], s[1]))
+        self._starts = [s[0] for s in self._slots]
+        self._rebuild_coverage()
+
+    def __len__(self):
+        return len(self._slots)
+
+    def _parse(self, row: dict):
+        try:
+            start = parse_slot_time(row.get("start"), self.naive_tz)
+            end = parse_slot_time(row.get("end"), self.naive_tz)
+        except (TypeError, ValueError):
+            return None
+        if start is None or end is None or end <= start:
+            return None
+        return (start.timestamp(), end.timestamp(), start, end, row)
+
+    def _rebuild_coverage(self):
+        cov_starts, cov_ends = [], []
+        for start, end, *_ in self._slots:
+            if cov_ends and start <= cov_ends[-1]:
+                cov_ends[-1] = max(cov_ends[-1], end)
+            else:
+                cov_starts.append(start)
+                cov_ends.append(end)
+        self._cov_starts, self._cov_ends = cov_starts, cov_ends
+
+    def _covered(self, start: float, end: float) -> bool:
+        i = bisect_left(self._cov_starts, end)
+        return i > 0 and self._cov_ends[i - 1] > start
+
+    # ---- Queries ----
+
+    def overlaps(self, start: datetime, end: datetime) -> bool:
+        """True if [start, end) intersects any existing slot (O(log n))"""
+        return self._covered(parse_slot_time(start, self.naive_tz).timestamp(),
+                             parse_slot_time(end, self.naive_tz).timestamp())
+
+    def merged(self) -> List[Tuple[datetime, datetime]]:
+        """Coverage with overlapping and back-to-back slots joined"""
+        tz = self.naive_tz
+        return [(datetime.fromtimestamp(s, tz), datetime.fromtimestamp(e, tz))
+                for s, e in zip(self._cov_starts, self._cov_ends)]
+
+    def slots(self) -> List[Tuple[datetime, datetime, dict]]:
+        """Every slot as (start, end, row), in start order"""
+        return [(s[2], s[3], s[4]) for s in self._slots]
+
+    def free_slots(self, after: Optional[datetime] = None, days: Optional[float] = None,
+                   limit: Optional[int] = None) -> List[Tuple[datetime, datetime, dict]]:
+        """
+        Unbooked slots starting strictly after `after` (default: now) and, with
+        `days`, before `after + days`, as (start, end, row) in start order.
+        """
+        after = parse_slot_time(after, self.naive_tz) if after else datetime.now(pytz.utc)
+        lo = bisect_right(self._starts, after.timestamp())
+        hi = bisect_left(self._starts, (after + timedelta(days=days)).timestamp()) if days is not None else len(self._starts)
+
+        free = []
+        for start, end, start_dt, end_dt, row in self._slots[lo:hi]:
+            if row.get("availabilityid") in self.used_ids:
+                continue
+            free.append((start_dt, end_dt, row))
+            if limit is not None and len(free) >= limit:
+                break
+        return free
+
+    # ---- Updates ----
+
+    def add(self, row: dict) -> bool:
+        """Insert one slot unless it overlaps an existing one"""
+        slot = self._parse(row)
+        if slot is None or self._covered(slot[0], slot[1]):
+            return False
+        i = bisect_right(self._starts, slot[0])
+        self._starts.insert(i, slot[0])
+        self._slots.insert(i, slot)
+
+        # Splice the slot into the coverage, joining touching neighbours
+        start, end = slot[0], slot[1]
+        j = bisect_left(self._cov_starts, start)
+        if j > 0 and self._cov_ends[j - 1] == start:
+            j -= 1
+            start = self._cov_starts[j]
+            del self._cov_starts[j], self._cov_ends[j]
+        if j < len(self._cov_starts) and self._cov_starts[j] == end:
+            end = self._cov_ends[j]
+            del self._cov_starts[j], self._cov_ends[j]
+        self._cov_starts.insert(j, start)
+        self._cov_ends.insert(j, end)
+        return True
+
+    def bulk_add(self, rows: Iterable[dict]) -> Tuple[List[dict], List[dict]]:
+        """
+        Insert many candidate slots at once: sorted sweep, O(m log n) checks and
+        one linear merge. Candidates overlapping existing slots or an earlier
+        accepted candidate are rejected. Returns (accepted, rejected) rows.
+        """
+        parsed, rejected = [], []
+        for row in rows:
+            if row.get("reserved_by"):  # claimed via sql/reservations.sql
+                self.used_ids.add(row.get("availabilityid"))
+            slot = self._parse(row)
+            if slot is None:
+                rejected.append(row)
+            else:
+                parsed.append(slot)
+        parsed.sort(key=lambda s: (s[0], s[1]))
+
+        accepted = []
+        last_end = float("-inf")
+        for slot in parsed:
+            if slot[0] < last_end or self._covered(slot[0], slot[1]):
+                rejected.append(slot[4])
+                continue
+            accepted.append(slot)
+            last_end = slot[1]
+
+        if accepted:
+            self._slots = sorted(self._slots + accepted, key=lambda s: (s[0], s[1]))  # merge of two sorted runs
+            self._starts = [s[0] for s in self._slots]
+            self._rebuild_coverage()
+        return [s[4] for s in accepted], rejected
+
+    def remove(self, availability_id) -> bool:
+        for i, slot in enumerate(self._slots):
+            if slot[4].get("availabilityid") == availability_id:
+                del self._slots[i], self._starts[i]
+                self._rebuild_coverage()
+                return True
+        return False
+
+    def mark_used(self, availability_id):
+        self.used_ids.add(availability_id)
+
+
+def load_availability_index(mentor_id, client=None, naive_tz=WAT, rules: Optional[List[dict]] = None,
+                            window_days: int = WINDOW_DAYS) -> AvailabilityIndex:
+    """
+    One mentor's slots and which of them are booked, in two scoped queries.
+    With `rules`, their occurrences over the next `window_days` are included
+    as virtual (not yet materialized) slots.
+    """
+    client = client or supabase
+    rows = client.table("availability").select("*").eq("mentorid", mentor_id).execute().data or []
+    booked = client.table("session").select("availabilityid").eq("mentorid", mentor_id).execute().data or []
+    if rules:
+        now = datetime.now(pytz.utc)
+        rows += expand_rules(rules, now, now + timedelta(days=window_days), rows)
+    return AvailabilityIndex(rows, {b["availabilityid"] for b in booked if b.get("availabilityid")}, naive_tz)
+
+
+def add_slots(mentor_id, candidates: List[Dict], index: Optional[AvailabilityIndex] = None, client=None) -> Dict[str, List[dict]]:
+    """
+    Validate many {start, end[, date]} candidates against the mentor's slots and
+    each other, then write the accepted ones in a single insert.
+    """
+    client = client or supabase
+    index = index or load_availability_index(mentor_id, client)
+    accepted, rejected = index.bulk_add([{**c, "mentorid": mentor_id} for c in candidates])
+    if accepted:
+        rows = [{k: (v.isoformat() if isinstance(v, datetime) else v) for k, v in row.items()} for row in accepted]
+        client.table("availability").insert(rows).execute()
+    return {"accepted": accepted, "rejected": rejected}
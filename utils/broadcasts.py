@@ -0,0 +1,115 @@
+# utils/broadcasts.py
+"""
+Direct and broadcast messages with compact read state (sql/broadcasts.sql).
+Personal messages keep their `is_read` flag; broadcast reads are one row per
+user (a high-water mark over `messages.seq` plus out-of-order reads above it).
+
+    python -m utils.broadcasts backfill   # carry over message_reads once
+"""
+
+import argparse
+import logging
+import uuid
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from database import supabase
+
+logger = logging.getLogger(__name__)
+
+INBOX_PAGE_SIZE = 50
+READ_STATE_TABLE = "broadcast_read_state"
+
+
+def is_broadcast(msg: Dict) -> bool:
+    return msg.get("receiver_id") is None
+
+
+def send_message(sender_id, title: str, body: str, receiver_id=None, role: Optional[str] = None, client=None) -> Dict:
+    """One row per message: receiver_id for a direct message, else a broadcast to `role` (None = everyone)"""
+    client = client or supabase
+    row = {
+        "id": str(uuid.uuid4()),
+        "sender_id": sender_id,
+        "receiver_id": receiver_id,
+        "role": role,
+        "title": title,
+        "body": body,
+        "created_at": datetime.now().isoformat(),
+        "is_read": False,
+    }
+    client.table("messages").insert(row).execute()
+    return row
+
+
+def load_inbox(user_id, role: str, limit: int = INBOX_PAGE_SIZE, client=None) -> List[Dict]:
+    """Newest `limit` messages addressed to the user, their role or everyone"""
+    client = client or supabase
+    audience = f"or(role.is.null,role.eq.{role})" if role else "role.is.null"
+    return client.table("messages").select("*") \
+        .or_(f"receiver_id.eq.{user_id},and(receiver_id.is.null,{audience})") \
+        .order("seq", desc=True).limit(limit).execute().data or []
+
+
+def load_read_state(user_id, client=None) -> Dict:
+    client = client or supabase
+    rows = client.table(READ_STATE_TABLE).select("read_through, read_extra") \
+        .eq("user_id", str(user_id)).execute().data or []
+    state = rows[0] if rows else {}
+    return {"read_through": state.get("read_through") or 0, "read_extra": set(state.get("read_extra") or [])}
+
+
+def is_read(msg: Dict, state: Dict) -> bool:
+    if not is_broadcast(msg):
+        return bool(msg.get("is_read"))
+    return msg["seq"] <= state["read_through"] or msg["seq"] in state["read_extra"]
+
+
+def unread_count(user_id, role: str, client=None) -> int:
+    """Unread direct + broadcast messages in one query, however long the history"""
+    client = client or supabase
+    return client.rpc("inbox_unread_count", {"p_user_id": user_id, "p_role": role}).execute().data or 0
+
+
+def mark_read(user_id, role: str, messages: Iterable[Dict], client=None):
+    """Batch mark-as-read: one update for direct messages, one RPC for broadcasts"""
+    client = client or supabase
+    messages = list(messages)
+    personal_ids = [m["id"] for m in messages if not is_broadcast(m) and not m.get("is_read")]
+    broadcast_seqs = [m["seq"] for m in messages if is_broadcast(m)]
+
+    if personal_ids:
+        client.table("messages").update({"is_read": True}).in_("id", personal_ids).execute()
+    if broadcast_seqs:
+        client.rpc("mark_broadcasts_read", {
+            "p_user_id": str(user_id), "p_role": role, "p_seqs": broadcast_seqs,
+        }).execute()
+
+
+def mark_all_read(user_id, role: str, client=None):
+    client = client or supabase
+    client.table("messages").update({"is_read": True}).eq("receiver_id", user_id).eq("is_read", False).execute()
+    client.rpc("mark_all_broadcasts_read", {"p_user_id": str(user_id), "p_role": role}).execute()
+
+
+def backfill(client=None) -> int:
+    """Fold existing message_reads rows into broadcast_read_state"""
+    client = client or supabase
+    users = client.rpc("broadcast_read_backfill", {}).execute().data
+    logger.info(f"✅ Broadcast read state backfilled for {users} users")
+    return users
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("backfill", help="fold message_reads into broadcast_read_state")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    if args.command == "backfill":
+        backfill()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+# utils/bulk_match.py
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+import pytz
+
+from database import supabase
+from utils.data_loader import DataLoader
+from utils.matching import UserProfile
+from utils.match_engine import MentorMatcher
+from utils.mentor_index import get_mentor_index, split_skills
+from utils.availability import parse_slot_time
+from utils.outbox import OutboxStore, booking_email, event_id_for
+from utils.recurrence import RULES_TABLE, WINDOW_DAYS, expand_rules, load_rules, materialize_rules
+from utils.reservations import ReservationStore
+
+WAT = pytz.timezone("Africa/Lagos")
+
+OPEN_STATUSES = ["PENDING", "ACCEPTED"]
+
+
+def assign_pairs(scores: np.ndarray, capacity: np.ndarray, min_score: float = 0.0) -> List[Tuple[int, int, float]]:
+    """
+    Capacity-constrained assignment of mentees (rows) to mentors (columns).
+
+    Greedy over all pairs in descending score order: a pair is taken when the
+    mentee is still unassigned and the mentor has capacity left. Ties keep
+    mentee/mentor order.
+    Returns (mentee_row, mentor_col, score) triples.
+    """
+    m, n = scores.shape
+    if m == 0 or n == 0:
+        return []
+
+    flat = scores.ravel()
+    pair_ids = np.flatnonzero((flat >= min_score) & np.tile(capacity > 0, m))
+    pair_ids = pair_ids[np.argsort(-flat[pair_ids], kind="stable")]
+
+    remaining = capacity.astype(np.int64).copy()
+    assigned = np.zeros(m, dtype=bool)
+    left_to_assign = m
+    pairs = []
+    for pair_id in pair_ids.tolist():
+        row, col = divmod(pair_id, n)
+        if assigned[row] or remaining[col] <= 0:
+            continue
+        assigned[row] = True
+        remaining[col] -= 1
+        pairs.append((row, col, float(flat[pair_id])))
+        left_to_assign -= 1
+        if left_to_assign == 0 or not remaining.any():
+            break
+    return pairs
+
+
+def load_bulk_match_inputs(client=None) -> Dict:
+    """
+    Everything the solver needs in a handful of set-based queries:
+    unmatched active mentees, open requests, and free upcoming slots per mentor
+    (availability rows plus recurring-rule occurrences in the next WINDOW_DAYS).
+    """
+    client = client or supabase
+
+    mentees = client.table("users").select("userid, email, profile(bio, skills, goals)") \
+        .eq("role", "Mentee").eq("status", "Active").execute().data or []
+
+    open_requests = client.table("mentorshiprequest").select("mentorid, menteeid") \
+        .in_("status", OPEN_STATUSES).execute().data or []
+
+    now = datetime.now(WAT)
+    slots = client.table("availability").select("availabilityid, mentorid, start, ruleid") \
+        .gte("start", now.isoformat()).execute().data or []
+    rules = client.table(RULES_TABLE).select("*").execute().data or []
+
+    booked = DataLoader(client).load_many("session", "availabilityid", [s["availabilityid"] for s in slots], "availabilityid")
+    used_ids = {aid for aid, rows in booked.items() if rows}
+
+    free_slots: Dict[str, int] = {}
+    for slot in slots:
+        if slot["availabilityid"] not in used_ids:
+            free_slots[slot["mentorid"]] = free_slots.get(slot["mentorid"], 0) + 1
+    # Occurrences without a row yet are free by definition
+    for slot in expand_rules(rules, now, now + timedelta(days=WINDOW_DAYS), materialized=slots):
+        free_slots[slot["mentorid"]] = free_slots.get(slot["mentorid"], 0) + 1
+
+    return {"mentees": mentees, "open_requests": open_requests, "free_slots": free_slots}
+
+
+def plan_bulk_matches(
+    max_per_mentor: int = 3,
+    min_score: float = 0.0,
+    inputs: Optional[Dict] = None,
+    matcher: Optional[MentorMatcher] = None,
+    mentor_rows: Optional[Dict[str, dict]] = None,
+) -> List[Dict]:
+    """
+    Score every unmatched mentee against every active mentor and solve the
+    assignment. A mentor's capacity is the smaller of `max_per_mentor` minus
+    their open requests and their free upcoming availability slots.
+    """
+    if matcher is None:
+        index = get_mentor_index()
+        matcher, mentor_rows = index.matcher, index.rows
+    inputs = inputs or load_bulk_match_inputs()
+
+    matched_mentees = {r["menteeid"] for r in inputs["open_requests"]}
+    mentee_rows = [m for m in inputs["mentees"] if m["userid"] not in matched_mentees]
+    mentees = [
+        UserProfile(
+            user_id=row["userid"],
+            role="mentee",
+            bio=(row.get("profile") or {}).get("bio") or "",
+            skills=split_skills((row.get("profile") or {}).get("skills")),
+            goals=(row.get("profile") or {}).get("goals") or "",
+        )
+        for row in mentee_rows
+    ]
+
+    mentors = matcher.mentors
+    open_per_mentor: Dict[str, int] = {}
+    for r in inputs["open_requests"]:
+        open_per_mentor[r["mentorid"]] = open_per_mentor.get(r["mentorid"], 0) + 1
+    capacity = np.array([
+        max(0, min(max_per_mentor - open_per_mentor.get(m.id, 0), inputs["free_slots"].get(m.id, 0)))
+        for m in mentors
+    ], dtype=np.int64)
+
+    scores = matcher.raw_score_matrix(mentees)
+    pairs = assign_pairs(scores, capacity, min_score=min_score)
+
+    mentor_rows = mentor_rows or {}
+    return [{
+        "menteeid": mentees[row].id,
+        "mentee_email": mentee_rows[row].get("email"),
+        "mentorid": mentors[col].id,
+        "mentor_email": (mentor_rows.get(mentors[col].id) or {}).get("email"),
+        "score": round(score, 2),
+    } for row, col, score in pairs]
+
+
+def materialize_rule_slots(mentor_ids: Iterable, client=None) -> int:
+    """
+    Turn the mentors' recurring-rule occurrences in the next WINDOW_DAYS into
+    availability rows, so the slot checks in create_bulk_matches and
+    reserve_next_slot (which only see rows) count them as the plan did.
+    """
+    now = datetime.now(WAT)
+    rules = load_rules(mentor_ids, client)
+    return materialize_rules([r for mentor_rules in rules.values() for r in mentor_rules],
+                             now, now + timedelta(days=WINDOW_DAYS), client)
+
+
+def create_bulk_matches(plan: List[Dict], status: str = "ACCEPTED", max_per_mentor: int = 3,
+                        client=None) -> List[Dict]:
+    """
+    Write the planned pairs in one RPC (sql/bulk_match.sql), which re-checks
+    each pair against the current requests and slots: a mentee matched since
+    the plan was computed, or a mentor now at `max_per_mentor` or out of free
+    slots, is skipped. Returns the pairs actually created.
+    """
+    if not plan:
+        return []
+    client = client or supabase
+    materialize_rule_slots([p["mentorid"] for p in plan], client)
+    rows = client.rpc("create_bulk_matches", {
+        "p_pairs": [{"menteeid": p["menteeid"], "mentorid": p["mentorid"]} for p in plan],
+        "p_status": status,
+        "p_max_per_mentor": max_per_mentor,
+    }).execute().data or []
+    if hasattr(client, "invalidate"):
+        client.invalidate("mentorshiprequest")
+    created = {(str(r["menteeid"]), str(r["mentorid"])) for r in rows}
+    return [p for p in plan if (str(p["menteeid"]), str(p["mentorid"])) in created]
+
+
+def schedule_kickoff_sessions(plan: List[Dict], client=None, calendar=None, summary: str = "Mentorship Kickoff",
+                              concurrency: int = 8) -> Dict[str, int]:
+    """
+    Book every planned pair's earliest free slot, create all their calendar
+    events in batched requests, and queue the confirmation emails. Events
+    that fail to create are queued as outbox calendar jobs, which retry and
+    send the emails themselves.
+    """
+    from utils.google_calendar import event_body, get_calendar_client
+
+    client = client or supabase
+    if not plan:
+        return {"booked": 0, "no_slot": 0, "events": 0, "queued": 0, "pooled": 0}
+
+    requests = client.table("mentorshiprequest").select("mentorshiprequestid, menteeid, mentorid") \
+        .in_("menteeid", [p["menteeid"] for p in plan]).eq("status", "ACCEPTED").execute().data or []
+    request_ids = {(r["menteeid"], r["mentorid"]): r["mentorshiprequestid"] for r in requests}
+
+    materialize_rule_slots([p["mentorid"] for p in plan], client)
+    store = ReservationStore(client)
+
+    def reserve(pair):
+        return store.reserve_next(pair["mentorid"], pair["menteeid"],
+                                  request_id=request_ids.get((pair["menteeid"], pair["mentorid"])))
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        sessions = list(pool.map(reserve, plan))
+
+    booked = []
+    pooled = 0
+    for pair, session in zip(plan, sessions):
+        if not session:
+            continue
+        if session.get("meet_link"):
+            # Claimed a pooled Meet event (sql/meet_pool.sql); its meet_patch job sends the invites
+            pooled += 1
+            continue
+        start = parse_slot_time(session.get("date"))
+        end = parse_slot_time(session.get("end_time")) or start
+        emails = [pair.get("mentor_email"), pair.get("mentee_email")]
+        booked.append((session["sessionid"], start, end, emails))
+
+    bodies = [event_body(start, end, summary, emails, event_id_for(f"session:{sid}:calendar"))
+              for sid, start, end, emails in booked]
+    results = (calendar or get_calendar_client()).insert_events(bodies) if bodies else []
+
+    jobs = []
+    created = 0
+    for (sid, start, end, emails), (event, error) in zip(booked, results):
+        if event is not None:
+            created += 1
+            subject, body = booking_email(start, end, event.get("hangoutLink"), event.get("htmlLink"))
+            jobs += [{"kind": "email", "payload": {"to": email, "subject": subject, "body": body},
+                      "key": f"session:{sid}:email:{email}"} for email in dict.fromkeys(e for e in emails if e)]
+        else:
+            jobs.append({"kind": "calendar_event", "key": f"session:{sid}:calendar", "payload": {
+                "sessionid": sid, "start": start.isoformat(), "end": end.isoformat(),
+                "summary": summary, "emails": emails,
+            }})
+    OutboxStore(client).enqueue_many(jobs)
+
+    return {"booked": len(booked) + pooled, "no_slot": len(plan) - len(booked) - pooled, "events": created,
+            "queued": len(booked) - created, "pooled": pooled}
@@ -0,0 +1,87 @@
+# utils/chat_history.py
+"""
+MentorChat history for one user: the latest turns in a ring buffer, older
+ones (optionally) spilled to a compact per-user JSONL log so "load older"
+can still page back through them. Nothing here grows with the length of a
+chat session except the log file.
+"""
+
+import json
+import os
+import re
+import time
+from collections import deque
+from typing import List, Optional, Tuple
+
+CHAT_HISTORY_CAP = int(os.getenv("MENTORCHAT_HISTORY_CAP", 200))  # turns kept in memory
+CHAT_PAGE_SIZE = int(os.getenv("MENTORCHAT_PAGE_SIZE", 20))  # turns rendered per page
+CHAT_LOG_DIR = os.getenv("MENTORCHAT_LOG_DIR", "")  # empty: older turns are dropped, not spilled
+
+Turn = Tuple[float, str, str]  # (timestamp, question, answer)
+
+
+def log_path_for(user_id, log_dir: str = CHAT_LOG_DIR) -> Optional[str]:
+    """Per-user log file, or None when spilling is off or the user is unknown"""
+    if not log_dir or not user_id:
+        return None
+    return os.path.join(log_dir, re.sub(r"[^A-Za-z0-9_.-]", "_", str(user_id)) + ".jsonl")
+
+
+def _tail_lines(path: str, n: int, block: int = 65536) -> List[bytes]:
+    """The last `n` lines of a file, oldest first, reading backwards from the end"""
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        data = b""
+        while pos > 0 and data.count(b"\n") <= n:
+            step = min(block, pos)
+            pos -= step
+            f.seek(pos)
+            data = f.read(step) + data
+    lines = data.splitlines()
+    if pos > 0:
+        lines = lines[1:]  # may start mid-line
+    return lines[-n:] if n > 0 else []
+
+
+class ChatHistory:
+    """Ring buffer of the latest `cap` turns; evicted turns are appended to `log_path` if given"""
+
+    def __init__(self, cap: int = CHAT_HISTORY_CAP, log_path: Optional[str] = None):
+        self.turns: deque = deque(maxlen=cap)
+        self.log_path = log_path
+        self.spilled = 0
+        if log_path and os.path.exists(log_path):
+            with open(log_path, "rb") as f:
+                self.spilled = sum(block.count(b"\n") for block in iter(lambda: f.read(65536), b""))
+
+    def __len__(self):
+        return len(self.turns) + self.spilled
+
+    def append(self, question: str, answer: str):
+        if len(self.turns) == self.turns.maxlen:
+            self._spill(self.turns[0])
+        self.turns.append((time.time(), question, answer))
+
+    def _spill(self, turn: Turn):
+        if not self.log_path:
+            return
+        os.makedirs(os.path.dirname(self.log_path) or ".", exist_ok=True)
+        with open(self.log_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(turn, ensure_ascii=False, separators=(",", ":")) + "\n")
+        self.spilled += 1
+
+    def window(self, n: int) -> List[Turn]:
+        """The latest `n` turns, oldest first; reaches into the log past the buffer"""
+        recent = list(self.turns)[-n:] if n > 0 else []
+        missing = min(n - len(recent), self.spilled)
+        if missing <= 0 or not self.log_path:
+            return recent
+        older = [tuple(json.loads(line)) for line in _tail_lines(self.log_path, missing)]
+        return older + recent
+
+    def clear(self):
+        self.turns.clear()
+        if self.log_path and os.path.exists(self.log_path):
+            os.remove(self.log_path)
+        self.spilled = 0
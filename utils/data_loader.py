@@ -0,0 +1,75 @@
+# utils/data_loader.py
+
+import logging
+from typing import Dict, Hashable, Iterable, List, Tuple
+
+from database import supabase
+
+logger = logging.getLogger(__name__)
+
+IN_FILTER_CHUNK = 200  # keep PostgREST in_() URLs well under proxy limits
+
+
+def chunked(values: List, size: int = IN_FILTER_CHUNK):
+    for i in range(0, len(values), size):
+        yield values[i:i + size]
+
+
+class DataLoader:
+    """
+    Request-scoped batching loader over the Supabase client.
+
+    Create one per render. Instead of one `.eq(key_column, key)` query per card,
+    call `load_many` once with every key the page will need; rows are fetched
+    with a single `.in_(key_column, [...])` query (chunked for very long lists)
+    and later per-key `load` calls are served from the loader's memo.
+    """
+
+    def __init__(self, client=None):
+        self.client = client or supabase
+        self._memo: Dict[tuple, List[dict]] = {}
+        self.query_count = 0
+        self.rows_loaded = 0
+        self.queries: List[Dict] = []
+
+    def load_many(self, table: str, key_column: str, keys: Iterable[Hashable], columns: str = "*",
+                  filters: Tuple[Tuple[str, str, Hashable], ...] = ()) -> Dict[Hashable, List[dict]]:
+        """
+        Rows grouped by key for every requested key (missing keys map to []).
+        `filters` are extra (op, column, value) conditions applied to every
+        chunk, e.g. `(("gte", "start", since),)`.
+        """
+        keys = list(dict.fromkeys(k for k in keys if k is not None))
+        filters = tuple(filters)
+        missing = [k for k in keys if (table, key_column, columns, filters, k) not in self._memo]
+
+        select = columns
+        if columns != "*" and key_column not in [c.strip() for c in columns.split(",")]:
+            select = f"{columns}, {key_column}"
+
+        for chunk in chunked(missing):
+            query = self.client.table(table).select(select).in_(key_column, chunk)
+            for op, column, value in filters:
+                query = getattr(query, op)(column, value)
+            rows = query.execute().data or []
+            self.query_count += 1
+            self.rows_loaded += len(rows)
+            self.queries.append({"table": table, "key": key_column, "keys": len(chunk), "rows": len(rows)})
+
+            grouped: Dict[Hashable, List[dict]] = {k: [] for k in chunk}
+            for row in rows:
+                grouped.setdefault(row.get(key_column), []).append(row)
+            for k, group in grouped.items():
+                self._memo[(table, key_column, columns, filters, k)] = group
+
+        return {k: self._memo.get((table, key_column, columns, filters, k), []) for k in keys}
+
+    def load(self, table: str, key_column: str, key: Hashable, columns: str = "*") -> List[dict]:
+        """Rows for one key; a memo hit if the key was part of an earlier load_many"""
+        return self.load_many(table, key_column, [key], columns).get(key, [])
+
+    def stats(self) -> Dict:
+        return {"queries": self.query_count, "rows": self.rows_loaded, "calls": list(self.queries)}
+
+    def log_stats(self, page: str):
+        logger.debug(f"{page}: {self.query_count} batched queries, {self.rows_loaded} rows")
@@ -1,46 +1,179 @@
+import os
+import threading
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+import google_auth_httplib2
+import httplib2
 import streamlit as st
 from google.oauth2 import service_account
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
-from datetime import datetime, timezone
+from googleapiclient.http import BatchHttpRequest, HttpRequest
 
 # Define the required scope for calendar access
 SCOPES = ['https://www.googleapis.com/auth/calendar']
+CALENDAR_ID = 'ezekielo.balogun@gmail.com'  # ✅ Ensure this calendar is shared with your service account
+CALENDAR_ROOT_URL = os.getenv("GOOGLE_CALENDAR_ROOT_URL", "https://www.googleapis.com/")  # point at a local fake in tests
+BATCH_SIZE = 50  # Calendar API limit for requests per batch
+HTTP_TIMEOUT = 30
+
+
+class CalendarClient:
+    """
+    A Calendar v3 service built once from the bundled (static) discovery
+    document. The service-account credentials and their access token are
+    shared by every call and refreshed by google-auth when they expire. Each
+    thread gets its own keep-alive connection, since httplib2 is not
+    thread-safe.
+    """
+
+    def __init__(self, credentials=None, root_url: str = CALENDAR_ROOT_URL, calendar_id: str = CALENDAR_ID):
+        self.credentials = credentials
+        self.root_url = root_url.rstrip("/") + "/"
+        self.calendar_id = calendar_id
+        self.batch_uri = f"{self.root_url}batch/calendar/v3"
+        self._local = threading.local()
+        client_options = {"api_endpoint": f"{self.root_url}calendar/v3/"}
+        self.service = build('calendar', 'v3', http=self.http(), requestBuilder=self._request,
+                             static_discovery=True, cache_discovery=False, client_options=client_options)
+
+    def http(self):
+        """This thread's connection, authorized with the shared credentials"""
+        http = getattr(self._local, "http", None)
+        if http is None:
+            http = httplib2.Http(timeout=HTTP_TIMEOUT)
+            if self.credentials is not None:
+                http = google_auth_httplib2.AuthorizedHttp(self.credentials, http=http)
+            self._local.http = http
+        return http
+
+    def _request(self, _http, *args, **kwargs):
+        return HttpRequest(self.http(), *args, **kwargs)
+
+    def insert_event(self, body: Dict, **params) -> Dict:
+        """Insert one event; with body['id'], a 409 returns the existing event"""
+        try:
+            return self.service.events().insert(calendarId=self.calendar_id, body=body, **params).execute()
+        except HttpError as error:
+            if body.get('id') and error.resp.status == 409:
+                return self.service.events().get(calendarId=self.calendar_id, eventId=body['id']).execute()
+            raise
+
+    def insert_events(self, bodies: List[Dict], batch_size: int = BATCH_SIZE,
+                      **params) -> List[Tuple[Optional[Dict], Optional[Exception]]]:
+        """
+        Insert many events with one batched HTTP request per `batch_size`.
+        Returns (event, error) per body, in order. Bodies with an 'id' that
+        already exists (409) resolve to the existing event, also batched.
+        `params` go to every insert (e.g. conferenceDataVersion=1).
+        """
+        results: List[Tuple[Optional[Dict], Optional[Exception]]] = [(None, None)] * len(bodies)
+        events = self.service.events()
+        self._run_batches([(i, events.insert(calendarId=self.calendar_id, body=body, **params))
+                           for i, body in enumerate(bodies)], results, batch_size)
+
+        conflicts = [
+            i for i, (_, error) in enumerate(results)
+            if isinstance(error, HttpError) and error.resp.status == 409 and bodies[i].get('id')
+        ]
+        self._run_batches([(i, events.get(calendarId=self.calendar_id, eventId=bodies[i]['id'])) for i in conflicts],
+                          results, batch_size)
+        return results
+
+    def get_events(self, event_ids: List[str], batch_size: int = BATCH_SIZE) -> List[Tuple[Optional[Dict], Optional[Exception]]]:
+        """Fetch events by id, batched; (event, error) per id, in order"""
+        results: List[Tuple[Optional[Dict], Optional[Exception]]] = [(None, None)] * len(event_ids)
+        events = self.service.events()
+        self._run_batches([(i, events.get(calendarId=self.calendar_id, eventId=event_id))
+                           for i, event_id in enumerate(event_ids)], results, batch_size)
+        return results
+
+    def patch_event(self, event_id: str, body: Dict, send_updates: str = "all") -> Dict:
+        """Update the given fields of an event; attendees are notified by default"""
+        return self.service.events().patch(calendarId=self.calendar_id, eventId=event_id, body=body,
+                                           sendUpdates=send_updates).execute()
+
+    def _run_batches(self, requests, results, batch_size):
+        def callback(request_id, response, exception):
+            results[int(request_id)] = (response, exception)
+
+        for start in range(0, len(requests), batch_size):
+            batch = BatchHttpRequest(callback=callback, batch_uri=self.batch_uri)
+            for i, request in requests[start:start + batch_size]:
+                batch.add(request, request_id=str(i))
+            batch.execute(http=self.http())
+
+
+_client: Optional[CalendarClient] = None
+_client_lock = threading.Lock()
+
+
+def get_calendar_client() -> CalendarClient:
+    """Process-wide CalendarClient, created on first use"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                # Authenticate with service account credentials from Streamlit secrets
+                credentials = service_account.Credentials.from_service_account_info(
+                    st.secrets["google_service_account"],
+                    scopes=SCOPES
+                )
+                _client = CalendarClient(credentials)
+    return _client
 
 
 def get_calendar_service():
-    # Authenticate with service account credentials from Streamlit secrets
-    credentials = service_account.Credentials.from_service_account_info(
-        st.secrets["google_service_account"],
-        scopes=SCOPES
-    )
-    return build('calendar', 'v3', credentials=credentials)
+    return get_calendar_client().service
 
 
-def create_meet_event(start: datetime, end: datetime, summary: str, attendee: str = None):
-    try:
-        service = get_calendar_service()
-
-        event = {
-            'summary': summary,
-            'start': {
-                'dateTime': start.astimezone(timezone.utc).isoformat(),
-                'timeZone': 'UTC'
-            },
-            'end': {
-                'dateTime': end.astimezone(timezone.utc).isoformat(),
-                'timeZone': 'UTC'
-            }
+def event_body(start: datetime, end: datetime, summary: str, attendees: Optional[List[str]] = None,
+               event_id: Optional[str] = None) -> Dict:
+    event = {
+        'summary': summary,
+        'start': {
+            'dateTime': start.astimezone(timezone.utc).isoformat(),
+            'timeZone': 'UTC'
+        },
+        'end': {
+            'dateTime': end.astimezone(timezone.utc).isoformat(),
+            'timeZone': 'UTC'
         }
+    }
+    if attendees:
+        event['attendees'] = [{'email': email} for email in attendees if email]
+    if event_id:
+        event['id'] = event_id
+    return event
 
-        if attendee:
-            event['attendees'] = [{'email': attendee}]
 
-        # Insert event into specified calendar
-        created_event = service.events().insert(
-            calendarId='ezekielo.balogun@gmail.com',  # ✅ Ensure this calendar is shared with your service account
-            body=event
-        ).execute()
+def insert_event(start: datetime, end: datetime, summary: str, attendee: str = None, event_id: str = None, service=None):
+    """
+    Create the calendar event and return it; raises on API errors.
+    With `event_id` (base32hex, 5-1024 chars) the insert is idempotent: a
+    retry that hits 409 returns the event created by the earlier attempt.
+    """
+    body = event_body(start, end, summary, [attendee] if attendee else None, event_id)
+    if service is None:
+        return get_calendar_client().insert_event(body)
+
+    try:
+        return service.events().insert(calendarId=CALENDAR_ID, body=body).execute()
+    except HttpError as error:
+        if event_id and error.resp.status == 409:
+            return service.events().get(calendarId=CALENDAR_ID, eventId=event_id).execute()
+        raise
+
+
+def insert_events(bodies: List[Dict], client: Optional[CalendarClient] = None):
+    """Batched insert of event_body() dicts; see CalendarClient.insert_events"""
+    return (client or get_calendar_client()).insert_events(bodies)
+
+
+def create_meet_event(start: datetime, end: datetime, summary: str, attendee: str = None):
+    try:
+        created_event = insert_event(start, end, summary, attendee)
 
         calendar_link = created_event.get('htmlLink')
         return None, calendar_link
@@ -1,40 +1,48 @@
 # utils/google_meet.py
-from google_auth import get_calendar_service
-from datetime import datetime
-import pytz
+import uuid
+from typing import Dict, List, Optional
 
+from utils.google_calendar import get_calendar_client
 
-def create_meet_link(summary, description, start_time, end_time, attendees):
-    service = get_calendar_service()
+TIMEZONE = "Africa/Lagos"
 
-    timezone = "Africa/Lagos"
+
+def meet_event_body(summary, start_time, end_time, attendees: List[str] = (), description: Optional[str] = None) -> Dict:
+    """Event that asks Google to attach a new Meet conference (insert with conferenceDataVersion=1)"""
     event = {
         "summary": summary,
-        "description": description,
         "start": {
             "dateTime": start_time.isoformat(),
-            "timeZone": timezone,
+            "timeZone": TIMEZONE,
         },
         "end": {
             "dateTime": end_time.isoformat(),
-            "timeZone": timezone,
+            "timeZone": TIMEZONE,
         },
         "attendees": [{"email": email} for email in attendees],
         "conferenceData": {
             "createRequest": {
                 "conferenceSolutionKey": {"type": "hangoutsMeet"},
-                "requestId": f"meet-{int(datetime.now().timestamp())}"
+                "requestId": f"meet-{uuid.uuid4().hex}"
             }
         }
     }
+    if description:
+        event["description"] = description
+    return event
+
 
+def create_meet_link(summary, description, start_time, end_time, attendees, client=None):
+    """
+    Create a Meet event synchronously and return its link. Slow (Google
+    creates the conference inline); bookings take a link from the pool in
+    utils.meet_pool instead.
+    """
     try:
-        event = service.events().insert(
-            calendarId='primary',  # or replace with custom calendar ID
-            body=event,
+        event = (client or get_calendar_client()).insert_event(
+            meet_event_body(summary, start_time, end_time, attendees, description),
             conferenceDataVersion=1
-        ).execute()
-
+        )
         return event.get("hangoutLink")
     except Exception as e:
         print(f"Error creating Meet link: {e}")
@@ -0,0 +1,394 @@
+# utils/ics.py
+"""
+ICS import and export.
+
+Import: stream-parse an .ics file (line by line, never the whole file in
+memory) into candidate availability slots, dedupe them against the mentor's
+slots and recurring rules, and write the accepted ones in one batched insert.
+
+Export: a per-user feed of booked sessions, served with ETag/Last-Modified so
+calendar clients polling it mostly get a 304.
+
+    python -m utils.ics serve [--port 8765]
+    python -m utils.ics url <userid>
+"""
+
+import argparse
+import hashlib
+import hmac
+import logging
+import os
+import re
+import threading
+from datetime import date, datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import pytz
+
+from database import supabase
+from utils.availability import add_slots, load_availability_index, parse_slot_time
+from utils.recurrence import load_rules
+
+logger = logging.getLogger(__name__)
+
+WAT = pytz.timezone("Africa/Lagos")
+FEED_SECRET = os.getenv("ICS_FEED_SECRET", "")
+FEED_BASE_URL = os.getenv("ICS_FEED_BASE_URL", "http://localhost:8765")
+FEED_PORT = int(os.getenv("ICS_FEED_PORT", 8765))
+IMPORT_HORIZON_DAYS = 365  # imported events further ahead than this are skipped
+DEFAULT_SESSION_MINUTES = 60
+PRODID = "-//MentorLink//Sessions//EN"
+
+_DURATION = re.compile(r"^([+-])?P(?:(\d+)W)?(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?$")
+
+
+# ---- Parsing ----
+
+def unfold_lines(stream: Iterable) -> Iterator[str]:
+    """Logical content lines from an .ics stream (bytes or text), folded lines joined"""
+    current = None
+    for raw in stream:
+        line = raw.decode("utf-8", errors="replace") if isinstance(raw, bytes) else raw
+        line = line.rstrip("\r\n")
+        if line[:1] in (" ", "\t") and current is not None:
+            current += line[1:]
+            continue
+        if current is not None:
+            yield current
+        current = line.lstrip("\ufeff") if current is None else line
+    if current:
+        yield current
+
+
+def split_property(line: str) -> Tuple[str, Dict[str, str], str]:
+    """'DTSTART;TZID=Africa/Lagos:20300101T090000' -> ('DTSTART', {'TZID': ...}, '20300101T090000')"""
+    head, _, value = line.partition(":")
+    name, *params = head.split(";")
+    return name.upper(), dict(p.split("=", 1) for p in params if "=" in p), value
+
+
+def parse_ics_datetime(value: str, params: Dict[str, str], default_tz=WAT):
+    """Aware datetime for DATE-TIME values; a date for all-day (VALUE=DATE) values"""
+    value = value.strip()
+    if params.get("VALUE") == "DATE" or len(value) == 8:
+        return datetime.strptime(value, "%Y%m%d").date()
+    if value.endswith("Z"):
+        return datetime.strptime(value[:-1], "%Y%m%dT%H%M%S").replace(tzinfo=timezone.utc)
+    naive = datetime.strptime(value, "%Y%m%dT%H%M%S")
+    try:
+        tz = pytz.timezone(params["TZID"].strip('"')) if "TZID" in params else default_tz
+    except pytz.UnknownTimeZoneError:
+        tz = default_tz
+    return tz.localize(naive)
+
+
+def parse_duration(value: str) -> Optional[timedelta]:
+    match = _DURATION.match(value.strip())
+    if not match:
+        return None
+    sign, weeks, days, hours, minutes, seconds = match.groups()
+    delta = timedelta(weeks=int(weeks or 0), days=int(days or 0), hours=int(hours or 0),
+                      minutes=int(minutes or 0), seconds=int(seconds or 0))
+    return -delta if sign == "-" else delta
+
+
+def iter_events(stream: Iterable, default_tz=WAT) -> Iterator[Dict]:
+    """
+    VEVENTs as dicts (uid, summary, start, end, status, transp), one at a time.
+    Nested components (VALARM) are skipped; events without a usable start
+    come through with start=None so callers can count them.
+    """
+    event = None
+    depth = 0
+    for line in unfold_lines(stream):
+        name, params, value = split_property(line)
+        if name == "BEGIN":
+            if value.upper() == "VEVENT" and event is None:
+                event, depth = {"duration": None}, 0
+            elif event is not None:
+                depth += 1
+            continue
+        if name == "END":
+            if event is not None and depth:
+                depth -= 1
+            elif event is not None and value.upper() == "VEVENT":
+                if event.get("end") is None and event.get("start") is not None:
+                    if event["duration"] is not None:
+                        event["end"] = event["start"] + event["duration"]
+                    elif isinstance(event["start"], date) and not isinstance(event["start"], datetime):
+                        event["end"] = event["start"] + timedelta(days=1)
+                yield event
+                event = None
+            continue
+        if event is None or depth:
+            continue
+        try:
+            if name == "DTSTART":
+                event["start"] = parse_ics_datetime(value, params, default_tz)
+            elif name == "DTEND":
+                event["end"] = parse_ics_datetime(value, params, default_tz)
+            elif name == "DURATION":
+                event["duration"] = parse_duration(value)
+            elif name in ("UID", "SUMMARY", "STATUS", "TRANSP"):
+                event[name.lower()] = value
+        except (ValueError, KeyError):
+            event.setdefault("errors", []).append(name)
+
+
+def availability_candidates(stream: Iterable, after: Optional[datetime] = None,
+                            horizon_days: int = IMPORT_HORIZON_DAYS, default_tz=WAT) -> Tuple[List[Dict], Dict[str, int]]:
+    """
+    Timed, confirmed events between `after` (default: now) and the horizon as
+    availability rows, plus counts of what was skipped and why.
+    """
+    after = after or datetime.now(timezone.utc)
+    horizon = after + timedelta(days=horizon_days)
+    candidates, skipped = [], {"all_day": 0, "cancelled": 0, "past_or_far": 0, "invalid": 0}
+    for event in iter_events(stream, default_tz):
+        start, end = event.get("start"), event.get("end")
+        if event.get("status", "").upper() == "CANCELLED":
+            skipped["cancelled"] += 1
+        elif start is None or end is None or event.get("errors"):
+            skipped["invalid"] += 1
+        elif not isinstance(start, datetime):
+            skipped["all_day"] += 1
+        elif not isinstance(end, datetime) or end <= start:
+            skipped["invalid"] += 1
+        elif not (after < start < horizon):
+            skipped["past_or_far"] += 1
+        else:
+            candidates.append({
+                "start": start.astimezone(WAT).isoformat(),
+                "end": end.astimezone(WAT).isoformat(),
+                "date": start.astimezone(WAT).date().isoformat(),
+            })
+    return candidates, skipped
+
+
+def import_availability(mentor_id, stream: Iterable, client=None, after: Optional[datetime] = None) -> Dict:
+    """
+    Import an .ics stream as availability. Overlaps with existing slots, rule
+    occurrences and other events in the file are rejected; the rest go in one
+    insert. Returns {"accepted": n, "rejected": n, "skipped": {...}}.
+    """
+    client = client or supabase
+    candidates, skipped = availability_candidates(stream, after)
+    index = load_availability_index(mentor_id, client, rules=load_rules([mentor_id], client).get(mentor_id, []),
+                                    window_days=IMPORT_HORIZON_DAYS)
+    result = add_slots(mentor_id, candidates, index=index, client=client)
+    return {"accepted": len(result["accepted"]), "rejected": len(result["rejected"]), "skipped": skipped}
+
+
+# ---- Export ----
+
+def escape_text(value) -> str:
+    return (str(value).replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,")
+            .replace("\r\n", "\\n").replace("\n", "\\n"))
+
+
+def fold_line(line: str) -> str:
+    """RFC 5545 folding: content lines of at most 75 octets"""
+    encoded = line.encode("utf-8")
+    if len(encoded) <= 75:
+        return line
+    parts, chunk, limit = [], b"", 75
+    for ch in line:
+        b = ch.encode("utf-8")
+        if len(chunk) + len(b) > limit:
+            parts.append(chunk.decode("utf-8"))
+            chunk, limit = b"", 74  # continuation lines start with a space
+        chunk += b
+    parts.append(chunk.decode("utf-8"))
+    return "\r\n ".join(parts)
+
+
+def _utc_stamp(dt: datetime) -> str:
+    return dt.astimezone(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def _session_times(session: Dict) -> Tuple[Optional[datetime], Optional[datetime]]:
+    """Start/end from the booked slot if joined, else session.date (WAT wall time) / end_time"""
+    slot = session.get("availability") or {}
+    try:
+        start = parse_slot_time(slot.get("start") or session.get("date"))
+        end = parse_slot_time(slot.get("end") or session.get("end_time"))
+    except (TypeError, ValueError):
+        return None, None
+    if start is not None and (end is None or end <= start):
+        end = start + timedelta(minutes=DEFAULT_SESSION_MINUTES)
+    return start, end
+
+
+def render_feed(sessions: Iterable[Dict], calendar_name: str = "MentorLink Sessions") -> str:
+    lines = ["BEGIN:VCALENDAR", "VERSION:2.0", f"PRODID:{PRODID}", "CALSCALE:GREGORIAN",
+             "METHOD:PUBLISH", f"X-WR-CALNAME:{escape_text(calendar_name)}"]
+    stamp = _utc_stamp(datetime.now(timezone.utc))
+    for session in sessions:
+        start, end = _session_times(session)
+        if start is None:
+            continue
+        meet_link = session.get("meet_link")
+        description = f"Join via Meet: {meet_link}" if meet_link else "Mentorship session"
+        lines += [
+            "BEGIN:VEVENT",
+            f"UID:session-{session['sessionid']}@mentorlink",
+            f"DTSTAMP:{stamp}",
+            f"DTSTART:{_utc_stamp(start)}",
+            f"DTEND:{_utc_stamp(end)}",
+            f"SUMMARY:{escape_text(session.get('summary') or 'Mentorship Session')}",
+            f"DESCRIPTION:{escape_text(description)}",
+        ]
+        if meet_link:
+            lines.append(f"URL:{meet_link}")
+        if str(session.get("status") or "").lower() == "cancelled":
+            lines.append("STATUS:CANCELLED")
+        lines.append("END:VEVENT")
+    lines.append("END:VCALENDAR")
+    return "\r\n".join(fold_line(line) for line in lines) + "\r\n"
+
+
+def load_feed_sessions(user_id, client=None) -> List[Dict]:
+    client = client or supabase
+    return client.table("session") \
+        .select("sessionid, date, end_time, status, meet_link, availability:availabilityid(start, end)") \
+        .or_(f"mentorid.eq.{user_id},menteeid.eq.{user_id}") \
+        .order("sessionid") \
+        .execute().data or []
+
+
+def feed_etag(sessions: Iterable[Dict]) -> str:
+    """Strong validator over exactly the fields that end up in the feed"""
+    digest = hashlib.sha1()
+    for s in sessions:
+        slot = s.get("availability") or {}
+        digest.update(repr((s.get("sessionid"), s.get("date"), s.get("end_time"), s.get("status"),
+                            s.get("meet_link"), slot.get("start"), slot.get("end"))).encode())
+    return f'"{digest.hexdigest()}"'
+
+
+def feed_token(user_id) -> str:
+    """Unguessable per-user path segment: user id plus an HMAC of it"""
+    if not FEED_SECRET:
+        raise RuntimeError("Set ICS_FEED_SECRET to enable calendar feeds.")
+    mac = hmac.new(FEED_SECRET.encode(), str(user_id).encode(), hashlib.sha256).hexdigest()[:32]
+    return f"{user_id}.{mac}"
+
+
+def user_for_token(token: str) -> Optional[str]:
+    user_id, _, mac = token.rpartition(".")
+    if not user_id or not FEED_SECRET:
+        return None
+    expected = hmac.new(FEED_SECRET.encode(), user_id.encode(), hashlib.sha256).hexdigest()[:32]
+    return user_id if hmac.compare_digest(mac, expected) else None
+
+
+def feed_url(user_id) -> str:
+    return f"{FEED_BASE_URL.rstrip('/')}/feed/{feed_token(user_id)}.ics"
+
+
+class FeedCache:
+    """
+    Last rendered feed per user. The body is only re-rendered when the
+    ETag changes, and Last-Modified is the time that ETag was first seen, so
+    it stays stable across polls.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, Tuple[str, datetime, bytes]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, user_id, sessions: List[Dict]) -> Tuple[str, datetime, bytes]:
+        etag = feed_etag(sessions)
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry and entry[0] == etag:
+                return entry
+        body = render_feed(sessions).encode("utf-8")
+        entry = (etag, datetime.now(timezone.utc).replace(microsecond=0), body)
+        with self._lock:
+            self._entries[user_id] = entry
+        return entry
+
+
+def not_modified(headers, etag: str, last_modified: datetime) -> bool:
+    """Conditional GET: If-None-Match wins over If-Modified-Since (RFC 9110)"""
+    inm = headers.get("If-None-Match")
+    if inm:
+        return etag in [t.strip() for t in inm.split(",")] or inm.strip() == "*"
+    ims = headers.get("If-Modified-Since")
+    if ims:
+        try:
+            return last_modified <= parsedate_to_datetime(ims)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def make_handler(load_sessions=load_feed_sessions, cache: Optional[FeedCache] = None):
+    cache = cache or FeedCache()
+
+    class FeedHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            match = re.match(r"^/feed/([^/?]+)\.ics$", self.path.split("?", 1)[0])
+            user_id = user_for_token(match.group(1)) if match else None
+            if user_id is None:
+                self.send_error(404)
+                return
+            try:
+                sessions = load_sessions(user_id)
+            except Exception as e:
+                logger.warning(f"⚠️ Feed query failed for {user_id}: {e}")
+                self.send_error(503)
+                return
+
+            etag, last_modified, body = cache.get(user_id, sessions)
+            if not_modified(self.headers, etag, last_modified):
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "text/calendar; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", format_datetime(last_modified, usegmt=True))
+            self.send_header("Cache-Control", "private, max-age=300")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, fmt, *args):
+            logger.debug(fmt % args)
+
+    return FeedHandler
+
+
+def serve(port: int = FEED_PORT, load_sessions=load_feed_sessions) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("", port), make_handler(load_sessions))
+    logger.info(f"📅 Serving session feeds on :{server.server_address[1]}")
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+    srv = sub.add_parser("serve", help="serve per-user session feeds")
+    srv.add_argument("--port", type=int, default=FEED_PORT)
+    url = sub.add_parser("url", help="print a user's feed URL")
+    url.add_argument("userid")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    if args.command == "url":
+        print(feed_url(args.userid))
+        return
+    server = serve(args.port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
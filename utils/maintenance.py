@@ -0,0 +1,220 @@
+# utils/maintenance.py
+"""
+Maintenance scheduler: bootstrap tasks once, then periodic sweeps, outside
+the Streamlit rerun path. Only the replica holding the leader lock does any
+work; the others stay on standby and take over if the leader exits.
+
+    python -m utils.maintenance run [--once]
+    python -m utils.maintenance status
+"""
+
+import argparse
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: no flock, run without leader election
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+LOCK_PATH = os.getenv("MAINTENANCE_LOCK_PATH", os.path.join(".cache", "maintenance.lock"))
+STATUS_PATH = os.getenv("MAINTENANCE_STATUS_PATH", os.path.join(".cache", "maintenance_status.json"))
+SWEEP_INTERVAL = int(os.getenv("MAINTENANCE_SWEEP_INTERVAL", 600))  # seconds between request sweeps
+RETRY_SECONDS = int(os.getenv("MAINTENANCE_RETRY_SECONDS", 30))      # first retry of a failed once-only task
+MEET_POOL_IN_MAINTENANCE = os.getenv("MEET_POOL_IN_MAINTENANCE", "1").lower() not in ("0", "false", "no")
+POLL_SECONDS = 5
+
+
+class LeaderLock:
+    """
+    Non-blocking exclusive flock on a shared file. The OS drops it when the
+    holder exits, so a crashed leader never blocks the standby replicas.
+    Replicas on different hosts need the lock file on a shared volume.
+    """
+
+    def __init__(self, path: str = LOCK_PATH):
+        self.path = path
+        self._file = None
+
+    def acquire(self) -> bool:
+        if self._file is not None:
+            return True
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        f = open(self.path, "a+")
+        if fcntl is not None:
+            try:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                f.close()
+                return False
+        f.seek(0)
+        f.truncate()
+        f.write(f"{os.getpid()}\n")
+        f.flush()
+        self._file = f
+        return True
+
+    def release(self):
+        if self._file is None:
+            return
+        if fcntl is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        self._file.close()
+        self._file = None
+
+    @property
+    def held(self) -> bool:
+        return self._file is not None
+
+
+class Task:
+    """
+    A named job: `interval=None` runs once per leadership, else every `interval`
+    seconds. A once-only job that fails is retried with doubling backoff.
+    """
+
+    def __init__(self, name: str, func: Callable, interval: Optional[int] = None):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.next_run = 0.0
+        self.done = False
+        self.failures = 0  # consecutive
+
+    def due(self, now: float) -> bool:
+        if self.interval is None and self.done:
+            return False
+        return now >= self.next_run
+
+
+def default_tasks() -> List[Task]:
+    from utils.setup_admin import setup_admin_account
+    from utils.auto_cancel import cancel_expired_requests
+    from utils.meet_pool import PROVISION_INTERVAL, top_up_pool
+    tasks = [
+        Task("setup_admin_account", setup_admin_account),
+        Task("cancel_expired_requests", cancel_expired_requests, interval=SWEEP_INTERVAL),
+    ]
+    if MEET_POOL_IN_MAINTENANCE:
+        tasks.append(Task("meet_pool_top_up", top_up_pool, interval=PROVISION_INTERVAL))
+    return tasks
+
+
+class MaintenanceScheduler:
+    """Runs due tasks while holding the leader lock and records per-task run metrics"""
+
+    def __init__(self, tasks: Optional[List[Task]] = None, lock: Optional[LeaderLock] = None,
+                 status_path: str = STATUS_PATH):
+        self.tasks = tasks if tasks is not None else default_tasks()
+        self.lock = lock or LeaderLock()
+        self.status_path = status_path
+        self.metrics: Dict[str, Dict] = {}
+        self._stop = threading.Event()
+
+    def run_task(self, task: Task):
+        stats = self.metrics.setdefault(task.name, {"runs": 0, "failures": 0, "total_ms": 0.0})
+        started = time.perf_counter()
+        stats["last_started"] = datetime.now(timezone.utc).isoformat()
+        try:
+            stats["last_result"] = task.func()
+            stats["last_error"] = None
+            task.done = True
+            task.failures = 0
+        except Exception as e:
+            stats["failures"] += 1
+            stats["last_error"] = f"{type(e).__name__}: {e}"
+            task.failures += 1
+            logger.warning(f"⚠️ Maintenance task {task.name} failed: {e}")
+        duration_ms = (time.perf_counter() - started) * 1000
+        stats["runs"] += 1
+        stats["total_ms"] = round(stats["total_ms"] + duration_ms, 1)
+        stats["last_duration_ms"] = round(duration_ms, 1)
+        if task.interval is not None:
+            task.next_run = time.monotonic() + task.interval
+        elif not task.done:
+            task.next_run = time.monotonic() + RETRY_SECONDS * 2 ** min(task.failures - 1, 6)
+        self.save_status()
+
+    def run_pending(self) -> int:
+        """Run every due task once; returns how many ran (0 when not leader)"""
+        if not self.lock.acquire():
+            return 0
+        now = time.monotonic()
+        due = [task for task in self.tasks if task.due(now)]
+        for task in due:
+            self.run_task(task)
+        return len(due)
+
+    def run_forever(self, poll: float = POLL_SECONDS):
+        was_leader = False
+        while not self._stop.is_set():
+            self.run_pending()
+            if self.lock.held and not was_leader:
+                logger.info(f"✅ Maintenance leader (pid {os.getpid()})")
+            was_leader = self.lock.held
+            self._stop.wait(poll)
+        self.lock.release()
+
+    def stop(self):
+        self._stop.set()
+
+    def save_status(self):
+        os.makedirs(os.path.dirname(self.status_path) or ".", exist_ok=True)
+        tmp_path = f"{self.status_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"pid": os.getpid(), "updated": datetime.now(timezone.utc).isoformat(),
+                       "tasks": self.metrics}, f, indent=2, default=str)
+        os.replace(tmp_path, self.status_path)
+
+
+def load_status(path: str = STATUS_PATH) -> Dict:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def start_background_scheduler() -> MaintenanceScheduler:
+    """In-process scheduler thread for deployments without a separate worker"""
+    scheduler = MaintenanceScheduler()
+    threading.Thread(target=scheduler.run_forever, name="maintenance", daemon=True).start()
+    return scheduler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+    run = sub.add_parser("run", help="run the scheduler")
+    run.add_argument("--once", action="store_true", help="run every task once (if leader) and exit")
+    sub.add_parser("status", help="print the last run metrics")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    if args.command == "status":
+        status = load_status()
+        print(json.dumps(status, indent=2) if status else "No maintenance runs recorded yet")
+        return
+
+    scheduler = MaintenanceScheduler()
+    if args.once:
+        ran = scheduler.run_pending()
+        if not ran:
+            logger.info("ℹ️ Another replica holds the maintenance lock; nothing run")
+        scheduler.lock.release()
+        return
+    try:
+        scheduler.run_forever()
+    except KeyboardInterrupt:
+        scheduler.lock.release()
+
+
+if __name__ == "__main__":
+    main()
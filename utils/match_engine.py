@@ -0,0 +1,246 @@
+# utils/match_engine.py
+
+from typing import Dict, Iterable, List
+import numpy as np
+
+from utils.matching import UserProfile, tokenize
+
+# Raw scores this close below the k-th best can still round to the same
+# 2-decimal score, so they stay in the candidate set for exact tie-breaking.
+ROUNDING_MARGIN = 0.011
+
+
+def skill_terms(skills) -> List[str]:
+    """Lowercased skill set, matching skill_score"""
+    return sorted(set(s.lower() for s in (skills or [])))
+
+
+class MentorMatcher:
+    """
+    Vectorized version of the match_score / recommend_mentors loop.
+
+    Every mentor is tokenized once into a shared vocabulary and stored as three
+    binary sparse rows (skills, goal terms = bio + skills, bio terms). Scoring a
+    mentee is then one sparse matrix-vector product per component plus a top-k
+    selection, and gives exactly the same scores as match_score.
+    """
+
+    def __init__(self, mentors: Iterable[UserProfile] = ()):
+        self.vocab: Dict[str, int] = {}
+        self.mentors: List[UserProfile] = []
+        self._positions: Dict[str, int] = {}
+        self._rows = {"skills": [], "goals": [], "bio": []}
+        self._compiled = None
+        for mentor in mentors:
+            self.add(mentor)
+
+    def __len__(self):
+        return len(self.mentors)
+
+    # ---- Indexing ----
+
+    def _term_ids(self, terms) -> np.ndarray:
+        ids = []
+        for term in set(terms):
+            term_id = self.vocab.get(term)
+            if term_id is None:
+                term_id = self.vocab[term] = len(self.vocab)
+            ids.append(term_id)
+        return np.array(sorted(ids), dtype=np.int32)
+
+    def _tokenize_rows(self, mentor: UserProfile):
+        skills = mentor.skills or []
+        bio = mentor.bio or ""
+        return {
+            "skills": self._term_ids(skill_terms(skills)),
+            "goals": self._term_ids(tokenize(bio + " " + " ".join(skills))),
+            "bio": self._term_ids(tokenize(bio)),
+        }
+
+    def add(self, mentor: UserProfile):
+        """Tokenize and append one mentor (non-mentor roles are ignored)"""
+        if mentor.role != "mentor":
+            return
+        self._positions[mentor.id] = len(self.mentors)
+        self.mentors.append(mentor)
+        for name, row in self._tokenize_rows(mentor).items():
+            self._rows[name].append(row)
+        self._compiled = None
+
+    def upsert(self, mentor: UserProfile):
+        """Re-tokenize one mentor in place, keeping its rank position"""
+        position = self._positions.get(mentor.id)
+        if position is None:
+            self.add(mentor)
+            return
+        if mentor.role != "mentor":
+            self.remove(mentor.id)
+            return
+        self.mentors[position] = mentor
+        for name, row in self._tokenize_rows(mentor).items():
+            self._rows[name][position] = row
+        self._compiled = None
+
+    def remove(self, mentor_id: str):
+        """Drop one mentor; later mentors shift up by one position"""
+        position = self._positions.pop(mentor_id, None)
+        if position is None:
+            return
+        del self.mentors[position]
+        for rows in self._rows.values():
+            del rows[position]
+        for mentor in self.mentors[position:]:
+            self._positions[mentor.id] -= 1
+        self._compiled = None
+
+    def __getstate__(self):
+        # Thousands of tiny arrays pickle slowly; store each component flat
+        state = self.__dict__.copy()
+        state["_compiled"] = None
+        state["_rows"] = {
+            name: (np.fromiter((len(r) for r in rows), dtype=np.int64, count=len(rows)),
+                   np.concatenate(rows) if rows else np.empty(0, dtype=np.int32))
+            for name, rows in self._rows.items()
+        }
+        return state
+
+    def __setstate__(self, state):
+        rows = {}
+        for name, (lengths, flat) in state["_rows"].items():
+            rows[name] = np.split(flat, np.cumsum(lengths)[:-1]) if len(lengths) else []
+        state["_rows"] = rows
+        self.__dict__.update(state)
+
+    def _compile(self):
+        """Pack per-mentor term rows into COO arrays (row ids + term ids)"""
+        if self._compiled is None:
+            compiled = {}
+            for name, rows in self._rows.items():
+                lengths = np.fromiter((len(r) for r in rows), dtype=np.int64, count=len(rows))
+                compiled[name] = (
+                    np.repeat(np.arange(len(rows), dtype=np.int32), lengths),
+                    np.concatenate(rows) if rows else np.empty(0, dtype=np.int32),
+                )
+            self._compiled = compiled
+        return self._compiled
+
+    # ---- Scoring ----
+
+    def _query(self, terms) -> np.ndarray:
+        vector = np.zeros(len(self.vocab), dtype=np.float64)
+        ids = [self.vocab[t] for t in set(terms) if t in self.vocab]
+        vector[ids] = 1.0
+        return vector
+
+    def _overlap(self, name: str, query: np.ndarray) -> np.ndarray:
+        rows, cols = self._compile()[name]
+        return np.bincount(rows, weights=query[cols], minlength=len(self.mentors))
+
+    def raw_scores(self, mentee: UserProfile) -> np.ndarray:
+        """Unrounded, clamped match scores of mentee against every indexed mentor"""
+        n = len(self.mentors)
+        scores = np.zeros(n, dtype=np.float64)
+        if n == 0:
+            return scores
+
+        s_score = scores
+        if mentee.skills:
+            s_score = self._overlap("skills", self._query(skill_terms(mentee.skills))) / len(mentee.skills)
+
+        g_score = scores
+        goal_words = set(tokenize(mentee.goals))
+        if goal_words:
+            g_score = self._overlap("goals", self._query(goal_words)) / len(goal_words)
+
+        b_score = scores
+        bio_words = set(tokenize(mentee.bio))
+        if bio_words:
+            b_score = self._overlap("bio", self._query(bio_words)) / len(bio_words)
+
+        return np.clip(0.4 * s_score + 0.3 * g_score + 0.3 * b_score, 0.0, 1.0)
+
+    def raw_score_matrix(self, mentees: List[UserProfile]) -> np.ndarray:
+        """
+        All-pairs version of raw_scores: a (mentees x mentors) matrix computed
+        with one dense product per component over the mentees' own vocabulary.
+        """
+        m, n = len(mentees), len(self.mentors)
+        if m == 0 or n == 0:
+            return np.zeros((m, n), dtype=np.float64)
+
+        queries = {"skills": [], "goals": [], "bio": []}
+        denominators = {"skills": [], "goals": [], "bio": []}
+        for mentee in mentees:
+            goal_words = set(tokenize(mentee.goals))
+            bio_words = set(tokenize(mentee.bio))
+            queries["skills"].append(skill_terms(mentee.skills))
+            denominators["skills"].append(len(mentee.skills or []))
+            queries["goals"].append(goal_words)
+            denominators["goals"].append(len(goal_words))
+            queries["bio"].append(bio_words)
+            denominators["bio"].append(len(bio_words))
+
+        component_scores = {}
+        for name in ("skills", "goals", "bio"):
+            term_ids = [[self.vocab[t] for t in terms if t in self.vocab] for terms in queries[name]]
+            used = np.unique(np.fromiter((i for ids in term_ids for i in ids), dtype=np.int64))
+            local = np.full(len(self.vocab), -1, dtype=np.int64)
+            local[used] = np.arange(len(used))
+
+            query_matrix = np.zeros((m, len(used)), dtype=np.float64)
+            for row, ids in enumerate(term_ids):
+                query_matrix[row, local[ids]] = 1.0
+
+            rows, cols = self._compile()[name]
+            keep = local[cols] >= 0
+            mentor_matrix = np.zeros((n, len(used)), dtype=np.float64)
+            mentor_matrix[rows[keep], local[cols[keep]]] = 1.0
+
+            denominator = np.array(denominators[name], dtype=np.float64)[:, None]
+            overlap = query_matrix @ mentor_matrix.T
+            component_scores[name] = np.divide(
+                overlap, denominator, out=np.zeros_like(overlap), where=denominator > 0
+            )
+
+        return np.clip(
+            0.4 * component_scores["skills"] + 0.3 * component_scores["goals"] + 0.3 * component_scores["bio"],
+            0.0, 1.0
+        )
+
+    def top_k(self, raw: np.ndarray, top_n: int):
+        """
+        Return (positions, rounded scores) of the best top_n mentors, ordered
+        like sorted(..., reverse=True) over round(score, 2) in insertion order.
+        """
+        n = len(raw)
+        if n == 0 or top_n <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+
+        if top_n < n:
+            kth = np.partition(raw, n - top_n)[n - top_n]
+            candidates = np.flatnonzero(raw >= kth - ROUNDING_MARGIN)
+        else:
+            candidates = np.arange(n)
+
+        # Python's round() on the few distinct values keeps scores identical to match_score
+        values, inverse = np.unique(raw[candidates], return_inverse=True)
+        rounded = np.array([round(float(v), 2) for v in values])[inverse]
+
+        order = np.argsort(-rounded, kind="stable")[:top_n]
+        return candidates[order], rounded[order]
+
+    def recommend(self, mentee: UserProfile, top_n: int = 5) -> List[Dict]:
+        """Same output as recommend_mentors: mentorId, score, sharedSkills, bio"""
+        positions, scores = self.top_k(self.raw_scores(mentee), top_n)
+        mentee_skills = set(s.lower() for s in (mentee.skills or []))
+
+        results = []
+        for position, score in zip(positions, scores):
+            mentor = self.mentors[position]
+            results.append({
+                "mentorId": mentor.id,
+                "score": float(score),
+                "sharedSkills": list(mentee_skills & set(s.lower() for s in (mentor.skills or []))),
+                "bio": mentor.bio
+            })
+        return results
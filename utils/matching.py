@@ -1,7 +1,12 @@
 # utils/matching.py
 
-from typing import List, Dict
+from collections import OrderedDict
+from typing import List, Dict, Optional
 import re
+import threading
+
+WORD_RE = re.compile(r"\w+")
+MATCHER_CACHE_SIZE = 8  # distinct mentor lists whose built matchers are kept
 
 # ---- Type definitions ----
 class UserProfile:
@@ -14,6 +19,12 @@ class UserProfile:
 
 # ---- Utility functions ----
 
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens, as used by semantic_similarity"""
+    if not text:
+        return []
+    return WORD_RE.findall(text.lower())
+
 def skill_score(mentee_skills: List[str], mentor_skills: List[str]) -> float:
     """Compute overlap of skills between mentee and mentor"""
     if not mentee_skills:
@@ -28,8 +39,8 @@ def semantic_similarity(text_a: str, text_b: str) -> float:
     """
     if not text_a or not text_b:
         return 0.0
-    words_a = set(re.findall(r"\w+", text_a.lower()))
-    words_b = set(re.findall(r"\w+", text_b.lower()))
+    words_a = set(tokenize(text_a))
+    words_b = set(tokenize(text_b))
     if not words_a:
         return 0.0
     return len(words_a & words_b) / len(words_a)
@@ -43,8 +54,48 @@ def match_score(mentee: UserProfile, mentor: UserProfile) -> float:
     score = 0.4 * s_score + 0.3 * g_score + 0.3 * b_score
     return round(min(max(score, 0.0), 1.0), 2)  # clamp between 0 and 1, 2 decimals
 
-def recommend_mentors(mentee: UserProfile, mentors: List[UserProfile], top_n: int = 5) -> List[Dict]:
-    """Return ranked mentors with score and shared skills"""
+_matchers: "OrderedDict[tuple, object]" = OrderedDict()
+_matchers_lock = threading.Lock()
+
+def mentor_fingerprint(mentors: List[UserProfile]) -> tuple:
+    """Everything about a mentor list that scoring depends on, as a hashable key"""
+    return tuple((m.id, m.role, m.bio, tuple(m.skills or ()), m.goals) for m in mentors)
+
+def cached_matcher(mentors: List[UserProfile]):
+    """
+    A MentorMatcher for this mentor list, built once and reused while the
+    list is unchanged (building costs about as much as one linear scan).
+    """
+    from utils.match_engine import MentorMatcher  # avoid circular import
+
+    key = mentor_fingerprint(mentors)
+    with _matchers_lock:
+        matcher = _matchers.get(key)
+        if matcher is not None:
+            _matchers.move_to_end(key)
+            return matcher
+    matcher = MentorMatcher(mentors)
+    with _matchers_lock:
+        _matchers[key] = matcher
+        while len(_matchers) > MATCHER_CACHE_SIZE:
+            _matchers.popitem(last=False)
+    return matcher
+
+def recommend_mentors(mentee: UserProfile, mentors: Optional[List[UserProfile]] = None, top_n: int = 5) -> List[Dict]:
+    """
+    Return ranked mentors with score and shared skills. Without `mentors`,
+    ranks the active mentors in the shared mentor index.
+    """
+    if mentors is None:
+        from utils.mentor_index import get_mentor_index  # avoid circular import
+        return get_mentor_index().recommend(mentee, top_n=top_n)
+    return cached_matcher(mentors).recommend(mentee, top_n=top_n)
+
+def recommend_mentors_linear(mentee: UserProfile, mentors: List[UserProfile], top_n: int = 5) -> List[Dict]:
+    """
+    Pure-Python reference ranking (one match_score call per mentor).
+    Kept so the vectorized engine can be checked and benchmarked against it.
+    """
     results = []
     for mentor in mentors:
         if mentor.role != "mentor":
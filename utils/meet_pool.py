@@ -0,0 +1,229 @@
+# utils/meet_pool.py
+"""
+Pool of pre-created Google Meet events, so a booking never waits on Google
+creating a conference. The provisioner keeps enough placeholder events with a
+Meet link in `meet_pool` for the forecast demand; inserting a session claims
+one in the same write (trigger in sql/meet_pool.sql) and queues an outbox
+`meet_patch` job that moves the event to the session's time and invites the
+attendees. While the pool is empty, bookings queue a `calendar_event` job that
+creates their own Meet event instead (slower), and top-ups log a warning.
+
+The maintenance scheduler tops the pool up every MEET_POOL_INTERVAL seconds
+unless MEET_POOL_IN_MAINTENANCE=0, for deployments that run the provisioner
+on its own:
+
+    python -m utils.meet_pool provision [--once] [--interval 60]
+    python -m utils.meet_pool status
+"""
+
+import argparse
+import logging
+import math
+import os
+import threading
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional
+
+from postgrest.exceptions import APIError
+
+from database import supabase
+from utils.availability import parse_slot_time
+
+logger = logging.getLogger(__name__)
+
+POOL_TABLE = "meet_pool"
+POOL_MIN = int(os.getenv("MEET_POOL_MIN", 5))
+POOL_MAX = int(os.getenv("MEET_POOL_MAX", 200))
+POOL_HEADROOM = float(os.getenv("MEET_POOL_HEADROOM", 2.0))
+LOOKAHEAD_HOURS = int(os.getenv("MEET_POOL_LOOKAHEAD_HOURS", 6))  # how long the pool must last between refills
+HISTORY_DAYS = int(os.getenv("MEET_POOL_HISTORY_DAYS", 14))
+PROVISION_BATCH = int(os.getenv("MEET_POOL_PROVISION_BATCH", 50))  # events created per run
+PROVISION_INTERVAL = int(os.getenv("MEET_POOL_INTERVAL", 60))  # seconds between maintenance top-ups
+MISSING_TABLE_CODES = ("42P01", "PGRST205")  # undefined_table; PostgREST: not in the schema cache
+PLACEHOLDER_SUMMARY = "MentorLink session (unassigned)"
+PLACEHOLDER_DAYS_AHEAD = 60
+
+
+def forecast_demand(booking_times: Iterable[datetime], now: datetime, lookahead_hours: int = LOOKAHEAD_HOURS,
+                    history_days: int = HISTORY_DAYS) -> float:
+    """
+    Expected bookings in the next `lookahead_hours`: for each of those hours,
+    the average number of bookings at that hour of the day over the last
+    `history_days` (bookings bunch up at the same times every day).
+    """
+    since = now - timedelta(days=history_days)
+    by_hour = Counter(t.astimezone(timezone.utc).hour for t in booking_times if since <= t < now)
+    return sum(by_hour[(now + timedelta(hours=h)).astimezone(timezone.utc).hour]
+               for h in range(lookahead_hours)) / history_days
+
+
+def pool_target(booking_times: Iterable[datetime], now: datetime) -> int:
+    """Pool depth to keep: forecast demand plus headroom, within POOL_MIN..POOL_MAX"""
+    return max(POOL_MIN, min(POOL_MAX, math.ceil(forecast_demand(booking_times, now) * POOL_HEADROOM)))
+
+
+def pool_missing(error: Exception) -> bool:
+    """The meet_pool table has not been migrated (sql/meet_pool.sql)"""
+    return isinstance(error, APIError) and error.code in MISSING_TABLE_CODES
+
+
+def placeholder_body(now: datetime) -> Dict:
+    """A Meet event parked well ahead and marked free, until a booking claims it"""
+    from utils.google_meet import meet_event_body
+
+    start = (now + timedelta(days=PLACEHOLDER_DAYS_AHEAD)).replace(minute=0, second=0, microsecond=0)
+    body = meet_event_body(PLACEHOLDER_SUMMARY, start, start + timedelta(minutes=30))
+    body.update(transparency="transparent", visibility="private")
+    return body
+
+
+class MeetPoolStore:
+    """The meet_pool table, plus booking history from the outbox for the forecast"""
+
+    def __init__(self, client=None):
+        self.client = client or supabase
+
+    def unclaimed(self) -> List[Dict]:
+        return self.client.table(POOL_TABLE).select("poolid, event_id, meet_link") \
+            .is_("sessionid", "null").execute().data or []
+
+    def add(self, entries: List[Dict]):
+        if entries:
+            self.client.table(POOL_TABLE).insert(entries).execute()
+
+    def set_meet_link(self, poolid, meet_link: str, calendar_link: Optional[str] = None):
+        self.client.table(POOL_TABLE).update({"meet_link": meet_link, "calendar_link": calendar_link}) \
+            .eq("poolid", poolid).execute()
+
+    def remove(self, poolids: List):
+        if poolids:
+            self.client.table(POOL_TABLE).delete().in_("poolid", poolids).execute()
+
+    def booking_times(self, since: datetime) -> List[datetime]:
+        """When bookings happened: pool claims plus bookings that found the pool empty"""
+        claims = self.client.table(POOL_TABLE).select("claimed_at") \
+            .gte("claimed_at", since.isoformat()).execute().data or []
+        misses = self.client.table("outbox").select("created_at").eq("kind", "calendar_event") \
+            .gte("created_at", since.isoformat()).execute().data or []
+        return [parse_slot_time(r["claimed_at"]) for r in claims] + [parse_slot_time(r["created_at"]) for r in misses]
+
+    def metrics(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """Pool depth and recent demand"""
+        now = now or datetime.now(timezone.utc)
+        unclaimed = self.unclaimed()
+        times = self.booking_times(now - timedelta(days=HISTORY_DAYS))
+        return {
+            "available": sum(1 for r in unclaimed if r.get("meet_link")),
+            "pending": sum(1 for r in unclaimed if not r.get("meet_link")),
+            "bookings_24h": sum(1 for t in times if t >= now - timedelta(hours=24)),
+            "target": pool_target(times, now),
+        }
+
+
+class MeetProvisioner:
+    """
+    Tops the pool up to pool_target(): creates the missing placeholder events
+    in batched Calendar requests and records their Meet links. Conferences
+    Google is still creating are stored without a link and picked up on the
+    next run.
+    """
+
+    def __init__(self, store: Optional[MeetPoolStore] = None, calendar=None):
+        self.store = store or MeetPoolStore()
+        self._calendar = calendar
+        self._stop = threading.Event()
+
+    @property
+    def calendar(self):
+        if self._calendar is None:
+            from utils.google_calendar import get_calendar_client
+            self._calendar = get_calendar_client()
+        return self._calendar
+
+    def _resolve_pending(self, pending: List[Dict]) -> int:
+        resolved = 0
+        for row, (event, error) in zip(pending, self.calendar.get_events([r["event_id"] for r in pending])):
+            if event is not None and event.get("hangoutLink"):
+                self.store.set_meet_link(row["poolid"], event["hangoutLink"], event.get("htmlLink"))
+                resolved += 1
+            elif event is None and getattr(getattr(error, "resp", None), "status", None) in (404, 410):
+                self.store.remove([row["poolid"]])  # placeholder deleted from the calendar
+        return resolved
+
+    def top_up(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        now = now or datetime.now(timezone.utc)
+        unclaimed = self.store.unclaimed()
+        pending = [r for r in unclaimed if not r.get("meet_link")]
+        resolved = self._resolve_pending(pending) if pending else 0
+
+        target = pool_target(self.store.booking_times(now - timedelta(days=HISTORY_DAYS)), now)
+        missing = min(max(target - len(unclaimed), 0), PROVISION_BATCH)
+        created = failed = ready = 0
+        if missing:
+            results = self.calendar.insert_events([placeholder_body(now) for _ in range(missing)],
+                                                  conferenceDataVersion=1)
+            entries = [{"event_id": event["id"], "meet_link": event.get("hangoutLink"),
+                        "calendar_link": event.get("htmlLink")}
+                       for event, _ in results if event is not None]
+            self.store.add(entries)
+            created, failed = len(entries), missing - len(entries)
+            ready = sum(1 for e in entries if e["meet_link"])
+
+        result = {"target": target, "available": len(unclaimed) - len(pending) + resolved + ready,
+                  "created": created, "failed": failed, "resolved": resolved}
+        if not result["available"]:
+            logger.warning(f"⚠️ Meet pool is empty: bookings create their own Meet event until it refills ({result})")
+        return result
+
+    def run_forever(self, interval: float = 60.0):
+        while not self._stop.is_set():
+            try:
+                result = self.top_up()
+                if result["created"] or result["failed"]:
+                    logger.info(f"🎥 Meet pool: {result}")
+            except Exception as e:
+                logger.warning(f"⚠️ Meet pool top-up failed: {e}")
+            self._stop.wait(interval)
+
+    def stop(self):
+        self._stop.set()
+
+
+_provisioner: Optional[MeetProvisioner] = None
+
+
+def top_up_pool() -> Dict[str, int]:
+    """One top-up with this process's provisioner (the maintenance task)"""
+    global _provisioner
+    if _provisioner is None:
+        _provisioner = MeetProvisioner()
+    return _provisioner.top_up()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+    provision = sub.add_parser("provision", help="keep the pool topped up")
+    provision.add_argument("--once", action="store_true", help="top up once and exit")
+    provision.add_argument("--interval", type=float, default=60.0, help="seconds between top-ups")
+    sub.add_parser("status", help="print pool depth and demand")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    if args.command == "status":
+        print(MeetPoolStore().metrics())
+        return
+
+    provisioner = MeetProvisioner()
+    if args.once:
+        logger.info(f"✅ Meet pool: {provisioner.top_up()}")
+        return
+    try:
+        provisioner.run_forever(args.interval)
+    except KeyboardInterrupt:
+        provisioner.stop()
+
+
+if __name__ == "__main__":
+    main()
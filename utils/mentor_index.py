@@ -0,0 +1,228 @@
+# utils/mentor_index.py
+
+import os
+import pickle
+import threading
+import time
+import logging
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Set
+
+try:
+    import fcntl
+except ImportError:  # Windows: no flock, snapshot writes are only serialized per process
+    fcntl = None
+
+from database import supabase
+from utils.matching import UserProfile
+from utils.match_engine import MentorMatcher
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_PATH = os.getenv("MENTOR_INDEX_PATH", os.path.join(".cache", "mentor_index.pkl"))
+SNAPSHOT_MAX_AGE = int(os.getenv("MENTOR_INDEX_MAX_AGE", 3600))  # seconds before a full rebuild
+SNAPSHOT_VERSION = 2  # 1 stored whole users rows, password hashes included
+
+# Only what Browse Mentors and matching read: the snapshot is a file on disk,
+# so it must never carry password hashes or other account columns
+MENTOR_COLUMNS = "userid, email, role, status, profile(name, bio, skills, goals, profile_image_url)"
+
+
+def split_skills(skills: Optional[str]) -> List[str]:
+    """Split the comma-separated profile.skills string into clean, lowercased skills"""
+    if not skills:
+        return []
+    return [s.strip().lower() for s in skills.split(",") if s.strip()]
+
+
+def profile_from_row(row: dict) -> UserProfile:
+    """Build a matching profile from a users row joined with profile"""
+    profile = row.get("profile") or {}
+    return UserProfile(
+        user_id=row["userid"],
+        role="mentor",
+        bio=profile.get("bio") or "",
+        skills=split_skills(profile.get("skills")),
+        goals=profile.get("goals") or "",
+    )
+
+
+class MentorIndex:
+    """
+    Active mentors with tokenized skills, an inverted skill -> mentor index and
+    the term vectors used by MentorMatcher. Updated one mentor at a time and
+    persisted as a small pickle snapshot for cold workers.
+    """
+
+    def __init__(self):
+        self.rows: Dict[str, dict] = {}
+        self.skill_index: Dict[str, Set[str]] = {}
+        self.matcher = MentorMatcher()
+        self.built_at = time.time()
+
+    def __len__(self):
+        return len(self.rows)
+
+    def upsert(self, row: dict):
+        """Add or refresh one mentor row (users + profile)"""
+        userid = row["userid"]
+        self._unindex_skills(userid)
+        self.rows[userid] = row
+        profile = profile_from_row(row)
+        for skill in profile.skills:
+            self.skill_index.setdefault(skill, set()).add(userid)
+        self.matcher.upsert(profile)
+
+    def remove(self, userid: str):
+        self._unindex_skills(userid)
+        self.rows.pop(userid, None)
+        self.matcher.remove(userid)
+
+    def _unindex_skills(self, userid: str):
+        old = self.rows.get(userid)
+        if not old:
+            return
+        for skill in split_skills((old.get("profile") or {}).get("skills")):
+            mentor_ids = self.skill_index.get(skill)
+            if mentor_ids:
+                mentor_ids.discard(userid)
+                if not mentor_ids:
+                    del self.skill_index[skill]
+
+    def skills(self) -> List[str]:
+        return sorted(self.skill_index)
+
+    def mentors(self, skill: Optional[str] = None) -> List[dict]:
+        """Mentor rows in insertion order, optionally only those listing `skill`"""
+        if not skill:
+            return list(self.rows.values())
+        mentor_ids = self.skill_index.get(skill.strip().lower(), set())
+        return [row for userid, row in self.rows.items() if userid in mentor_ids]
+
+    def recommend(self, mentee: UserProfile, top_n: int = 5) -> List[dict]:
+        return self.matcher.recommend(mentee, top_n=top_n)
+
+    # ---- Snapshot ----
+
+    def save(self, path: str = SNAPSHOT_PATH):
+        """Atomically write the snapshot so readers never see a partial file"""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump({"version": SNAPSHOT_VERSION, "index": self}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str = SNAPSHOT_PATH) -> Optional["MentorIndex"]:
+        try:
+            with open(path, "rb") as f:
+                snapshot = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError) as e:
+            logger.info(f"Mentor index snapshot not loaded: {e}")
+            return None
+        if snapshot.get("version") != SNAPSHOT_VERSION:
+            return None
+        return snapshot["index"]
+
+    @classmethod
+    def build(cls, client=None) -> "MentorIndex":
+        """Full rebuild from Supabase (one query)"""
+        client = client or supabase
+        rows = client.table("users").select(MENTOR_COLUMNS) \
+            .eq("role", "Mentor").eq("status", "Active").execute().data or []
+        index = cls()
+        for row in rows:
+            index.upsert(row)
+        return index
+
+
+# ---- Process-wide instance ----
+
+_lock = threading.Lock()
+_index: Optional[MentorIndex] = None
+_snapshot_mtime = 0.0
+
+
+def _mtime(path: str) -> float:
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return 0.0
+
+
+@contextmanager
+def _snapshot_lock(path: str):
+    """Exclusive flock on `<snapshot>.lock`, so workers update the snapshot one at a time"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(f"{path}.lock", "a") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def _current_index(path: str) -> MentorIndex:
+    """
+    The freshest index: in-memory if no other worker has written since, else
+    the on-disk snapshot, else a full build saved for the others. Call with
+    _lock held; a build also needs the snapshot lock.
+    """
+    global _index, _snapshot_mtime
+    mtime = _mtime(path)
+    if _index is not None and mtime <= _snapshot_mtime:
+        return _index
+
+    if mtime and time.time() - mtime < SNAPSHOT_MAX_AGE:
+        loaded = MentorIndex.load(path)
+        if loaded is not None:
+            _index, _snapshot_mtime = loaded, mtime
+            return _index
+
+    _index = MentorIndex.build()
+    _index.save(path)
+    _snapshot_mtime = _mtime(path)
+    return _index
+
+
+def get_mentor_index(path: str = SNAPSHOT_PATH) -> MentorIndex:
+    """
+    Return the shared index: in-memory if current, else the on-disk snapshot
+    (picking up writes from other workers), else a fresh build from Supabase.
+    """
+    with _lock:
+        mtime = _mtime(path)
+        if _index is not None and mtime <= _snapshot_mtime:
+            return _index
+        # Rebuilds and reloads wait for any worker mid-update, then see its write
+        with _snapshot_lock(path):
+            return _current_index(path)
+
+
+def refresh_mentor(userid: str, path: str = SNAPSHOT_PATH):
+    """
+    Re-read one user after a profile/users write and patch the index.
+    Non-mentors and inactive users are dropped from it. The patch is applied
+    to the latest snapshot under the snapshot lock, so concurrent refreshes
+    from other workers are merged rather than overwritten.
+    """
+    global _snapshot_mtime
+    try:
+        rows = supabase.table("users").select(MENTOR_COLUMNS).eq("userid", userid).execute().data or []
+    except Exception as e:
+        logger.warning(f"⚠️ Could not refresh mentor {userid} in index: {e}")
+        return
+
+    with _lock, _snapshot_lock(path):
+        index = _current_index(path)
+        row = rows[0] if rows else None
+        if row and row.get("role") == "Mentor" and row.get("status") == "Active":
+            index.upsert(row)
+        elif userid in index.rows:
+            index.remove(userid)
+        else:
+            return
+        index.save(path)
+        _snapshot_mtime = _mtime(path)
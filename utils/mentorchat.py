@@ -1,17 +1,37 @@
-def mentorchat(user_input: str, user_role: str = "Mentee") -> str:
-    user_input = user_input.strip().lower()
+"""
+MentorChat answers. Keyword rules are compiled into trie-shaped regexes and
+matched in one pass per message, highest-priority intent first (the order
+the rules have always been checked in, so existing answers don't change).
+Anything no rule covers is looked up in the FAQ (utils/mentorchat_faq.py)
+with BM25; answers are cached per (role, normalized message).
+"""
+
+import heapq
+import math
+import os
+import re
+from collections import Counter, defaultdict
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from utils.mentorchat_faq import FAQ
 
-    greetings = ("hi", "hello", "hey", "good morning", "good afternoon", "good evening")
-    farewells = ("bye", "goodbye", "see you", "take care", "later")
-    gratitude = ("thank you", "thanks", "thx", "appreciate")
-    help_requests = ("help", "support", "assist", "need help", "how do i")
+CACHE_SIZE = int(os.getenv("MENTORCHAT_CACHE_SIZE", 4096))
+FAQ_MIN_SCORE = 3.0  # below this the FAQ match is a guess; show the suggestions instead
 
-    if any(greet in user_input for greet in greetings):
-        return f"👋 Hello {user_role.title()}! I'm MentorChat. How can I support you on MentorLink today?"
 
-    elif any(word in user_input for word in help_requests):
-        if user_role == "Admin":
-            return """🛠️ As an Admin, you can:
+class Intent(NamedTuple):
+    name: str
+    keywords: Tuple[str, ...]
+    answers: Dict[str, str]  # by role; "*" for everyone else. "{role}" is filled in
+
+
+INTENTS: List[Intent] = [
+    Intent("greeting", ("hi", "hello", "hey", "good morning", "good afternoon", "good evening"), {
+        "*": "👋 Hello {role}! I'm MentorChat. How can I support you on MentorLink today?",
+    }),
+    Intent("help", ("help", "support", "assist", "need help", "how do i"), {
+        "Admin": """🛠️ As an Admin, you can:
 - Register new users (mentors & mentees)
 - Monitor user activities and session logs
 - View platform-wide analytics
@@ -19,10 +39,8 @@ def mentorchat(user_input: str, user_role: str = "Mentee") -> str:
 - Manage roles and user status (active/inactive)
 - Reset passwords and approve profile completions
 
-Would you like help with user registration, analytics, or system settings?"""
-
-        elif user_role == "Mentor":
-            return """👨‍🏫 As a Mentor, you can:
+Would you like help with user registration, analytics, or system settings?""",
+        "Mentor": """👨‍🏫 As a Mentor, you can:
 - Complete your profile with name, skills, and mentoring goals
 - Set and manage your availability calendar
 - View mentorship requests from mentees
@@ -30,10 +48,8 @@ Would you like help with user registration, analytics, or system settings?"""
 - Chat with mentees and respond to inquiries
 - Track upcoming sessions and mentorship impact
 
-What would you like to do today—set availability, manage requests, or update your profile?"""
-
-        else:  # Mentee
-            return """🎯 As a Mentee, you can:
+What would you like to do today—set availability, manage requests, or update your profile?""",
+        "*": """🎯 As a Mentee, you can:
 - Complete your profile with name, skills, and goals
 - Browse available mentors by expertise or availability
 - Send mentorship requests
@@ -41,116 +57,92 @@ What would you like to do today—set availability, manage requests, or update y
 - Chat with mentors directly
 - View your dashboard for progress and updates
 
-Would you like help with booking, finding a mentor, or editing your profile?"""
-
-    elif "availability" in user_input:
-        if user_role == "Mentor":
-            return "📆 To set your availability, go to your Mentor Dashboard and click on 'Manage Availability'. You can add specific time slots, set recurring availability, or block off dates."
-        elif user_role == "Mentee":
-            return "📅 You can check mentor availability from your Mentee Dashboard under 'Browse Mentor'. Filter by expertise or time to find a suitable mentor."
-        else:
-            return "🔍 Availability details are specific to mentor schedules. You can review them from the admin panel under 'Mentor Schedules'."
-
-    elif "book" in user_input or "schedule" in user_input or "request" in user_input:
-        if user_role == "Mentee":
-            return "🗓️ To schedule a session, open your dashboard, go to 'Browse Mentor', select a mentor, and click 'Request Mentorship'. You'll receive a confirmation once the mentor responds."
-        elif user_role == "Mentor":
-            return "🗂️ You can respond to mentorship requests from your dashboard under 'Pending Requests'. Accept or decline, and confirm the session time with the mentee."
-        else:
-            return "📊 As Admin, you can oversee session bookings, review scheduling conflicts, and monitor activity logs in the analytics panel."
-
-    elif "profile" in user_input:
-        return "📝 You can complete or edit your profile by clicking on your name (top-right), then selecting 'Edit Profile'. Ensure your skills, goals, and contact details are up-to-date for better mentor-mentee matching."
-
-    elif "dashboard" in user_input:
-        return f"📊 To manage your activities, navigate to the '{user_role.title()} Dashboard' from the sidebar. Here, you can view sessions, messages, and analytics specific to your role."
-
-    elif "messages" in user_input or "chat" in user_input:
-        return "💬 Mentorship messages are accessible through the top-right inbox icon or your session overview. You can reply to mentees or mentors directly and review past conversations."
-
-    elif "register" in user_input or "create user" in user_input:
-        if user_role == "Admin":
-            return "➕ To register users, use the 'Register User' form on your Admin Dashboard. Provide email, role (Mentor/Mentee), and status (active/inactive). Ensure all fields are validated before submission."
-        else:
-            return "🔐 Only Admins can register new users. Please contact support at [support@mentorlink.com](mailto:support@mentorlink.com) for account access or registration issues."
-
-    elif "track progress" in user_input or "progress" in user_input:
-        if user_role == "Mentee":
-            return "📈 You can view your mentorship progress, completed sessions, and goal milestones from your dashboard under 'My Sessions'. Use the progress tracker to review feedback from mentors."
-        elif user_role == "Mentor":
-            return "📊 Mentors can track mentee engagements, session history, and feedback from the Mentor Dashboard under 'Mentorship Impact'. Export reports for detailed insights."
-        else:
-            return "📉 Admins can oversee all users’ progress, session completion rates, and platform engagement metrics in the analytics and activity monitoring section."
-
-    elif "change password" in user_input:
-        return "🔐 To change your password, go to 'Settings' in your profile dropdown menu. Enter your current password, then your new password, and confirm. Ensure it meets security requirements (8+ characters, mix of letters and numbers)."
-
-    elif "support" in user_input or "contact" in user_input:
-        return "📞 For technical support or questions, click 'Contact Us' in the sidebar or reach out via [chat with support](https://wa.me/2348062529172) or email [support@mentorlink.com](mailto:support@mentorlink.com)."
-
-    elif "who are you" in user_input or "what can you do" in user_input:
-        return """🤖 I'm MentorChat, your AI assistant on MentorLink.
-I help you navigate the platform, understand your role, and perform tasks more easily—whether you're an Admin, Mentor, or Mentee. Ask me about profiles, scheduling, analytics, or anything MentorLink-related!"""
-
-    elif any(bye in user_input for bye in farewells):
-        return "👋 Goodbye! Wishing you a productive mentorship experience on MentorLink."
-
-    elif any(word in user_input for word in gratitude):
-        return "🙏 You're welcome! Let me know if there’s anything else I can assist you with."
-
-    elif "mentor expertise" in user_input or "browse mentor" in user_input:
-        if user_role == "Mentee":
-            return "🔎 To find a mentor, go to 'Browse Mentor' on your dashboard. Filter by expertise (e.g., Python, Data Science, UX Design), availability, or ratings. Send a request to connect!"
-        elif user_role == "Mentor":
-            return "📚 As a mentor, you can showcase your expertise by updating your profile with skills and certifications. This helps mentees find you in their search."
-        else:
-            return "🔍 Admins can view mentor expertise and mentee preferences in the user management panel to optimize matching."
-
-    elif "session feedback" in user_input or "review" in user_input:
-        if user_role == "Mentee":
-            return "⭐ After a session, you can provide feedback via the 'My Sessions' section. Rate your mentor and share comments to help improve future sessions."
-        elif user_role == "Mentor":
-            return "📝 You can submit session feedback or review mentee progress in the 'Mentorship Impact' section. Feedback helps track growth and improve mentoring."
-        else:
-            return "📊 Admins can review all session feedback in the analytics panel to ensure quality and address any concerns."
-
-    elif "cancel session" in user_input or "reschedule" in user_input:
-        if user_role == "Mentee":
-            return "🗑️ To cancel or reschedule a session, go to 'My Sessions', select the session, and choose 'Cancel' or 'Reschedule'. Notify your mentor promptly."
-        elif user_role == "Mentor":
-            return "🗓️ You can cancel or reschedule sessions in the 'Upcoming Sessions' section. Notify mentees and update your availability accordingly."
-        else:
-            return "🔧 Admins can manage session cancellations or rescheduling requests via the session logs in the admin panel."
-
-    elif "platform analytics" in user_input or "reports" in user_input:
-        if user_role == "Admin":
-            return "📈 Access platform analytics via the Admin Dashboard under 'Analytics'. View metrics like active users, session completion rates, and mentor-mentee engagement."
-        else:
-            return "🔍 Analytics are available to Admins only. Contact your admin or [support@mentorlink.com](mailto:support@mentorlink.com) for insights."
-
-    elif "notifications" in user_input:
-        return "🔔 Manage notifications in 'Settings' from your profile dropdown. Customize alerts for new messages, session requests, or platform updates."
-
-    elif "mentor matching" in user_input or "match" in user_input:
-        if user_role == "Mentee":
-            return "🤝 Mentor matching is based on your goals and mentor expertise. Update your profile with clear objectives and use 'Browse Mentor' to explore matches."
-        elif user_role == "Mentor":
-            return "🤝 Ensure your profile reflects your expertise and availability to improve mentor-mentee matching. Check pending requests in your dashboard."
-        else:
-            return "🔧 Admins can oversee mentor-mentee matching algorithms and manually adjust matches in the user management panel."
-
-    elif "faq" in user_input or "frequently asked questions" in user_input:
-        return """❓ **MentorLink FAQ**:
+Would you like help with booking, finding a mentor, or editing your profile?""",
+    }),
+    Intent("availability", ("availability",), {
+        "Mentor": "📆 To set your availability, go to your Mentor Dashboard and click on 'Manage Availability'. You can add specific time slots, set recurring availability, or block off dates.",
+        "Mentee": "📅 You can check mentor availability from your Mentee Dashboard under 'Browse Mentor'. Filter by expertise or time to find a suitable mentor.",
+        "*": "🔍 Availability details are specific to mentor schedules. You can review them from the admin panel under 'Mentor Schedules'.",
+    }),
+    Intent("booking", ("book", "schedule", "request"), {
+        "Mentee": "🗓️ To schedule a session, open your dashboard, go to 'Browse Mentor', select a mentor, and click 'Request Mentorship'. You'll receive a confirmation once the mentor responds.",
+        "Mentor": "🗂️ You can respond to mentorship requests from your dashboard under 'Pending Requests'. Accept or decline, and confirm the session time with the mentee.",
+        "*": "📊 As Admin, you can oversee session bookings, review scheduling conflicts, and monitor activity logs in the analytics panel.",
+    }),
+    Intent("profile", ("profile",), {
+        "*": "📝 You can complete or edit your profile by clicking on your name (top-right), then selecting 'Edit Profile'. Ensure your skills, goals, and contact details are up-to-date for better mentor-mentee matching.",
+    }),
+    Intent("dashboard", ("dashboard",), {
+        "*": "📊 To manage your activities, navigate to the '{role} Dashboard' from the sidebar. Here, you can view sessions, messages, and analytics specific to your role.",
+    }),
+    Intent("messages", ("messages", "chat"), {
+        "*": "💬 Mentorship messages are accessible through the top-right inbox icon or your session overview. You can reply to mentees or mentors directly and review past conversations.",
+    }),
+    Intent("register", ("register", "create user"), {
+        "Admin": "➕ To register users, use the 'Register User' form on your Admin Dashboard. Provide email, role (Mentor/Mentee), and status (active/inactive). Ensure all fields are validated before submission.",
+        "*": "🔐 Only Admins can register new users. Please contact support at [support@mentorlink.com](mailto:support@mentorlink.com) for account access or registration issues.",
+    }),
+    Intent("progress", ("track progress", "progress"), {
+        "Mentee": "📈 You can view your mentorship progress, completed sessions, and goal milestones from your dashboard under 'My Sessions'. Use the progress tracker to review feedback from mentors.",
+        "Mentor": "📊 Mentors can track mentee engagements, session history, and feedback from the Mentor Dashboard under 'Mentorship Impact'. Export reports for detailed insights.",
+        "*": "📉 Admins can oversee all users’ progress, session completion rates, and platform engagement metrics in the analytics and activity monitoring section.",
+    }),
+    Intent("password", ("change password",), {
+        "*": "🔐 To change your password, go to 'Settings' in your profile dropdown menu. Enter your current password, then your new password, and confirm. Ensure it meets security requirements (8+ characters, mix of letters and numbers).",
+    }),
+    Intent("support", ("support", "contact"), {
+        "*": "📞 For technical support or questions, click 'Contact Us' in the sidebar or reach out via [chat with support](https://wa.me/2348062529172) or email [support@mentorlink.com](mailto:support@mentorlink.com).",
+    }),
+    Intent("about", ("who are you", "what can you do"), {
+        "*": """🤖 I'm MentorChat, your AI assistant on MentorLink.
+I help you navigate the platform, understand your role, and perform tasks more easily—whether you're an Admin, Mentor, or Mentee. Ask me about profiles, scheduling, analytics, or anything MentorLink-related!""",
+    }),
+    Intent("farewell", ("bye", "goodbye", "see you", "take care", "later"), {
+        "*": "👋 Goodbye! Wishing you a productive mentorship experience on MentorLink.",
+    }),
+    Intent("gratitude", ("thank you", "thanks", "thx", "appreciate"), {
+        "*": "🙏 You're welcome! Let me know if there’s anything else I can assist you with.",
+    }),
+    Intent("expertise", ("mentor expertise", "browse mentor"), {
+        "Mentee": "🔎 To find a mentor, go to 'Browse Mentor' on your dashboard. Filter by expertise (e.g., Python, Data Science, UX Design), availability, or ratings. Send a request to connect!",
+        "Mentor": "📚 As a mentor, you can showcase your expertise by updating your profile with skills and certifications. This helps mentees find you in their search.",
+        "*": "🔍 Admins can view mentor expertise and mentee preferences in the user management panel to optimize matching.",
+    }),
+    Intent("feedback", ("session feedback", "review"), {
+        "Mentee": "⭐ After a session, you can provide feedback via the 'My Sessions' section. Rate your mentor and share comments to help improve future sessions.",
+        "Mentor": "📝 You can submit session feedback or review mentee progress in the 'Mentorship Impact' section. Feedback helps track growth and improve mentoring.",
+        "*": "📊 Admins can review all session feedback in the analytics panel to ensure quality and address any concerns.",
+    }),
+    Intent("cancel", ("cancel session", "reschedule"), {
+        "Mentee": "🗑️ To cancel or reschedule a session, go to 'My Sessions', select the session, and choose 'Cancel' or 'Reschedule'. Notify your mentor promptly.",
+        "Mentor": "🗓️ You can cancel or reschedule sessions in the 'Upcoming Sessions' section. Notify mentees and update your availability accordingly.",
+        "*": "🔧 Admins can manage session cancellations or rescheduling requests via the session logs in the admin panel.",
+    }),
+    Intent("analytics", ("platform analytics", "reports"), {
+        "Admin": "📈 Access platform analytics via the Admin Dashboard under 'Analytics'. View metrics like active users, session completion rates, and mentor-mentee engagement.",
+        "*": "🔍 Analytics are available to Admins only. Contact your admin or [support@mentorlink.com](mailto:support@mentorlink.com) for insights.",
+    }),
+    Intent("notifications", ("notifications",), {
+        "*": "🔔 Manage notifications in 'Settings' from your profile dropdown. Customize alerts for new messages, session requests, or platform updates.",
+    }),
+    Intent("matching", ("mentor matching", "match"), {
+        "Mentee": "🤝 Mentor matching is based on your goals and mentor expertise. Update your profile with clear objectives and use 'Browse Mentor' to explore matches.",
+        "Mentor": "🤝 Ensure your profile reflects your expertise and availability to improve mentor-mentee matching. Check pending requests in your dashboard.",
+        "*": "🔧 Admins can oversee mentor-mentee matching algorithms and manually adjust matches in the user management panel.",
+    }),
+    Intent("faq", ("faq", "frequently asked questions"), {
+        "*": """❓ **MentorLink FAQ**:
 - **How do I find a mentor?** Go to 'Browse Mentor' on your dashboard, filter by expertise or availability, and send a request.
 - **How do I set up my profile?** Click your name (top-right), select 'Edit Profile', and add skills, goals, and contact info.
 - **Can I cancel a session?** Yes, in 'My Sessions', select the session and choose 'Cancel' or 'Reschedule'.
 - **How do I contact support?** Use the 'Contact Us' link or email [support@mentorlink.com](mailto:support@mentorlink.com).
 - **Where do I see my progress?** Check 'My Sessions' (Mentees) or 'Mentorship Impact' (Mentors) on your dashboard.
 - **How do Admins monitor activity?** Use the Admin Dashboard's analytics panel for user activity and session logs.
-Want more details on any of these?"""
+Want more details on any of these?""",
+    }),
+]
 
-    else:
-        return """🤔 I’m not sure I understood that. Try asking about:
+FALLBACK = """🤔 I’m not sure I understood that. Try asking about:
 - Setting availability
 - Booking or canceling a session
 - Completing your profile
@@ -162,3 +154,131 @@ Want more details on any of these?"""
 - Session feedback or platform analytics
 - Notifications or FAQs
 """
+
+
+def _trie_pattern(words: Sequence[str]) -> str:
+    """One regex for a set of literals, factored by common prefix ("h(?:ello|ey|i)")"""
+    trie: Dict = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def emit(node):
+        branches = [re.escape(ch) + emit(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        return f"(?:{body})?" if "" in node else body
+
+    return emit(trie)
+
+
+class IntentMatcher:
+    """
+    First intent (in list order) with a keyword anywhere in the text. A
+    search with the pattern of every keyword finds some match; the search
+    is then repeated with only the keywords of higher-priority intents until
+    none is left, so a message costs one or two regex scans.
+    """
+
+    def __init__(self, intents: Sequence[Intent]):
+        self.intents = list(intents)
+        self.priority: Dict[str, int] = {}
+        for i, intent in enumerate(self.intents):
+            for keyword in intent.keywords:
+                self.priority.setdefault(keyword, i)
+        # _above[p]: keywords of intents 0..p-1
+        self._above = [None] + [
+            re.compile(_trie_pattern([k for k, i in self.priority.items() if i < p]))
+            for p in range(1, len(self.intents) + 1)
+        ]
+
+    def match(self, text: str) -> Optional[Intent]:
+        best = None
+        p = len(self.intents)
+        while p:
+            m = self._above[p].search(text)
+            if not m:
+                break
+            p = best = self.priority[m.group()]
+        return None if best is None else self.intents[best]
+
+
+_STOPWORDS = frozenset("""
+a about an and are as at be can do does for from how i if in is it its me my of on or so that the this to was
+what when where which who why will with you your
+""".split())
+_TOKEN = re.compile(r"[a-z0-9]+")
+_LINKS = re.compile(r"\(\S+?\)|\S+@\S+")  # markdown link targets and email addresses aren't content
+
+
+def tokenize(text: str) -> List[str]:
+    tokens = []
+    for token in _TOKEN.findall(text.lower()):
+        if token in _STOPWORDS:
+            continue
+        for suffix in ("ing", "ed", "es", "s"):
+            if len(token) > len(suffix) + 3 and token.endswith(suffix):
+                token = token[:-len(suffix)]
+                break
+        tokens.append(token)
+    return tokens
+
+
+class FaqIndex:
+    """BM25 over an inverted index of FAQ entries; questions count twice"""
+
+    def __init__(self, entries: Sequence[Dict], k1: float = 1.5, b: float = 0.75):
+        self.entries = list(entries)
+        self.k1, self.b = k1, b
+        self.postings: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        self.lengths: List[int] = []
+        for doc, entry in enumerate(self.entries):
+            tokens = tokenize(entry["question"]) * 2 + tokenize(_LINKS.sub(" ", entry["answer"]))
+            self.lengths.append(len(tokens))
+            for token, tf in Counter(tokens).items():
+                self.postings[token].append((doc, tf))
+        n = len(self.entries)
+        avg_length = sum(self.lengths) / n if n else 0.0
+        idf = {t: math.log(1 + (n - len(p) + 0.5) / (len(p) + 0.5)) for t, p in self.postings.items()}
+        # Everything but the query is fixed, so each posting carries its final weight
+        self.weights: Dict[str, List[Tuple[int, float]]] = {
+            token: [(doc, idf[token] * tf * (k1 + 1) / (tf + k1 * (1 - b + b * self.lengths[doc] / avg_length)))
+                    for doc, tf in postings]
+            for token, postings in self.postings.items()
+        }
+
+    def search(self, query: str, k: int = 1) -> List[Tuple[float, Dict]]:
+        scores: Dict[int, float] = defaultdict(float)
+        for token in set(tokenize(query)):
+            for doc, weight in self.weights.get(token, ()):
+                scores[doc] += weight
+        best = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+        return [(score, self.entries[doc]) for doc, score in best]
+
+
+MATCHER = IntentMatcher(INTENTS)
+FAQ_INDEX = FaqIndex(FAQ)
+
+
+def normalize(user_input: str) -> str:
+    return " ".join(user_input.lower().split())
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _answer(message: str, user_role: str) -> str:
+    intent = MATCHER.match(message)
+    if intent is not None:
+        answer = intent.answers.get(user_role, intent.answers["*"])
+        return answer.replace("{role}", user_role.title())
+
+    hits = FAQ_INDEX.search(message)
+    if hits and hits[0][0] >= FAQ_MIN_SCORE:
+        return hits[0][1]["answer"]
+    return FALLBACK
+
+
+def mentorchat(user_input: str, user_role: str = "Mentee") -> str:
+    return _answer(normalize(user_input), user_role)
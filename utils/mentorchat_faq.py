@@ -0,0 +1,87 @@
+# utils/mentorchat_faq.py
+# Questions MentorChat answers when no keyword rule matches (BM25 over
+# question + answer, see utils/mentorchat.py). Add entries here; keep answers
+# short and point at the tab or button that does the job.
+
+FAQ = [
+    {
+        "question": "What time zone are session times shown in?",
+        "answer": "🕒 Session times are in West Africa Time (WAT, Africa/Lagos); mentees also see them in their browser's time zone. Calendar invites carry the time zone, so your calendar app converts them for you.",
+    },
+    {
+        "question": "Where do I find the Google Meet link to join my session?",
+        "answer": "🎥 Every booked session gets a Google Meet link. It's on the session card under 'My Sessions' (mentees) or 'Sessions' (mentors), and in your confirmation email.",
+    },
+    {
+        "question": "Can I add my sessions to Google Calendar or Outlook?",
+        "answer": "📅 Yes. Under 'My Sessions' (mentees) or 'Sessions' (mentors), open 'Add sessions to your calendar' and subscribe with the URL (Add calendar → From URL), or download an .ics file.",
+    },
+    {
+        "question": "Can I import free time from my existing calendar as availability?",
+        "answer": "📥 Mentors can upload an .ics export from Google Calendar or Outlook in the 'Availability' tab under 'Import availability from a calendar (.ics)'. Timed events in the next year become slots; overlaps are skipped.",
+    },
+    {
+        "question": "How do I offer the same weekly time slot every week?",
+        "answer": "🔁 In the 'Availability' tab, use 'Recurring Availability': pick the weekdays, times and how often it repeats. You can skip a single date without deleting the rule.",
+    },
+    {
+        "question": "What happens if the slot I picked was taken just before I confirmed?",
+        "answer": "⚡ Slots can't be double-booked. If someone got there first, you're booked into the mentor's next free slot and told the new time; if none is left, you'll see a warning.",
+    },
+    {
+        "question": "I didn't get a confirmation email for my session",
+        "answer": "📧 Confirmations and calendar invites are sent a few moments after booking. Check your spam folder; the session and its Meet link are already visible under 'My Sessions' or 'Sessions'.",
+    },
+    {
+        "question": "How do I rate my mentor after a session?",
+        "answer": "⭐ Open the '✅ Session Feedback' tab, expand the session, pick a rating and add a comment, then click 'Submit Feedback'.",
+    },
+    {
+        "question": "How do I remind the other person about an upcoming session?",
+        "answer": "📧 Each upcoming session card has a '📧 Send Reminder' button that emails the other participant the time and Meet link.",
+    },
+    {
+        "question": "What does pending, accepted or rejected mean on my mentorship requests?",
+        "answer": "⏳ PENDING means the mentor hasn't answered yet, ACCEPTED means a session was booked, and REJECTED means the mentor declined. You can send a new request to another mentor from 'Browse Mentors'.",
+    },
+    {
+        "question": "How long is a mentorship session?",
+        "answer": "⏱️ Mentors choose the length of each slot when they add availability; the start and end time are shown on every slot before you book it.",
+    },
+    {
+        "question": "How can I become a mentor?",
+        "answer": "🚀 Mentees can be promoted to mentors by an Admin. Complete your profile with your skills and contact [support@mentorlink.com](mailto:support@mentorlink.com).",
+    },
+    {
+        "question": "How do I delete or deactivate my account?",
+        "answer": "🗑️ Accounts are managed by Admins. Email [support@mentorlink.com](mailto:support@mentorlink.com) from your registered address to have your account deactivated or removed.",
+    },
+    {
+        "question": "I forgot my password and can't log in",
+        "answer": "🔑 Ask an Admin or email [support@mentorlink.com](mailto:support@mentorlink.com) to reset it, then change it from 'Settings' once you're in.",
+    },
+    {
+        "question": "Where do I see announcements from the MentorLink team?",
+        "answer": "📥 Announcements appear in your Inbox: click '📥 Inbox' on your dashboard. New ones are marked 📨 until you open them.",
+    },
+    {
+        "question": "What is MentorLink, and what is MentorLink for?",
+        "answer": "🌍 MentorLink connects mentees with experienced mentors: mentees browse mentors by skill and free time, request mentorship, and book sessions with a Meet link and calendar invite.",
+    },
+    {
+        "question": "Can an admin pair all unmatched mentees with mentors at once?",
+        "answer": "🔁 Yes. In the '🔁 Matches' tab, Admins can propose matches for every unmatched mentee by skills and mentor capacity, create them in one click, and then book everyone's kickoff sessions.",
+    },
+    {
+        "question": "How do admins send an announcement to all users?",
+        "answer": "📢 In the '📢 Broadcast' tab, write a title and message, pick the audience and click '📤 Send Message'. It lands in each recipient's Inbox.",
+    },
+    {
+        "question": "Can I see my past sessions and ratings?",
+        "answer": "🗂️ Past and upcoming sessions are listed under 'My Sessions' (mentees) or 'Sessions' (mentors), with the rating and feedback once it's been given.",
+    },
+    {
+        "question": "Why can't I see any free slots for a mentor?",
+        "answer": "🈳 The mentor has no open time in the coming weeks, or all of it is booked. Try another mentor with the same skills, or check back later.",
+    },
+]
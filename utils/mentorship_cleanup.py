@@ -1,41 +1,19 @@
-from datetime import datetime, timedelta, timezone
-from database import supabase
-import pytz
-
-# Define WAT timezone for any local conversions if needed
-WAT = pytz.timezone("Africa/Lagos")
+from utils.auto_cancel import cancel_pending_requests
 
 def cancel_stale_requests():
     """
-    Cancels mentorship requests older than 48 hours that are still PENDING.
-    Assumes 'created_at' is stored in UTC ISO format.
+    Cancels mentorship requests older than 48 hours that are still PENDING,
+    with a single UPDATE. Returns the number cancelled.
     """
     try:
-        # Get current UTC time and subtract 48 hours for cutoff
-        cutoff_time_utc = datetime.now(timezone.utc) - timedelta(hours=48)
-
-        # Query all PENDING requests older than cutoff time
-        response = supabase.table("mentorshiprequest") \
-            .select("id, created_at") \
-            .eq("status", "PENDING") \
-            .lt("created_at", cutoff_time_utc.isoformat()) \
-            .execute()
-
-        stale_requests = response.data or []
+        cancelled = cancel_pending_requests("CANCELLED")
 
-        if not stale_requests:
+        if not cancelled:
             print("ℹ️ No stale requests found.")
-            return
-
-        for req in stale_requests:
-            # Update status to CANCELLED for each stale request
-            supabase.table("mentorshiprequest") \
-                .update({"status": "CANCELLED"}) \
-                .eq("id", req["id"]) \
-                .execute()
-            print(f"✅ Cancelled request ID: {req['id']}")
-
-        print(f"🔁 Total cancelled stale requests: {len(stale_requests)}")
+        else:
+            print(f"🔁 Total cancelled stale requests: {cancelled}")
+        return cancelled
 
     except Exception as e:
         print(f"❌ Error while cancelling stale requests: {e}")
+        return 0
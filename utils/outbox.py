@@ -0,0 +1,324 @@
+# utils/outbox.py
+"""
+Booking side-effects (calendar event, confirmation emails) run from the
+`outbox` table instead of inside the user's click. Booking is one RPC that
+writes the session and its jobs together; workers drain the jobs with retries.
+Each app server runs a worker thread (app.py) unless OUTBOX_IN_APP=0, in which
+case run one or more workers separately:
+
+    python -m utils.outbox work [--once] [--concurrency 8]
+    python -m utils.outbox status
+"""
+
+import argparse
+import hashlib
+import logging
+import os
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional
+
+import pytz
+
+from database import supabase
+
+logger = logging.getLogger(__name__)
+
+WAT = pytz.timezone("Africa/Lagos")
+
+OUTBOX_TABLE = "outbox"
+MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", 6))
+BACKOFF_SECONDS = float(os.getenv("OUTBOX_BACKOFF_SECONDS", 5))
+BACKOFF_MAX_SECONDS = float(os.getenv("OUTBOX_BACKOFF_MAX_SECONDS", 600))
+BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", 20))
+LEASE_SECONDS = int(os.getenv("OUTBOX_LEASE_SECONDS", 60))
+CONCURRENCY = int(os.getenv("OUTBOX_CONCURRENCY", 8))
+
+
+def booking_email(start: datetime, end: datetime, meet_link: Optional[str], cal_link: Optional[str]):
+    """Subject and body of the booking confirmation"""
+    start_wat = start.astimezone(WAT)
+    end_wat = end.astimezone(WAT)
+    subject = "📅 Mentorship Session Booked"
+    body = f"""
+Hi,
+
+Your mentorship session has been scheduled.
+
+🕒 Time: {start_wat.strftime('%A, %d %B %Y at %I:%M %p')} to {end_wat.strftime('%I:%M %p')} (WAT)
+🔗 Join Meeting: {meet_link}
+📅 View in Calendar: {cal_link}
+
+Thank you,
+MentorLink Team
+    """.strip()
+    return subject, body
+
+
+def event_id_for(key: str) -> str:
+    """Stable Google Calendar event id (base32hex-safe) for an idempotency key"""
+    return hashlib.sha1(key.encode()).hexdigest()
+
+
+def localize(dt: datetime) -> datetime:
+    """Naive datetimes are WAT wall-clock times (the booking UI's zone)"""
+    return WAT.localize(dt) if dt.tzinfo is None else dt
+
+
+def backoff_delay(attempts: int) -> float:
+    return min(BACKOFF_MAX_SECONDS, BACKOFF_SECONDS * 2 ** max(attempts - 1, 0))
+
+
+class OutboxStore:
+    """The outbox table plus the two RPCs from sql/outbox.sql"""
+
+    def __init__(self, client=None):
+        self.client = client or supabase
+
+    def book_session(self, mentor_id, mentee_id, start: datetime, end: datetime, summary: str = "Mentorship Session"):
+        """Insert the session and its calendar job in one transaction; None on a slot conflict"""
+        sessionid = self.client.rpc("book_session", {
+            "p_mentorid": mentor_id,
+            "p_menteeid": mentee_id,
+            "p_start": localize(start).isoformat(),  # timestamptz: naive would be read in the DB's zone
+            "p_end": localize(end).isoformat(),
+            "p_summary": summary,
+        }).execute().data
+        if hasattr(self.client, "invalidate"):
+            self.client.invalidate("session")
+        return sessionid
+
+    def set_meet_link(self, sessionid, meet_link: str):
+        self.client.table("session").update({"meet_link": meet_link}).eq("sessionid", sessionid).execute()
+
+    def enqueue(self, kind: str, payload: Dict, key: str):
+        """Queue a job; a second enqueue with the same key is a no-op"""
+        self.client.table(OUTBOX_TABLE).upsert(
+            {"kind": kind, "payload": payload, "idempotency_key": key},
+            on_conflict="idempotency_key", ignore_duplicates=True,
+        ).execute()
+
+    def enqueue_many(self, jobs: List[Dict]):
+        """Queue {kind, payload, key} jobs in one upsert; keys already queued are skipped"""
+        if not jobs:
+            return
+        self.client.table(OUTBOX_TABLE).upsert(
+            [{"kind": j["kind"], "payload": j["payload"], "idempotency_key": j["key"]} for j in jobs],
+            on_conflict="idempotency_key", ignore_duplicates=True,
+        ).execute()
+
+    def claim(self, worker: str, limit: int = BATCH_SIZE, lease: int = LEASE_SECONDS) -> List[Dict]:
+        return self.client.rpc("claim_outbox_jobs", {
+            "p_worker": worker, "p_limit": limit, "p_lease_seconds": lease,
+        }).execute().data or []
+
+    def _finish(self, job: Dict, fields: Dict):
+        # Only the worker holding the lease may settle the job
+        self.client.table(OUTBOX_TABLE).update({"locked_until": None, **fields}) \
+            .eq("jobid", job["jobid"]).eq("locked_by", job["locked_by"]).execute()
+
+    def complete(self, job: Dict):
+        self._finish(job, {"status": "DONE", "last_error": None, "done_at": datetime.now(timezone.utc).isoformat()})
+
+    def retry(self, job: Dict, error: str, delay: float):
+        run_after = datetime.now(timezone.utc) + timedelta(seconds=delay)
+        self._finish(job, {"status": "PENDING", "last_error": error, "run_after": run_after.isoformat()})
+
+    def bury(self, job: Dict, error: str):
+        self._finish(job, {"status": "DEAD", "last_error": error})
+
+    def counts(self) -> Dict[str, int]:
+        rows = self.client.table(OUTBOX_TABLE).select("status").neq("status", "DONE").execute().data or []
+        counts: Dict[str, int] = {}
+        for row in rows:
+            counts[row["status"]] = counts.get(row["status"], 0) + 1
+        return counts
+
+
+# ---- Job handlers ----
+
+def _default_create_event(start, end, summary, event_id):
+    from utils.google_calendar import get_calendar_client
+    from utils.google_meet import meet_event_body
+    body = meet_event_body(summary, start, end)
+    body["id"] = event_id
+    return get_calendar_client().insert_event(body, conferenceDataVersion=1)
+
+
+def conference_pending(event: Dict) -> bool:
+    """Google accepted the Meet request but hasn't attached the link yet"""
+    status = (event.get("conferenceData") or {}).get("createRequest", {}).get("status", {})
+    return status.get("statusCode") == "pending"
+
+
+def _default_patch_event(event_id, body):
+    from utils.google_calendar import get_calendar_client
+    return get_calendar_client().patch_event(event_id, body)
+
+
+def _default_send(to_email, subject, body):
+    from emailer import deliver_email
+    deliver_email(to_email, subject, body)
+
+
+def make_handlers(create_event: Optional[Callable] = None, send: Optional[Callable] = None,
+                  patch_event: Optional[Callable] = None) -> Dict[str, Callable]:
+    """
+    Handlers by job kind. `create_event(start, end, summary, event_id) -> event`,
+    `patch_event(event_id, fields) -> event` and `send(to, subject, body)`
+    default to Google Calendar and pooled SMTP; pass local stand-ins to run
+    the outbox without either.
+    """
+    create_event = create_event or _default_create_event
+    patch_event = patch_event or _default_patch_event
+    send = send or _default_send
+
+    def queue_emails(store: OutboxStore, p: Dict, start, end, meet_link, cal_link):
+        subject, body = booking_email(start, end, meet_link, cal_link)
+        for email in dict.fromkeys(e for e in p.get("emails") or [] if e):
+            store.enqueue("email", {"to": email, "subject": subject, "body": body},
+                          f"session:{p['sessionid']}:email:{email}")
+
+    def calendar_event(job: Dict, store: OutboxStore):
+        p = job["payload"]
+        start, end = datetime.fromisoformat(p["start"]), datetime.fromisoformat(p["end"])
+        event = create_event(start, end, p.get("summary") or "Mentorship Session", event_id_for(job["idempotency_key"]))
+        if conference_pending(event):
+            # The retry's insert hits 409 and reads the event back, link included
+            raise RuntimeError("Meet conference is still being created")
+        meet_link, cal_link = event.get("hangoutLink"), event.get("htmlLink")
+        if meet_link:
+            store.set_meet_link(p["sessionid"], meet_link)
+        queue_emails(store, p, start, end, meet_link, cal_link)
+
+    def meet_patch(job: Dict, store: OutboxStore):
+        # The session already has the pooled Meet link; move the placeholder
+        # event to the session's time and invite the attendees
+        from utils.google_calendar import event_body
+
+        p = job["payload"]
+        start, end = datetime.fromisoformat(p["start"]), datetime.fromisoformat(p["end"])
+        fields = event_body(start, end, p.get("summary") or "Mentorship Session",
+                            [e for e in p.get("emails") or [] if e])
+        fields.update(transparency="opaque", visibility="default")
+        event = patch_event(p["event_id"], fields)
+        queue_emails(store, p, start, end, p.get("meet_link") or event.get("hangoutLink"), event.get("htmlLink"))
+
+    def email(job: Dict, store: OutboxStore):
+        p = job["payload"]
+        send(p["to"], p["subject"], p["body"])
+
+    return {"calendar_event": calendar_event, "meet_patch": meet_patch, "email": email}
+
+
+class OutboxWorker:
+    """
+    Claims batches of ready jobs and runs them on a thread pool. Failures are
+    retried with exponential backoff; after MAX_ATTEMPTS a job is marked DEAD.
+    Delivery is at-least-once, so handlers rely on idempotency keys (calendar
+    event ids, one email job per recipient) to make repeats harmless.
+    """
+
+    def __init__(self, store: Optional[OutboxStore] = None, handlers: Optional[Dict[str, Callable]] = None,
+                 concurrency: int = CONCURRENCY, batch_size: int = BATCH_SIZE, lease: int = LEASE_SECONDS,
+                 name: Optional[str] = None):
+        self.store = store or OutboxStore()
+        self.handlers = handlers or make_handlers()
+        self.batch_size = batch_size
+        self.lease = lease
+        self.name = name or f"{socket.gethostname()}:{os.getpid()}"
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="outbox")
+        self._stop = threading.Event()
+        self.counts = {"done": 0, "retried": 0, "dead": 0}
+        self._lock = threading.Lock()
+
+    def _count(self, field: str):
+        with self._lock:
+            self.counts[field] += 1
+
+    def _run(self, job: Dict):
+        handler = self.handlers.get(job["kind"])
+        try:
+            if handler is None:
+                raise ValueError(f"No handler for job kind '{job['kind']}'")
+            handler(job, self.store)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            if handler is None or job["attempts"] >= MAX_ATTEMPTS:
+                logger.error(f"❌ Outbox job {job['jobid']} ({job['kind']}) is dead: {error}")
+                self.store.bury(job, error)
+                self._count("dead")
+            else:
+                self.store.retry(job, error, backoff_delay(job["attempts"]))
+                self._count("retried")
+            return
+        self.store.complete(job)
+        self._count("done")
+
+    def run_once(self) -> int:
+        """Claim one batch and wait for it; returns the number of jobs run"""
+        jobs = self.store.claim(self.name, self.batch_size, self.lease)
+        list(self._executor.map(self._run, jobs))
+        return len(jobs)
+
+    def run_forever(self, poll_interval: float = 2.0):
+        while not self._stop.is_set():
+            try:
+                if self.run_once():
+                    continue  # more may be ready
+            except Exception as e:
+                logger.warning(f"⚠️ Outbox poll failed: {e}")
+            self._stop.wait(poll_interval)
+
+    def drain(self) -> int:
+        """Run until nothing is ready (follow-up jobs included)"""
+        total = 0
+        while True:
+            ran = self.run_once()
+            if not ran:
+                return total
+            total += ran
+
+    def stop(self):
+        self._stop.set()
+        self._executor.shutdown(wait=True)
+
+
+def start_background_worker(concurrency: int = CONCURRENCY, poll_interval: float = 2.0) -> OutboxWorker:
+    """In-process worker thread for deployments without a separate worker"""
+    worker = OutboxWorker(concurrency=concurrency)
+    threading.Thread(target=worker.run_forever, args=(poll_interval,), name="outbox", daemon=True).start()
+    return worker
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+    work = sub.add_parser("work", help="drain outbox jobs")
+    work.add_argument("--once", action="store_true", help="exit when nothing is ready")
+    work.add_argument("--concurrency", type=int, default=CONCURRENCY)
+    work.add_argument("--poll", type=float, default=2.0, help="seconds between idle polls")
+    sub.add_parser("status", help="count jobs that are not done")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    if args.command == "status":
+        print(OutboxStore().counts() or "outbox is empty")
+        return
+
+    worker = OutboxWorker(concurrency=args.concurrency)
+    try:
+        if args.once:
+            logger.info(f"✅ Ran {worker.drain()} outbox jobs")
+        else:
+            worker.run_forever(args.poll)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        worker.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+# utils/recurrence.py
+"""
+Recurring availability: weekly / every-N-weeks rules stored as one
+`availability_rule` row each (sql/availability_rules.sql). Rules are expanded
+into concrete slots only for the window being viewed, so the cost is
+O(days in window) however long the rule has been running. An occurrence
+becomes a real `availability` row when it is booked (reserve_rule_slot).
+"""
+
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pytz
+
+from database import supabase
+
+WAT = pytz.timezone("Africa/Lagos")
+WEEKDAYS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+WINDOW_DAYS = 28  # how far ahead browse/booking pages expand rules
+RULES_TABLE = "availability_rule"
+
+
+def _as_date(value) -> Optional[date]:
+    if value is None or isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+def _as_time(value) -> time:
+    return value if isinstance(value, time) else time.fromisoformat(str(value))
+
+
+def rule_occurrences(rule: Dict, window_start: datetime, window_end: datetime) -> List[Tuple[datetime, datetime]]:
+    """(start, end) of every occurrence of `rule` starting in [window_start, window_end)"""
+    tz = pytz.timezone(rule.get("tz") or "Africa/Lagos")
+    dtstart = _as_date(rule["dtstart"])
+    until = _as_date(rule.get("until"))
+    byday = set(rule["byday"])
+    every = int(rule.get("every_weeks") or 1)
+    exdates = {_as_date(d) for d in rule.get("exdates") or []}
+    start_time, end_time = _as_time(rule["start_time"]), _as_time(rule["end_time"])
+    duration = datetime.combine(dtstart, end_time) - datetime.combine(dtstart, start_time)
+    anchor = dtstart - timedelta(days=dtstart.weekday())  # Monday of the first week
+
+    first = max(dtstart, window_start.astimezone(tz).date())
+    last = window_end.astimezone(tz).date()
+    if until is not None:
+        last = min(last, until)
+
+    occurrences = []
+    day = first
+    while day <= last:
+        if day.weekday() in byday and ((day - anchor).days // 7) % every == 0 and day not in exdates:
+            start = tz.localize(datetime.combine(day, start_time))
+            if window_start <= start < window_end:
+                occurrences.append((start, start + duration))
+        day += timedelta(days=1)
+    return occurrences
+
+
+def expand_rules(rules: Iterable[Dict], window_start: datetime, window_end: datetime,
+                 materialized: Iterable[Dict] = ()) -> List[Dict]:
+    """
+    Virtual availability rows for every rule occurrence in the window, in start
+    order. Occurrences that already have an availability row (same ruleid and
+    start) are left to that row. Virtual rows have no availabilityid.
+    """
+    taken = set()
+    for row in materialized:
+        if row.get("ruleid") and row.get("start"):
+            start = datetime.fromisoformat(str(row["start"]).replace("Z", "+00:00"))
+            taken.add((row["ruleid"], (start if start.tzinfo else pytz.utc.localize(start)).timestamp()))
+
+    slots = []
+    for rule in rules:
+        for start, end in rule_occurrences(rule, window_start, window_end):
+            if (rule["ruleid"], start.timestamp()) in taken:
+                continue
+            slots.append({
+                "availabilityid": None,
+                "ruleid": rule["ruleid"],
+                "mentorid": rule["mentorid"],
+                "start": start.isoformat(),
+                "end": end.isoformat(),
+                "date": start.date().isoformat(),
+            })
+    slots.sort(key=lambda s: s["start"])
+    return slots
+
+
+def overlapping_occurrence(rules: Iterable[Dict], start: datetime, end: datetime) -> Optional[Tuple[datetime, datetime]]:
+    """First rule occurrence intersecting [start, end), if any"""
+    for rule in rules:
+        for occ_start, occ_end in rule_occurrences(rule, start - timedelta(days=1), end):
+            if occ_start < end and start < occ_end:
+                return occ_start, occ_end
+    return None
+
+
+def describe_rule(rule: Dict) -> str:
+    days = ", ".join(WEEKDAYS[d] for d in sorted(rule["byday"]))
+    every = int(rule.get("every_weeks") or 1)
+    cadence = "Every week" if every == 1 else f"Every {every} weeks"
+    times = f"{_as_time(rule['start_time']).strftime('%I:%M %p')} – {_as_time(rule['end_time']).strftime('%I:%M %p')}"
+    text = f"{cadence} on {days}, {times} from {_as_date(rule['dtstart']).strftime('%d %b %Y')}"
+    if rule.get("until"):
+        text += f" until {_as_date(rule['until']).strftime('%d %b %Y')}"
+    if rule.get("exdates"):
+        text += f" (skipping {len(rule['exdates'])} date{'s' if len(rule['exdates']) != 1 else ''})"
+    return text
+
+
+# ---- Storage ----
+
+def load_rules(mentor_ids: Iterable, client=None) -> Dict[str, List[Dict]]:
+    """Rules grouped by mentor, in one in_() query"""
+    client = client or supabase
+    mentor_ids = list(dict.fromkeys(m for m in mentor_ids if m))
+    grouped: Dict[str, List[Dict]] = {m: [] for m in mentor_ids}
+    if not mentor_ids:
+        return grouped
+    rows = client.table(RULES_TABLE).select("*").in_("mentorid", mentor_ids).execute().data or []
+    for row in rows:
+        grouped.setdefault(row["mentorid"], []).append(row)
+    return grouped
+
+
+def materialize_rules(rules: Iterable[Dict], window_start: datetime, window_end: datetime, client=None) -> int:
+    """
+    Give every occurrence of `rules` in the window a real availability row
+    (materialize_rule_slots; rows that exist are kept), for SQL that counts or
+    claims free slots itself. Returns the number of occurrences sent.
+    """
+    slots = expand_rules(rules, window_start, window_end)
+    if not slots:
+        return 0
+    client = client or supabase
+    made = client.rpc("materialize_rule_slots", {
+        "p_slots": [{"ruleid": s["ruleid"], "start": s["start"]} for s in slots],
+    }).execute().data or 0
+    if hasattr(client, "invalidate"):
+        client.invalidate("availability")
+    return made
+
+
+def add_rule(mentor_id, weekdays: List[int], start_time: time, end_time: time, every_weeks: int = 1,
+             starts_on: Optional[date] = None, until: Optional[date] = None, tz: str = "Africa/Lagos",
+             client=None) -> Dict:
+    if not weekdays:
+        raise ValueError("Pick at least one weekday.")
+    if end_time <= start_time:
+        raise ValueError("End time must be after start time.")
+    starts_on = starts_on or datetime.now(pytz.timezone(tz)).date()
+    if until is not None and until < starts_on:
+        raise ValueError("The end date is before the start date.")
+    client = client or supabase
+    rows = client.table(RULES_TABLE).insert({
+        "mentorid": mentor_id,
+        "byday": sorted(set(weekdays)),
+        "every_weeks": every_weeks,
+        "start_time": start_time.strftime("%H:%M:%S"),
+        "end_time": end_time.strftime("%H:%M:%S"),
+        "tz": tz,
+        "dtstart": starts_on.isoformat(),
+        "until": until.isoformat() if until else None,
+    }).execute().data or []
+    return rows[0] if rows else {}
+
+
+def skip_date(rule: Dict, day: date, client=None):
+    """Add an exception date; an already-booked occurrence on that day stays booked"""
+    client = client or supabase
+    exdates = sorted({str(d)[:10] for d in rule.get("exdates") or []} | {day.isoformat()})
+    client.table(RULES_TABLE).update({"exdates": exdates}).eq("ruleid", rule["ruleid"]).execute()
+
+
+def delete_rule(ruleid, client=None):
+    """Stops future occurrences; materialized (booked) slots are kept"""
+    client = client or supabase
+    client.table(RULES_TABLE).delete().eq("ruleid", ruleid).execute()
@@ -0,0 +1,101 @@
+# utils/reservations.py
+"""
+Slot reservations: claim an availability slot and create its session with a
+single conditional write (the RPCs in sql/reservations.sql). Losing a race
+costs one more round trip to the mentor's next free slot, never a double
+booking.
+"""
+
+import random
+import time
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
+
+from database import supabase
+
+RESERVE_RETRIES = 3
+
+
+class ReservationStore:
+    """reserve_slot / reserve_next_slot / release_slot over PostgREST"""
+
+    def __init__(self, client=None):
+        self.client = client or supabase
+
+    def _invalidate(self):
+        if hasattr(self.client, "invalidate"):
+            self.client.invalidate("availability", "session", "mentorshiprequest")
+
+    def _call(self, fn: str, params: Dict) -> Optional[Dict]:
+        rows = self.client.rpc(fn, params).execute().data or []
+        self._invalidate()
+        return rows[0] if rows else None
+
+    def reserve(self, availability_id, mentee_id, request_id=None) -> Optional[Dict]:
+        """The new session, or None if someone else holds the slot"""
+        return self._call("reserve_slot", {
+            "p_availabilityid": availability_id,
+            "p_menteeid": mentee_id,
+            "p_requestid": request_id,
+        })
+
+    def reserve_next(self, mentor_id, mentee_id, after=None, request_id=None) -> Optional[Dict]:
+        """Earliest free slot starting after `after` (default: now); None if none is free"""
+        after = after or datetime.now(timezone.utc)
+        return self._call("reserve_next_slot", {
+            "p_mentorid": mentor_id,
+            "p_menteeid": mentee_id,
+            "p_after": after.isoformat() if isinstance(after, datetime) else after,
+            "p_requestid": request_id,
+        })
+
+    def reserve_occurrence(self, ruleid, start, mentee_id, request_id=None) -> Optional[Dict]:
+        """Materialize a recurring-rule occurrence and reserve it (sql/availability_rules.sql)"""
+        return self._call("reserve_rule_slot", {
+            "p_ruleid": ruleid,
+            "p_start": start.isoformat() if isinstance(start, datetime) else start,
+            "p_menteeid": mentee_id,
+            "p_requestid": request_id,
+        })
+
+    def release(self, availability_id):
+        self.client.rpc("release_slot", {"p_availabilityid": availability_id}).execute()
+        self._invalidate()
+
+
+def book_slot(mentor_id, mentee_id, availability_id=None, request_id=None, after=None,
+              store=None, retries: int = RESERVE_RETRIES) -> Tuple[Optional[Dict], bool]:
+    """
+    Book `availability_id` for the mentee, or the mentor's next free slot
+    after `after` if it was just taken. Returns (session, fell_back); session
+    is None when the mentor has no free slot left.
+    """
+    store = store or ReservationStore()
+    if availability_id is not None:
+        session = store.reserve(availability_id, mentee_id, request_id)
+        if session:
+            return session, False
+
+    for attempt in range(retries):
+        session = store.reserve_next(mentor_id, mentee_id, after, request_id)
+        if session:
+            return session, availability_id is not None
+        # Nothing free, or every candidate was mid-claim by someone else: a
+        # short jittered pause lets those claims settle before looking again
+        time.sleep(random.uniform(0, 0.005 * (attempt + 1)))
+    return None, availability_id is not None
+
+
+def book_available(slot: Dict, mentee_id, request_id=None, after=None, store=None) -> Tuple[Optional[Dict], bool]:
+    """
+    book_slot for a row from the availability table or a virtual row from
+    utils.recurrence.expand_rules (no availabilityid yet).
+    """
+    store = store or ReservationStore()
+    if slot.get("availabilityid") is not None or not slot.get("ruleid"):
+        return book_slot(slot["mentorid"], mentee_id, slot.get("availabilityid"), request_id, after, store)
+    session = store.reserve_occurrence(slot["ruleid"], slot["start"], mentee_id, request_id)
+    if session:
+        return session, False
+    session, _ = book_slot(slot["mentorid"], mentee_id, None, request_id, after, store)
+    return session, True
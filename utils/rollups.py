@@ -0,0 +1,108 @@
+# utils/rollups.py
+"""
+Read side and backfill command for the analytics_rollup table (sql/rollups.sql).
+
+    python -m utils.rollups backfill     # rebuild all buckets from raw rows
+    python -m utils.rollups show users   # print monthly buckets for a metric
+"""
+
+import argparse
+import logging
+from datetime import date
+from typing import List, Optional, Tuple
+
+import pandas as pd
+
+from database import supabase
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+ROLLUP_TABLE = "analytics_rollup"
+METRICS = ("users", "sessions", "requests")
+
+
+def bucket_range(year=None, month=None):
+    """[start, end) bucket dates for a year/month filter; None means unbounded by date"""
+    if year in (None, "All"):
+        return None, None
+    year = int(year)
+    if month in (None, "All"):
+        return date(year, 1, 1), date(year + 1, 1, 1)
+    month = int(month)
+    end = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+    return date(year, month, 1), end
+
+
+def read_rollup(
+    metric: str,
+    year=None,
+    month=None,
+    grain: str = "month",
+    dimension: Optional[str] = None,
+    mentorid: str = "",
+    client=None,
+) -> pd.DataFrame:
+    """
+    Buckets for one metric as a frame with columns bucket, dimension, count.
+    Cost is proportional to the number of buckets, not the number of rows.
+    """
+    client = client or supabase
+    query = client.table(ROLLUP_TABLE).select("bucket, dimension, count") \
+        .eq("metric", metric).eq("grain", grain).eq("mentorid", mentorid)
+
+    start, end = bucket_range(year, month)
+    if start:
+        query = query.gte("bucket", start.isoformat()).lt("bucket", end.isoformat())
+    elif month not in (None, "All"):
+        # A month without a year means that month in every year
+        query = query.eq("month", int(month))
+    if dimension is not None:
+        query = query.eq("dimension", dimension)
+
+    rows = query.order("bucket").execute().data or []
+    df = pd.DataFrame(rows, columns=["bucket", "dimension", "count"])
+    return df[df["count"] != 0]
+
+
+def monthly_series(metric: str, year=None, month=None, dimension: Optional[str] = None, client=None) -> pd.DataFrame:
+    """Monthly buckets with a YYYY-MM `month` column, ready for charts"""
+    df = read_rollup(metric, year, month, grain="month", dimension=dimension, client=client)
+    df["month"] = df["bucket"].astype(str).str[:7]
+    return df[["month", "dimension", "count"]]
+
+
+def active_months(client=None) -> List[Tuple[int, int]]:
+    """(year, month) pairs that have any counted activity"""
+    client = client or supabase
+    rows = client.table(ROLLUP_TABLE).select("bucket") \
+        .eq("grain", "month").eq("mentorid", "").neq("count", 0).execute().data or []
+    return sorted({(int(r["bucket"][:4]), int(r["bucket"][5:7])) for r in rows})
+
+
+def backfill(client=None) -> int:
+    """Rebuild every bucket from raw rows with one set-based SQL function"""
+    client = client or supabase
+    total = client.rpc("analytics_rollup_backfill", {}).execute().data
+    logger.info(f"✅ Rollup backfill wrote {total} buckets")
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("backfill", help="rebuild analytics_rollup from raw tables")
+    show = sub.add_parser("show", help="print monthly buckets for a metric")
+    show.add_argument("metric", choices=METRICS)
+    show.add_argument("--year")
+    show.add_argument("--month")
+    args = parser.parse_args()
+
+    if args.command == "backfill":
+        backfill()
+    else:
+        print(monthly_series(args.metric, args.year, args.month).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -13,7 +13,7 @@ def setup_admin_account():
         existing = supabase.table("users").select("*").eq("email", admin_email).execute()
         if existing.data:
             print("ℹ️ Admin account already exists.")
-            return
+            return "exists"
 
         # 🔐 Hash the password securely
         hashed_pw = bcrypt.hashpw(admin_password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
@@ -30,6 +30,8 @@ def setup_admin_account():
         }).execute()
 
         print("✅ Admin account successfully created.")
+        return "created"
 
     except Exception as e:
         print("🔥 Failed to create admin account:", e)
+        raise